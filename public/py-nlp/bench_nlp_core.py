@@ -0,0 +1,302 @@
+# ATS Engine Benchmarks
+# Run with: python bench_nlp_core.py [--size BYTES] [--budget SECONDS]
+#           python bench_nlp_core.py --memory [--update-budget]
+#           python bench_nlp_core.py --bound
+#
+# Stdlib only so it runs anywhere nlp_core.py runs. Exits non-zero when any
+# case exceeds its budget, which makes it usable as a CI gate.
+
+import argparse
+import json
+import random
+import sys
+import os
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from nlp_core import (
+    extract_contact_info,
+    parse_resume,
+    parse_resume_canonical,
+    score_ats,
+    optimize_resume,
+    parse_jd,
+    evaluate_ats,
+    match_keywords,
+    calculate_ats_score,
+    ats_score_upper_bound,
+    _concept_cache
+)
+
+# --- Adversarial Inputs ---
+
+ADVERSARIAL_SIZE = 1_000_000  # 1 MB
+CONTACT_BUDGET_S = 1.0  # per case, generous enough for Pyodide and slow CI hosts
+
+
+def _repeat(unit: str, size: int) -> str:
+    return (unit * (size // len(unit) + 1))[:size]
+
+
+def _pdf_garbage(size: int) -> str:
+    # Deterministic soup of the characters the contact patterns care about
+    rng = random.Random(1337)
+    alphabet = 'abcXYZ0189._@-+() /:\n'
+    return ''.join(rng.choice(alphabet) for _ in range(size))
+
+
+ADVERSARIAL_CASES: Dict[str, Callable[[int], str]] = {
+    'word_run': lambda size: _repeat('a', size),
+    'digit_run': lambda size: _repeat('7', size),
+    'dotted_run': lambda size: _repeat('a.', size),
+    'at_chain': lambda size: _repeat('a@', size),
+    'unterminated_email': lambda size: 'x@' + _repeat('a', size - 2),
+    'digit_tail': lambda size: _repeat('1', 9) + _repeat(' ', size - 9),
+    'table_dump': lambda size: _repeat('2017 | 42.0 | (3) - ', size),
+    'url_chain': lambda size: _repeat('http://', size),
+    'pdf_garbage': _pdf_garbage,
+}
+
+
+# --- Benchmarks ---
+
+def run_contact_benchmark(size: int = ADVERSARIAL_SIZE, budget_s: float = CONTACT_BUDGET_S) -> List[dict]:
+    """Time extract_contact_info on every adversarial case."""
+    report = []
+    for name, build in ADVERSARIAL_CASES.items():
+        text = build(size)
+        start = time.perf_counter()
+        extract_contact_info(text)
+        elapsed = time.perf_counter() - start
+        report.append({
+            'case': name,
+            'bytes': len(text),
+            'seconds': round(elapsed, 4),
+            'budgetSeconds': budget_s,
+            'withinBudget': elapsed <= budget_s
+        })
+    return report
+
+
+# --- Memory Benchmarks ---
+
+MEMORY_BUDGET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'memory_budget.json')
+MEMORY_BUDGET_HEADROOM = 1.5  # --update-budget stores measured peak * headroom
+MEMORY_TOP_SITES = 5
+
+# Size name -> number of experience bullets in the synthetic resume
+MEMORY_INPUT_SIZES = {'small': 10, 'medium': 100, 'large': 1000}
+
+_BULLET_TEMPLATES = [
+    'Developed {0} services with {1} handling {2}k requests per second',
+    'Led migration from {0} to {1}, reducing costs by {2}%',
+    'Built {0} dashboards and automated {1} reporting for {2} teams',
+    'Mentored {2} engineers on {0} and {1} best practices',
+]
+_BULLET_TERMS = ['Python', 'React', 'Node.js', 'AWS', 'Docker', 'Kubernetes', 'PostgreSQL',
+                 'GraphQL', 'Kafka', 'Terraform', 'TypeScript', 'Redis', 'microservices', 'analytics']
+
+
+def synthetic_resume(bullets: int) -> str:
+    """Deterministic resume with the given number of experience bullets."""
+    rng = random.Random(bullets)
+    lines = ['Alex Morgan', 'alex.morgan@example.com | 555-010-2030', '', 'Summary',
+             'Backend engineer focused on reliable distributed systems.', '', 'Experience']
+    for i in range(bullets):
+        template = _BULLET_TEMPLATES[i % len(_BULLET_TEMPLATES)]
+        lines.append('- ' + template.format(rng.choice(_BULLET_TERMS), rng.choice(_BULLET_TERMS), rng.randint(2, 90)))
+    lines += ['', 'Skills', ', '.join(_BULLET_TERMS), '', 'Education', 'BS Computer Science']
+    return '\n'.join(lines)
+
+
+def synthetic_jd(requirements: int) -> str:
+    """Deterministic JD with the given number of requirement lines."""
+    rng = random.Random(requirements + 1)
+    lines = ['Senior Backend Engineer', '', 'Requirements:']
+    for _ in range(requirements):
+        lines.append(f"- {rng.randint(2, 8)}+ years with {rng.choice(_BULLET_TERMS)} and {rng.choice(_BULLET_TERMS)}")
+    lines += ['', 'Responsibilities:', '- Design and operate scalable services', '',
+              'Nice to Have:', '- Machine learning background']
+    return '\n'.join(lines)
+
+
+# Public function -> callable(resume_text, jd_text)
+MEMORY_TARGETS: Dict[str, Callable[[str, str], object]] = {
+    'parse_resume': lambda resume, jd: parse_resume(resume),
+    'parse_resume_canonical': lambda resume, jd: parse_resume_canonical(resume),
+    'parse_jd': lambda resume, jd: parse_jd(jd),
+    'score_ats': score_ats,
+    'optimize_resume': optimize_resume,
+    'evaluate_ats': evaluate_ats,
+}
+
+
+def measure_memory(fn: Callable[[], object], top_sites: int = MEMORY_TOP_SITES) -> dict:
+    """
+    Peak and retained allocations of a single call, via tracemalloc.
+
+    Peak is the high-water mark above the pre-call baseline (it includes
+    transient structures such as Levenshtein matrices); retained is what is
+    still allocated while the result is alive. retainedSites are the source
+    lines that own the most retained memory; tracemalloc cannot snapshot the
+    peak itself, so transient allocations do not show up there.
+    """
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        result = fn()
+        current, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+        del result
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+    filters = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    stats = after.filter_traces(filters).compare_to(before.filter_traces(filters), 'lineno')
+    sites = [
+        {'site': f"{os.path.basename(stat.traceback[0].filename)}:{stat.traceback[0].lineno}",
+         'bytes': stat.size_diff, 'blocks': stat.count_diff}
+        for stat in sorted(stats, key=lambda stat: stat.size_diff, reverse=True)[:top_sites]
+        if stat.size_diff > 0
+    ]
+    return {
+        'peakBytes': max(peak - baseline, 0),
+        'retainedBytes': max(current - baseline, 0),
+        'retainedSites': sites
+    }
+
+
+def load_memory_budget(path: str = MEMORY_BUDGET_PATH) -> Dict[str, Dict[str, int]]:
+    """Committed peak budgets: {function: {size: bytes}}."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def run_memory_benchmark(sizes: Optional[List[str]] = None, budget: Optional[dict] = None) -> List[dict]:
+    """Measure every MEMORY_TARGETS function at each input size against the budget."""
+    sizes = sizes or list(MEMORY_INPUT_SIZES)
+    budget = load_memory_budget() if budget is None else budget
+    report = []
+    for size in sizes:
+        bullets = MEMORY_INPUT_SIZES[size]
+        resume, jd = synthetic_resume(bullets), synthetic_jd(max(bullets // 10, 3))
+        for name, target in MEMORY_TARGETS.items():
+            target(resume, jd)  # warm compiled regexes and constants outside the measurement
+            _concept_cache.clear()  # but measure building the concept vectors again
+            stats = measure_memory(lambda: target(resume, jd))
+            limit = budget.get(name, {}).get(size)
+            report.append({
+                'function': name,
+                'size': size,
+                'inputBytes': len(resume) + len(jd),
+                **stats,
+                'budgetBytes': limit,
+                'withinBudget': limit is None or stats['peakBytes'] <= limit
+            })
+    return report
+
+
+# --- Score Bound Benchmark ---
+
+# Requirements no synthetic resume mentions, so the bound has to rule them out via the fuzzy check
+_OFF_PROFILE_TERMS = ['Rust', 'Scala', 'Snowflake', 'Elixir', 'Haskell', 'Airflow', 'Spark', 'Golang']
+BOUND_REPEATS = 5
+
+
+def synthetic_off_profile_jd(requirements: int) -> str:
+    """synthetic_jd() plus requirements from outside the synthetic resumes' vocabulary."""
+    rng = random.Random(requirements + 2)
+    extra = [f"- Experience with {rng.choice(_OFF_PROFILE_TERMS)} or {rng.choice(_OFF_PROFILE_TERMS)}"
+             for _ in range(max(requirements // 2, 2))]
+    return synthetic_jd(requirements).replace('\nResponsibilities:', '\n'.join(extra) + '\nResponsibilities:', 1)
+
+
+def _best_ms(fn: Callable[[], object], repeats: int = BOUND_REPEATS) -> float:
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def run_bound_benchmark(sizes: Optional[List[str]] = None) -> List[dict]:
+    """
+    Time ats_score_upper_bound against the full matching it lets rank_top_k skip
+    (match_keywords + calculate_ats_score), on the synthetic resumes with an
+    on-profile and an off-profile JD. Parsing is shared and not timed.
+    """
+    report = []
+    for size in sizes or list(MEMORY_INPUT_SIZES):
+        bullets = MEMORY_INPUT_SIZES[size]
+        resume = synthetic_resume(bullets)
+        resume_model = parse_resume_canonical(resume)
+        for profile, build in (('on', synthetic_jd), ('off', synthetic_off_profile_jd)):
+            jd_model = parse_jd(build(max(bullets // 10, 3)))
+            full_ms = _best_ms(lambda: calculate_ats_score(jd_model, match_keywords(jd_model, resume_model), resume))
+            bound_ms = _best_ms(lambda: ats_score_upper_bound(jd_model, resume_model, resume))
+            total = calculate_ats_score(jd_model, match_keywords(jd_model, resume_model), resume)['total']
+            report.append({
+                'size': size,
+                'profile': profile,
+                'keywords': len(jd_model['categorizedKeywords']),
+                'fullMs': round(full_ms, 3),
+                'boundMs': round(bound_ms, 3),
+                'speedup': round(full_ms / bound_ms, 2) if bound_ms else None,
+                'total': total,
+                'bound': ats_score_upper_bound(jd_model, resume_model, resume),
+                'cheaper': bound_ms < full_ms
+            })
+    return report
+
+
+def budget_from_report(report: List[dict], headroom: float = MEMORY_BUDGET_HEADROOM) -> Dict[str, Dict[str, int]]:
+    budget: Dict[str, Dict[str, int]] = {}
+    for case in report:
+        budget.setdefault(case['function'], {})[case['size']] = int(case['peakBytes'] * headroom)
+    return budget
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Adversarial-input and memory benchmarks for nlp_core')
+    parser.add_argument('--size', type=int, default=ADVERSARIAL_SIZE, help='input size in characters')
+    parser.add_argument('--budget', type=float, default=CONTACT_BUDGET_S, help='per-case budget in seconds')
+    parser.add_argument('--memory', action='store_true', help='run tracemalloc peak/retained benchmarks')
+    parser.add_argument('--bound', action='store_true',
+                        help='compare ats_score_upper_bound with full matching (fails if it is not cheaper)')
+    parser.add_argument('--update-budget', action='store_true',
+                        help=f"rewrite {os.path.basename(MEMORY_BUDGET_PATH)} from this run (with --memory)")
+    args = parser.parse_args(argv)
+
+    if args.memory:
+        report = run_memory_benchmark()
+        if args.update_budget:
+            with open(MEMORY_BUDGET_PATH, 'w', encoding='utf-8') as f:
+                json.dump(budget_from_report(report), f, indent=2, sort_keys=True)
+                f.write('\n')
+        print(json.dumps({'memory': report}, indent=2))
+        return 0 if args.update_budget or all(case['withinBudget'] for case in report) else 1
+
+    if args.bound:
+        report = run_bound_benchmark()
+        print(json.dumps({'bound': report}, indent=2))
+        return 0 if all(case['cheaper'] for case in report) else 1
+
+    report = run_contact_benchmark(args.size, args.budget)
+    print(json.dumps({'contact': report}, indent=2))
+    return 0 if all(case['withinBudget'] for case in report) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,33 @@
+# Lexicon Snapshot Build Step
+# Run with: python build_lexicon_snapshot.py [--constants PATH] [--output PATH]
+#
+# Compiles public/shared-constants.json into public/shared-constants.snapshot,
+# which nlp_core loads instead of rebuilding the lexicon index when the
+# checksums match. Rerun whenever the constants or the engine version change;
+# a stale snapshot is ignored, never used.
+
+import argparse
+import json
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+
+from nlp_core import write_lexicon_snapshot
+
+PUBLIC_DIR = os.path.dirname(HERE)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Build the nlp_core lexicon snapshot')
+    parser.add_argument('--constants', default=os.path.join(PUBLIC_DIR, 'shared-constants.json'))
+    parser.add_argument('--output', default=os.path.join(PUBLIC_DIR, 'shared-constants.snapshot'))
+    args = parser.parse_args(argv)
+
+    print(json.dumps(write_lexicon_snapshot(args.output, args.constants), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
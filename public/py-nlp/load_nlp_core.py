@@ -0,0 +1,363 @@
+# ATS Engine Load / Soak Test
+# Run with: python load_nlp_core.py [--rate RPS] [--duration SECONDS] [--concurrency N]
+#                                   [--mix evaluateATS=6,scoreATS=3,optimizeResume=1]
+#                                   [--replay requests.jsonl] [--url http://127.0.0.1:8080/dispatch]
+#                                   [--output report.json]
+#
+# Open-loop load at a fixed arrival rate: latency is measured from each
+# request's scheduled start, so queueing behind slow calls shows up in the
+# tail instead of silently lowering the offered rate. Stdlib only.
+
+import argparse
+import gc
+import json
+import math
+import os
+import random
+import sys
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from nlp_core import evaluate_ats, score_ats, optimize_resume
+from bench_nlp_core import synthetic_resume, synthetic_jd
+
+DEFAULT_MIX = {'evaluateATS': 6, 'scoreATS': 3, 'optimizeResume': 1}
+PERCENTILES = (50, 95, 99, 99.9)
+
+# Operation name (as in dispatch / usePyNLP.ts) -> in-process call
+IN_PROCESS_OPERATIONS: Dict[str, Callable[[dict], object]] = {
+    'evaluateATS': lambda args: evaluate_ats(args['resumeText'], args['jdText']),
+    'scoreATS': lambda args: score_ats(args['resumeText'], args['jdText']),
+    'optimizeResume': lambda args: optimize_resume(args['resumeText'], args['jdText']),
+}
+
+
+# --- Latency Histogram ---
+
+class LatencyHistogram:
+    """
+    Log-bucketed latency histogram with ~1% relative error and memory that
+    does not grow with the number of samples, so hour-long soaks do not
+    distort the RSS they are measuring.
+    """
+
+    MIN_SECONDS = 1e-6
+    GROWTH = 1.01
+
+    def __init__(self):
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        index = int(math.log(max(seconds, self.MIN_SECONDS) / self.MIN_SECONDS, self.GROWTH))
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def merge(self, other: 'LatencyHistogram') -> None:
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, pct: float) -> float:
+        """Upper edge of the bucket holding the nearest-rank percentile, in seconds."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(round(pct * self.count / 100, 9)))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(self.MIN_SECONDS * self.GROWTH ** (index + 1), self.max)
+        return self.max
+
+    def summary_ms(self) -> dict:
+        summary = {f"p{pct:g}".replace('.', ''): round(self.percentile(pct) * 1000, 3) for pct in PERCENTILES}
+        summary['mean'] = round(self.total / self.count * 1000, 3) if self.count else 0.0
+        summary['max'] = round(self.max * 1000, 3)
+        return summary
+
+
+# --- Process Stats ---
+
+def current_rss_bytes() -> Optional[int]:
+    """Resident set size now (Linux /proc), else the peak from getrusage, else None."""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+    except (ImportError, OSError):
+        return None
+
+
+class _GCPauses:
+    """Time spent in garbage collection, via gc.callbacks."""
+
+    def __init__(self):
+        self.collections = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._started = 0.0
+
+    def __call__(self, phase: str, info: dict) -> None:
+        if phase == 'start':
+            self._started = time.perf_counter()
+        else:
+            pause = time.perf_counter() - self._started
+            self.collections += 1
+            self.total += pause
+            self.max = max(self.max, pause)
+
+    def summary(self) -> dict:
+        return {'collections': self.collections, 'pauseMsTotal': round(self.total * 1000, 3),
+                'pauseMsMax': round(self.max * 1000, 3)}
+
+
+# --- Workloads ---
+
+def synthetic_workload(mix: Dict[str, int] = None, seed: int = 42, variants: int = 8) -> Callable[[], dict]:
+    """
+    Return a generator function of dispatch-style requests drawn from mix
+    (operation -> relative weight), over resumes and JDs of varying size.
+    """
+    mix = mix or DEFAULT_MIX
+    unknown = set(mix) - set(IN_PROCESS_OPERATIONS)
+    if unknown:
+        raise ValueError(f"Unknown operations in mix: {sorted(unknown)}")
+    rng = random.Random(seed)
+    resumes = [synthetic_resume(rng.randint(5, 60)) for _ in range(variants)]
+    jds = [synthetic_jd(rng.randint(3, 15)) for _ in range(variants)]
+    ops, weights = list(mix), list(mix.values())
+
+    def next_request() -> dict:
+        return {'op': rng.choices(ops, weights)[0],
+                'args': {'resumeText': rng.choice(resumes), 'jdText': rng.choice(jds)}}
+    return next_request
+
+
+def replay_workload(path: str) -> Callable[[], dict]:
+    """Cycle through recorded dispatch-style requests ({op, args} per JSONL line)."""
+    with open(path, 'r', encoding='utf-8') as f:
+        recorded = [json.loads(line) for line in f if line.strip()]
+    if not recorded:
+        raise ValueError(f"No requests in {path}")
+    position = [0]
+
+    def next_request() -> dict:
+        request = recorded[position[0] % len(recorded)]
+        position[0] += 1
+        return request
+    return next_request
+
+
+def _http_target(url: str, timeout: float) -> Callable[[dict], object]:
+    """POST each request as a one-element dispatch batch to a local service."""
+    def call(request: dict) -> object:
+        body = json.dumps([request]).encode('utf-8')
+        http_request = urllib.request.Request(url, data=body, headers={'Content-Type': 'application/json'})
+        with urllib.request.urlopen(http_request, timeout=timeout) as response:
+            result = json.loads(response.read().decode('utf-8'))
+        if result and 'error' in result[0]:
+            raise RuntimeError(result[0]['error'])
+        return result
+    return call
+
+
+def _in_process_target(request: dict) -> object:
+    return IN_PROCESS_OPERATIONS[request['op']](request['args'])
+
+
+# --- Runner ---
+
+def run_load(next_request: Callable[[], dict], rate: float, duration_s: float, concurrency: int = 4,
+             url: Optional[str] = None, interval_s: float = 10.0, timeout_s: float = 30.0,
+             max_queue: Optional[int] = None) -> dict:
+    """
+    Offer rate requests per second for duration_s and report how the engine held up.
+
+    Requests that would push the backlog past max_queue (default 50 per
+    worker) are dropped and counted rather than queued without bound.
+
+    Returns:
+    {
+        config: {...},
+        summary: {offered, completed, errors, dropped, throughputRps, latencyMs: {p50, p95, p99, p999, mean, max}},
+        operations: Record<op, {completed, errors, latencyMs}>,
+        windows: [{startS, completed, errors, throughputRps, latencyMs, rssBytes}],
+        rss: {startBytes, endBytes, peakBytes, growthBytes},
+        gc: {collections, pauseMsTotal, pauseMsMax}
+    }
+    """
+    if rate <= 0 or duration_s <= 0:
+        raise ValueError("rate and duration_s must be positive")
+    target = _http_target(url, timeout_s) if url else _in_process_target
+    max_queue = max_queue or concurrency * 50
+
+    lock = threading.Lock()
+    overall = LatencyHistogram()
+    per_op: Dict[str, dict] = {}
+    windows: Dict[int, dict] = {}
+    counters = {'completed': 0, 'errors': 0, 'dropped': 0, 'inFlight': 0}
+    rss_samples: List[int] = []
+    gc_pauses = _GCPauses()
+
+    def window_for(elapsed: float) -> dict:
+        index = int(elapsed // interval_s)
+        if index not in windows:
+            windows[index] = {'histogram': LatencyHistogram(), 'errors': 0, 'rssBytes': None}
+        return windows[index]
+
+    def execute(request: dict, scheduled: float) -> None:
+        failed = False
+        try:
+            target(request)
+        except Exception:
+            failed = True
+        finished = time.perf_counter()
+        latency = finished - scheduled
+        with lock:
+            counters['inFlight'] -= 1
+            op = per_op.setdefault(request['op'], {'histogram': LatencyHistogram(), 'errors': 0})
+            window = window_for(scheduled - started)
+            if failed:
+                counters['errors'] += 1
+                op['errors'] += 1
+                window['errors'] += 1
+            else:
+                counters['completed'] += 1
+                overall.record(latency)
+                op['histogram'].record(latency)
+                window['histogram'].record(latency)
+
+    stop_sampling = threading.Event()
+
+    def sample_rss() -> None:
+        while True:
+            rss = current_rss_bytes()
+            with lock:
+                if rss is not None:
+                    rss_samples.append(rss)
+                    window_for(time.perf_counter() - started)['rssBytes'] = rss
+            if stop_sampling.wait(interval_s):
+                return
+
+    gc.callbacks.append(gc_pauses)
+    started = time.perf_counter()
+    sampler = threading.Thread(target=sample_rss, name='load-rss', daemon=True)
+    sampler.start()
+    offered = 0
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='load') as pool:
+            while True:
+                # Compare offsets, not absolute clock values: started + x - started need not equal x
+                offset = offered / rate
+                if offset >= duration_s:
+                    break
+                scheduled = started + offset
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                offered += 1
+                request = next_request()
+                with lock:
+                    if counters['inFlight'] >= max_queue:
+                        counters['dropped'] += 1
+                        continue
+                    counters['inFlight'] += 1
+                pool.submit(execute, request, scheduled)
+    finally:
+        elapsed = time.perf_counter() - started
+        stop_sampling.set()
+        sampler.join()
+        gc.callbacks.remove(gc_pauses)
+
+    end_rss = current_rss_bytes()
+    if end_rss is not None:
+        rss_samples.append(end_rss)
+
+    return {
+        'config': {'rate': rate, 'durationS': duration_s, 'concurrency': concurrency,
+                   'target': url or 'in-process', 'intervalS': interval_s, 'maxQueue': max_queue},
+        'summary': {
+            'offered': offered,
+            'completed': counters['completed'],
+            'errors': counters['errors'],
+            'dropped': counters['dropped'],
+            'elapsedS': round(elapsed, 3),
+            'throughputRps': round(counters['completed'] / elapsed, 2) if elapsed else 0.0,
+            'latencyMs': overall.summary_ms()
+        },
+        'operations': {
+            name: {'completed': op['histogram'].count, 'errors': op['errors'],
+                   'latencyMs': op['histogram'].summary_ms()}
+            for name, op in sorted(per_op.items())
+        },
+        'windows': [
+            {
+                'startS': index * interval_s,
+                'completed': window['histogram'].count,
+                'errors': window['errors'],
+                'throughputRps': round(window['histogram'].count / interval_s, 2),
+                'latencyMs': window['histogram'].summary_ms(),
+                'rssBytes': window['rssBytes']
+            }
+            for index, window in sorted(windows.items())
+        ],
+        'rss': {
+            'startBytes': rss_samples[0] if rss_samples else None,
+            'endBytes': rss_samples[-1] if rss_samples else None,
+            'peakBytes': max(rss_samples) if rss_samples else None,
+            'growthBytes': rss_samples[-1] - rss_samples[0] if rss_samples else None
+        },
+        'gc': gc_pauses.summary()
+    }
+
+
+def _parse_mix(value: str) -> Dict[str, int]:
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        mix[name.strip()] = int(weight or 1)
+    return mix
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Load and soak test for nlp_core')
+    parser.add_argument('--rate', type=float, default=20.0, help='offered requests per second')
+    parser.add_argument('--duration', type=float, default=60.0, help='test length in seconds')
+    parser.add_argument('--concurrency', type=int, default=4, help='worker threads')
+    parser.add_argument('--interval', type=float, default=10.0, help='report window in seconds')
+    parser.add_argument('--mix', type=_parse_mix, default=None, help='e.g. evaluateATS=6,scoreATS=3,optimizeResume=1')
+    parser.add_argument('--replay', help='JSONL file of recorded {op, args} requests')
+    parser.add_argument('--url', help='POST one-element dispatch batches to this local service instead')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='also write the JSON report to this file')
+    args = parser.parse_args(argv)
+
+    next_request = replay_workload(args.replay) if args.replay else synthetic_workload(args.mix, args.seed)
+    report = run_load(next_request, args.rate, args.duration, args.concurrency, args.url, args.interval)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    print(text)
+    return 0 if report['summary']['errors'] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
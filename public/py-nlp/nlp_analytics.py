@@ -0,0 +1,295 @@
+# Skill Demand Analytics - streaming top-skill statistics over JD feeds
+# Fixed-memory sketches (stdlib only); the browser build never imports this module.
+
+import hashlib
+import heapq
+import math
+from typing import List, Dict, Any, Optional, Tuple, Iterable
+
+from nlp_core import parse_jd
+
+KEYWORD_CATEGORIES = ('hard_skill', 'tool', 'concept', 'soft_skill')
+
+DEFAULT_SKETCH_WIDTH = 2048
+DEFAULT_SKETCH_DEPTH = 4
+DEFAULT_HEAVY_HITTERS = 64
+
+
+def _hash_pair(key: str) -> Tuple[int, int]:
+    # Stable across processes (unlike the salted builtin hash()), so sketches from different workers line up
+    digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+    return int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+
+
+# --- Count-Min Sketch ---
+
+class CountMinSketch:
+    """
+    Frequency estimates for an unbounded key space in width * depth counters.
+
+    estimate() never underestimates; with probability 1 - e^-depth it
+    overestimates by at most (e / width) * total.
+    """
+
+    def __init__(self, width: int = DEFAULT_SKETCH_WIDTH, depth: int = DEFAULT_SKETCH_DEPTH):
+        if width < 1 or depth < 1:
+            raise ValueError("width and depth must be positive")
+        self.width = width
+        self.depth = depth
+        self.total = 0
+        self._rows = [[0] * width for _ in range(depth)]
+
+    def _cells(self, key: str):
+        # Double hashing: row i uses h1 + i * h2
+        h1, h2 = _hash_pair(key)
+        width = self.width
+        return [(h1 + i * h2) % width for i in range(self.depth)]
+
+    def add(self, key: str, count: int = 1) -> None:
+        for row, cell in zip(self._rows, self._cells(key)):
+            row[cell] += count
+        self.total += count
+
+    def estimate(self, key: str) -> int:
+        return min(row[cell] for row, cell in zip(self._rows, self._cells(key)))
+
+    @property
+    def epsilon(self) -> float:
+        return math.e / self.width
+
+    @property
+    def delta(self) -> float:
+        return math.exp(-self.depth)
+
+    def error_bound(self) -> float:
+        """Additive overestimate bound, holding with probability 1 - delta."""
+        return self.epsilon * self.total
+
+    def merge(self, other: 'CountMinSketch') -> None:
+        """Add another sketch's counts; both must have the same dimensions."""
+        if (self.width, self.depth) != (other.width, other.depth):
+            raise ValueError("Cannot merge sketches with different dimensions")
+        for row, other_row in zip(self._rows, other._rows):
+            for i, value in enumerate(other_row):
+                if value:
+                    row[i] += value
+        self.total += other.total
+
+    def to_dict(self) -> dict:
+        return {'width': self.width, 'depth': self.depth, 'total': self.total, 'rows': self._rows}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'CountMinSketch':
+        sketch = cls(data['width'], data['depth'])
+        sketch.total = data['total']
+        sketch._rows = [list(row) for row in data['rows']]
+        return sketch
+
+
+# --- Space-Saving Heavy Hitters ---
+
+class SpaceSaving:
+    """
+    The most frequent keys of a stream, tracked in a fixed number of counters.
+
+    Each tracked key has a count that never underestimates its true
+    frequency and an error such that count - error never overestimates it.
+    Any key whose true frequency exceeds total / capacity is tracked.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_HEAVY_HITTERS):
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self.total = 0
+        self._counters: Dict[str, List[int]] = {}  # key -> [count, error]
+        self._heap: List[Tuple[int, str]] = []  # lazy min-heap of (count, key)
+
+    def _min_entry(self) -> Tuple[int, str]:
+        # Drop stale heap entries until the top matches its live counter
+        heap = self._heap
+        while True:
+            count, key = heap[0]
+            counter = self._counters.get(key)
+            if counter is not None and counter[0] == count:
+                return count, key
+            heapq.heappop(heap)
+
+    def _push(self, count: int, key: str) -> None:
+        heapq.heappush(self._heap, (count, key))
+        if len(self._heap) > 4 * self.capacity:
+            # Keep memory fixed: rebuild from the live counters
+            self._heap = [(counter[0], k) for k, counter in self._counters.items()]
+            heapq.heapify(self._heap)
+
+    def add(self, key: str, count: int = 1) -> None:
+        self.total += count
+        counter = self._counters.get(key)
+        if counter is not None:
+            counter[0] += count
+        elif len(self._counters) < self.capacity:
+            counter = self._counters[key] = [count, 0]
+        else:
+            # Replace the smallest counter; its count bounds the newcomer's missed occurrences
+            floor, evicted = self._min_entry()
+            heapq.heappop(self._heap)
+            del self._counters[evicted]
+            counter = self._counters[key] = [floor + count, floor]
+        self._push(counter[0], key)
+
+    def min_count(self) -> int:
+        """Upper bound on the frequency of any untracked key."""
+        if len(self._counters) < self.capacity:
+            return 0
+        return self._min_entry()[0]
+
+    def top(self, n: Optional[int] = None) -> List[Tuple[str, int, int]]:
+        """(key, count, error) for the n largest counters, largest first."""
+        ranked = sorted(self._counters.items(), key=lambda item: (-item[1][0], item[0]))
+        if n is not None:
+            ranked = ranked[:n]
+        return [(key, count, error) for key, (count, error) in ranked]
+
+    def merge(self, other: 'SpaceSaving') -> None:
+        """
+        Combine with another summary (mergeable summaries, Agarwal et al.).
+
+        A key missing from a full summary may still have occurred up to that
+        summary's minimum count, so that amount is added to both its count and
+        its error. The largest capacity counters are kept.
+        """
+        floor_self, floor_other = self.min_count(), other.min_count()
+        merged: Dict[str, List[int]] = {}
+        for key in set(self._counters) | set(other._counters):
+            mine = self._counters.get(key, [floor_self, floor_self])
+            theirs = other._counters.get(key, [floor_other, floor_other])
+            merged[key] = [mine[0] + theirs[0], mine[1] + theirs[1]]
+        kept = sorted(merged.items(), key=lambda item: (-item[1][0], item[0]))[:self.capacity]
+        self._counters = dict(kept)
+        self._heap = [(counter[0], key) for key, counter in self._counters.items()]
+        heapq.heapify(self._heap)
+        self.total += other.total
+
+    def to_dict(self) -> dict:
+        return {'capacity': self.capacity, 'total': self.total,
+                'counters': {key: list(counter) for key, counter in self._counters.items()}}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'SpaceSaving':
+        summary = cls(data['capacity'])
+        summary.total = data['total']
+        summary._counters = {key: list(counter) for key, counter in data['counters'].items()}
+        summary._heap = [(counter[0], key) for key, counter in summary._counters.items()]
+        heapq.heapify(summary._heap)
+        return summary
+
+
+# --- Skill Demand Aggregator ---
+
+class SkillDemandAggregator:
+    """
+    Live "top requested skills by category" over a stream of job postings.
+
+    Each posting counts once per distinct keyword (document frequency), using
+    the categorized keywords from parse_jd. Every category has one
+    Count-Min Sketch and one Space-Saving summary, so memory is fixed no
+    matter how many postings are seen. Aggregators built with the same
+    parameters in different workers can be merged, also across processes via
+    to_dict() / from_dict().
+    """
+
+    def __init__(self, width: int = DEFAULT_SKETCH_WIDTH, depth: int = DEFAULT_SKETCH_DEPTH,
+                 capacity: int = DEFAULT_HEAVY_HITTERS):
+        self.width = width
+        self.depth = depth
+        self.capacity = capacity
+        self.postings = 0
+        self._sketches = {category: CountMinSketch(width, depth) for category in KEYWORD_CATEGORIES}
+        self._heavy = {category: SpaceSaving(capacity) for category in KEYWORD_CATEGORIES}
+
+    def add_model(self, jd_model: dict) -> None:
+        """Count one parsed JobDescriptionModel."""
+        self.postings += 1
+        for kw in jd_model.get('categorizedKeywords', []):
+            category = kw['category'] if kw['category'] in self._sketches else 'concept'
+            self._sketches[category].add(kw['keyword'])
+            self._heavy[category].add(kw['keyword'])
+
+    def add(self, jd_text: str) -> None:
+        self.add_model(parse_jd(jd_text))
+
+    def add_many(self, jd_texts: Iterable[str]) -> int:
+        count = 0
+        for text in jd_texts:
+            self.add(text)
+            count += 1
+        return count
+
+    def merge(self, other: 'SkillDemandAggregator') -> None:
+        if (self.width, self.depth, self.capacity) != (other.width, other.depth, other.capacity):
+            raise ValueError("Cannot merge aggregators with different parameters")
+        for category in KEYWORD_CATEGORIES:
+            self._sketches[category].merge(other._sketches[category])
+            self._heavy[category].merge(other._heavy[category])
+        self.postings += other.postings
+
+    def estimate(self, keyword: str, category: str) -> int:
+        """Upper-bound estimate of the postings that requested keyword."""
+        return self._sketches[category].estimate(keyword.lower())
+
+    def top(self, category: str, n: int = 10) -> List[dict]:
+        """
+        The n most requested skills in a category.
+
+        Returns SkillDemand dicts, most requested first:
+        {
+            keyword: string,
+            count: number,       # best estimate (never below the true count)
+            lowerBound: number,  # guaranteed minimum
+            errorBound: number   # count - lowerBound
+        }
+        """
+        sketch = self._sketches[category]
+        results = []
+        for keyword, count, error in self._heavy[category].top():
+            # Both summaries overestimate, so the smaller one is tighter
+            upper = min(count, sketch.estimate(keyword))
+            lower = max(count - error, 0)
+            results.append({'keyword': keyword, 'count': upper, 'lowerBound': lower, 'errorBound': upper - lower})
+        results.sort(key=lambda entry: (-entry['count'], -entry['lowerBound'], entry['keyword']))
+        return results[:n]
+
+    def snapshot(self, n: int = 10) -> dict:
+        """
+        Top-n skills for every category, queryable at any point in the stream.
+
+        Returns: {postings, categories: Record<KeywordCategory, SkillDemand[]>,
+                  sketchError: Record<KeywordCategory, number>, confidence}
+        """
+        return {
+            'postings': self.postings,
+            'categories': {category: self.top(category, n) for category in KEYWORD_CATEGORIES},
+            'sketchError': {category: round(self._sketches[category].error_bound(), 2)
+                            for category in KEYWORD_CATEGORIES},
+            'confidence': round(1 - math.exp(-self.depth), 4)
+        }
+
+    def to_dict(self) -> dict:
+        return {
+            'width': self.width,
+            'depth': self.depth,
+            'capacity': self.capacity,
+            'postings': self.postings,
+            'sketches': {category: sketch.to_dict() for category, sketch in self._sketches.items()},
+            'heavyHitters': {category: heavy.to_dict() for category, heavy in self._heavy.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'SkillDemandAggregator':
+        aggregator = cls(data['width'], data['depth'], data['capacity'])
+        aggregator.postings = data['postings']
+        aggregator._sketches = {category: CountMinSketch.from_dict(sketch)
+                                for category, sketch in data['sketches'].items()}
+        aggregator._heavy = {category: SpaceSaving.from_dict(heavy)
+                             for category, heavy in data['heavyHitters'].items()}
+        return aggregator
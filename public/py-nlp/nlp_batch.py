@@ -0,0 +1,310 @@
+# Batch Scoring - applicant pool helpers built on the NLP core
+# Pure Python (stdlib only), same constraints as nlp_core.py
+
+import copy
+import hashlib
+import heapq
+import time
+from typing import List, Dict, Any, Optional, Tuple
+
+from nlp_core import (
+    parse_jd,
+    parse_resume_canonical,
+    match_keywords,
+    calculate_ats_score,
+    generate_recommendations,
+    ats_score_upper_bound
+)
+
+# --- Near-Duplicate Detection (MinHash + LSH) ---
+
+MINHASH_PERMUTATIONS = 64
+DEFAULT_DEDUPE_THRESHOLD = 0.9
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+def _permutations(num_perm: int) -> List[Tuple[int, int]]:
+    """Deterministic (a, b) pairs for the universal hash family a*x + b mod p."""
+    perms = []
+    for i in range(num_perm):
+        digest = hashlib.blake2b(f"minhash:{i}".encode(), digest_size=16).digest()
+        a = int.from_bytes(digest[:8], 'little') % (_MERSENNE_PRIME - 1) + 1
+        b = int.from_bytes(digest[8:], 'little') % _MERSENNE_PRIME
+        perms.append((a, b))
+    return perms
+
+
+_PERMUTATION_CACHE: Dict[int, List[Tuple[int, int]]] = {}
+
+
+def _token_hash(token: str) -> int:
+    # Stable across processes, unlike the salted builtin hash()
+    return int.from_bytes(hashlib.blake2b(token.encode('utf-8'), digest_size=4).digest(), 'little')
+
+
+def canonical_token_set(resume_model: dict) -> set:
+    """Normalized tokens of a canonical resume model, as a set."""
+    return {t['normalized'] for t in resume_model.get('tokens', [])}
+
+
+def minhash_signature(tokens: set, num_perm: int = MINHASH_PERMUTATIONS) -> Tuple[int, ...]:
+    """
+    Compute a MinHash signature over a token set.
+
+    The fraction of equal positions between two signatures estimates the
+    Jaccard similarity of the underlying token sets.
+    """
+    perms = _PERMUTATION_CACHE.get(num_perm)
+    if perms is None:
+        perms = _PERMUTATION_CACHE[num_perm] = _permutations(num_perm)
+
+    if not tokens:
+        return tuple([_MAX_HASH] * num_perm)
+
+    hashes = [_token_hash(t) for t in tokens]
+    return tuple(
+        min((a * h + b) % _MERSENNE_PRIME for h in hashes) & _MAX_HASH
+        for a, b in perms
+    )
+
+
+def estimate_similarity(sig1: Tuple[int, ...], sig2: Tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity from two equal-length MinHash signatures."""
+    if not sig1:
+        return 0.0
+    return sum(1 for x, y in zip(sig1, sig2) if x == y) / len(sig1)
+
+
+def choose_bands(threshold: float, num_perm: int = MINHASH_PERMUTATIONS) -> Tuple[int, int]:
+    """
+    Pick (bands, rows) with bands * rows == num_perm for an LSH threshold.
+
+    Two signatures become candidates with probability 1 - (1 - s^r)^b, which
+    turns steeply around s = (1/b)^(1/r). The split whose turning point is
+    closest to, but not above, the requested threshold is used so that true
+    duplicates are rarely missed; candidate pairs are verified afterwards.
+    """
+    splits = []
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows == 0:
+            bands = num_perm // rows
+            splits.append(((1.0 / bands) ** (1.0 / rows), bands, rows))
+    below = [split for split in splits if split[0] <= threshold]
+    _, bands, rows = max(below) if below else min(splits)
+    return bands, rows
+
+
+def find_near_duplicates(signatures: List[Tuple[int, ...]], threshold: float = DEFAULT_DEDUPE_THRESHOLD,
+                         bands: Optional[int] = None) -> List[List[int]]:
+    """
+    Group signatures into clusters of near-duplicates with LSH banding.
+
+    Returns clusters as lists of input indices in ascending order; the first
+    index of each cluster is its representative. Singletons are included.
+    """
+    count = len(signatures)
+    if count == 0:
+        return []
+    num_perm = len(signatures[0])
+    if bands is None:
+        bands, rows = choose_bands(threshold, num_perm)
+    else:
+        rows = max(1, num_perm // bands)
+
+    parent = list(range(count))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    checked = set()
+    for band in range(bands):
+        start = band * rows
+        buckets: Dict[Tuple[int, ...], List[int]] = {}
+        for idx, sig in enumerate(signatures):
+            buckets.setdefault(sig[start:start + rows], []).append(idx)
+        for members in buckets.values():
+            # Every pair in a bucket is a candidate; pairs already joined need no check
+            for i, first in enumerate(members):
+                for other in members[i + 1:]:
+                    root_a, root_b = find(first), find(other)
+                    if root_a == root_b or (first, other) in checked:
+                        continue
+                    checked.add((first, other))
+                    if estimate_similarity(signatures[first], signatures[other]) >= threshold:
+                        parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    clusters: Dict[int, List[int]] = {}
+    for idx in range(count):
+        clusters.setdefault(find(idx), []).append(idx)
+    return sorted(clusters.values(), key=lambda members: members[0])
+
+
+def _member_evaluation(evaluation: dict, resume_model: dict, resume_text: str) -> dict:
+    """
+    A cluster member's own copy of its representative's evaluation.
+
+    Statuses, category scores and recommendations are the representative's;
+    roleTitleScore and structureScore (and so the total) are recomputed from
+    the member's own text. A matched keyword's locations are looked up in
+    the member's tokens, keeping the representative's only where the member
+    lacks the matched token.
+    """
+    locations: Dict[str, List[str]] = {}
+    for token in resume_model.get('tokens', []):
+        found = locations.setdefault(token['normalized'], [])
+        if token['location'] not in found:
+            found.append(token['location'])
+
+    match_results = []
+    for result in evaluation['matchResults']:
+        result = dict(result)
+        if result['status'] == 'matched':
+            token = result.get('matchedVariant', result['keyword'].lower())
+            result['locations'] = list(locations.get(token) or result['locations'])
+        match_results.append(result)
+    jd_model = copy.deepcopy(evaluation['jdModel'])
+    return dict(evaluation, jdModel=jd_model, matchResults=match_results,
+                scoreBreakdown=calculate_ats_score(jd_model, match_results, resume_text),
+                recommendations=copy.deepcopy(evaluation['recommendations']))
+
+
+def evaluate_ats_many(resume_texts: List[str], jd_text: str,
+                      dedupe_threshold: Optional[float] = DEFAULT_DEDUPE_THRESHOLD,
+                      num_perm: int = MINHASH_PERMUTATIONS) -> dict:
+    """
+    Evaluate many resumes against one JD, scoring near-duplicates only once.
+
+    Every resume is parsed (that is cheap and feeds the signature), but keyword
+    matching, scoring and recommendations only run for one representative per
+    cluster; the other members receive a copy of the representative's result
+    with their own locations, role and structure scores (see
+    _member_evaluation). Pass dedupe_threshold=None to score every resume.
+
+    Returns:
+    {
+        results: ATSEvaluationResponse[],   # aligned with resume_texts; one dict per resume
+        representatives: number[],          # index whose result each resume received
+        clusters: number[][],
+        report: {resumes, clusters, evaluated, skipped, savedRatio, signatureMs, scoringMs}
+    }
+    """
+    jd_model = parse_jd(jd_text)
+    resume_models = [parse_resume_canonical(text) for text in resume_texts]
+
+    sig_start = time.perf_counter()
+    if dedupe_threshold is None:
+        clusters = [[i] for i in range(len(resume_texts))]
+    else:
+        signatures = [minhash_signature(canonical_token_set(m), num_perm) for m in resume_models]
+        clusters = find_near_duplicates(signatures, dedupe_threshold)
+    signature_ms = (time.perf_counter() - sig_start) * 1000
+
+    score_start = time.perf_counter()
+    results: List[Any] = [None] * len(resume_texts)
+    representatives = [0] * len(resume_texts)
+    for members in clusters:
+        head = members[0]
+        match_results = match_keywords(jd_model, resume_models[head])
+        evaluation = {
+            'jdModel': jd_model,
+            'matchResults': match_results,
+            'scoreBreakdown': calculate_ats_score(jd_model, match_results, resume_texts[head]),
+            'recommendations': generate_recommendations(match_results)
+        }
+        for idx in members:
+            results[idx] = (evaluation if idx == head
+                            else _member_evaluation(evaluation, resume_models[idx], resume_texts[idx]))
+            representatives[idx] = head
+    scoring_ms = (time.perf_counter() - score_start) * 1000
+
+    total = len(resume_texts)
+    evaluated = len(clusters)
+    return {
+        'results': results,
+        'representatives': representatives,
+        'clusters': clusters,
+        'report': {
+            'resumes': total,
+            'clusters': evaluated,
+            'evaluated': evaluated,
+            'skipped': total - evaluated,
+            'savedRatio': round((total - evaluated) / total, 4) if total else 0.0,
+            'signatureMs': round(signature_ms, 2),
+            'scoringMs': round(scoring_ms, 2)
+        }
+    }
+
+
+# --- Top-k Ranking ---
+
+def rank_top_k(resume_texts: List[str], jd_text: str, k: int = 50,
+               fuzzy_threshold: float = 0.85) -> dict:
+    """
+    Return the k best resumes for a JD, skipping work for hopeless candidates.
+
+    Candidates are visited in input order. Once k candidates are held, any
+    candidate whose ats_score_upper_bound cannot beat the current k-th best
+    total is skipped before partial/fuzzy matching; ties go to the earlier
+    resume, exactly as a stable sort over full scores would. Recommendations
+    are only generated for the final top-k, so the result is identical to
+    fully scoring every resume and sorting by total.
+
+    Returns:
+    {
+        topK: [{index, total, evaluation: ATSEvaluationResponse}],  # best first
+        report: {candidates, evaluated, pruned, prunedRatio}
+    }
+    """
+    jd_model = parse_jd(jd_text)
+    if k <= 0:
+        return {'topK': [], 'report': {'candidates': len(resume_texts), 'evaluated': 0,
+                                       'pruned': len(resume_texts), 'prunedRatio': 1.0 if resume_texts else 0.0}}
+    heap: List[Tuple[int, int, list]] = []  # (total, -index, match_results); min-heap on rank
+    evaluated = 0
+    pruned = 0
+
+    for index, text in enumerate(resume_texts):
+        resume_model = parse_resume_canonical(text)
+        if len(heap) >= k:
+            # Earlier resumes win ties, so equalling the cut-off is not enough
+            if ats_score_upper_bound(jd_model, resume_model, text, fuzzy_threshold) <= heap[0][0]:
+                pruned += 1
+                continue
+        evaluated += 1
+        match_results = match_keywords(jd_model, resume_model, fuzzy_threshold)
+        total = calculate_ats_score(jd_model, match_results, text)['total']
+        entry = (total, -index, match_results)
+        if len(heap) < k:
+            heapq.heappush(heap, entry)
+        elif entry[:2] > heap[0][:2]:
+            heapq.heapreplace(heap, entry)
+
+    top_k = []
+    for total, neg_index, match_results in sorted(heap, key=lambda e: (-e[0], -e[1])):
+        index = -neg_index
+        top_k.append({
+            'index': index,
+            'total': total,
+            'evaluation': {
+                'jdModel': jd_model,
+                'matchResults': match_results,
+                'scoreBreakdown': calculate_ats_score(jd_model, match_results, resume_texts[index]),
+                'recommendations': generate_recommendations(match_results)
+            }
+        })
+
+    candidates = len(resume_texts)
+    return {
+        'topK': top_k,
+        'report': {
+            'candidates': candidates,
+            'evaluated': evaluated,
+            'pruned': pruned,
+            'prunedRatio': round(pruned / candidates, 4) if candidates else 0.0
+        }
+    }
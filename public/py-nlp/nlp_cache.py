@@ -0,0 +1,179 @@
+# Evaluation Cache - persistent evaluate_ats results on stdlib sqlite3
+# For batch/service use; the browser build never imports this module.
+
+import hashlib
+import json
+import sqlite3
+import time
+import zlib
+from typing import Optional, List, Dict, Any, Tuple, Iterable
+
+from nlp_core import evaluate_ats, engine_version, metrics_sink
+
+# SQLite's historical default limit on bound parameters is 999
+_LOOKUP_CHUNK = 300
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS evaluations (
+    resume_hash TEXT NOT NULL,
+    jd_hash TEXT NOT NULL,
+    engine_version TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    size INTEGER NOT NULL,
+    payload BLOB NOT NULL,
+    PRIMARY KEY (resume_hash, jd_hash, engine_version)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS evaluations_created_at ON evaluations (created_at);
+"""
+
+
+def content_hash(text: str) -> str:
+    """Stable content key for a resume or JD."""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _compress(result: dict) -> bytes:
+    return zlib.compress(json.dumps(result, separators=(',', ':')).encode('utf-8'))
+
+
+def _decompress(payload: bytes) -> dict:
+    return json.loads(zlib.decompress(payload).decode('utf-8'))
+
+
+class EvaluationCache:
+    """
+    Persistent evaluate_ats cache keyed by (resume hash, JD hash, engine version).
+
+    Results are stored as zlib-compressed JSON. The database runs in WAL mode,
+    so any number of worker processes can read while one writes; each process
+    should open its own EvaluationCache. Entries written by another engine or
+    lexicon version are never returned and age out through evict().
+    """
+
+    def __init__(self, path: str, version: Optional[str] = None, timeout: float = 30.0):
+        self.path = path
+        self.version = version or engine_version()
+        self._conn = sqlite3.connect(path, timeout=timeout)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> 'EvaluationCache':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # --- Lookups ---
+
+    def get(self, resume_text: str, jd_text: str) -> Optional[dict]:
+        return self.get_many([(resume_text, jd_text)])[0]
+
+    def get_many(self, pairs: List[Tuple[str, str]]) -> List[Optional[dict]]:
+        """Look up many (resume_text, jd_text) pairs; misses are None."""
+        keys = [(content_hash(resume), content_hash(jd)) for resume, jd in pairs]
+        found: Dict[Tuple[str, str], bytes] = {}
+        unique = list(dict.fromkeys(keys))
+        for start in range(0, len(unique), _LOOKUP_CHUNK):
+            chunk = unique[start:start + _LOOKUP_CHUNK]
+            placeholders = ','.join(['(?, ?)'] * len(chunk))
+            params: List[Any] = [self.version]
+            for resume_hash, jd_hash in chunk:
+                params += [resume_hash, jd_hash]
+            rows = self._conn.execute(
+                'SELECT resume_hash, jd_hash, payload FROM evaluations '
+                f'WHERE engine_version = ? AND (resume_hash, jd_hash) IN (VALUES {placeholders})',
+                params
+            )
+            for resume_hash, jd_hash, payload in rows:
+                found[(resume_hash, jd_hash)] = payload
+        sink = metrics_sink()
+        if sink is not None:
+            hits = sum(1 for key in keys if key in found)
+            sink.observe_cache('evaluation', hits, len(keys) - hits)
+        return [_decompress(found[key]) if key in found else None for key in keys]
+
+    # --- Inserts ---
+
+    def put(self, resume_text: str, jd_text: str, result: dict) -> None:
+        self.put_many([(resume_text, jd_text, result)])
+
+    def put_many(self, items: Iterable[Tuple[str, str, dict]]) -> int:
+        """Insert or replace many results in a single transaction."""
+        now = time.time()
+        rows = []
+        for resume_text, jd_text, result in items:
+            payload = _compress(result)
+            rows.append((content_hash(resume_text), content_hash(jd_text), self.version, now, len(payload), payload))
+        with self._conn:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO evaluations '
+                '(resume_hash, jd_hash, engine_version, created_at, size, payload) VALUES (?, ?, ?, ?, ?, ?)',
+                rows
+            )
+        return len(rows)
+
+    # --- Eviction ---
+
+    def evict(self, max_age_s: Optional[float] = None, max_bytes: Optional[int] = None,
+              drop_other_versions: bool = False) -> int:
+        """
+        Delete entries older than max_age_s, then the oldest entries until the
+        stored payloads fit in max_bytes. Returns the number of rows removed.
+        """
+        removed = 0
+        with self._conn:
+            if drop_other_versions:
+                removed += self._conn.execute(
+                    'DELETE FROM evaluations WHERE engine_version != ?', (self.version,)
+                ).rowcount
+            if max_age_s is not None:
+                removed += self._conn.execute(
+                    'DELETE FROM evaluations WHERE created_at < ?', (time.time() - max_age_s,)
+                ).rowcount
+            if max_bytes is not None:
+                # Keep the newest rows whose running payload total fits the budget
+                removed += self._conn.execute(
+                    'DELETE FROM evaluations WHERE (resume_hash, jd_hash, engine_version) IN ('
+                    '  SELECT resume_hash, jd_hash, engine_version FROM ('
+                    '    SELECT resume_hash, jd_hash, engine_version, '
+                    '           SUM(size) OVER (ORDER BY created_at DESC, resume_hash, jd_hash) AS running'
+                    '    FROM evaluations'
+                    '  ) WHERE running > ?'
+                    ')',
+                    (max_bytes,)
+                ).rowcount
+        return removed
+
+    def stats(self) -> dict:
+        entries, total = self._conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM evaluations').fetchone()
+        return {'entries': entries, 'bytes': total, 'version': self.version}
+
+
+def evaluate_ats_cached(cache: EvaluationCache, pairs: List[Tuple[str, str]]) -> dict:
+    """
+    evaluate_ats for many (resume_text, jd_text) pairs through the cache.
+
+    All pairs are looked up in one pass, misses are evaluated and then written
+    back in one transaction.
+
+    Returns: {results: ATSEvaluationResponse[], report: {pairs, hits, misses, evaluated}}
+    """
+    results = cache.get_many(pairs)
+    hits = sum(1 for result in results if result is not None)
+    computed: Dict[Tuple[str, str], dict] = {}
+    for i, (resume_text, jd_text) in enumerate(pairs):
+        if results[i] is None:
+            key = (resume_text, jd_text)
+            if key not in computed:
+                computed[key] = evaluate_ats(resume_text, jd_text)
+            results[i] = computed[key]
+    if computed:
+        cache.put_many((resume, jd, result) for (resume, jd), result in computed.items())
+    return {
+        'results': results,
+        'report': {'pairs': len(pairs), 'hits': hits, 'misses': len(pairs) - hits, 'evaluated': len(computed)}
+    }
@@ -3,13 +3,26 @@
 
 import re
 import json
-from collections import Counter
-from typing import Optional, List, Dict, Any, Set
+import math
+import time
+import zlib
+import bisect
+import functools
+import threading
+from collections import Counter, OrderedDict
+from collections.abc import Mapping as AbstractMapping, Sequence as AbstractSequence, Set as AbstractSet
+from types import MappingProxyType
+from typing import Optional, List, Dict, Any, Set, Tuple, Iterator
 
 # --- Constants & Patterns ---
 
-EMAIL_PATTERN = re.compile(r'[a-zA-Z0-9._]+@[a-zA-Z0-9._]+\.[a-zA-Z]+')
-PHONE_PATTERN = re.compile(r'[+]?[0-9][0-9 .()\-]{8,}[0-9]')
+# Contact patterns are written so that a search never backtracks more than once
+# over any character: the email local part may only start at the beginning of a
+# run (lookbehind), and phones are matched as whole separator runs and
+# validated afterwards. Both stay linear on long runs of letters or digits.
+EMAIL_PATTERN = re.compile(r'(?<![a-zA-Z0-9._])[a-zA-Z0-9._]+@[a-zA-Z0-9._]+\.[a-zA-Z]+')
+PHONE_PATTERN = re.compile(r'[+]?[0-9][0-9 .()\-]*')
+PHONE_MIN_SPAN = 10  # first digit .. last digit, as in the old [0-9][...]{8,}[0-9]
 LINKEDIN_PATTERN = re.compile(r'linkedin\.com/in/[a-zA-Z0-9]+', re.IGNORECASE)
 GITHUB_PATTERN = re.compile(r'github\.com/[a-zA-Z0-9]+', re.IGNORECASE)
 URL_PATTERN = re.compile(r'https?://[^\s]+')
@@ -25,27 +38,58 @@ SECTION_HEADERS = {
 }
 
 # Shared constants - will be loaded from shared-constants.json
+CONSTANTS_PATH = 'shared-constants.json'
 TECH_SKILLS: List[str] = []
 SOFT_SKILLS: List[str] = []
 STOP_WORDS: Set[str] = set()
 _constants_loaded = False
 
 def _load_shared_constants() -> None:
-    """Load shared constants from shared-constants.json file."""
+    """
+    Load shared constants and the lexicon index.
+    
+    A lexicon snapshot (see write_lexicon_snapshot) whose checksum matches
+    shared-constants.json is used as-is; otherwise the JSON is parsed and the
+    index is built from it.
+    """
     global TECH_SKILLS, SOFT_SKILLS, STOP_WORDS, _constants_loaded
     
     if _constants_loaded:
         return
     
+    # Worker processes can map one shared, prebuilt lexicon image instead (see nlp_shards.SharedLexicon)
+    import os
+    image_path = os.environ.get(LEXICON_IMAGE_ENV)
+    if image_path:
+        try:
+            _install_lexicon(open_lexicon_image(image_path))
+            _constants_loaded = True
+            return
+        except Exception as e:
+            print(f'[Shared Constants] Cannot map lexicon image {image_path}: {e}, loading constants')
+    
     try:
         # Try to read from filesystem (works in both Pyodide and regular Python)
-        with open('shared-constants.json', 'r', encoding='utf-8') as f:
-            constants = json.load(f)
-        TECH_SKILLS = constants.get('TECH_SKILLS', [])
-        SOFT_SKILLS = constants.get('SOFT_SKILLS', [])
-        STOP_WORDS = set(constants.get('STOP_WORDS', []))
+        with open(CONSTANTS_PATH, 'rb') as f:
+            source = f.read()
+        data = _read_lexicon_snapshot(LEXICON_SNAPSHOT_PATH, _lexicon_checksum(source))
+        if data is not None:
+            print('[Shared Constants] Loaded lexicon snapshot')
+        else:
+            constants = json.loads(source.decode('utf-8'))
+            data = _build_lexicon(
+                constants.get('TECH_SKILLS', []),
+                constants.get('SOFT_SKILLS', []),
+                constants.get('STOP_WORDS', [])
+            )
+            print('[Shared Constants] Loaded from shared-constants.json')
+        lexicon = Lexicon(data)
+        term_weights = read_term_weights(TERM_WEIGHTS_PATH)
+        if term_weights is not None and term_weights.lexicon in (None, lexicon.fingerprint):
+            lexicon = lexicon.with_term_weights(term_weights)
+            print('[Shared Constants] Loaded corpus term weights')
+        _install_lexicon(lexicon)
         _constants_loaded = True
-        print('[Shared Constants] Loaded from shared-constants.json')
     except Exception as e:
         print(f'[Shared Constants] Failed to load from file: {e}, using defaults')
         # Fallback defaults
@@ -79,6 +123,7 @@ def _load_shared_constants() -> None:
             'any', 'both', 'once', 'here', 'there', 'too', 'now', 'page', 'site', 'work',
             'data', 'new', 'time', 'team', 'first', 'level', 'based', 'using', 'throughout'
         }
+        _install_lexicon(Lexicon.from_constants(TECH_SKILLS, SOFT_SKILLS, STOP_WORDS))
         _constants_loaded = True
 
 def ensure_constants_loaded() -> None:
@@ -100,29 +145,955 @@ ACTION_VERBS = {
     'streamlined', 'automated', 'collaborated', 'mentored', 'trained'
 }
 
-# Load constants on module import
-_load_shared_constants()
+# --- Type Constants ---
+KEYWORD_CATEGORIES = ['hard_skill', 'tool', 'concept', 'soft_skill']
+
+SOFT_SKILL_PATTERNS = [
+    'leadership', 'communication', 'teamwork', 'problem-solving', 'analytical',
+    'collaboration', 'mentoring', 'management', 'strategic', 'innovative',
+    'adaptable', 'creative', 'detail-oriented', 'organized', 'proactive'
+]
+
+TOOL_KEYWORDS = [
+    'docker', 'kubernetes', 'git', 'jenkins', 'jira', 'terraform', 'ansible', 
+    'github', 'gitlab', 'confluence', 'prometheus', 'grafana', 'datadog',
+    'helm', 'argocd', 'circleci', 'travis', 'bamboo', 'slack', 'notion'
+]
+
+JD_SECTION_PATTERNS = {
+    'requirements': ['requirements', 'qualifications', 'must have', 'required', 'you have', 'you bring'],
+    'responsibilities': ['responsibilities', 'duties', 'what you will do', 'role', 'you will'],
+    'nice_to_have': ['nice to have', 'preferred', 'bonus', 'plus', 'ideal'],
+    'about': ['about us', 'about the company', 'who we are', 'company', 'we are']
+}
+
+# Multi-word phrases detected in job descriptions
+MULTI_WORD_PATTERN = r'\b(spring boot|react native|machine learning|deep learning|data science|full stack|front.?end|back.?end|cloud computing|ci/cd)\b'
+
+# Well-known spellings of a keyword (lowercase) that resume tokens resolve to without fuzzy
+# matching. Variants the tokenizer produces from lexicon skills ("nodejs") are generated.
+SKILL_ALIASES = {
+    'react': ['reactjs', 'react.js'],
+    'angular': ['angularjs', 'angular.js'],
+    'vue': ['vuejs', 'vue.js'],
+    'node.js': ['node', 'nodejs'],
+    'nuxt.js': ['nuxt'],
+    'javascript': ['js', 'ecmascript', 'es6'],
+    'typescript': ['ts'],
+    'python': ['python3', 'py'],
+    'go': ['golang'],
+    'c++': ['cpp'],
+    'c#': ['csharp'],
+    'postgresql': ['postgres', 'psql', 'pgsql'],
+    'mongodb': ['mongo'],
+    'dynamodb': ['dynamo'],
+    'kubernetes': ['k8s', 'kube'],
+    'scikit-learn': ['sklearn'],
+    'pytorch': ['torch'],
+    'graphql': ['gql'],
+    'tailwind': ['tailwindcss'],
+    'sass': ['scss'],
+    'microservices': ['microservice'],
+    'websockets': ['websocket'],
+    'llm': ['llms'],
+}
+
+# Characters kept in resume word tokens
+_TOKEN_STRIP_PATTERN = re.compile(r'[^a-zA-Z0-9\-+#]')
+
+# Bump when scoring or parsing behaviour changes so persisted results are not reused
+ENGINE_VERSION = '2.3.0'
+
+# --- Lexicon Index ---
+
+# Built from the shared constants and the tables above. _build_lexicon produces
+# plain data (what a snapshot stores); Lexicon freezes it. Skills are found with
+# str.find plus a word-boundary check (_skill_count), so there is no per-skill
+# pattern to compile when a lexicon is built or loaded.
+
+LEXICON_SNAPSHOT_PATH = 'shared-constants.snapshot'
+LEXICON_SNAPSHOT_MAGIC = b'NLPLEX'
+LEXICON_SNAPSHOT_FORMAT = 3
+_SNAPSHOT_HEADER_SIZE = len(LEXICON_SNAPSHOT_MAGIC) + 2 + 32  # magic, format (u16), sha256
+
+def _is_word_char(ch: str) -> bool:
+    """Whether re's \\w matches ch (str patterns are Unicode-aware)."""
+    return ch.isalnum() or ch == '_'
+
+def _skill_count(text_lower: str, skill: str, stop_at: int = 0) -> int:
+    """
+    How many matches re.findall(r'\\b' + re.escape(skill) + r'\\b', text_lower)
+    reports, counted with str.find; with stop_at, counting stops there.
+    """
+    if not skill:
+        return 0
+    size, text_size = len(skill), len(text_lower)
+    starts_word, ends_word = _is_word_char(skill[0]), _is_word_char(skill[-1])
+    count = 0
+    index = text_lower.find(skill)
+    while index >= 0:
+        end = index + size
+        # \b holds where exactly one side is a word character (text edges are not)
+        if ((index > 0 and _is_word_char(text_lower[index - 1])) != starts_word
+                and (end < text_size and _is_word_char(text_lower[end])) != ends_word):
+            count += 1
+            if count == stop_at:
+                break
+            index = text_lower.find(skill, end)
+        else:
+            index = text_lower.find(skill, index + 1)
+    return count
+
+def _categorize_by_rules(kw_lower: str, tech_lower: Set[str]) -> str:
+    # Check if it's a tool
+    if any(tool in kw_lower for tool in TOOL_KEYWORDS):
+        return 'tool'
+
+    # Check if it's a soft skill
+    if any(soft in kw_lower for soft in SOFT_SKILL_PATTERNS):
+        return 'soft_skill'
+
+    # Check if it's a known tech skill (hard skill)
+    if kw_lower in tech_lower:
+        return 'hard_skill'
+
+    # Default to concept
+    return 'concept'
+
+def _build_aliases(tech_lower: List[str], tech_set: Set[str]) -> Dict[str, str]:
+    """
+    Variant -> canonical keyword table for resume tokens.
+    
+    Generated entries map what the word tokenizer leaves of a skill
+    ("node.js" -> "nodejs", "ci/cd" -> "cicd") back to it; SKILL_ALIASES
+    entries win over generated ones. Variants two skills would generate, and
+    variants that are lexicon skills themselves, are left out.
+    """
+    aliases: Dict[str, str] = {}
+    ambiguous = set()
+    for skill in tech_lower:
+        variant = _TOKEN_STRIP_PATTERN.sub('', skill)
+        if variant and variant != skill:
+            if aliases.get(variant, skill) != skill:
+                ambiguous.add(variant)
+            aliases[variant] = skill
+    for variant in ambiguous:
+        del aliases[variant]
+    for canonical, variants in SKILL_ALIASES.items():
+        for variant in variants:
+            aliases[variant] = canonical
+    return {variant: canonical for variant, canonical in aliases.items() if variant not in tech_set}
+
+def _overlay_aliases(base: 'Lexicon', added: List[str], tech_lower: Tuple[str, ...], tech_set: frozenset):
+    """
+    base.aliases plus the variants of the added skills, sharing the base table.
+    
+    Equal to _build_aliases over all skills; rebuilt in full only when an added
+    skill or variant collides with an existing entry.
+    """
+    from collections import ChainMap
+    extra = {}
+    for skill in added:
+        variant = _TOKEN_STRIP_PATTERN.sub('', skill)
+        if variant and variant != skill:
+            extra.setdefault(variant, []).append(skill)
+    base_variants = {_TOKEN_STRIP_PATTERN.sub('', skill) for skill in base.tech_lower}
+    if any(skill in base.aliases for skill in added) or any(
+            len(skills) > 1 or variant in base.aliases or variant in base_variants
+            for variant, skills in extra.items()):
+        return MappingProxyType(_build_aliases(list(tech_lower), tech_set))
+    return MappingProxyType(ChainMap(
+        {variant: skills[0] for variant, skills in extra.items() if variant not in tech_set}, base.aliases))
+
+def _build_lexicon(tech_skills: List[str], soft_skills: List[str], stop_words) -> Dict[str, Any]:
+    """Build the lexicon index: lowercased skills, categories, aliases and the header recognizer."""
+    tech_lower = [skill.lower() for skill in tech_skills]
+    tech_set = set(tech_lower)
+    headers_by_initial: Dict[str, List[Tuple[str, str]]] = {}
+    for section_name, keywords in SECTION_HEADERS.items():
+        for keyword in keywords:
+            headers_by_initial.setdefault(keyword[0], []).append((keyword, section_name))
+    return {
+        'techSkills': list(tech_skills),
+        'softSkills': list(soft_skills),
+        'stopWords': sorted(set(stop_words)),
+        'techLower': tech_lower,
+        'techSet': tech_set,
+        'categories': {skill: _categorize_by_rules(skill, tech_set) for skill in tech_lower},
+        'aliases': _build_aliases(tech_lower, tech_set),
+        'phrasePattern': MULTI_WORD_PATTERN,
+        # Header keywords in SECTION_HEADERS priority order, keyed by first character
+        'headers': {initial: tuple(entries) for initial, entries in headers_by_initial.items()},
+    }
+
+class Lexicon:
+    """
+    Immutable, fully built lexicon index.
+
+    Everything is built up front and no attribute can be rebound, so one
+    instance can back any number of engines and threads without locking.
+    Collections are tuples, frozensets and read-only mappings, or read-only
+    views of the same shape for a lexicon mapped from an image.
+    """
+
+    __slots__ = ('tech_skills', 'soft_skills', 'stop_words', 'tech_lower', 'tech_set', 'categories', 'aliases',
+                 'phrase_pattern', 'headers', 'phrase_regex', 'term_weights', 'fingerprint')
+
+    def __init__(self, data: Dict[str, Any]):
+        """data as produced by _build_lexicon (or loaded from a snapshot)."""
+        values = {
+            'tech_skills': tuple(data['techSkills']),
+            'soft_skills': tuple(data['softSkills']),
+            'stop_words': frozenset(data['stopWords']),
+            'tech_lower': tuple(data['techLower']),
+            'tech_set': frozenset(data['techSet']),
+            'categories': MappingProxyType(dict(data['categories'])),
+            'aliases': MappingProxyType(dict(data['aliases'])),
+            'phrase_pattern': data['phrasePattern'],
+            'headers': MappingProxyType({initial: tuple(entries) for initial, entries in data['headers'].items()}),
+        }
+        values['phrase_regex'] = re.compile(values['phrase_pattern'])
+        values['term_weights'] = None
+        self._freeze(values)
+
+    def _freeze(self, values: Dict[str, Any], fingerprint: Optional[str] = None) -> None:
+        if fingerprint is None:
+            import hashlib
+            source = json.dumps([list(values['tech_skills']), list(values['soft_skills']), sorted(values['stop_words']),
+                                 sorted(values['aliases'].items())], separators=(',', ':'))
+            fingerprint = hashlib.sha256(source.encode('utf-8')).hexdigest()[:12]
+        values['fingerprint'] = fingerprint
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    @classmethod
+    def from_constants(cls, tech_skills: List[str], soft_skills: List[str], stop_words) -> 'Lexicon':
+        return cls(_build_lexicon(tech_skills, soft_skills, stop_words))
+
+    def overlay(self, tech_skills=(), soft_skills=(), stop_words=()) -> 'Lexicon':
+        """
+        This lexicon plus extra vocabulary, e.g. one customer's skills.
+
+        The result shares this lexicon's categories, aliases, header table and
+        phrase pattern instead of rebuilding them. Skills already present (case-insensitively) are skipped, and
+        added skills rank after the existing ones, so the overlay behaves like
+        a lexicon built from the concatenated constants.
+        """
+        from collections import ChainMap
+        added = []
+        known = set(self.tech_set)
+        for skill in tech_skills:
+            skill_lower = skill.lower()
+            if skill_lower not in known:
+                known.add(skill_lower)
+                added.append((skill, skill_lower))
+        # Parts the overlay leaves unchanged stay the very same objects
+        tech_set = frozenset(known) if added else self.tech_set
+        tech_lower = tuple(self.tech_lower) + tuple(skill_lower for _, skill_lower in added)
+        extra_stop_words = frozenset(stop_words) - self.stop_words
+        lexicon = Lexicon.__new__(Lexicon)
+        lexicon._freeze({
+            'tech_skills': tuple(self.tech_skills) + tuple(skill for skill, _ in added),
+            'soft_skills': tuple(self.soft_skills) + tuple(
+                s for s in dict.fromkeys(soft_skills) if s not in self.soft_skills),
+            'stop_words': frozenset(self.stop_words) | extra_stop_words if extra_stop_words else self.stop_words,
+            'tech_lower': tech_lower,
+            'tech_set': tech_set,
+            'categories': MappingProxyType(ChainMap(
+                {skill_lower: _categorize_by_rules(skill_lower, tech_set) for _, skill_lower in added},
+                self.categories)) if added else self.categories,
+            'aliases': _overlay_aliases(self, [skill_lower for _, skill_lower in added], tech_lower, tech_set)
+                       if added else self.aliases,
+            'phrase_pattern': self.phrase_pattern,
+            'headers': self.headers,
+            'phrase_regex': self.phrase_regex,
+            'term_weights': self.term_weights,
+        })
+        return lexicon
+
+    def with_term_weights(self, term_weights: Optional['TermWeights']) -> 'Lexicon':
+        """
+        This lexicon with a corpus IDF table (None removes it); everything else is shared.
+        
+        Raises ValueError if the table was counted with a different lexicon.
+        The fingerprint stays the same; engine_version() tells tables apart.
+        """
+        if term_weights is not None and term_weights.lexicon not in (None, self.fingerprint):
+            raise ValueError(f"Term weights were built for lexicon {term_weights.lexicon}, not {self.fingerprint}")
+        return self._with_values(term_weights=term_weights)
+
+    def _with_values(self, **changed: Any) -> 'Lexicon':
+        lexicon = Lexicon.__new__(Lexicon)
+        values = {name: getattr(self, name) for name in Lexicon.__slots__ if name != 'fingerprint'}
+        values.update(changed)
+        # Only term weights change here, and they are not part of the fingerprint
+        lexicon._freeze(values, self.fingerprint)
+        return lexicon
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"Lexicon is immutable (cannot set {name!r})")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"Lexicon is immutable (cannot delete {name!r})")
+
+    def to_data(self) -> Dict[str, Any]:
+        """The plain-data form, as stored in a lexicon snapshot."""
+        return {
+            'techSkills': list(self.tech_skills),
+            'softSkills': list(self.soft_skills),
+            'stopWords': sorted(self.stop_words),
+            'techLower': list(self.tech_lower),
+            'techSet': set(self.tech_set),
+            'categories': dict(self.categories),
+            'aliases': dict(self.aliases),
+            'phrasePattern': self.phrase_pattern,
+            'headers': dict(self.headers),
+        }
+
+def _install_lexicon(lexicon: Lexicon) -> None:
+    """Make lexicon the default engine's; the legacy globals mirror it."""
+    global TECH_SKILLS, SOFT_SKILLS, STOP_WORDS, _default_engine
+    _default_engine = ATSEngine(lexicon)
+    TECH_SKILLS = list(lexicon.tech_skills)
+    SOFT_SKILLS = list(lexicon.soft_skills)
+    STOP_WORDS = set(lexicon.stop_words)
+
+def _lexicon_checksum(source: bytes) -> bytes:
+    """Ties a snapshot to its source constants, the code-side tables and the engine version."""
+    import hashlib
+    tables = json.dumps([SECTION_HEADERS, JD_SECTION_PATTERNS, TOOL_KEYWORDS, SOFT_SKILL_PATTERNS, MULTI_WORD_PATTERN,
+                         SKILL_ALIASES])
+    digest = hashlib.sha256(f"{LEXICON_SNAPSHOT_FORMAT}|{ENGINE_VERSION}|".encode('utf-8'))
+    digest.update(tables.encode('utf-8'))
+    digest.update(source)
+    return digest.digest()
+
+def _snapshot_unpickler(stream) -> Any:
+    import pickle
+
+    class _DataOnlyUnpickler(pickle.Unpickler):
+        # The index is plain data; refuse anything that would import or call code
+        def find_class(self, module, name):
+            raise pickle.UnpicklingError(f"Lexicon snapshot may not reference {module}.{name}")
+
+    return _DataOnlyUnpickler(stream)
+
+def _read_lexicon_snapshot(path: str, checksum: bytes) -> Optional[Dict[str, Any]]:
+    """The snapshotted index, or None if it is missing, stale or unreadable."""
+    try:
+        with open(path, 'rb') as f:
+            try:
+                import mmap
+                stream = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (ImportError, OSError, ValueError):
+                # No mmap (e.g. Pyodide): a single read is just as good at this size
+                import io
+                stream = io.BytesIO(f.read())
+            try:
+                header = stream.read(_SNAPSHOT_HEADER_SIZE)
+                magic = header[:len(LEXICON_SNAPSHOT_MAGIC)]
+                fmt = int.from_bytes(header[len(LEXICON_SNAPSHOT_MAGIC):len(LEXICON_SNAPSHOT_MAGIC) + 2], 'little')
+                if magic != LEXICON_SNAPSHOT_MAGIC or fmt != LEXICON_SNAPSHOT_FORMAT or header[-32:] != checksum:
+                    return None
+                return _snapshot_unpickler(stream).load()
+            finally:
+                stream.close()
+    except Exception:
+        return None
+
+def write_lexicon_snapshot(path: str = LEXICON_SNAPSHOT_PATH, constants_path: str = CONSTANTS_PATH) -> dict:
+    """
+    Build step: compile the lexicon index from constants_path into a snapshot file.
+
+    The snapshot is a small header (magic, format, checksum of the sources)
+    followed by the index as a data-only pickle (protocol 4, so a snapshot
+    built on CPython loads in Pyodide).
+
+    Returns: {path, bytes, checksum}
+    """
+    import os
+    import pickle
+    with open(constants_path, 'rb') as f:
+        source = f.read()
+    constants = json.loads(source.decode('utf-8'))
+    lexicon = _build_lexicon(
+        constants.get('TECH_SKILLS', []),
+        constants.get('SOFT_SKILLS', []),
+        constants.get('STOP_WORDS', [])
+    )
+    checksum = _lexicon_checksum(source)
+    data = (LEXICON_SNAPSHOT_MAGIC + LEXICON_SNAPSHOT_FORMAT.to_bytes(2, 'little') + checksum
+            + pickle.dumps(lexicon, protocol=4))
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return {'path': path, 'bytes': len(data), 'checksum': checksum.hex()}
+
+def engine_version() -> str:
+    """Engine version plus a fingerprint of the loaded lexicon, e.g. for cache keys."""
+    return _default_engine.engine_version()
+
+# --- Corpus Term Weights ---
+
+# Optional IDF table built offline over a JD/resume corpus (see nlp_idf.py). Without
+# one, keyword weights come from in-document frequency alone.
+
+TERM_WEIGHTS_PATH = 'shared-constants.idf.json'
+TERM_WEIGHTS_FORMAT = 1
+_KEYWORD_WORD_PATTERN = re.compile(r'\b[a-zA-Z]{3,}\b')
+
+class TermWeights:
+    """
+    Immutable corpus IDF table: O(1) term -> weight lookups.
+    
+    Stored as a sorted term array with a parallel document-frequency array;
+    lookups go through a dict built once on load. weight() is smoothed IDF,
+    log((1 + N) / (1 + df)) + 1, divided by its largest possible value, so a
+    term every document has weighs least and a term the corpus never saw
+    weighs 1.0. Counts (not weights) are kept, so updated() can fold in new
+    documents; version counts those updates, lexicon is the fingerprint of
+    the lexicon the terms were extracted with.
+    """
+    
+    __slots__ = ('terms', 'frequencies', 'documents', 'version', 'lexicon', 'fingerprint', '_weights')
+    
+    def __init__(self, counts: Dict[str, int], documents: int, version: int = 1, lexicon: Optional[str] = None):
+        import hashlib
+        from array import array
+        terms = tuple(sorted(counts))
+        values = {
+            'terms': terms,
+            'frequencies': array('I', (counts[term] for term in terms)),
+            'documents': documents,
+            'version': version,
+            'lexicon': lexicon,
+        }
+        source = json.dumps([documents, '\n'.join(terms)]).encode('utf-8') + values['frequencies'].tobytes()
+        values['fingerprint'] = hashlib.sha256(source).hexdigest()[:8]
+        max_idf = math.log(1 + documents) + 1
+        values['_weights'] = {
+            term: round((math.log((1 + documents) / (1 + df)) + 1) / max_idf, 4)
+            for term, df in zip(terms, values['frequencies'])
+        }
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+    
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"TermWeights is immutable (cannot set {name!r})")
+    
+    def __len__(self) -> int:
+        return len(self.terms)
+    
+    def weight(self, term: str) -> float:
+        """IDF of a lowercase term scaled to (0, 1]; unseen terms weigh 1.0."""
+        return self._weights.get(term, 1.0)
+    
+    def counts(self) -> Dict[str, int]:
+        return dict(zip(self.terms, self.frequencies))
+    
+    def updated(self, counts: Dict[str, int], documents: int) -> 'TermWeights':
+        """This table plus the document frequencies of `documents` new documents, as the next version."""
+        merged = Counter(self.counts())
+        merged.update(counts)
+        return TermWeights(merged, self.documents + documents, self.version + 1, self.lexicon)
+    
+    def to_data(self) -> dict:
+        """
+        Returns: {format, version, lexicon, documents, terms: string (sorted, newline-separated), frequencies: number[]}
+        """
+        return {
+            'format': TERM_WEIGHTS_FORMAT,
+            'version': self.version,
+            'lexicon': self.lexicon,
+            'documents': self.documents,
+            'terms': '\n'.join(self.terms),
+            'frequencies': list(self.frequencies),
+        }
+    
+    @classmethod
+    def from_data(cls, data: dict) -> 'TermWeights':
+        if data.get('format') != TERM_WEIGHTS_FORMAT:
+            raise ValueError(f"Unsupported term weights format: {data.get('format')!r}")
+        terms = data['terms'].split('\n') if data['terms'] else []
+        if len(terms) != len(data['frequencies']):
+            raise ValueError("Term weights have mismatched terms and frequencies")
+        return cls(dict(zip(terms, data['frequencies'])), data['documents'], data['version'], data.get('lexicon'))
+
+def read_term_weights(path: str = TERM_WEIGHTS_PATH) -> Optional[TermWeights]:
+    """The IDF table at path, or None if it is missing or unreadable."""
+    try:
+        with open(path, 'rb') as f:
+            return TermWeights.from_data(json.loads(f.read().decode('utf-8')))
+    except Exception:
+        return None
+
+def document_terms(text: str) -> Set[str]:
+    return _default_engine.document_terms(text)
+
+def _document_terms(lexicon: Lexicon, text: str) -> Set[str]:
+    """Distinct terms TermWeights are counted over: lexicon skills and phrases, and the generic words extract_keywords ranks."""
+    text_lower = text.lower()
+    terms = {skill for skill in lexicon.tech_lower if _skill_count(text_lower, skill, 1)}
+    terms.update(match.lower() for match in lexicon.phrase_regex.findall(text_lower))
+    stop_words = lexicon.stop_words
+    terms.update(word for word in _KEYWORD_WORD_PATTERN.findall(text_lower) if word not in stop_words)
+    return terms
+
+# --- Lexicon Image ---
+
+# A lexicon and its IDF table as one flat, read-only buffer that any number of worker
+# processes map (see nlp_shards.SharedLexicon). Opening it unpickles and compiles
+# nothing but the phrase pattern: skill lists, stop words, categories, aliases, the
+# header table and the IDF table are read in place through the views below, and skills
+# are matched with str.find over the skill table (_skill_count), so the lexicon exists
+# once in memory instead of once per worker.
+#
+# Layout: magic, format (u16), metadata size (u32), JSON metadata, then 8-byte aligned
+# sections. A string table NAME is its UTF-8 strings back to back plus NAMEOffsets (u32,
+# one more than there are strings); a looked-up table also has NAMEIndex, an
+# open-addressing table of string numbers + 1 (u32, 0 = empty) probed from the crc32 of
+# the key. Mappings are a keys table with an index plus a parallel values table. Arrays
+# are in native byte order: images are per host.
+
+LEXICON_IMAGE_ENV = 'NLP_LEXICON_IMAGE'
+LEXICON_IMAGE_MAGIC = b'NLPIMG'
+LEXICON_IMAGE_FORMAT = 2
+_IMAGE_HEADER_SIZE = len(LEXICON_IMAGE_MAGIC) + 2 + 4  # magic, format (u16), metadata size (u32)
+
+def _image_align(size: int) -> int:
+    return (size + 7) & ~7
+
+def _image_strings(name: str, strings, index: bool = False) -> List[Tuple[str, bytes]]:
+    """Sections of a string table: NAME, NAMEOffsets and, with index, NAMEIndex."""
+    from array import array
+    encoded = [string.encode('utf-8', 'surrogatepass') for string in strings]
+    offsets = array('I', [0])
+    for key in encoded:
+        offsets.append(offsets[-1] + len(key))
+    sections = [(name, b''.join(encoded)), (name + 'Offsets', offsets.tobytes())]
+    if index:
+        # At most half full, so probe sequences stay short
+        size = 1 << max(1, (2 * len(encoded)).bit_length())
+        slots = array('I', bytes(4 * size))
+        for number, key in enumerate(encoded):
+            slot = zlib.crc32(key) & (size - 1)
+            while slots[slot]:
+                slot = (slot + 1) & (size - 1)
+            slots[slot] = number + 1
+        sections.append((name + 'Index', slots.tobytes()))
+    return sections
+
+class _ImageStrings(AbstractSequence):
+    """Tuple-like, read-only view of a string table; strings are decoded on access."""
+    
+    __slots__ = ('_blob', '_offsets')
+    
+    def __init__(self, blob: memoryview, offsets: memoryview):
+        self._blob = blob
+        self._offsets = offsets.cast('I')
+    
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return tuple(self)[index]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("string table index out of range")
+        return str(self._blob[self._offsets[index]:self._offsets[index + 1]], 'utf-8', 'surrogatepass')
+    
+    def __iter__(self) -> Iterator[str]:
+        blob, offsets = self._blob, self._offsets
+        for index in range(len(offsets) - 1):
+            yield str(blob[offsets[index]:offsets[index + 1]], 'utf-8', 'surrogatepass')
+    
+    def __add__(self, other) -> tuple:
+        return tuple(self) + tuple(other)
+    
+    def find(self, slots: memoryview, key: str) -> int:
+        """Number of key in the table through its index slots, or -1."""
+        data = key.encode('utf-8', 'surrogatepass')
+        blob, offsets, mask = self._blob, self._offsets, len(slots) - 1
+        slot = zlib.crc32(data) & mask
+        while True:
+            number = slots[slot]
+            if not number:
+                return -1
+            number -= 1
+            if blob[offsets[number]:offsets[number + 1]] == data:
+                return number
+            slot = (slot + 1) & mask
+
+class _ImageStringSet(AbstractSet):
+    """frozenset-like, read-only view of an indexed string table."""
+    
+    __slots__ = ('_strings', '_slots')
+    
+    def __init__(self, strings: _ImageStrings, slots: memoryview):
+        self._strings = strings
+        self._slots = slots.cast('I')
+    
+    @classmethod
+    def _from_iterable(cls, iterable) -> frozenset:
+        return frozenset(iterable)
+    
+    def __contains__(self, key) -> bool:
+        return isinstance(key, str) and self._strings.find(self._slots, key) >= 0
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._strings)
+    
+    def __len__(self) -> int:
+        return len(self._strings)
+
+class _ImageStringMap(AbstractMapping):
+    """Read-only mapping view: an indexed keys table and a parallel values table."""
+    
+    __slots__ = ('_keys', '_values', '_decode')
+    
+    def __init__(self, keys: _ImageStringSet, values: _ImageStrings, decode=None):
+        self._keys = keys
+        self._values = values
+        self._decode = decode
+    
+    def get(self, key, default=None):
+        if not isinstance(key, str):
+            return default
+        number = self._keys._strings.find(self._keys._slots, key)
+        if number < 0:
+            return default
+        value = self._values[number]
+        return self._decode(value) if self._decode is not None else value
+    
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+    
+    def __contains__(self, key) -> bool:
+        return key in self._keys
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+    
+    def __len__(self) -> int:
+        return len(self._keys)
+
+_MISSING = object()
+
+def _header_entries(value: str) -> Tuple[Tuple[str, str], ...]:
+    """Lexicon.headers entries from their image form, 'keyword\\tsection' lines."""
+    return tuple(tuple(line.split('\t')) for line in value.split('\n'))
+
+class _TermWeightsView:
+    """
+    TermWeights read in place from a lexicon image; nothing is copied into the process.
+    
+    weight() probes the image's term index, so lookups stay O(1) without a
+    per-process dict. counts() and updated() materialize a TermWeights.
+    """
+    
+    __slots__ = ('documents', 'version', 'lexicon', 'fingerprint', '_terms', '_slots', '_frequencies', '_weights')
+    
+    def __init__(self, meta: dict, sections: Dict[str, memoryview]):
+        self.documents = meta['documents']
+        self.version = meta['version']
+        self.lexicon = meta['lexicon']
+        self.fingerprint = meta['fingerprint']
+        self._terms = _ImageStrings(sections['terms'], sections['termsOffsets'])
+        self._slots = sections['termsIndex'].cast('I')
+        self._frequencies = sections['frequencies'].cast('I')
+        self._weights = sections['weights'].cast('d')
+    
+    def __len__(self) -> int:
+        return len(self._weights)
+    
+    def weight(self, term: str) -> float:
+        number = self._terms.find(self._slots, term)
+        return self._weights[number] if number >= 0 else 1.0
+    
+    def counts(self) -> Dict[str, int]:
+        return dict(zip(self._terms, self._frequencies))
+    
+    def updated(self, counts: Dict[str, int], documents: int) -> TermWeights:
+        return TermWeights(self.counts(), self.documents, self.version, self.lexicon).updated(counts, documents)
+
+def lexicon_image(lexicon: Lexicon) -> bytes:
+    """The flat image of lexicon (and its term weights, if any); see open_lexicon_image."""
+    from array import array
+    sections = (
+        _image_strings('techSkills', lexicon.tech_skills)
+        + _image_strings('techLower', lexicon.tech_lower)
+        + _image_strings('techSet', sorted(lexicon.tech_set), index=True)
+        + _image_strings('softSkills', lexicon.soft_skills)
+        + _image_strings('stopWords', sorted(lexicon.stop_words), index=True)
+        + _image_strings('categoryKeys', list(lexicon.categories), index=True)
+        + _image_strings('categoryValues', list(lexicon.categories.values()))
+        + _image_strings('aliasKeys', list(lexicon.aliases), index=True)
+        + _image_strings('aliasValues', list(lexicon.aliases.values()))
+        + _image_strings('headerKeys', list(lexicon.headers), index=True)
+        + _image_strings('headerValues', ['\n'.join(f"{keyword}\t{section}" for keyword, section in entries)
+                                          for entries in lexicon.headers.values()])
+    )
+    meta: Dict[str, Any] = {'engine': ENGINE_VERSION, 'fingerprint': lexicon.fingerprint,
+                            'phrasePattern': lexicon.phrase_pattern, 'termWeights': None}
+    term_weights = lexicon.term_weights
+    if term_weights is not None:
+        counts = term_weights.counts()
+        terms = sorted(counts)
+        sections += _image_strings('terms', terms, index=True) + [
+            ('frequencies', array('I', (counts[term] for term in terms)).tobytes()),
+            ('weights', array('d', (term_weights.weight(term) for term in terms)).tobytes()),
+        ]
+        meta['termWeights'] = {'documents': term_weights.documents, 'version': term_weights.version,
+                               'lexicon': term_weights.lexicon, 'fingerprint': term_weights.fingerprint}
+    layout = {}
+    position = 0
+    for name, data in sections:
+        layout[name] = [position, len(data)]
+        position = _image_align(position + len(data))
+    meta['sections'] = layout
+    meta_bytes = json.dumps(meta, separators=(',', ':')).encode('utf-8')
+    image = bytearray(_image_align(_IMAGE_HEADER_SIZE + len(meta_bytes)) + position)
+    image[:_IMAGE_HEADER_SIZE] = (LEXICON_IMAGE_MAGIC + LEXICON_IMAGE_FORMAT.to_bytes(2, 'little')
+                                  + len(meta_bytes).to_bytes(4, 'little'))
+    image[_IMAGE_HEADER_SIZE:_IMAGE_HEADER_SIZE + len(meta_bytes)] = meta_bytes
+    base = _image_align(_IMAGE_HEADER_SIZE + len(meta_bytes))
+    for name, data in sections:
+        start = base + layout[name][0]
+        image[start:start + len(data)] = data
+    return bytes(image)
+
+def _read_lexicon_image(buffer) -> Lexicon:
+    """Lexicon whose tables are views into an image buffer."""
+    view = memoryview(buffer)
+    magic = bytes(view[:len(LEXICON_IMAGE_MAGIC)])
+    fmt = int.from_bytes(view[len(LEXICON_IMAGE_MAGIC):len(LEXICON_IMAGE_MAGIC) + 2], 'little')
+    if magic != LEXICON_IMAGE_MAGIC or fmt != LEXICON_IMAGE_FORMAT:
+        raise ValueError("Not a lexicon image of this format")
+    meta_size = int.from_bytes(view[len(LEXICON_IMAGE_MAGIC) + 2:_IMAGE_HEADER_SIZE], 'little')
+    meta = json.loads(bytes(view[_IMAGE_HEADER_SIZE:_IMAGE_HEADER_SIZE + meta_size]).decode('utf-8'))
+    if meta['engine'] != ENGINE_VERSION:
+        raise ValueError(f"Lexicon image is for engine {meta['engine']}, not {ENGINE_VERSION}")
+    base = _image_align(_IMAGE_HEADER_SIZE + meta_size)
+    sections = {name: view[base + start:base + start + size] for name, (start, size) in meta['sections'].items()}
+    
+    def strings(name: str) -> _ImageStrings:
+        return _ImageStrings(sections[name], sections[name + 'Offsets'])
+    
+    def string_set(name: str) -> _ImageStringSet:
+        return _ImageStringSet(strings(name), sections[name + 'Index'])
+    
+    lexicon = Lexicon.__new__(Lexicon)
+    lexicon._freeze({
+        'tech_skills': strings('techSkills'),
+        'soft_skills': strings('softSkills'),
+        'stop_words': string_set('stopWords'),
+        'tech_lower': strings('techLower'),
+        'tech_set': string_set('techSet'),
+        'categories': _ImageStringMap(string_set('categoryKeys'), strings('categoryValues')),
+        'aliases': _ImageStringMap(string_set('aliasKeys'), strings('aliasValues')),
+        'phrase_pattern': meta['phrasePattern'],
+        'headers': _ImageStringMap(string_set('headerKeys'), strings('headerValues'), _header_entries),
+        'phrase_regex': re.compile(meta['phrasePattern']),
+        'term_weights': _TermWeightsView(meta['termWeights'], sections) if meta['termWeights'] else None,
+    }, meta['fingerprint'])
+    return lexicon
+
+def write_lexicon_image(path: str, lexicon: Optional[Lexicon] = None) -> dict:
+    """
+    Write the image of lexicon (default: the default engine's) to path, atomically.
+    
+    Returns: {path, bytes, fingerprint}
+    """
+    import os
+    lexicon = lexicon if lexicon is not None else _default_engine.lexicon
+    data = lexicon_image(lexicon)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return {'path': path, 'bytes': len(data), 'fingerprint': lexicon.fingerprint}
+
+def open_lexicon_image(path: str) -> Lexicon:
+    """
+    Map a lexicon image file read-only.
+    
+    The lexicon's tables and IDF table are used in place, so every process
+    mapping the same file shares one copy of them; only the phrase pattern
+    is compiled. Lookups decode from the image, so they cost a little more
+    than in a lexicon built in the process.
+    """
+    import mmap
+    with open(path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return _read_lexicon_image(mapped)
+
+# --- Metrics Hook ---
+
+# Receives observations when set (see nlp_metrics.py); None keeps the hot path to one global lookup
+_metrics_sink: Optional[Any] = None
+
+def set_metrics_sink(sink: Optional[Any]) -> None:
+    """
+    Install an observer with observe_call(op, seconds, input_chars, error),
+    observe_match(stage) and observe_cache(cache, hits, misses); None removes it.
+    """
+    global _metrics_sink
+    _metrics_sink = sink
+
+def metrics_sink() -> Optional[Any]:
+    return _metrics_sink
+
+# Code flags of generator, coroutine and async generator functions (inspect.CO_*;
+# inspect itself is not imported, it would add to module load time)
+_CO_GENERATOR = 0x20
+_CO_COROUTINE = 0x80
+_CO_ASYNC_GENERATOR = 0x200
+
+
+# Parameters of the observed entry points that carry document text (options such as mode do not)
+_TEXT_PARAMETERS = frozenset({'text', 'resume_text', 'jd_text', 'job_desc', 'jd_texts', 'pairs', 'requests_json'})
+
+
+def _input_chars(values) -> int:
+    """Characters of text arguments: strings, and lists of strings or of (resume, jd) pairs."""
+    total = 0
+    for value in values:
+        if isinstance(value, str):
+            total += len(value)
+        elif isinstance(value, (list, tuple)):
+            total += _input_chars(value)
+    return total
+
+
+def _observed(op: str):
+    """
+    Report latency and input size of a public entry point to the metrics sink.
+    
+    Coroutines are timed until they return, and generators (sync or async)
+    from the first item until they are exhausted or closed; a consumer that
+    stops early is not counted as an error.
+    """
+    def decorate(fn):
+        code = fn.__code__
+        flags = code.co_flags
+        text_positions = [i for i, name in enumerate(code.co_varnames[:code.co_argcount]) if name in _TEXT_PARAMETERS]
+        
+        def observe(sink, start: float, args: tuple, kwargs: dict, error: bool) -> None:
+            texts = [args[i] for i in text_positions if i < len(args)]
+            texts += [value for name, value in kwargs.items() if name in _TEXT_PARAMETERS]
+            sink.observe_call(op, time.perf_counter() - start, _input_chars(texts), error)
+        
+        if flags & _CO_ASYNC_GENERATOR:
+            @functools.wraps(fn)
+            async def wrapper(*args, **kwargs):
+                sink = _metrics_sink
+                if sink is None:
+                    async for item in fn(*args, **kwargs):
+                        yield item
+                    return
+                start = time.perf_counter()
+                error = True
+                try:
+                    async for item in fn(*args, **kwargs):
+                        yield item
+                    error = False
+                except GeneratorExit:
+                    error = False
+                    raise
+                finally:
+                    observe(sink, start, args, kwargs, error)
+        elif flags & _CO_COROUTINE:
+            @functools.wraps(fn)
+            async def wrapper(*args, **kwargs):
+                sink = _metrics_sink
+                if sink is None:
+                    return await fn(*args, **kwargs)
+                start = time.perf_counter()
+                error = True
+                try:
+                    result = await fn(*args, **kwargs)
+                    error = False
+                    return result
+                finally:
+                    observe(sink, start, args, kwargs, error)
+        elif flags & _CO_GENERATOR:
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                sink = _metrics_sink
+                if sink is None:
+                    yield from fn(*args, **kwargs)
+                    return
+                start = time.perf_counter()
+                error = True
+                try:
+                    yield from fn(*args, **kwargs)
+                    error = False
+                except GeneratorExit:
+                    error = False
+                    raise
+                finally:
+                    observe(sink, start, args, kwargs, error)
+        else:
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                sink = _metrics_sink
+                if sink is None:
+                    return fn(*args, **kwargs)
+                start = time.perf_counter()
+                error = True
+                try:
+                    result = fn(*args, **kwargs)
+                    error = False
+                    return result
+                finally:
+                    observe(sink, start, args, kwargs, error)
+        return wrapper
+    return decorate
 
 # --- Internal Utilities ---
 
+def _first_phone(text: str) -> Optional[str]:
+    """Return the first phone-like run with at least 10 digits, or None."""
+    for match in PHONE_PATTERN.finditer(text):
+        candidate = match.group(0).rstrip(' .()-')
+        digits_start = 1 if candidate.startswith('+') else 0
+        if len(candidate) - digits_start < PHONE_MIN_SPAN:
+            continue
+        phone = re.sub(r'[^0-9+() -]', '', candidate).strip()
+        if len(re.sub(r'[^0-9]', '', phone)) >= 10:
+            return phone
+    return None
+
 def extract_contact_info(text: str) -> dict:
+    """
+    Extract email, phone and profile links.
+
+    Every field is scanned lazily in document order and the scan stops at the
+    first valid hit, so the header region is always searched first and the rest
+    of the document is only read when a field is missing there. All scans are
+    linear in the input length (see EMAIL_PATTERN / PHONE_PATTERN).
+    """
     result = {}
-    emails = EMAIL_PATTERN.findall(text)
-    if emails:
-        result['email'] = emails[0]
-    phones = PHONE_PATTERN.findall(text)
-    if phones:
-        phone = re.sub(r'[^0-9+() -]', '', phones[0]).strip()
-        if len(re.sub(r'[^0-9]', '', phone)) >= 10:
-            result['phone'] = phone
+    email = EMAIL_PATTERN.search(text)
+    if email:
+        result['email'] = email.group(0)
+    phone = _first_phone(text)
+    if phone:
+        result['phone'] = phone
     linkedin = LINKEDIN_PATTERN.search(text)
     if linkedin:
         result['linkedin'] = linkedin.group(0)
     github = GITHUB_PATTERN.search(text)
     if github:
         result['github'] = github.group(0)
-    urls = URL_PATTERN.findall(text)
-    for url in urls:
+    for url_match in URL_PATTERN.finditer(text):
+        url = url_match.group(0)
         if 'linkedin' not in url.lower() and 'github' not in url.lower():
             result['website'] = url
             break
@@ -142,56 +1113,187 @@ def extract_name(text: str) -> Optional[str]:
     return None
 
 def extract_skills(text: str) -> List[str]:
+    return _default_engine.extract_skills(text)
+
+def _extract_skills(lexicon: Lexicon, text: str) -> List[str]:
     skills = set()
     text_lower = text.lower()
-    for skill in TECH_SKILLS:
-        if skill.lower() in text_lower:
+    for skill, skill_lower in zip(lexicon.tech_skills, lexicon.tech_lower):
+        if skill_lower in text_lower:
             skills.add(skill)
     return list(skills)[:50]
 
-def identify_section(line: str) -> Optional[str]:
-    line_lower = line.lower().strip()
-    for section_name, keywords in SECTION_HEADERS.items():
-        for keyword in keywords:
-            if line_lower == keyword or line_lower.startswith(keyword + ':') or line_lower.startswith(keyword + ' '):
+def _lower_buffer(text: str) -> Tuple[str, bool]:
+    """
+    text.lower() with one output character per input character, so offsets
+    are shared; the flag says whether it is exactly text.lower().
+    """
+    lower = text.lower()
+    if len(lower) == len(text):
+        return lower, True
+    # A few characters (e.g. 'İ') lowercase to two code points; keep the first
+    return ''.join(ch.lower()[0] for ch in text), False
+
+def _strip_span(text: str, start: int, end: int) -> Tuple[int, int]:
+    """Narrow (start, end) the way str.strip() would, without copying."""
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return start, end
+
+def _line_spans(text: str, start: int, end: int) -> Iterator[Tuple[int, int]]:
+    """(start, end) of each line in text[start:end], as str.split('\\n') would cut it."""
+    while True:
+        newline = text.find('\n', start, end)
+        if newline == -1:
+            yield start, end
+            return
+        yield start, newline
+        start = newline + 1
+
+def _split_spans(pattern: re.Pattern, text: str, start: int, end: int) -> Iterator[Tuple[int, int]]:
+    """(start, end) of each piece of pattern.split(text[start:end]); pattern must not match empty."""
+    for match in pattern.finditer(text, start, end):
+        yield start, match.start()
+        start = match.end()
+    yield start, end
+
+def _section_at(headers: Dict[str, tuple], lower: str, start: int, end: int) -> Optional[str]:
+    """identify_section() for the stripped line lower[start:end], given Lexicon.headers."""
+    if start == end:
+        return None
+    # Only header keywords sharing the line's first character can match
+    for keyword, section_name in headers.get(lower[start], ()):
+        if lower.startswith(keyword, start, end):
+            after = start + len(keyword)
+            if after == end or lower[after] == ':' or lower[after] == ' ':
                 return section_name
     return None
 
-def parse_resume_sections(text: str) -> Dict[str, str]:
-    sections = {}
+def identify_section(line: str) -> Optional[str]:
+    return _default_engine.identify_section(line)
+
+def _identify_section(lexicon: Lexicon, line: str) -> Optional[str]:
+    lower, _ = _lower_buffer(line)
+    return _section_at(lexicon.headers, lower, *_strip_span(lower, 0, len(lower)))
+
+
+class SectionSpans:
+    """
+    Document sections as (start, end) offsets into one shared text buffer.
+    
+    The text is lowercased once, up front; section content is only copied
+    when view() or lower_view() is asked for it. Offsets index both text and
+    lower.
+    """
+    
+    __slots__ = ('text', 'lower', 'spans', '_exact')
+    
+    def __init__(self, text: str, spans: Optional[Dict[str, Tuple[int, int]]] = None):
+        self.text = text
+        self.lower, self._exact = _lower_buffer(text)
+        self.spans = {} if spans is None else spans
+    
+    def full_lower(self) -> str:
+        """Exactly text.lower(), for whole-text scans; the shared buffer unless the text has 'İ' and the like."""
+        return self.lower if self._exact else self.text.lower()
+    
+    def __contains__(self, name: str) -> bool:
+        return name in self.spans
+    
+    def __getitem__(self, name: str) -> Tuple[int, int]:
+        return self.spans[name]
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.spans)
+    
+    def stripped_line(self, start: int, end: int) -> Tuple[str, int, int]:
+        """(buffer, start, end) of the lowercased, stripped line text[start:end]."""
+        if not self._exact:
+            line_lower = self.text[start:end].lower()
+            return (line_lower,) + _strip_span(line_lower, 0, len(line_lower))
+        return (self.lower,) + _strip_span(self.lower, start, end)
+    
+    def view(self, name: str) -> str:
+        start, end = self.spans.get(name, (0, 0))
+        return self.text[start:end]
+    
+    def lower_view(self, name: str) -> str:
+        start, end = self.spans.get(name, (0, 0))
+        return self.lower[start:end]
+    
+    def contains(self, name: str, needle: str) -> bool:
+        """Whether a lowercase needle occurs in the section, without copying it."""
+        if name not in self.spans:
+            return False
+        start, end = self.spans[name]
+        if not self._exact:
+            return needle in self.text[start:end].lower()
+        return self.lower.find(needle, start, end) != -1
+    
+    def line_spans(self, name: str) -> Iterator[Tuple[int, int]]:
+        if name not in self.spans:
+            return iter(())
+        return _line_spans(self.text, *self.spans[name])
+    
+    def as_dict(self) -> Dict[str, str]:
+        return {name: self.text[start:end] for name, (start, end) in self.spans.items()}
+
+
+def resume_section_spans(text: str) -> SectionSpans:
+    """
+    Resume sections as offsets into text.
+    
+    view(name) == parse_resume_sections(text)[name] for every section.
+    """
+    return _default_engine.resume_section_spans(text)
+
+def _resume_section_spans(lexicon: Lexicon, text: str) -> SectionSpans:
+    headers = lexicon.headers
+    doc = SectionSpans(text)
+    spans = doc.spans
     current_section = 'header'
-    current_content = []
-    lines = text.split('\n')
-    for line in lines:
-        section = identify_section(line)
+    content_start = None
+    content_end = 0
+    for line_start, line_end in _line_spans(text, 0, len(text)):
+        section = _section_at(headers, *doc.stripped_line(line_start, line_end))
         if section:
-            if current_content:
-                sections[current_section] = '\n'.join(current_content).strip()
+            if content_start is not None:
+                spans[current_section] = _strip_span(text, content_start, content_end)
             current_section = section
-            current_content = []
+            content_start = None
         else:
-            current_content.append(line)
-    if current_content:
-        sections[current_section] = '\n'.join(current_content).strip()
-    return sections
+            if content_start is None:
+                content_start = line_start
+            content_end = line_end
+    if content_start is not None:
+        spans[current_section] = _strip_span(text, content_start, content_end)
+    return doc
+
+def parse_resume_sections(text: str) -> Dict[str, str]:
+    return _default_engine.parse_resume_sections(text)
 
 def extract_keywords(text: str, topn: int = 30) -> List[str]:
+    return _default_engine.extract_keywords(text, topn)
+
+def _extract_keywords(lexicon: Lexicon, text: str, topn: int) -> List[str]:
     # 1. Identify explicit technical skills first
     text_lower = text.lower()
+    stop_words = lexicon.stop_words
     found_tech = []
-    for skill in TECH_SKILLS:
-        # Use word boundaries for tech skills to avoid partial matches like 'Go' in 'Google'
-        pattern = r'\b' + re.escape(skill.lower()) + r'\b'
-        if re.search(pattern, text_lower):
-            found_tech.append(skill.lower())
+    for skill in lexicon.tech_lower:
+        # Word boundaries avoid partial matches like 'Go' in 'Google'
+        if _skill_count(text_lower, skill, 1):
+            found_tech.append(skill)
     
     # 2. Extract other potentially relevant words (nouns/adj with >3 chars)
-    words = re.findall(r'\b[a-zA-Z]{3,}\b', text_lower)
+    words = _KEYWORD_WORD_PATTERN.findall(text_lower)
     
     # Filter out stop words, prohibited words, and action verbs
     filtered = []
     for w in words:
-        if (w not in STOP_WORDS and 
+        if (w not in stop_words and 
             w not in PROHIBITED_KEYWORDS and 
             w not in ACTION_VERBS and 
             len(w) > 3): # Favor longer words for non-predefined skills
@@ -200,10 +1302,18 @@ def extract_keywords(text: str, topn: int = 30) -> List[str]:
     # Count frequencies
     word_counts = Counter(filtered)
     
+    # Rank by frequency, times corpus IDF when a table is loaded so filler words sink
+    term_weights = lexicon.term_weights
+    if term_weights is None:
+        ranked = word_counts.most_common(topn)
+    else:
+        weight = term_weights.weight
+        ranked = sorted(word_counts.items(), key=lambda item: item[1] * weight(item[0]), reverse=True)[:topn]
+    
     # Combine tech skills with top generic keywords
     # Tech skills get priority and are always included if they exist
     tech_set = set(found_tech)
-    generic_keywords = [word for word, count in word_counts.most_common(topn) if word not in tech_set]
+    generic_keywords = [word for word, count in ranked if word not in tech_set]
     
     combined = found_tech + generic_keywords
     return combined[:topn]
@@ -229,10 +1339,13 @@ def calculate_readability(text: str) -> int:
 
 def parse_resume(text: str) -> dict:
     """Entry point for parsing a resume string."""
+    return _default_engine.parse_resume(text)
+
+def _parse_resume(analysis: '_DocumentAnalysis', text: str) -> dict:
     contact = extract_contact_info(text)
-    name = extract_name(text)
-    raw_sections = parse_resume_sections(text)
-    skills = extract_skills(text)
+    name = analysis.name(text)
+    raw_sections = analysis.sections(text)
+    skills = _extract_skills(analysis.lexicon, text)
     
     sections = {}
     for key in ['summary', 'experience', 'education', 'projects', 'certifications', 'achievements']:
@@ -258,6 +1371,14 @@ def parse_resume(text: str) -> dict:
         "skills": skills
     }
 
+# rewrite_bullet's semantic replacements, tried in order: (word, pattern, replacement template)
+_BULLET_REWRITES = tuple((word, re.compile(word, re.IGNORECASE), template) for word, template in (
+    ('experience', 'experience in {}'),
+    ('expertise', 'expertise in {}'),
+    ('developed', 'developed {}-driven'),
+    ('using', 'using {} and'),
+))
+
 def rewrite_bullet(bullet: str, keyword: str) -> str:
     """Intelligently integrate a keyword into a bullet point."""
     trimmed = bullet.strip()
@@ -266,14 +1387,10 @@ def rewrite_bullet(bullet: str, keyword: str) -> str:
     
     keyword = keyword.title()
     # Simple semantic replacement
-    if 'experience' in trimmed.lower():
-        return re.sub(r'experience', f'experience in {keyword}', trimmed, flags=re.IGNORECASE, count=1)
-    if 'expertise' in trimmed.lower():
-        return re.sub(r'expertise', f'expertise in {keyword}', trimmed, flags=re.IGNORECASE, count=1)
-    if 'developed' in trimmed.lower():
-        return re.sub(r'developed', f'developed {keyword}-driven', trimmed, flags=re.IGNORECASE, count=1)
-    if 'using' in trimmed.lower():
-        return re.sub(r'using', f'using {keyword} and', trimmed, flags=re.IGNORECASE, count=1)
+    lowered = trimmed.lower()
+    for word, pattern, template in _BULLET_REWRITES:
+        if word in lowered:
+            return pattern.sub(template.format(keyword), trimmed, count=1)
         
     # Default: Append with a transition
     suffix = f" utilizing {keyword}"
@@ -281,39 +1398,93 @@ def rewrite_bullet(bullet: str, keyword: str) -> str:
         return trimmed[:-1] + suffix + "."
     return trimmed + suffix + "."
 
-def score_ats(resume_text: str, job_desc: str) -> dict:
-    """Entry point for ATS scoring."""
-    suggestions = []
+# Evaluation modes for score_ats / evaluate_ats:
+#   'full'   - every stage (default)
+#   'triage' - cheap first-pass screening; see each function for the subset returned.
+#              promote_score / promote_evaluation complete a triage result later.
+EVALUATION_MODES = ('full', 'triage')
+
+def _check_mode(mode: str) -> None:
+    if mode not in EVALUATION_MODES:
+        raise ValueError(f"Unknown mode: {mode!r} (expected one of {', '.join(EVALUATION_MODES)})")
+
+def score_ats(resume_text: str, job_desc: str, mode: str = 'full') -> dict:
+    """
+    Entry point for ATS scoring.
+    
+    mode='triage' skips readability and suggestions and returns
+    {mode, score, matchRatio, matchingKeywords, missing,
+     breakdown: {keywordMatch, formatScore, actionVerbs}}, where score spreads
+    the readability weight over the other components. promote_score() turns
+    it into the full response.
+    """
+    return _default_engine.score_ats(resume_text, job_desc, mode)
+
+def _score_ats(analysis: '_DocumentAnalysis', resume_text: str, job_desc: str, mode: str = 'full') -> dict:
+    _check_mode(mode)
     
     # Keyword Match
     # Extract name to filter it out from keywords
-    candidate_name = extract_name(resume_text)
+    candidate_name = analysis.name(resume_text)
     name_parts = set(candidate_name.lower().split()) if candidate_name else set()
     
-    resume_kw = set(extract_keywords(resume_text, 30)) - name_parts
-    jd_kw = set(extract_keywords(job_desc, 30)) - name_parts
+    resume_kw = set(analysis.keywords(resume_text, 30)) - name_parts
+    jd_kw = set(analysis.keywords(job_desc, 30)) - name_parts
     matched = resume_kw & jd_kw
     match_ratio = len(matched) / max(len(jd_kw), 1)
     
     keyword_score = int(match_ratio * 100)
     missing = list(jd_kw - resume_kw)[:5]
-    if missing:
-        suggestions.append(f"Add these keywords: {', '.join(missing)}")
     
     # Format & Sections
-    sections = parse_resume_sections(resume_text)
+    sections = analysis.sections(resume_text)
     required = ['summary', 'experience', 'education', 'skills']
     found = sum(1 for s in required if s in sections)
     format_score = int((found / len(required)) * 100)
     
+    # Verbs
+    action_verb_count = sum(1 for w in resume_text.lower().split() if w in ACTION_VERBS)
+    action_score = min(100, action_verb_count * 10)
+    
+    triage = {
+        "mode": "triage",
+        "score": int((keyword_score * 0.40 + format_score * 0.20 + action_score * 0.20) / 0.80),
+        "matchRatio": round(match_ratio, 2),
+        "matchingKeywords": list(matched),
+        "missing": missing,
+        "breakdown": {
+            "keywordMatch": keyword_score,
+            "formatScore": format_score,
+            "actionVerbs": action_score
+        }
+    }
+    if mode == 'triage':
+        return triage
+    return _promote_score(analysis, triage, resume_text)
+
+def promote_score(triage_result: dict, resume_text: str) -> dict:
+    """Complete a score_ats(mode='triage') result, reusing its keyword, format and verb scores."""
+    return _default_engine.promote_score(triage_result, resume_text)
+
+def _promote_score(analysis: '_DocumentAnalysis', triage_result: dict, resume_text: str) -> dict:
+    if triage_result.get('mode') != 'triage':
+        return triage_result
+    breakdown = triage_result['breakdown']
+    keyword_score = breakdown['keywordMatch']
+    format_score = breakdown['formatScore']
+    action_score = breakdown['actionVerbs']
+    missing = triage_result['missing']
+    
+    suggestions = []
+    if missing:
+        suggestions.append(f"Add these keywords: {', '.join(missing)}")
+    
+    sections = analysis.sections(resume_text)
     if 'summary' not in sections: suggestions.append("Add a professional summary section")
     if 'skills' not in sections: suggestions.append("Add a dedicated skills section")
     
-    # Readability & Verbs
+    # Readability
     readability_score = calculate_readability(resume_text)
-    words = resume_text.lower().split()
-    action_verb_count = sum(1 for w in words if w in ACTION_VERBS)
-    action_score = min(100, action_verb_count * 10)
     
     if action_score < 50:
         suggestions.append("Use stronger action verbs (led, achieved, optimized)")
@@ -327,8 +1498,8 @@ def score_ats(resume_text: str, job_desc: str) -> dict:
     
     return {
         "score": overall_score,
-        "matchRatio": round(match_ratio, 2),
-        "matchingKeywords": list(matched),
+        "matchRatio": triage_result['matchRatio'],
+        "matchingKeywords": triage_result['matchingKeywords'],
         "missing": missing,
         "suggestions": suggestions[:5],
         "breakdown": {
@@ -339,44 +1510,69 @@ def score_ats(resume_text: str, job_desc: str) -> dict:
         }
     }
 
-def optimize_resume(resume_text: str, job_desc: str) -> str:
-    """Intelligently optimize resume by injecting missing keywords."""
-    sections = parse_resume_sections(resume_text)
-    
-    # Identify missing keywords
-    candidate_name = extract_name(resume_text)
-    name_parts = set(candidate_name.lower().split()) if candidate_name else set()
-    
-    resume_kw = set(extract_keywords(resume_text, 50)) - name_parts
-    jd_kw = set(extract_keywords(job_desc, 30)) - name_parts
-    missing = list(jd_kw - resume_kw)
+def optimize_resume(resume_text: str, job_desc: str, output: str = 'text'):
+    """
+    Intelligently optimize resume by injecting missing keywords.
     
-    if not missing:
-        return resume_text
+    output='text' (default) returns the rebuilt resume. output='edits' returns
+    the same changes as span-based edit operations on the original text
+    (see _optimize_resume_edits); apply them with apply_edits(). Offsets are
+    Python string indices; utf16_edits() converts them for JavaScript.
+    """
+    return _default_engine.optimize_resume(resume_text, job_desc, output)
+
+def _check_output(output: str) -> None:
+    if output not in ('text', 'edits'):
+        raise ValueError(f"Unknown output: {output!r} (expected 'text' or 'edits')")
+
+def _optimize_resume_output(analysis: '_DocumentAnalysis', resume_text: str, job_desc: str, output: str):
+    _check_output(output)
+    if output == 'edits':
+        return _optimize_resume_edits(analysis, resume_text, job_desc)
+    return _optimize_resume(analysis, resume_text, job_desc)
+
+def optimize_resume_many(resume_text: str, jd_texts: List[str], output: str = 'text') -> list:
+    """
+    optimize_resume() against each of jd_texts, e.g. one tailored variant per saved posting.
+    
+    Results are in jd_texts order and equal the single calls. The resume is
+    sectioned, named and keyword-scanned once and a repeated JD is parsed once;
+    per JD only its missing keywords (a set difference against the resume's
+    keyword set) and the sections they touch are recomputed.
+    """
+    return _default_engine.optimize_resume_many(resume_text, jd_texts, output)
+
+def _optimize_resume_many(analysis: '_DocumentAnalysis', resume_text: str, jd_texts: List[str], output: str) -> list:
+    _check_output(output)
+    return [_optimize_resume_output(analysis, resume_text, job_desc, output) for job_desc in jd_texts]
+
+def _optimize_resume(analysis: '_DocumentAnalysis', resume_text: str, job_desc: str) -> str:
+    doc = analysis.section_spans(resume_text)
+    # Copy: the sections are rewritten in place below
+    sections = dict(analysis.sections(resume_text))
+    
+    # Identify missing keywords
+    missing = _missing_keywords(analysis, resume_text, job_desc)
+    
+    if not missing:
+        return resume_text
 
     # 1. Distribute some keywords into Experience Section (Better Integration)
-    experience_content = sections.get('experience', '')
     experience_keywords = missing[:min(len(missing), 5)] # Take first few for experience
     remaining_keywords = missing[min(len(missing), 5):]
     
-    if experience_content:
-        lines = experience_content.split('\n')
-        updated_lines = []
-        kw_idx = 0
-        for line in lines:
-            trimmed = line.strip()
-            # If it's a bullet point and we still have keywords to integrate
-            if (trimmed.startswith('•') or trimmed.startswith('-') or trimmed.startswith('*')) and kw_idx < len(experience_keywords):
-                prefix = ""
-                if trimmed.startswith('•'): prefix = "• "
-                elif trimmed.startswith('-'): prefix = "- "
-                elif trimmed.startswith('*'): prefix = "* "
-                
-                raw_text = trimmed.lstrip('•-* ')
-                line = prefix + rewrite_bullet(raw_text, experience_keywords[kw_idx])
-                kw_idx += 1
-            updated_lines.append(line)
-        sections['experience'] = '\n'.join(updated_lines)
+    if sections.get('experience'):
+        # Splice rewritten bullet lines between untouched slices of the original
+        start, end = doc['experience']
+        parts = []
+        cursor = start
+        for line_start, line_end, _, _, new_line, _ in _bullet_rewrites(analysis.bullet_lines(resume_text),
+                                                                         experience_keywords):
+            parts.append(resume_text[cursor:line_start])
+            parts.append(new_line)
+            cursor = line_end
+        parts.append(resume_text[cursor:end])
+        sections['experience'] = ''.join(parts)
 
     # 2. Update/Add Skills section with remaining
     skills_text = sections.get('skills', '')
@@ -410,31 +1606,147 @@ def optimize_resume(resume_text: str, job_desc: str) -> str:
             
     return "\n".join(output)
 
-# =============================================================================
-# NEW ATS ENGINE V2 - Structured responses matching TypeScript contracts
-# =============================================================================
+def _missing_keywords(analysis: '_DocumentAnalysis', resume_text: str, job_desc: str) -> List[str]:
+    """JD keywords absent from the resume, ignoring the candidate's name."""
+    name_parts, resume_kw = analysis.resume_keywords(resume_text)
+    jd_kw = set(analysis.keywords(job_desc, 30)) - name_parts
+    return list(jd_kw - resume_kw)
 
-# --- Type Constants ---
-KEYWORD_CATEGORIES = ['hard_skill', 'tool', 'concept', 'soft_skill']
+def _bullet_prefix(text: str, start: int, end: int) -> Optional[str]:
+    if text.startswith('•', start, end): return "• "
+    if text.startswith('-', start, end): return "- "
+    if text.startswith('*', start, end): return "* "
+    return None
 
-SOFT_SKILL_PATTERNS = [
-    'leadership', 'communication', 'teamwork', 'problem-solving', 'analytical',
-    'collaboration', 'mentoring', 'management', 'strategic', 'innovative',
-    'adaptable', 'creative', 'detail-oriented', 'organized', 'proactive'
-]
+def _bullet_lines(doc: SectionSpans) -> List[tuple]:
+    """
+    The experience section's bullet lines.
+    
+    Returns (line_start, line_end, content_start, content_end, prefix, raw_text)
+    tuples; content_* excludes the line's surrounding whitespace and raw_text
+    also drops the bullet marker.
+    """
+    text = doc.text
+    lines = []
+    for line_start, line_end in doc.line_spans('experience'):
+        content_start, content_end = _strip_span(text, line_start, line_end)
+        prefix = _bullet_prefix(text, content_start, content_end)
+        if prefix is not None:
+            raw_text = text[content_start:content_end].lstrip('•-* ')
+            lines.append((line_start, line_end, content_start, content_end, prefix, raw_text))
+    return lines
 
-TOOL_KEYWORDS = [
-    'docker', 'kubernetes', 'git', 'jenkins', 'jira', 'terraform', 'ansible', 
-    'github', 'gitlab', 'confluence', 'prometheus', 'grafana', 'datadog',
-    'helm', 'argocd', 'circleci', 'travis', 'bamboo', 'slack', 'notion'
-]
+def _bullet_rewrites(lines: List[tuple], keywords: List[str]) -> Iterator[tuple]:
+    """
+    Rewrite the first bullet lines (see _bullet_lines), one keyword each.
+    
+    Yields (line_start, line_end, content_start, content_end, new_line, keyword).
+    """
+    for (line_start, line_end, content_start, content_end, prefix, raw_text), keyword in zip(lines, keywords):
+        yield (line_start, line_end, content_start, content_end, prefix + rewrite_bullet(raw_text, keyword), keyword)
 
-JD_SECTION_PATTERNS = {
-    'requirements': ['requirements', 'qualifications', 'must have', 'required', 'you have', 'you bring'],
-    'responsibilities': ['responsibilities', 'duties', 'what you will do', 'role', 'you will'],
-    'nice_to_have': ['nice to have', 'preferred', 'bonus', 'plus', 'ideal'],
-    'about': ['about us', 'about the company', 'who we are', 'company', 'we are']
-}
+def _optimize_resume_edits(analysis: '_DocumentAnalysis', resume_text: str, job_desc: str) -> List[dict]:
+    """
+    The optimize_resume changes as edit operations on the original text.
+    
+    Returns ResumeEdit dicts sorted by offset:
+    {
+        op: 'replace' | 'insert' | 'append',
+        start: number,      # offsets into resume_text (Python string indices)
+        end: number,        # == start for insert/append
+        text: string,       # replacement or inserted text
+        keywords: string[]  # JD keywords this edit introduces
+    }
+    Everything outside the edits, including sections with unrecognized
+    headers, is left untouched.
+    """
+    missing = _missing_keywords(analysis, resume_text, job_desc)
+    if not missing:
+        return []
+    
+    spans = analysis.section_spans(resume_text)
+    experience_keywords = missing[:min(len(missing), 5)]
+    remaining_keywords = missing[min(len(missing), 5):]
+    edits = []
+    
+    # 1. Rewrite experience bullets in place
+    for _, _, content_start, content_end, new_line, keyword in _bullet_rewrites(analysis.bullet_lines(resume_text),
+                                                                                experience_keywords):
+        edits.append({
+            'op': 'replace',
+            'start': content_start,
+            'end': content_end,
+            'text': new_line,
+            'keywords': [keyword]
+        })
+    
+    # 2. Extend (or add) the skills section with the remaining keywords
+    if remaining_keywords:
+        new_skills = ", ".join(m.title() for m in remaining_keywords)
+        if 'skills' in spans:
+            start, end = spans['skills']
+            edits.append({
+                'op': 'insert',
+                'start': end,
+                'end': end,
+                'text': (", " + new_skills) if end > start else new_skills,
+                'keywords': remaining_keywords
+            })
+        else:
+            edits.append({
+                'op': 'append',
+                'start': len(resume_text),
+                'end': len(resume_text),
+                'text': f"\n\nSKILLS\n{new_skills}",
+                'keywords': remaining_keywords
+            })
+    
+    # 3. Extend the summary
+    if 'summary' in spans and spans['summary'][1] > spans['summary'][0]:
+        end = spans['summary'][1]
+        buzzwords = ", ".join([m.title() for m in missing[:2]])
+        edits.append({
+            'op': 'insert',
+            'start': end,
+            'end': end,
+            'text': f" Expert in {buzzwords} with a focus on delivering high-impact solutions.",
+            'keywords': missing[:2]
+        })
+    
+    edits.sort(key=lambda edit: edit['start'])
+    return edits
+
+def apply_edits(text: str, edits: List[dict]) -> str:
+    """Apply edit operations (as returned by optimize_resume(output='edits')) to text."""
+    parts = []
+    cursor = len(text)
+    # Back to front so earlier offsets stay valid; at equal offsets the earlier edit ends up first
+    for edit in reversed(edits):
+        parts.append(text[edit['end']:cursor])
+        parts.append(edit['text'])
+        cursor = edit['start']
+    parts.append(text[:cursor])
+    return ''.join(reversed(parts))
+
+def utf16_edits(text: str, edits: List[dict]) -> List[dict]:
+    """
+    Edits for text with start/end counted in UTF-16 code units (JavaScript
+    string indices) instead of Python code points.
+    
+    The two differ after every character outside the BMP (e.g. emoji), which
+    takes two code units in JavaScript. dispatch() returns edits this way;
+    without such characters the edits are returned as they are.
+    """
+    astral = [index for index, char in enumerate(text) if char > '\uffff']
+    if not astral:
+        return edits
+    return [dict(edit, start=edit['start'] + bisect.bisect_left(astral, edit['start']),
+                 end=edit['end'] + bisect.bisect_left(astral, edit['end']))
+            for edit in edits]
+
+# =============================================================================
+# NEW ATS ENGINE V2 - Structured responses matching TypeScript contracts
+# =============================================================================
 
 def _generate_id() -> str:
     """Generate a simple unique ID."""
@@ -443,27 +1755,47 @@ def _generate_id() -> str:
     return hashlib.md5(f"{time.time()}".encode()).hexdigest()[:12]
 
 
-def _categorize_keyword(keyword: str) -> str:
+def _categorize_keyword(lexicon: Lexicon, keyword: str) -> str:
     """Categorize a keyword into hard_skill, tool, concept, or soft_skill."""
     kw_lower = keyword.lower()
-    
-    # Check if it's a tool
-    if any(tool in kw_lower for tool in TOOL_KEYWORDS):
-        return 'tool'
-    
-    # Check if it's a soft skill
-    if any(soft in kw_lower for soft in SOFT_SKILL_PATTERNS):
-        return 'soft_skill'
-    
-    # Check if it's a known tech skill (hard skill)
-    for skill in TECH_SKILLS:
-        if skill.lower() == kw_lower:
-            return 'hard_skill'
-    
-    # Default to concept
-    return 'concept'
+    category = lexicon.categories.get(kw_lower)
+    if category is None:
+        category = _categorize_by_rules(kw_lower, lexicon.tech_set)
+    return category
 
 
+def _jd_section_at(lower: str, start: int, end: int) -> Optional[str]:
+    """JD section whose pattern occurs in the stripped line lower[start:end], if any."""
+    if end - start >= 60:
+        return None
+    for section_key, patterns in JD_SECTION_PATTERNS.items():
+        for pattern in patterns:
+            if lower.find(pattern, start, end) != -1:
+                return section_key
+    return None
+
+def jd_section_spans(text: str) -> SectionSpans:
+    """JD sections as offsets into text; section content is not stripped."""
+    doc = SectionSpans(text)
+    spans = doc.spans
+    current_section = 'general'
+    content_start = None
+    content_end = 0
+    for line_start, line_end in _line_spans(text, 0, len(text)):
+        found_section = _jd_section_at(*doc.stripped_line(line_start, line_end))
+        if found_section:
+            if content_start is not None:
+                spans[current_section] = (content_start, content_end)
+            current_section = found_section
+            content_start = None
+        else:
+            if content_start is None:
+                content_start = line_start
+            content_end = line_end
+    if content_start is not None:
+        spans[current_section] = (content_start, content_end)
+    return doc
+
 def parse_jd(text: str) -> dict:
     """
     Parse a job description into a structured JobDescriptionModel.
@@ -476,72 +1808,40 @@ def parse_jd(text: str) -> dict:
         categorizedKeywords: KeywordModel[]
     }
     """
-    # Parse sections
-    sections = {}
-    lines = text.split('\n')
-    current_section = 'general'
-    current_content = []
-    
-    for line in lines:
-        lower_line = line.lower().strip()
-        found_section = None
-        
-        # Check each section pattern
-        for section_key, patterns in JD_SECTION_PATTERNS.items():
-            for pattern in patterns:
-                if pattern in lower_line and len(lower_line) < 60:
-                    found_section = section_key
-                    break
-            if found_section:
-                break
-        
-        if found_section:
-            if current_content:
-                sections[current_section] = '\n'.join(current_content)
-            current_section = found_section
-            current_content = []
-        else:
-            current_content.append(line)
-    
-    if current_content:
-        sections[current_section] = '\n'.join(current_content)
+    return _default_engine.parse_jd(text)
+
+def _parse_jd(lexicon: Lexicon, text: str) -> dict:
+    doc = jd_section_spans(text)
     
     # Extract and categorize keywords
     categorized_keywords = []
-    text_lower = text.lower()
+    text_lower = doc.full_lower()
     keyword_counts = {}
     
     # Find all tech skills in the JD
-    for skill in TECH_SKILLS:
-        pattern = r'\b' + re.escape(skill.lower()) + r'\b'
-        matches = re.findall(pattern, text_lower, re.IGNORECASE)
+    for skill in lexicon.tech_lower:
+        matches = _skill_count(text_lower, skill)
         if matches:
-            keyword_counts[skill.lower()] = len(matches)
+            keyword_counts[skill] = matches
     
     # Add multi-word phrase detection
-    multi_word_patterns = [
-        r'\b(spring boot|react native|machine learning|deep learning|data science|full stack|front.?end|back.?end|cloud computing|ci/cd)\b'
-    ]
-    for pattern in multi_word_patterns:
-        matches = re.findall(pattern, text_lower)
-        for match in matches:
-            key = match.lower()
-            if key not in keyword_counts:
-                keyword_counts[key] = 1
+    for match in lexicon.phrase_regex.findall(text_lower):
+        key = match.lower()
+        if key not in keyword_counts:
+            keyword_counts[key] = 1
     
     # Determine which section each keyword came from (prioritize requirements)
-    requirements_text = sections.get('requirements', '').lower()
-    
+    term_weights = lexicon.term_weights
     for keyword, count in keyword_counts.items():
-        category = _categorize_keyword(keyword)
+        category = _categorize_keyword(lexicon, keyword)
         
         # Determine section
         jd_section = 'general'
-        if keyword in requirements_text:
+        if doc.contains('requirements', keyword):
             jd_section = 'requirements'
         
-        # Calculate weight (requirements get 1.5x boost)
-        base_weight = 1.0
+        # Calculate weight (requirements get 1.5x boost); corpus IDF lowers terms every posting has
+        base_weight = 1.0 if term_weights is None else term_weights.weight(keyword)
         frequency_bonus = min(count - 1, 2) * 0.25
         section_bonus = 0.5 if jd_section == 'requirements' else 0
         
@@ -559,11 +1859,15 @@ def parse_jd(text: str) -> dict:
     return {
         'id': _generate_id(),
         'rawText': text,
-        'sections': sections,
+        'sections': doc.as_dict(),
         'categorizedKeywords': categorized_keywords
     }
 
 
+_WORD_PATTERN = re.compile(r'\S+')
+_BULLET_SPLIT_PATTERN = re.compile(r'\n\s*[-•*]\s*')
+_SKILL_SPLIT_PATTERN = re.compile(r'[,\n•\-*]')
+
 def parse_resume_canonical(text: str) -> dict:
     """
     Parse a resume into a canonical format with location strings for each token.
@@ -571,67 +1875,67 @@ def parse_resume_canonical(text: str) -> dict:
     Returns a dict with:
     {
         sections: {summary: str, experience: [], skills: [], ...},
-        tokens: [{text: str, location: str, normalized: str}, ...]
+        tokens: [{text: str, location: str, normalized: str, canonical?: str}, ...]
     }
+    
+    canonical is set on tokens that are a known variant of a keyword
+    ("k8s" -> "kubernetes"); match_keywords resolves those without fuzzy matching.
     """
-    sections = parse_resume_sections(text)
+    return _default_engine.parse_resume_canonical(text)
+
+def _token(text: str, location: str, normalized: str, aliases: Dict[str, str]) -> dict:
+    """Resume token; known variants (see _build_aliases) also carry their canonical keyword."""
+    token = {
+        'text': text,
+        'location': location,
+        'normalized': normalized
+    }
+    canonical = aliases.get(normalized)
+    if canonical is not None:
+        token['canonical'] = canonical
+    return token
+
+def _word_tokens(lexicon: Lexicon, lower: str, start: int, end: int, location: str, tokens: list) -> None:
+    stop_words, aliases = lexicon.stop_words, lexicon.aliases
+    for match in _WORD_PATTERN.finditer(lower, start, end):
+        clean = _TOKEN_STRIP_PATTERN.sub('', match.group())
+        if clean and clean not in stop_words:
+            tokens.append(_token(clean, location, clean.lower(), aliases))
+
+def _parse_resume_canonical(lexicon: Lexicon, doc: SectionSpans) -> dict:
+    # Tokens are cut straight out of the shared buffers; section text is never re-joined or re-lowered
+    text, lower = doc.text, doc.lower
     tokens = []
     
     # Process summary
-    summary = sections.get('summary', '')
-    if summary:
-        for word in summary.lower().split():
-            clean = re.sub(r'[^a-zA-Z0-9\-+#]', '', word)
-            if clean and clean not in STOP_WORDS:
-                tokens.append({
-                    'text': clean,
-                    'location': 'summary:0',
-                    'normalized': clean.lower()
-                })
+    if 'summary' in doc:
+        _word_tokens(lexicon, lower, *doc['summary'], 'summary:0', tokens)
     
     # Process experience (extract bullet points)
-    experience_text = sections.get('experience', '')
-    if experience_text:
-        bullets = re.split(r'\n\s*[-•*]\s*', experience_text)
-        for i, bullet in enumerate(bullets):
-            bullet = bullet.strip()
-            if bullet:
-                words = bullet.lower().split()
-                for word in words:
-                    clean = re.sub(r'[^a-zA-Z0-9\-+#]', '', word)
-                    if clean and clean not in STOP_WORDS:
-                        tokens.append({
-                            'text': clean,
-                            'location': f'experience:0:bullets:{i}',
-                            'normalized': clean.lower()
-                        })
+    if 'experience' in doc:
+        for i, bullet in enumerate(_split_spans(_BULLET_SPLIT_PATTERN, text, *doc['experience'])):
+            _word_tokens(lexicon, lower, *_strip_span(text, *bullet), f'experience:0:bullets:{i}', tokens)
     
     # Process skills
-    skills_text = sections.get('skills', '')
-    if skills_text:
+    if 'skills' in doc:
         # Skills are usually comma-separated
-        skills = re.split(r'[,\n•\-*]', skills_text)
-        for i, skill in enumerate(skills):
-            skill = skill.strip()
-            if skill:
-                tokens.append({
-                    'text': skill,
-                    'location': f'skills:0:list:{i}',
-                    'normalized': skill.lower()
-                })
+        for i, piece in enumerate(_split_spans(_SKILL_SPLIT_PATTERN, text, *doc['skills'])):
+            start, end = _strip_span(text, *piece)
+            if start < end:
+                tokens.append(_token(text[start:end], f'skills:0:list:{i}', text[start:end].lower(), lexicon.aliases))
     
     # Also extract tech skills from full text
-    text_lower = text.lower()
-    for skill in TECH_SKILLS:
-        if skill.lower() in text_lower:
+    text_lower = doc.full_lower()
+    for skill, skill_lower in zip(lexicon.tech_skills, lexicon.tech_lower):
+        if skill_lower in text_lower:
             tokens.append({
                 'text': skill,
                 'location': 'detected',
-                'normalized': skill.lower()
+                'normalized': skill_lower
             })
     
     return {
-        'sections': sections,
+        'sections': doc.as_dict(),
         'tokens': tokens
     }
 
@@ -731,13 +2035,30 @@ def match_keywords(jd_model: dict, resume_model: dict, fuzzy_threshold: float =
         matchedVariant: string | None  # The actual variant found (e.g., "ReactJS" for keyword "React")
     }
     """
-    results = []
-    resume_tokens = resume_model.get('tokens', [])
-    
-    # Create a set of normalized resume tokens for fast lookup
-    resume_token_set = {t['normalized'] for t in resume_tokens}
-    
-    # Create a location map
+    keywords = jd_model.get('categorizedKeywords', [])
+    results: List[Any] = [None] * len(keywords)
+    for index, result in _staged_matches(jd_model, resume_model, fuzzy_threshold):
+        results[index] = result
+    return results
+
+
+def _build_alias_map(resume_tokens: list) -> Dict[str, Tuple[List[str], str]]:
+    """Map each canonical keyword to the distinct locations of its variants and the first variant seen."""
+    alias_map = {}
+    for token in resume_tokens:
+        canonical = token.get('canonical')
+        if canonical is None:
+            continue
+        entry = alias_map.get(canonical)
+        if entry is None:
+            entry = alias_map[canonical] = ([], token['normalized'])
+        if token['location'] not in entry[0]:
+            entry[0].append(token['location'])
+    return alias_map
+
+
+def _build_location_map(resume_tokens: list) -> Dict[str, List[str]]:
+    """Map each normalized token to its distinct locations, in document order."""
     location_map = {}
     for token in resume_tokens:
         normalized = token['normalized']
@@ -745,63 +2066,435 @@ def match_keywords(jd_model: dict, resume_model: dict, fuzzy_threshold: float =
             location_map[normalized] = []
         if token['location'] not in location_map[normalized]:
             location_map[normalized].append(token['location'])
+    return location_map
+
+
+# Tokens between deadline / time slice checks inside one fuzzy scan
+_FUZZY_CHECK_STRIDE = 64
+
+# Yielded by _staged_matches instead of a result when its time slice is over
+_PAUSE = (-1, None)
+
+
+class _TimeSlice:
+    """
+    Cooperative scheduling for the async API: work runs until `length`
+    seconds have passed since the last pause, then hands control back.
+    """
+
+    __slots__ = ('length', 'end')
+
+    def __init__(self, time_slice_ms: float):
+        self.length = max(time_slice_ms, 0) / 1000
+        self.end = time.perf_counter() + self.length
+
+    def over(self) -> bool:
+        return time.perf_counter() >= self.end
+
+    async def pause(self) -> None:
+        """Yield to the event loop and start a new slice."""
+        import asyncio
+        await asyncio.sleep(0)
+        self.end = time.perf_counter() + self.length
+
+    async def checkpoint(self) -> None:
+        if self.over():
+            await self.pause()
+
+
+def _staged_matches(jd_model: dict, resume_model: dict, fuzzy_threshold: float = 0.85,
+                    deadline: Optional[float] = None,
+                    time_slice: Optional[_TimeSlice] = None,
+                    exact_misses: Optional[Set[int]] = None) -> Iterator[Tuple[int, dict]]:
+    """
+    match_keywords() results as (keyword index, result), cheapest stage first.
+    
+    Every keyword is tried for an exact match first (or a known alias, see
+    _build_aliases, at the same price), then the rest for a partial match,
+    then the rest again for a fuzzy one (JD order within each stage); a
+    keyword is yielded as soon as a stage decides it. Each keyword gets
+    exactly the result match_keywords would give it.
+    
+    With a deadline (a time.perf_counter() value) the generator stops once it
+    has passed, leaving the remaining keywords undecided. It is checked
+    between keywords and every _FUZZY_CHECK_STRIDE tokens of a fuzzy scan,
+    whose keyword is then left undecided as well. With a time_slice it
+    yields _PAUSE at those same points once the slice is over; the caller
+    pauses the slice and matching resumes where it stopped.
+    
+    exact_misses seeds the first stage with keyword indices already known to
+    have no exact or alias match (a triage result's misses): they go
+    straight to the partial stage, and the other keywords only look up
+    their locations.
+    """
+    resume_tokens = resume_model.get('tokens', [])
     
-    for kw in jd_model.get('categorizedKeywords', []):
-        keyword = kw['keyword']
-        keyword_normalized = keyword.lower()
-        matched_variant = None
-        
-        # Check for exact match
-        locations = location_map.get(keyword_normalized, [])
-        
-        # Also check for partial matches (e.g., "react" in "react.js")
-        if not locations:
-            for token_norm in resume_token_set:
-                if keyword_normalized in token_norm or token_norm in keyword_normalized:
-                    if token_norm in location_map:
-                        locations = location_map[token_norm]
-                        matched_variant = token_norm
-                    break
-        
-        # Fuzzy matching for variations (e.g., "React" vs "ReactJS" vs "React.js")
-        if not locations:
-            best_match = None
-            best_similarity = 0.0
-            
-            for token_norm in resume_token_set:
-                similarity = _calculate_similarity(keyword_normalized, token_norm)
-                if similarity >= fuzzy_threshold and similarity > best_similarity:
-                    best_similarity = similarity
-                    best_match = token_norm
-            
-            if best_match and best_match in location_map:
-                locations = location_map[best_match]
-                matched_variant = best_match
-        
+    # Create a set of normalized resume tokens for fast lookup
+    resume_token_set = {t['normalized'] for t in resume_tokens}
+    location_map = _build_location_map(resume_tokens)
+    alias_map = _build_alias_map(resume_tokens)
+    
+    # Check for exact match, then for a variant the tokenizer already resolved
+    pending = []
+    for index, kw in enumerate(jd_model.get('categorizedKeywords', [])):
+        keyword_normalized = kw['keyword'].lower()
+        if exact_misses is not None and index in exact_misses:
+            pending.append((index, kw, keyword_normalized))
+            continue
+        locations = location_map.get(keyword_normalized)
         if locations:
-            status = 'matched'
-            score_contribution = kw['weight'] * 5
+            yield index, _match_result(kw, keyword_normalized, locations, None, 'exact')
+        elif keyword_normalized in alias_map:
+            locations, matched_variant = alias_map[keyword_normalized]
+            yield index, _match_result(kw, keyword_normalized, locations, matched_variant, 'alias')
         else:
-            status = 'missing'
-            score_contribution = 0
-        
-        result = {
-            'keyword': keyword,
-            'category': kw['category'],
-            'status': status,
-            'locations': locations,
-            'scoreContribution': score_contribution
-        }
-        
-        # Only add matchedVariant if there's a fuzzy match
-        if matched_variant and matched_variant != keyword_normalized:
-            result['matchedVariant'] = matched_variant
-        
-        results.append(result)
+            pending.append((index, kw, keyword_normalized))
+    
+    # Also check for partial matches (e.g., "react" in "react.js")
+    unresolved = []
+    for index, kw, keyword_normalized in pending:
+        if deadline is not None and time.perf_counter() >= deadline:
+            return
+        if time_slice is not None and time_slice.over():
+            yield _PAUSE
+        locations, matched_variant = _partial_match(keyword_normalized, location_map, resume_token_set)
+        if locations:
+            yield index, _match_result(kw, keyword_normalized, locations, matched_variant, 'partial')
+        else:
+            unresolved.append((index, kw, keyword_normalized))
+    
+    # Fuzzy matching for variations (e.g., "React" vs "ReactJS" vs "React.js")
+    for index, kw, keyword_normalized in unresolved:
+        if deadline is not None and time.perf_counter() >= deadline:
+            return
+        if time_slice is not None and time_slice.over():
+            yield _PAUSE
+        match = yield from _fuzzy_match(keyword_normalized, location_map, resume_token_set, fuzzy_threshold,
+                                        deadline, time_slice)
+        if match is None:
+            return
+        locations, matched_variant = match
+        yield index, _match_result(kw, keyword_normalized, locations, matched_variant,
+                                   'fuzzy' if locations else 'missing')
+
+
+def _partial_match(keyword_normalized: str, location_map: Dict[str, List[str]],
+                   resume_token_set: set) -> Tuple[List[str], Optional[str]]:
+    """(locations, variant) of the first token containing or contained in the keyword."""
+    for token_norm in resume_token_set:
+        if keyword_normalized in token_norm or token_norm in keyword_normalized:
+            if token_norm in location_map:
+                return location_map[token_norm], token_norm
+            break
+    return [], None
+
+
+def _fuzzy_match(keyword_normalized: str, location_map: Dict[str, List[str]], resume_token_set: set,
+                 fuzzy_threshold: float, deadline: Optional[float] = None, time_slice: Optional[_TimeSlice] = None):
+    """
+    Generator returning (locations, variant) of the most similar token at or
+    above the threshold, or None if the deadline passed first. Yields _PAUSE
+    when time_slice is over mid-scan (see _staged_matches).
+    """
+    best_match = None
+    best_similarity = 0.0
+    checked = deadline is not None or time_slice is not None
+    
+    for scanned, token_norm in enumerate(resume_token_set):
+        if checked and scanned % _FUZZY_CHECK_STRIDE == 0:
+            if deadline is not None and time.perf_counter() >= deadline:
+                return None
+            if time_slice is not None and time_slice.over():
+                yield _PAUSE
+        similarity = _calculate_similarity(keyword_normalized, token_norm)
+        if similarity >= fuzzy_threshold and similarity > best_similarity:
+            best_similarity = similarity
+            best_match = token_norm
+    
+    if best_match and best_match in location_map:
+        return location_map[best_match], best_match
+    return [], None
+
+
+def _match_result(kw: dict, keyword_normalized: str, locations: List[str], matched_variant: Optional[str],
+                  stage: str) -> dict:
+    """MatchResultModel for a keyword decided at stage (exact, alias, partial, fuzzy or missing)."""
+    if _metrics_sink is not None:
+        _metrics_sink.observe_match(stage)
+    
+    if locations:
+        status = 'matched'
+        score_contribution = kw['weight'] * 5
+    else:
+        status = 'missing'
+        score_contribution = 0
+    
+    result = {
+        'keyword': kw['keyword'],
+        'category': kw['category'],
+        'status': status,
+        'locations': locations,
+        'scoreContribution': score_contribution
+    }
     
+    # Only add matchedVariant if there's a fuzzy match
+    if matched_variant and matched_variant != keyword_normalized:
+        result['matchedVariant'] = matched_variant
+    
+    return result
+
+
+def _token_keys(resume_tokens: list) -> set:
+    """Everything an exact or alias lookup can hit: normalized tokens and their canonical keywords."""
+    keys = {t['normalized'] for t in resume_tokens}
+    keys.update(t['canonical'] for t in resume_tokens if 'canonical' in t)
+    return keys
+
+
+def _match_keywords_exact(jd_model: dict, resume_model: dict) -> list:
+    """
+    Triage matching: exact lexicon hits and known aliases only, no location lists.
+    
+    Returns MatchResultModel dicts without `locations`; keywords that would
+    need the partial or fuzzy stage are reported as 'missing'.
+    """
+    resume_token_set = _token_keys(resume_model.get('tokens', []))
+    results = []
+    for kw in jd_model.get('categorizedKeywords', []):
+        matched = kw['keyword'].lower() in resume_token_set
+        results.append({
+            'keyword': kw['keyword'],
+            'category': kw['category'],
+            'status': 'matched' if matched else 'missing',
+            'scoreContribution': kw['weight'] * 5 if matched else 0
+        })
     return results
 
 
+# --- Concept Similarity ---
+
+CONCEPT_VECTOR_DIM = 1 << 12  # hash buckets; a power of two
+CONCEPT_JD_SECTIONS = ('general', 'requirements', 'responsibilities')
+CONCEPT_SIMILARITY_FULL = 0.5  # cosine at which the role/concept score reaches 100
+CONCEPT_CACHE_SIZE = 256  # documents whose vectors are kept, JDs and resumes together
+ROLE_TITLE_DEFAULT_SCORE = 75  # roleTitleScore when there is nothing to compare
+_CONCEPT_TERM_PATTERN = re.compile(r'[a-z0-9][a-z0-9+#]*')
+_CONCEPT_SIGN_BIT = 1 << 31
+
+_numpy_module: Any = False  # not probed yet
+
+
+def _numpy():
+    """NumPy if it can be imported (it is optional, also under Pyodide), else None."""
+    global _numpy_module
+    if _numpy_module is False:
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        _numpy_module = numpy
+    return _numpy_module
+
+
+class ConceptVector:
+    """
+    L2-normalized, feature-hashed term vector of one text.
+    
+    Terms are hashed (crc32) into CONCEPT_VECTOR_DIM buckets with a sign bit,
+    so there is no vocabulary to store and vectors of any two documents are
+    comparable. Only used buckets are kept: {bucket: weight}, read-only since
+    cached vectors are shared. Build vectors once per document with
+    concept_vectors() and reuse them for every pair.
+    """
+    
+    __slots__ = ('weights', 'terms')
+    
+    def __init__(self, weights: Dict[int, float], terms: int):
+        self.weights = MappingProxyType(weights)
+        self.terms = terms
+    
+    def __bool__(self) -> bool:
+        return bool(self.weights)
+    
+    def cosine(self, other: 'ConceptVector') -> float:
+        small, large = sorted((self.weights, other.weights), key=len)
+        return sum(weight * large.get(bucket, 0.0) for bucket, weight in small.items())
+
+
+def concept_vector(text: str) -> ConceptVector:
+    """Hashed vector of text's terms (stop words, section words and numbers skipped), weighted 1 + log(tf)."""
+    return _concept_vector(_default_engine.lexicon, text)
+
+
+def _concept_vector(lexicon: Lexicon, text: str) -> ConceptVector:
+    stop_words = lexicon.stop_words
+    counts = Counter(
+        term for term in _CONCEPT_TERM_PATTERN.findall(text.lower())
+        if term not in stop_words and term not in PROHIBITED_KEYWORDS and not term.isdigit()
+    )
+    weights: Dict[int, float] = {}
+    for term, count in counts.items():
+        hashed = zlib.crc32(term.encode('utf-8'))
+        bucket = hashed & (CONCEPT_VECTOR_DIM - 1)
+        sign = 1.0 if hashed & _CONCEPT_SIGN_BIT else -1.0
+        weights[bucket] = weights.get(bucket, 0.0) + sign * (1.0 + math.log(count))
+    norm = math.sqrt(sum(weight * weight for weight in weights.values()))
+    if not norm:
+        return ConceptVector({}, len(counts))
+    return ConceptVector({bucket: weight / norm for bucket, weight in weights.items() if weight}, len(counts))
+
+
+def concept_vectors(sections: Dict[str, str]) -> Dict[str, ConceptVector]:
+    """ConceptVector per section, e.g. of parse_jd()['sections'] or parse_resume_sections()."""
+    return _default_engine.concept_vectors(sections)
+
+
+def _concept_vectors(lexicon: Lexicon, sections: Dict[str, str]) -> Dict[str, ConceptVector]:
+    return {name: _concept_vector(lexicon, text) for name, text in sections.items()}
+
+
+def concept_similarity_matrix(rows: List[ConceptVector], columns: List[ConceptVector]) -> List[List[float]]:
+    """
+    Cosine similarity of every row vector with every column vector.
+    
+    With NumPy the vectors are packed into two dense matrices over just the
+    buckets they use, and all pairs come out of one matrix product; without
+    it each pair is a sparse dot product.
+    """
+    np = _numpy()
+    if np is None or not rows or not columns:
+        return [[row.cosine(column) for column in columns] for row in rows]
+    buckets: Dict[int, int] = {}
+    for vector in rows + columns:
+        for bucket in vector.weights:
+            buckets.setdefault(bucket, len(buckets))
+    return (_dense_matrix(np, rows, buckets) @ _dense_matrix(np, columns, buckets).T).tolist()
+
+
+def _dense_matrix(np, vectors: List[ConceptVector], buckets: Dict[int, int]):
+    matrix = np.zeros((len(vectors), len(buckets)))
+    for i, vector in enumerate(vectors):
+        if vector.weights:
+            matrix[i, [buckets[bucket] for bucket in vector.weights]] = list(vector.weights.values())
+    return matrix
+
+
+def concept_similarity_score(jd_vectors: Dict[str, ConceptVector],
+                             resume_vectors: Dict[str, ConceptVector]) -> Optional[int]:
+    """
+    How closely a resume's sections cover a JD's title, requirements and responsibilities (0-100).
+    
+    Each JD section in CONCEPT_JD_SECTIONS takes its best cosine against any
+    resume section; those are averaged, weighted by the section's distinct
+    terms, and scaled so that CONCEPT_SIMILARITY_FULL scores 100. None if
+    either side has no terms to compare.
+    """
+    rows = [jd_vectors[name] for name in CONCEPT_JD_SECTIONS if jd_vectors.get(name)]
+    columns = [vector for vector in resume_vectors.values() if vector]
+    if not rows or not columns:
+        return None
+    matrix = concept_similarity_matrix(rows, columns)
+    similarity = sum(row.terms * max(0.0, max(cosines)) for row, cosines in zip(rows, matrix))
+    similarity /= sum(row.terms for row in rows)
+    # Rounded first so that NumPy and pure-Python sums land on the same integer
+    return min(100, int(round(similarity / CONCEPT_SIMILARITY_FULL * 100, 6)))
+
+
+class _ConceptVectorCache:
+    """
+    Section vectors of recently scored documents, least recently used dropped first.
+    
+    Keys are (lexicon fingerprint, side, text): vectors depend on the
+    lexicon's stop words and, for resumes, its section headers, so engines
+    with other lexicons never share entries. Values are read-only.
+    """
+    
+    def __init__(self, size: int):
+        self.size = size
+        self._entries: 'OrderedDict[tuple, Any]' = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def vectors(self, lexicon: Lexicon, side: str, text: str):
+        key = (lexicon.fingerprint, side, text)
+        with self._lock:
+            vectors = self._entries.get(key)
+            if vectors is not None:
+                self._entries.move_to_end(key)
+                return vectors
+        spans = jd_section_spans(text) if side == 'jd' else _resume_section_spans(lexicon, text)
+        vectors = MappingProxyType(_concept_vectors(lexicon, spans.as_dict()))
+        with self._lock:
+            self._entries[key] = vectors
+            if len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+        return vectors
+    
+    def cached(self, lexicon: Lexicon, side: str, text: str):
+        """vectors() if they are cached already, else None (nothing is computed)."""
+        with self._lock:
+            return self._entries.get((lexicon.fingerprint, side, text))
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_concept_cache = _ConceptVectorCache(CONCEPT_CACHE_SIZE)
+
+
+def _role_title_score(lexicon: Lexicon, jd_model: dict, resume_text: str,
+                      deadline: Optional[float] = None) -> int:
+    """
+    roleTitleScore: concept similarity, or ROLE_TITLE_DEFAULT_SCORE when there is nothing to compare.
+    
+    Once deadline (a time.perf_counter() value) has passed, only vectors
+    already in _concept_cache are compared; building them scans both texts
+    again, so without them the score is ROLE_TITLE_DEFAULT_SCORE instead.
+    """
+    jd_text = jd_model.get('rawText', '')
+    if deadline is not None and time.perf_counter() >= deadline:
+        jd_vectors = _concept_cache.cached(lexicon, 'jd', jd_text)
+        resume_vectors = _concept_cache.cached(lexicon, 'resume', resume_text)
+        if jd_vectors is None or resume_vectors is None:
+            return ROLE_TITLE_DEFAULT_SCORE
+    else:
+        jd_vectors = _concept_cache.vectors(lexicon, 'jd', jd_text)
+        resume_vectors = _concept_cache.vectors(lexicon, 'resume', resume_text)
+    score = concept_similarity_score(jd_vectors, resume_vectors)
+    return ROLE_TITLE_DEFAULT_SCORE if score is None else score
+
+
+SCORED_CATEGORIES = ['hard_skill', 'tool', 'concept']
+
+
+def _category_score(matched: int, total: int) -> int:
+    """Category score (0-100); no requirements = perfect score."""
+    if total == 0:
+        return 100
+    return int((matched / total) * 100)
+
+
+def _structure_score(resume_text: str) -> int:
+    """Structure score - check for key sections."""
+    text_lower = resume_text.lower()
+    has_experience = bool(re.search(r'experience|work history|employment', text_lower))
+    has_education = bool(re.search(r'education|degree|university', text_lower))
+    has_skills = bool(re.search(r'skills|technologies|proficient', text_lower))
+    return (40 if has_experience else 0) + (30 if has_education else 0) + (30 if has_skills else 0)
+
+
+def _weighted_total(hard_skill_score: int, tools_score: int, concept_score: int,
+                    role_title_score: int, structure_score: int) -> int:
+    """Total using formula: (HardSkill * 0.45) + (Tools * 0.20) + (Concepts * 0.20) + (RoleTitle * 0.10) + (Structure * 0.05)"""
+    return int(
+        hard_skill_score * 0.45 +
+        tools_score * 0.20 +
+        concept_score * 0.20 +
+        role_title_score * 0.10 +
+        structure_score * 0.05
+    )
+
+
 def calculate_ats_score(jd_model: dict, match_results: list, resume_text: str) -> dict:
     """
     Calculate the ATS score breakdown from match results.
@@ -816,6 +2509,11 @@ def calculate_ats_score(jd_model: dict, match_results: list, resume_text: str) -
         total: number
     }
     """
+    return _default_engine.calculate_ats_score(jd_model, match_results, resume_text)
+
+
+def _calculate_ats_score(lexicon: Lexicon, jd_model: dict, match_results: list, resume_text: str,
+                         deadline: Optional[float] = None) -> dict:
     # Group by category
     by_category = {
         'hard_skill': {'matched': 0, 'total': 0},
@@ -833,32 +2531,18 @@ def calculate_ats_score(jd_model: dict, match_results: list, resume_text: str) -
     
     # Calculate category scores (0-100)
     def calc_score(cat):
-        if by_category[cat]['total'] == 0:
-            return 100  # No requirements = perfect score
-        return int((by_category[cat]['matched'] / by_category[cat]['total']) * 100)
+        return _category_score(by_category[cat]['matched'], by_category[cat]['total'])
     
     hard_skill_score = calc_score('hard_skill')
     tools_score = calc_score('tool')
     concept_score = calc_score('concept')
     
-    # Role title match (simplified - check for common title patterns)
-    role_title_score = 75  # Default
+    # Role title match - how closely the resume's sections cover the JD's title, requirements and duties
+    role_title_score = _role_title_score(lexicon, jd_model, resume_text, deadline)
     
-    # Structure score - check for key sections
-    text_lower = resume_text.lower()
-    has_experience = bool(re.search(r'experience|work history|employment', text_lower))
-    has_education = bool(re.search(r'education|degree|university', text_lower))
-    has_skills = bool(re.search(r'skills|technologies|proficient', text_lower))
-    structure_score = (40 if has_experience else 0) + (30 if has_education else 0) + (30 if has_skills else 0)
+    structure_score = _structure_score(resume_text)
     
-    # Total using formula: (HardSkill * 0.45) + (Tools * 0.20) + (Concepts * 0.20) + (RoleTitle * 0.10) + (Structure * 0.05)
-    total = int(
-        hard_skill_score * 0.45 +
-        tools_score * 0.20 +
-        concept_score * 0.20 +
-        role_title_score * 0.10 +
-        structure_score * 0.05
-    )
+    total = _weighted_total(hard_skill_score, tools_score, concept_score, role_title_score, structure_score)
     
     return {
         'hardSkillScore': hard_skill_score,
@@ -870,6 +2554,138 @@ def calculate_ats_score(jd_model: dict, match_results: list, resume_text: str) -
     }
 
 
+class _FuzzyNorms:
+    """
+    Resume tokens prepared for the fuzzy check of _could_match.
+
+    Built on the first keyword that gets that far: in a typical resume most
+    keywords are settled by the exact and partial checks, and normalizing
+    every token up front cost more than full matching on small inputs.
+    """
+
+    __slots__ = ('_tokens', '_norms', '_joined', '_by_length', '_bags')
+
+    def __init__(self, tokens: set):
+        self._tokens = tokens
+        self._norms = None
+
+    def _build(self) -> None:
+        self._norms = {_normalize_for_fuzzy_matching(token) for token in self._tokens}
+        self._joined = '\n'.join(self._norms)
+        self._by_length: Dict[int, List[str]] = {}
+        for norm in self._norms:
+            self._by_length.setdefault(len(norm), []).append(norm)
+        self._bags: Dict[str, Counter] = {}
+
+    def could_match(self, keyword: str, fuzzy_threshold: float) -> bool:
+        """Whether _calculate_similarity can reach fuzzy_threshold for keyword and any token."""
+        if self._norms is None:
+            self._build()
+        norm1 = _normalize_for_fuzzy_matching(keyword)
+        # The same cases as _calculate_similarity: equal (0.95), then contained either way (0.9)
+        if fuzzy_threshold <= 0.95 and norm1 in self._norms:
+            return True
+        if fuzzy_threshold <= 0.9 and self._contains(norm1):
+            return True
+        len1 = len(norm1)
+        if len1 == 0:
+            return False
+
+        # Length difference and character-bag difference bound the Levenshtein distance from below
+        bag1 = Counter(norm1)
+        for len2, norms in self._by_length.items():
+            max_len = max(len1, len2)
+            if len2 == 0 or 1.0 - (abs(len1 - len2) / max_len) < fuzzy_threshold:
+                continue
+            for norm2 in norms:
+                if norm1 in norm2 or norm2 in norm1:
+                    continue  # capped at 0.9 or 0.95 above
+                bag2 = self._bags.get(norm2)
+                if bag2 is None:
+                    bag2 = self._bags[norm2] = Counter(norm2)
+                bag_distance = max(sum((bag1 - bag2).values()), sum((bag2 - bag1).values()))
+                cap = 1.0 - (bag_distance / max_len)
+                if cap >= fuzzy_threshold and cap > 0.0:
+                    return True
+        return False
+
+    def _contains(self, norm1: str) -> bool:
+        """Whether norm1 contains or is contained in a token's norm (one search plus a set lookup per substring)."""
+        if norm1 in self._joined or '' in self._norms:
+            return True
+        length = len(norm1)
+        for i in range(length):
+            for j in range(i + 1, length + 1):
+                if norm1[i:j] in self._norms:
+                    return True
+        return False
+
+
+def _could_match(keyword: str, token_set: set, joined_tokens: str, fuzzy_norms: _FuzzyNorms,
+                 fuzzy_threshold: float) -> bool:
+    """
+    Cheap necessary condition for match_keywords to report `keyword` as matched.
+
+    Exact and partial matches are decided precisely (set lookup, one substring
+    search over the joined tokens, and a lookup of every substring of the
+    keyword). For the fuzzy stage the similarity of each token is capped from
+    above by the cases of _calculate_similarity (see _FuzzyNorms).
+    """
+    if keyword in token_set or keyword in joined_tokens:
+        return True
+    length = len(keyword)
+    for i in range(length):
+        for j in range(i + 1, length + 1):
+            if keyword[i:j] in token_set:
+                return True
+    if not token_set:
+        return False
+    return fuzzy_norms.could_match(keyword, fuzzy_threshold)
+
+
+def ats_score_upper_bound(jd_model: dict, resume_model: dict, resume_text: str,
+                          fuzzy_threshold: float = 0.85) -> int:
+    """
+    Upper bound on calculate_ats_score(...)['total'] without full matching.
+
+    A keyword counts as matched when a resume token is one of its aliases,
+    or when _could_match cannot rule out that some stage of match_keywords
+    matches it, so the bound is never below the real total. Ranking code
+    uses it to skip partial/fuzzy matching and recommendations for
+    candidates that cannot reach a cut-off (bench_nlp_core.py --bound
+    compares its cost with full matching).
+    """
+    return _default_engine.ats_score_upper_bound(jd_model, resume_model, resume_text, fuzzy_threshold)
+
+
+def _ats_score_upper_bound(lexicon: Lexicon, jd_model: dict, resume_model: dict, resume_text: str,
+                           fuzzy_threshold: float = 0.85) -> int:
+    resume_tokens = resume_model.get('tokens', [])
+    token_set = {t['normalized'] for t in resume_tokens}
+    alias_set = {t['canonical'] for t in resume_tokens if 'canonical' in t}
+    joined_tokens = '\n'.join(token_set)
+    fuzzy_norms = _FuzzyNorms(token_set)
+
+    matched = {cat: 0 for cat in SCORED_CATEGORIES}
+    totals = {cat: 0 for cat in SCORED_CATEGORIES}
+    for kw in jd_model.get('categorizedKeywords', []):
+        cat = kw['category']
+        if cat not in totals:
+            continue
+        totals[cat] += 1
+        keyword = kw['keyword'].lower()
+        if keyword in alias_set or _could_match(keyword, token_set, joined_tokens, fuzzy_norms, fuzzy_threshold):
+            matched[cat] += 1
+
+    return _weighted_total(
+        _category_score(matched['hard_skill'], totals['hard_skill']),
+        _category_score(matched['tool'], totals['tool']),
+        _category_score(matched['concept'], totals['concept']),
+        _role_title_score(lexicon, jd_model, resume_text),
+        _structure_score(resume_text)
+    )
+
+
 def generate_recommendations(match_results: list) -> list:
     """
     Generate actionable recommendations from match results.
@@ -934,7 +2750,7 @@ def generate_recommendations(match_results: list) -> list:
     return recommendations
 
 
-def evaluate_ats(resume_text: str, jd_text: str) -> dict:
+def evaluate_ats(resume_text: str, jd_text: str, mode: str = 'full', deadline_ms: Optional[float] = None) -> dict:
     """
     Complete ATS evaluation - the main entry point for structured ATS analysis.
     
@@ -945,30 +2761,663 @@ def evaluate_ats(resume_text: str, jd_text: str) -> dict:
         scoreBreakdown: ATSScoreBreakdown,
         recommendations: Recommendation[]
     }
+    
+    mode='triage' only counts exact lexicon hits and returns ATSTriageResponse:
+    {mode: 'triage', jdModel, matchResults (without locations), scoreBreakdown}.
+    Its total is a lower bound of the full total; promote_evaluation() fills
+    in the rest for shortlisted candidates.
+    
+    deadline_ms bounds a full evaluation for interactive use: keywords are
+    matched cheapest stage first (see _staged_matches) and matching stops
+    once deadline_ms have passed since the call started. Keywords left
+    undecided count as missing, so the total is a lower bound, but get no
+    recommendations. Parsing is not interrupted, but a budget it used up
+    leaves only exact matches; past the deadline roleTitleScore falls back
+    to ROLE_TITLE_DEFAULT_SCORE unless the concept vectors are cached (see
+    _role_title_score). The response then also has
+    {unevaluatedKeywords: string[], deadlineExceeded: boolean}, the latter
+    true whenever the call ran past deadline_ms.
     """
+    return _default_engine.evaluate_ats(resume_text, jd_text, mode, deadline_ms)
+
+
+def _evaluate_ats(analysis: '_DocumentAnalysis', resume_text: str, jd_text: str, mode: str = 'full',
+                  deadline_ms: Optional[float] = None) -> dict:
+    started = time.perf_counter()
+    _check_mode(mode)
+    
     # Parse JD
-    jd_model = parse_jd(jd_text)
+    jd_model = analysis.jd_model(jd_text)
     
     # Parse resume
-    resume_model = parse_resume_canonical(resume_text)
+    resume_model = analysis.resume_model(resume_text)
+    
+    if mode == 'triage':
+        match_results = _match_keywords_exact(jd_model, resume_model)
+        return {
+            'mode': 'triage',
+            'jdModel': jd_model,
+            'matchResults': match_results,
+            'scoreBreakdown': _calculate_ats_score(analysis.lexicon, jd_model, match_results, resume_text)
+        }
+    
+    if deadline_ms is not None:
+        deadline = started + deadline_ms / 1000
+        match_results: List[Any] = [None] * len(jd_model.get('categorizedKeywords', []))
+        for index, result in _staged_matches(jd_model, resume_model, deadline=deadline):
+            match_results[index] = result
+        return _bounded_evaluation(analysis.lexicon, jd_model, match_results, resume_text, deadline)
     
     # Match keywords
     match_results = match_keywords(jd_model, resume_model)
     
-    # Calculate score
-    score_breakdown = calculate_ats_score(jd_model, match_results, resume_text)
-    
-    # Generate recommendations
-    recommendations = generate_recommendations(match_results)
+    return _full_evaluation(analysis.lexicon, jd_model, match_results, resume_text)
+
+
+def _full_evaluation(lexicon: Lexicon, jd_model: dict, match_results: list, resume_text: str) -> dict:
+    """ATSEvaluationResponse around finished match results: score and recommendations."""
+    return {
+        'jdModel': jd_model,
+        'matchResults': match_results,
+        'scoreBreakdown': _calculate_ats_score(lexicon, jd_model, match_results, resume_text),
+        'recommendations': generate_recommendations(match_results)
+    }
+
+
+def _bounded_evaluation(lexicon: Lexicon, jd_model: dict, match_results: list, resume_text: str,
+                        deadline: float) -> dict:
+    """
+    Deadline response: match_results entries left None (undecided) are
+    reported as unevaluated, and deadlineExceeded is also set when parsing
+    or scoring ran past deadline with every keyword decided.
+    """
+    keywords = jd_model.get('categorizedKeywords', [])
+    unevaluated = [index for index, result in enumerate(match_results) if result is None]
+    for index in unevaluated:
+        kw = keywords[index]
+        match_results[index] = {
+            'keyword': kw['keyword'],
+            'category': kw['category'],
+            'status': 'missing',
+            'locations': [],
+            'scoreContribution': 0
+        }
+    skipped = set(unevaluated)
+    score_breakdown = _calculate_ats_score(lexicon, jd_model, match_results, resume_text, deadline)
     
     return {
         'jdModel': jd_model,
         'matchResults': match_results,
         'scoreBreakdown': score_breakdown,
-        'recommendations': recommendations
+        'recommendations': generate_recommendations(
+            [result for index, result in enumerate(match_results) if index not in skipped]),
+        'unevaluatedKeywords': [keywords[index]['keyword'] for index in unevaluated],
+        'deadlineExceeded': bool(unevaluated) or time.perf_counter() >= deadline
     }
 
 
+# --- Streaming Matches ---
+
+def iter_match_keywords(jd_model: dict, resume_model: dict, fuzzy_threshold: float = 0.85) -> Iterator[dict]:
+    """
+    match_keywords() as a stream: yields each MatchResultModel as soon as it is decided.
+    
+    Exact matches come first, then partial, then fuzzy matches and misses
+    (see _staged_matches), so cheap results arrive before any fuzzy scan
+    starts. Each result equals its match_keywords() counterpart; only the
+    order differs. Feed them to a ScoreAccumulator for running scores.
+    """
+    for _, result in _staged_matches(jd_model, resume_model, fuzzy_threshold):
+        yield result
+
+
+class ScoreAccumulator:
+    """
+    Running calculate_ats_score() over match results as they arrive.
+    
+    breakdown() counts keywords not added yet as missing, so its total never
+    drops and ends equal to calculate_ats_score()'s; max_total() counts them
+    as matched instead, so the two bracket the final total. lexicon defaults
+    to the default engine's; a deadline is passed on to _role_title_score.
+    """
+    
+    def __init__(self, jd_model: dict, resume_text: str, lexicon: Optional[Lexicon] = None,
+                 deadline: Optional[float] = None):
+        lexicon = lexicon if lexicon is not None else _default_engine.lexicon
+        keywords = jd_model.get('categorizedKeywords', [])
+        self.keywords = len(keywords)
+        self.totals = Counter(kw['category'] for kw in keywords)
+        self.pending = Counter(self.totals)
+        self.matched: Counter = Counter()
+        self.matched_keywords: List[str] = []
+        self.decided = 0
+        self.role_title_score = _role_title_score(lexicon, jd_model, resume_text, deadline)
+        self.structure_score = _structure_score(resume_text)
+    
+    def add(self, result: dict) -> None:
+        self.decided += 1
+        self.pending[result['category']] -= 1
+        if result['status'] == 'matched':
+            self.matched[result['category']] += 1
+            self.matched_keywords.append(result['keyword'])
+    
+    def _scores(self, extra: Counter) -> List[int]:
+        return [_category_score(self.matched[cat] + extra[cat], self.totals[cat]) for cat in SCORED_CATEGORIES]
+    
+    def breakdown(self) -> dict:
+        """ATSScoreBreakdown over the keywords decided so far; the rest count as missing."""
+        hard_skill_score, tools_score, concept_score = self._scores(Counter())
+        return {
+            'hardSkillScore': hard_skill_score,
+            'toolsScore': tools_score,
+            'conceptScore': concept_score,
+            'roleTitleScore': self.role_title_score,
+            'structureScore': self.structure_score,
+            'total': _weighted_total(hard_skill_score, tools_score, concept_score,
+                                     self.role_title_score, self.structure_score)
+        }
+    
+    def max_total(self) -> int:
+        """Highest total still reachable if every undecided keyword matches."""
+        return _weighted_total(*self._scores(self.pending), self.role_title_score, self.structure_score)
+    
+    def snapshot(self) -> dict:
+        """
+        Returns: {decided, keywords, scoreBreakdown, maxTotal, matchedKeywords: string[]}
+        """
+        return {
+            'decided': self.decided,
+            'keywords': self.keywords,
+            'scoreBreakdown': self.breakdown(),
+            'maxTotal': self.max_total(),
+            'matchedKeywords': list(self.matched_keywords)
+        }
+
+
+def iter_evaluate_ats(resume_text: str, jd_text: str) -> Iterator[dict]:
+    """
+    evaluate_ats() with progress, for UIs that show scores while fuzzy matching runs.
+    
+    Yields a ScoreAccumulator snapshot plus {matchResult, done: false} after
+    each decided keyword (exact matches first), then a final
+    {matchResult: null, done: true, evaluation} event whose evaluation equals
+    evaluate_ats(resume_text, jd_text).
+    """
+    return _default_engine.iter_evaluate_ats(resume_text, jd_text)
+
+
+def _iter_evaluate_ats(analysis: '_DocumentAnalysis', resume_text: str, jd_text: str) -> Iterator[dict]:
+    jd_model = analysis.jd_model(jd_text)
+    resume_model = analysis.resume_model(resume_text)
+    accumulator = ScoreAccumulator(jd_model, resume_text, analysis.lexicon)
+    match_results: List[Any] = [None] * accumulator.keywords
+    
+    for index, result in _staged_matches(jd_model, resume_model):
+        match_results[index] = result
+        accumulator.add(result)
+        yield _progress_event(accumulator, result)
+    
+    yield _final_event(accumulator, _full_evaluation(analysis.lexicon, jd_model, match_results, resume_text))
+
+
+def _progress_event(accumulator: ScoreAccumulator, result: dict) -> dict:
+    event = accumulator.snapshot()
+    event['matchResult'] = result
+    event['done'] = False
+    return event
+
+
+def _final_event(accumulator: ScoreAccumulator, evaluation: dict) -> dict:
+    event = accumulator.snapshot()
+    event['matchResult'] = None
+    event['done'] = True
+    event['evaluation'] = evaluation
+    return event
+
+
+def promote_evaluation(triage_result: dict, resume_text: str) -> dict:
+    """
+    Complete an evaluate_ats(mode='triage') result into a full ATSEvaluationResponse.
+    
+    The parsed JD from the triage result is reused as-is (same id), and so
+    are its exact matches: only the keywords triage reported missing go on
+    to partial and fuzzy matching, then scoring and recommendations run.
+    """
+    return _default_engine.promote_evaluation(triage_result, resume_text)
+
+
+def _promote_evaluation(analysis: '_DocumentAnalysis', triage_result: dict, resume_text: str) -> dict:
+    if triage_result.get('mode') != 'triage':
+        return triage_result
+    jd_model = triage_result['jdModel']
+    # Triage already ran the exact and alias stage; only its misses need partial and fuzzy matching
+    exact_misses = {index for index, result in enumerate(triage_result['matchResults'])
+                    if result['status'] != 'matched'}
+    match_results: List[Any] = [None] * len(jd_model.get('categorizedKeywords', []))
+    for index, result in _staged_matches(jd_model, analysis.resume_model(resume_text),
+                                         exact_misses=exact_misses):
+        match_results[index] = result
+    return _full_evaluation(analysis.lexicon, jd_model, match_results, resume_text)
+
+
+# --- Batched Bridge Entry Point ---
+
+class _DocumentAnalysis:
+    """
+    Per-request memo of document-level analysis, keyed by the raw text.
+
+    Entry points that run in one dispatch() call share an instance, so a
+    resume or JD that several operations touch is sectioned, keyword-scanned
+    and parsed only once. Cached values are shared, so callers must copy
+    before mutating.
+    """
+
+    def __init__(self, lexicon: Lexicon):
+        self.lexicon = lexicon
+        self._cache: Dict[tuple, Any] = {}
+
+    def _memo(self, key: tuple, compute):
+        hit = key in self._cache
+        if not hit:
+            self._cache[key] = compute()
+        if _metrics_sink is not None:
+            _metrics_sink.observe_cache('analysis', int(hit), int(not hit))
+        return self._cache[key]
+
+    def section_spans(self, text: str) -> SectionSpans:
+        return self._memo(('spans', text), lambda: _resume_section_spans(self.lexicon, text))
+
+    def sections(self, text: str) -> Dict[str, str]:
+        return self._memo(('sections', text), lambda: self.section_spans(text).as_dict())
+
+    def name(self, text: str) -> Optional[str]:
+        return self._memo(('name', text), lambda: extract_name(text))
+
+    def resume_keywords(self, text: str) -> Tuple[Set[str], Set[str]]:
+        """(name parts, top-50 keywords without them) of a resume, as optimize_resume compares them."""
+        def compute():
+            candidate_name = self.name(text)
+            name_parts = set(candidate_name.lower().split()) if candidate_name else set()
+            return name_parts, set(self.keywords(text, 50)) - name_parts
+        return self._memo(('resume_keywords', text), compute)
+
+    def bullet_lines(self, text: str) -> List[tuple]:
+        return self._memo(('bullets', text), lambda: _bullet_lines(self.section_spans(text)))
+
+    def keywords(self, text: str, topn: int) -> List[str]:
+        return self._memo(('keywords', text, topn), lambda: _extract_keywords(self.lexicon, text, topn))
+
+    def jd_model(self, text: str) -> dict:
+        return self._memo(('jd', text), lambda: _parse_jd(self.lexicon, text))
+
+    def resume_model(self, text: str) -> dict:
+        return self._memo(('resume', text), lambda: _parse_resume_canonical(self.lexicon, self.section_spans(text)))
+
+
+def _bridge_edits(resume_text: str, output: str, result):
+    """Edit offsets as the JavaScript side indexes strings (see utf16_edits); text output passes through."""
+    return utf16_edits(resume_text, result) if output == 'edits' else result
+
+
+# Operation name (as used by usePyNLP.ts) -> handler(analysis, args)
+DISPATCH_OPERATIONS = {
+    'parseResume': lambda analysis, args: _parse_resume(analysis, args['text']),
+    'scoreATS': lambda analysis, args: _score_ats(analysis, args['resumeText'], args['jdText'], args.get('mode', 'full')),
+    'promoteScore': lambda analysis, args: _promote_score(analysis, args['triageResult'], args['resumeText']),
+    'optimizeResume': lambda analysis, args: _bridge_edits(args['resumeText'], args.get('output', 'text'),
+        _optimize_resume_output(analysis, args['resumeText'], args['jdText'], args.get('output', 'text'))),
+    'optimizeResumeMany': lambda analysis, args: [
+        _bridge_edits(args['resumeText'], args.get('output', 'text'), variant)
+        for variant in _optimize_resume_many(analysis, args['resumeText'], args['jdTexts'], args.get('output', 'text'))],
+    'rewriteBullet': lambda analysis, args: rewrite_bullet(args['bullet'], args['keyword']),
+    'parseJD': lambda analysis, args: analysis.jd_model(args['text']),
+    'parseResumeCanonical': lambda analysis, args: analysis.resume_model(args['text']),
+    'evaluateATS': lambda analysis, args: _evaluate_ats(analysis, args['resumeText'], args['jdText'], args.get('mode', 'full'),
+                                                        args.get('deadlineMs')),
+    'promoteEvaluation': lambda analysis, args: _promote_evaluation(analysis, args['triageResult'], args['resumeText']),
+}
+
+
+def dispatch(requests_json: str) -> str:
+    """
+    Run several operations in one bridge crossing.
+
+    Takes a JSON list of {id?, op, args} requests and returns a JSON list of
+    {id, result} or {id, error} entries in the same order. All operations
+    share one _DocumentAnalysis, so e.g. parseJD followed by evaluateATS on
+    the same JD parses it once (and both report the same JD id). A failing
+    operation reports its error without aborting the rest of the batch.
+    Edit offsets (optimizeResume with output 'edits') are UTF-16 code units,
+    ready to apply to the JavaScript string.
+    """
+    return _default_engine.dispatch(requests_json)
+
+
+def _dispatch(analysis: _DocumentAnalysis, requests_json: str) -> str:
+    requests = json.loads(requests_json)
+    responses = []
+    for request in requests:
+        request_id = request.get('id')
+        op = request.get('op')
+        handler = DISPATCH_OPERATIONS.get(op)
+        if handler is None:
+            responses.append({'id': request_id, 'error': f"Unknown operation: {op}"})
+            continue
+        try:
+            responses.append({'id': request_id, 'result': handler(analysis, request.get('args') or {})})
+        except Exception as e:
+            responses.append({'id': request_id, 'error': f"{type(e).__name__}: {e}"})
+    return json.dumps(responses)
+
+
+# --- Async API ---
+
+# Work between two yields to the event loop. In Pyodide a yield lets the browser render
+# and handle input; each one costs a setTimeout round trip, so slices stay a few ms long.
+DEFAULT_TIME_SLICE_MS = 10
+
+async def evaluate_ats_async(resume_text: str, jd_text: str, mode: str = 'full',
+                             deadline_ms: Optional[float] = None,
+                             time_slice_ms: float = DEFAULT_TIME_SLICE_MS) -> dict:
+    """
+    evaluate_ats() as a coroutine that yields to the event loop every
+    time_slice_ms of work, so a long evaluation does not block the browser's
+    main thread (Pyodide) or a service's other tasks (CPython asyncio).
+    
+    Parsing runs as one chunk per document; keyword matching pauses between
+    keywords and inside fuzzy scans. The result equals evaluate_ats(); a
+    deadline_ms counts wall time since the call, including pauses.
+    """
+    return await _default_engine.evaluate_ats_async(resume_text, jd_text, mode, deadline_ms, time_slice_ms)
+
+
+async def _evaluate_ats_async(analysis: _DocumentAnalysis, resume_text: str, jd_text: str, mode: str,
+                              deadline_ms: Optional[float], time_slice: _TimeSlice) -> dict:
+    started = time.perf_counter()
+    _check_mode(mode)
+    jd_model = analysis.jd_model(jd_text)
+    await time_slice.checkpoint()
+    resume_model = analysis.resume_model(resume_text)
+    await time_slice.checkpoint()
+    if mode == 'triage':
+        # Exact lookups only; the parses above are memoized
+        return _evaluate_ats(analysis, resume_text, jd_text, mode)
+    
+    deadline = started + deadline_ms / 1000 if deadline_ms is not None else None
+    match_results: List[Any] = [None] * len(jd_model.get('categorizedKeywords', []))
+    for index, result in _staged_matches(jd_model, resume_model, deadline=deadline, time_slice=time_slice):
+        if result is None:
+            await time_slice.pause()
+        else:
+            match_results[index] = result
+    await time_slice.checkpoint()
+    if deadline is not None:
+        return _bounded_evaluation(analysis.lexicon, jd_model, match_results, resume_text, deadline)
+    return _full_evaluation(analysis.lexicon, jd_model, match_results, resume_text)
+
+
+async def iter_evaluate_ats_async(resume_text: str, jd_text: str, deadline_ms: Optional[float] = None,
+                                  time_slice_ms: float = DEFAULT_TIME_SLICE_MS):
+    """
+    iter_evaluate_ats() as an async iterator for an async UI bridge: the same
+    progress events, yielding to the event loop every time_slice_ms of work,
+    so partial scores can be shown while fuzzy matching runs.
+    
+    With deadline_ms the final event carries evaluate_ats(deadline_ms=...)'s
+    bounded evaluation instead.
+    """
+    async for event in _default_engine.iter_evaluate_ats_async(resume_text, jd_text, deadline_ms, time_slice_ms):
+        yield event
+
+
+async def _iter_evaluate_ats_async(analysis: _DocumentAnalysis, resume_text: str, jd_text: str,
+                                   deadline_ms: Optional[float], time_slice: _TimeSlice):
+    started = time.perf_counter()
+    jd_model = analysis.jd_model(jd_text)
+    await time_slice.checkpoint()
+    resume_model = analysis.resume_model(resume_text)
+    await time_slice.checkpoint()
+    deadline = started + deadline_ms / 1000 if deadline_ms is not None else None
+    accumulator = ScoreAccumulator(jd_model, resume_text, analysis.lexicon, deadline)
+    match_results: List[Any] = [None] * accumulator.keywords
+    
+    for index, result in _staged_matches(jd_model, resume_model, deadline=deadline, time_slice=time_slice):
+        if result is None:
+            await time_slice.pause()
+            continue
+        match_results[index] = result
+        accumulator.add(result)
+        yield _progress_event(accumulator, result)
+    await time_slice.checkpoint()
+    if deadline is not None:
+        yield _final_event(accumulator, _bounded_evaluation(analysis.lexicon, jd_model, match_results, resume_text,
+                                                            deadline))
+    else:
+        yield _final_event(accumulator, _full_evaluation(analysis.lexicon, jd_model, match_results, resume_text))
+
+
+async def map_evaluate_async(pairs, mode: str = 'full', deadline_ms: Optional[float] = None,
+                             time_slice_ms: float = DEFAULT_TIME_SLICE_MS) -> List[dict]:
+    """
+    evaluate_ats_async() over (resume_text, jd_text) pairs, one after another,
+    e.g. one resume against several JDs. Results are in input order; a
+    document that appears in several pairs is parsed once. deadline_ms
+    applies to each evaluation separately.
+    """
+    return await _default_engine.map_evaluate_async(pairs, mode, deadline_ms, time_slice_ms)
+
+
+async def optimize_resume_async(resume_text: str, job_desc: str, output: str = 'text',
+                                time_slice_ms: float = DEFAULT_TIME_SLICE_MS):
+    """optimize_resume() as a coroutine, yielding to the event loop between its analysis steps."""
+    return await _default_engine.optimize_resume_async(resume_text, job_desc, output, time_slice_ms)
+
+
+async def optimize_resume_many_async(resume_text: str, jd_texts: List[str], output: str = 'text',
+                                     time_slice_ms: float = DEFAULT_TIME_SLICE_MS) -> list:
+    """optimize_resume_many() as a coroutine, yielding to the event loop between its analysis steps."""
+    return await _default_engine.optimize_resume_many_async(resume_text, jd_texts, output, time_slice_ms)
+
+
+async def _optimize_resume_async(analysis: _DocumentAnalysis, resume_text: str, job_desc: str, output: str,
+                                 time_slice: _TimeSlice):
+    # Warm the memoized steps one chunk at a time; the final pass only reads them back
+    analysis.section_spans(resume_text)
+    await time_slice.checkpoint()
+    _missing_keywords(analysis, resume_text, job_desc)
+    await time_slice.checkpoint()
+    return _optimize_resume_output(analysis, resume_text, job_desc, output)
+
+
+# --- Engine ---
+
+class ATSEngine:
+    """
+    The public API bound to one immutable Lexicon.
+
+    Methods mirror the module functions of the same name. An engine holds no
+    mutable state (each call gets its own _DocumentAnalysis), so one instance
+    can serve any number of threads, and different engines can use different
+    lexicons side by side. The module functions are a facade over the default
+    engine built from shared-constants.json (see default_engine()).
+    """
+
+    __slots__ = ('lexicon',)
+
+    def __init__(self, lexicon: Lexicon):
+        object.__setattr__(self, 'lexicon', lexicon)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"ATSEngine is immutable (cannot set {name!r})")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"ATSEngine is immutable (cannot delete {name!r})")
+
+    def _analysis(self) -> _DocumentAnalysis:
+        return _DocumentAnalysis(self.lexicon)
+
+    def engine_version(self) -> str:
+        term_weights = self.lexicon.term_weights
+        if term_weights is None:
+            return f"{ENGINE_VERSION}+{self.lexicon.fingerprint}"
+        return f"{ENGINE_VERSION}+{self.lexicon.fingerprint}.{term_weights.fingerprint}"
+
+    # Lexicon-independent steps, so an engine offers the whole API
+    extract_contact_info = staticmethod(extract_contact_info)
+    extract_name = staticmethod(extract_name)
+    calculate_readability = staticmethod(calculate_readability)
+    rewrite_bullet = staticmethod(rewrite_bullet)
+    apply_edits = staticmethod(apply_edits)
+    utf16_edits = staticmethod(utf16_edits)
+    jd_section_spans = staticmethod(jd_section_spans)
+    match_keywords = staticmethod(match_keywords)
+    iter_match_keywords = staticmethod(iter_match_keywords)
+    concept_similarity_score = staticmethod(concept_similarity_score)
+    generate_recommendations = staticmethod(generate_recommendations)
+
+    def extract_skills(self, text: str) -> List[str]:
+        return _extract_skills(self.lexicon, text)
+
+    def concept_vectors(self, sections: Dict[str, str]) -> Dict[str, ConceptVector]:
+        return _concept_vectors(self.lexicon, sections)
+
+    def calculate_ats_score(self, jd_model: dict, match_results: list, resume_text: str) -> dict:
+        return _calculate_ats_score(self.lexicon, jd_model, match_results, resume_text)
+
+    def ats_score_upper_bound(self, jd_model: dict, resume_model: dict, resume_text: str,
+                              fuzzy_threshold: float = 0.85) -> int:
+        return _ats_score_upper_bound(self.lexicon, jd_model, resume_model, resume_text, fuzzy_threshold)
+
+    def identify_section(self, line: str) -> Optional[str]:
+        return _identify_section(self.lexicon, line)
+
+    def resume_section_spans(self, text: str) -> SectionSpans:
+        return _resume_section_spans(self.lexicon, text)
+
+    def parse_resume_sections(self, text: str) -> Dict[str, str]:
+        return _resume_section_spans(self.lexicon, text).as_dict()
+
+    def extract_keywords(self, text: str, topn: int = 30) -> List[str]:
+        return _extract_keywords(self.lexicon, text, topn)
+
+    def document_terms(self, text: str) -> Set[str]:
+        return _document_terms(self.lexicon, text)
+
+    def parse_resume(self, text: str) -> dict:
+        return _parse_resume(self._analysis(), text)
+
+    @_observed('score_ats')
+    def score_ats(self, resume_text: str, job_desc: str, mode: str = 'full') -> dict:
+        return _score_ats(self._analysis(), resume_text, job_desc, mode)
+
+    @_observed('promote_score')
+    def promote_score(self, triage_result: dict, resume_text: str) -> dict:
+        return _promote_score(self._analysis(), triage_result, resume_text)
+
+    @_observed('optimize_resume')
+    def optimize_resume(self, resume_text: str, job_desc: str, output: str = 'text'):
+        return _optimize_resume_output(self._analysis(), resume_text, job_desc, output)
+
+    @_observed('optimize_resume_many')
+    def optimize_resume_many(self, resume_text: str, jd_texts: List[str], output: str = 'text') -> list:
+        return _optimize_resume_many(self._analysis(), resume_text, jd_texts, output)
+
+    @_observed('parse_jd')
+    def parse_jd(self, text: str) -> dict:
+        return _parse_jd(self.lexicon, text)
+
+    def parse_resume_canonical(self, text: str) -> dict:
+        return _parse_resume_canonical(self.lexicon, _resume_section_spans(self.lexicon, text))
+
+    @_observed('evaluate_ats')
+    def evaluate_ats(self, resume_text: str, jd_text: str, mode: str = 'full',
+                     deadline_ms: Optional[float] = None) -> dict:
+        return _evaluate_ats(self._analysis(), resume_text, jd_text, mode, deadline_ms)
+
+    @_observed('promote_evaluation')
+    def promote_evaluation(self, triage_result: dict, resume_text: str) -> dict:
+        return _promote_evaluation(self._analysis(), triage_result, resume_text)
+
+    @_observed('iter_evaluate_ats')
+    def iter_evaluate_ats(self, resume_text: str, jd_text: str) -> Iterator[dict]:
+        yield from _iter_evaluate_ats(self._analysis(), resume_text, jd_text)
+
+    @_observed('dispatch')
+    def dispatch(self, requests_json: str) -> str:
+        return _dispatch(self._analysis(), requests_json)
+
+    @_observed('evaluate_ats_async')
+    async def evaluate_ats_async(self, resume_text: str, jd_text: str, mode: str = 'full',
+                                 deadline_ms: Optional[float] = None,
+                                 time_slice_ms: float = DEFAULT_TIME_SLICE_MS) -> dict:
+        return await _evaluate_ats_async(self._analysis(), resume_text, jd_text, mode, deadline_ms,
+                                         _TimeSlice(time_slice_ms))
+
+    @_observed('iter_evaluate_ats_async')
+    async def iter_evaluate_ats_async(self, resume_text: str, jd_text: str, deadline_ms: Optional[float] = None,
+                                      time_slice_ms: float = DEFAULT_TIME_SLICE_MS):
+        async for event in _iter_evaluate_ats_async(self._analysis(), resume_text, jd_text, deadline_ms,
+                                                    _TimeSlice(time_slice_ms)):
+            yield event
+
+    @_observed('map_evaluate_async')
+    async def map_evaluate_async(self, pairs, mode: str = 'full', deadline_ms: Optional[float] = None,
+                                 time_slice_ms: float = DEFAULT_TIME_SLICE_MS) -> List[dict]:
+        _check_mode(mode)
+        analysis = self._analysis()
+        time_slice = _TimeSlice(time_slice_ms)
+        results = []
+        for resume_text, jd_text in pairs:
+            results.append(await _evaluate_ats_async(analysis, resume_text, jd_text, mode, deadline_ms, time_slice))
+        return results
+
+    @_observed('optimize_resume_async')
+    async def optimize_resume_async(self, resume_text: str, job_desc: str, output: str = 'text',
+                                    time_slice_ms: float = DEFAULT_TIME_SLICE_MS):
+        return await _optimize_resume_async(self._analysis(), resume_text, job_desc, output,
+                                            _TimeSlice(time_slice_ms))
+
+    @_observed('optimize_resume_many_async')
+    async def optimize_resume_many_async(self, resume_text: str, jd_texts: List[str], output: str = 'text',
+                                         time_slice_ms: float = DEFAULT_TIME_SLICE_MS) -> list:
+        _check_output(output)
+        analysis = self._analysis()
+        time_slice = _TimeSlice(time_slice_ms)
+        results = []
+        for job_desc in jd_texts:
+            results.append(await _optimize_resume_async(analysis, resume_text, job_desc, output, time_slice))
+        return results
+
+    def map_evaluate(self, pairs, mode: str = 'full', max_workers: Optional[int] = None,
+                     executor: Optional[Any] = None, deadline_ms: Optional[float] = None) -> List[dict]:
+        """
+        evaluate_ats over (resume_text, jd_text) pairs on a thread pool.
+
+        Results are in input order. Pass an executor to reuse a pool across
+        calls; otherwise one with max_workers threads is created for this call.
+        deadline_ms applies to each evaluation separately.
+        Threads only run Python code in parallel on a free-threaded build, but
+        they let callers share one engine without copying its lexicon.
+        """
+        _check_mode(mode)
+        evaluate = lambda pair: self.evaluate_ats(pair[0], pair[1], mode, deadline_ms)
+        if executor is not None:
+            return list(executor.map(evaluate, pairs))
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            return list(pool.map(evaluate, pairs))
+
+
+_default_engine: ATSEngine
+
+def default_engine() -> ATSEngine:
+    """The engine behind the module functions, built from the shared constants."""
+    return _default_engine
+
+# Load constants on module import
+_load_shared_constants()
+
+
 if __name__ == "__main__":
     sample_resume = """
     John Doe
@@ -0,0 +1,2597 @@
+# Resume Parser - Offline NLP Core (frozen reference, engine 2.3.0)
+# Verbatim copy of nlp_core.py that nlp_equivalence.py checks the live engine against.
+# Never optimize or fix this file; re-freeze it (copy nlp_core.py over it) only after
+# a deliberate behaviour change, together with an ENGINE_VERSION bump.
+
+import re
+import json
+import math
+import time
+import zlib
+import functools
+from collections import Counter
+from typing import Optional, List, Dict, Any, Set, Tuple, Iterator
+
+# --- Constants & Patterns ---
+
+# Contact patterns are written so that a search never backtracks more than once
+# over any character: the email local part may only start at the beginning of a
+# run (lookbehind), and phones are matched as whole separator runs and
+# validated afterwards. Both stay linear on long runs of letters or digits.
+EMAIL_PATTERN = re.compile(r'(?<![a-zA-Z0-9._])[a-zA-Z0-9._]+@[a-zA-Z0-9._]+\.[a-zA-Z]+')
+PHONE_PATTERN = re.compile(r'[+]?[0-9][0-9 .()\-]*')
+PHONE_MIN_SPAN = 10  # first digit .. last digit, as in the old [0-9][...]{8,}[0-9]
+LINKEDIN_PATTERN = re.compile(r'linkedin\.com/in/[a-zA-Z0-9]+', re.IGNORECASE)
+GITHUB_PATTERN = re.compile(r'github\.com/[a-zA-Z0-9]+', re.IGNORECASE)
+URL_PATTERN = re.compile(r'https?://[^\s]+')
+
+SECTION_HEADERS = {
+    'experience': ['experience', 'employment', 'work history', 'professional experience', 'work experience'],
+    'education': ['education', 'academic', 'qualifications', 'degrees'],
+    'skills': ['skills', 'technical skills', 'competencies', 'technologies', 'expertise'],
+    'projects': ['projects', 'personal projects', 'portfolio', 'side projects'],
+    'summary': ['summary', 'objective', 'profile', 'about', 'professional summary'],
+    'certifications': ['certifications', 'certificates', 'licenses', 'credentials'],
+    'achievements': ['achievements', 'awards', 'honors', 'accomplishments']
+}
+
+# Shared constants - will be loaded from shared-constants.json
+CONSTANTS_PATH = 'shared-constants.json'
+TECH_SKILLS: List[str] = []
+SOFT_SKILLS: List[str] = []
+STOP_WORDS: Set[str] = set()
+_constants_loaded = False
+
+def _load_shared_constants() -> None:
+    """
+    Load shared constants and the lexicon index.
+    
+    A lexicon snapshot (see write_lexicon_snapshot) whose checksum matches
+    shared-constants.json is used as-is; otherwise the JSON is parsed and the
+    index is built from it.
+    """
+    global TECH_SKILLS, SOFT_SKILLS, STOP_WORDS, _constants_loaded
+    
+    if _constants_loaded:
+        return
+    
+    try:
+        # Try to read from filesystem (works in both Pyodide and regular Python)
+        with open(CONSTANTS_PATH, 'rb') as f:
+            source = f.read()
+        data = _read_lexicon_snapshot(LEXICON_SNAPSHOT_PATH, _lexicon_checksum(source))
+        if data is not None:
+            print('[Shared Constants] Loaded lexicon snapshot')
+        else:
+            constants = json.loads(source.decode('utf-8'))
+            data = _build_lexicon(
+                constants.get('TECH_SKILLS', []),
+                constants.get('SOFT_SKILLS', []),
+                constants.get('STOP_WORDS', [])
+            )
+            print('[Shared Constants] Loaded from shared-constants.json')
+        _install_lexicon(Lexicon(data))
+        _constants_loaded = True
+    except Exception as e:
+        print(f'[Shared Constants] Failed to load from file: {e}, using defaults')
+        # Fallback defaults
+        TECH_SKILLS = [
+            'Python', 'JavaScript', 'TypeScript', 'Java', 'C++', 'C#', 'Ruby', 'Go', 'Rust', 'Swift', 'Kotlin', 'PHP', 'SQL', 'R', 'Scala', 'Cobol', 'Fortran',
+            'React', 'Angular', 'Vue', 'Next.js', 'Nuxt.js', 'Svelte', 'SolidJS', 'Node.js', 'Express', 'Deno', 'Bun', 'Django', 'Flask', 'FastAPI', 'Spring Boot', 'Rails', 'Laravel', 'ASP.NET',
+            'AWS', 'Azure', 'GCP', 'Google Cloud', 'DigitalOcean', 'Heroku', 'Netlify', 'Vercel',
+            'Docker', 'Kubernetes', 'Terraform', 'Ansible', 'Pulumi', 'Jenkins', 'Git', 'GitHub Actions', 'GitLab CI', 'CircleCI', 'CI/CD', 'DevOps', 'SRE',
+            'PostgreSQL', 'MySQL', 'MariaDB', 'MongoDB', 'Redis', 'Cassandra', 'Elasticsearch', 'Kafka', 'RabbitMQ', 'Supabase', 'Firebase', 'Prisma', 'Drizzle',
+            'TensorFlow', 'PyTorch', 'Scikit-learn', 'Pandas', 'NumPy', 'SciPy', 'Matplotlib', 'Seaborn', 'OpenCV', 'HuggingFace', 'Transformers', 'LLM', 'LangChain', 'OpenAI',
+            'REST', 'GraphQL', 'gRPC', 'SOAP', 'API', 'Microservices', 'Serverless', 'WebSockets', 'TRPC',
+            'Agile', 'Scrum', 'Kanban', 'TDD', 'BDD', 'Jira', 'Confluence',
+            'Docker Compose', 'Podman', 'Helm', 'Flux', 'ArgoCD', 'Prometheus', 'Grafana', 'ELK Stack', 'DataDog', 'New Relic',
+            'Tailwind', 'Sass', 'Less', 'CloudFront', 'Lambda', 'S3', 'EC2', 'RDS', 'Redshift', 'BigQuery', 'Snowflake', 'DynamoDB',
+            'Mobile', 'iOS', 'Android', 'Flutter', 'React Native', 'Ionic', 'Capacitor', 'Embedded', 'Firmware', 'Real-time', 'Distributed'
+        ]
+        SOFT_SKILLS = [
+            'leadership', 'communication', 'teamwork', 'problem-solving', 'analytical',
+            'collaboration', 'mentoring', 'management', 'strategic', 'innovative'
+        ]
+        STOP_WORDS = {
+            'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with',
+            'by', 'from', 'as', 'is', 'was', 'are', 'were', 'been', 'be', 'have', 'has', 'had',
+            'do', 'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might', 'must',
+            'that', 'which', 'who', 'whom', 'this', 'these', 'those', 'it', 'its', 'their',
+            'our', 'your', 'my', 'we', 'they', 'you', 'i', 'he', 'she', 'can', 'all', 'each',
+            'such', 'what', 'when', 'where', 'how', 'why', 'very', 'just', 'also', 'more',
+            'about', 'up', 'out', 'if', 'than', 'so', 'no', 'not', 'only', 'own', 'same',
+            'into', 'through', 'during', 'before', 'after', 'above', 'below', 'between',
+            'using', 'well', 'used', 'many', 'some', 'most', 'very', 'often', 'like', 'every',
+            'any', 'both', 'once', 'here', 'there', 'too', 'now', 'page', 'site', 'work',
+            'data', 'new', 'time', 'team', 'first', 'level', 'based', 'using', 'throughout'
+        }
+        _install_lexicon(Lexicon.from_constants(TECH_SKILLS, SOFT_SKILLS, STOP_WORDS))
+        _constants_loaded = True
+
+def ensure_constants_loaded() -> None:
+    """Ensure shared constants are loaded before use."""
+    if not _constants_loaded:
+        _load_shared_constants()
+
+# Words that should NEVER be considered keywords in an ATS context
+PROHIBITED_KEYWORDS = {
+    'remote', 'located', 'location', 'charleston', 'duration', 'contract', 'months', 'years', 'only', 'must', 'zone',
+    'time', 'work', 'corp', 'company', 'business', 'professional', 'summary', 'objective', 'skills', 'education',
+    'experience', 'projects', 'achievements', 'awards', 'honors', 'background', 'profile'
+}
+
+ACTION_VERBS = {
+    'led', 'managed', 'developed', 'created', 'designed', 'implemented', 'built',
+    'architected', 'engineered', 'orchestrated', 'spearheaded', 'launched',
+    'delivered', 'achieved', 'increased', 'reduced', 'improved', 'optimized',
+    'streamlined', 'automated', 'collaborated', 'mentored', 'trained'
+}
+
+# --- Type Constants ---
+KEYWORD_CATEGORIES = ['hard_skill', 'tool', 'concept', 'soft_skill']
+
+SOFT_SKILL_PATTERNS = [
+    'leadership', 'communication', 'teamwork', 'problem-solving', 'analytical',
+    'collaboration', 'mentoring', 'management', 'strategic', 'innovative',
+    'adaptable', 'creative', 'detail-oriented', 'organized', 'proactive'
+]
+
+TOOL_KEYWORDS = [
+    'docker', 'kubernetes', 'git', 'jenkins', 'jira', 'terraform', 'ansible', 
+    'github', 'gitlab', 'confluence', 'prometheus', 'grafana', 'datadog',
+    'helm', 'argocd', 'circleci', 'travis', 'bamboo', 'slack', 'notion'
+]
+
+JD_SECTION_PATTERNS = {
+    'requirements': ['requirements', 'qualifications', 'must have', 'required', 'you have', 'you bring'],
+    'responsibilities': ['responsibilities', 'duties', 'what you will do', 'role', 'you will'],
+    'nice_to_have': ['nice to have', 'preferred', 'bonus', 'plus', 'ideal'],
+    'about': ['about us', 'about the company', 'who we are', 'company', 'we are']
+}
+
+# Multi-word phrases detected in job descriptions
+MULTI_WORD_PATTERN = r'\b(spring boot|react native|machine learning|deep learning|data science|full stack|front.?end|back.?end|cloud computing|ci/cd)\b'
+
+# Well-known spellings of a keyword (lowercase) that resume tokens resolve to without fuzzy
+# matching. Variants the tokenizer produces from lexicon skills ("nodejs") are generated.
+SKILL_ALIASES = {
+    'react': ['reactjs', 'react.js'],
+    'angular': ['angularjs', 'angular.js'],
+    'vue': ['vuejs', 'vue.js'],
+    'node.js': ['node', 'nodejs'],
+    'nuxt.js': ['nuxt'],
+    'javascript': ['js', 'ecmascript', 'es6'],
+    'typescript': ['ts'],
+    'python': ['python3', 'py'],
+    'go': ['golang'],
+    'c++': ['cpp'],
+    'c#': ['csharp'],
+    'postgresql': ['postgres', 'psql', 'pgsql'],
+    'mongodb': ['mongo'],
+    'dynamodb': ['dynamo'],
+    'kubernetes': ['k8s', 'kube'],
+    'scikit-learn': ['sklearn'],
+    'pytorch': ['torch'],
+    'graphql': ['gql'],
+    'tailwind': ['tailwindcss'],
+    'sass': ['scss'],
+    'microservices': ['microservice'],
+    'websockets': ['websocket'],
+    'llm': ['llms'],
+}
+
+# Characters kept in resume word tokens
+_TOKEN_STRIP_PATTERN = re.compile(r'[^a-zA-Z0-9\-+#]')
+
+# Bump when scoring or parsing behaviour changes so persisted results are not reused
+ENGINE_VERSION = '2.3.0'
+
+# --- Lexicon Index ---
+
+# Built from the shared constants and the tables above. _build_lexicon produces
+# plain data (what a snapshot stores); Lexicon freezes it and compiles the patterns.
+
+LEXICON_SNAPSHOT_PATH = 'shared-constants.snapshot'
+LEXICON_SNAPSHOT_MAGIC = b'NLPLEX'
+LEXICON_SNAPSHOT_FORMAT = 2
+_SNAPSHOT_HEADER_SIZE = len(LEXICON_SNAPSHOT_MAGIC) + 2 + 32  # magic, format (u16), sha256
+
+def _categorize_by_rules(kw_lower: str, tech_lower: Set[str]) -> str:
+    # Check if it's a tool
+    if any(tool in kw_lower for tool in TOOL_KEYWORDS):
+        return 'tool'
+
+    # Check if it's a soft skill
+    if any(soft in kw_lower for soft in SOFT_SKILL_PATTERNS):
+        return 'soft_skill'
+
+    # Check if it's a known tech skill (hard skill)
+    if kw_lower in tech_lower:
+        return 'hard_skill'
+
+    # Default to concept
+    return 'concept'
+
+def _build_aliases(tech_lower: List[str], tech_set: Set[str]) -> Dict[str, str]:
+    """
+    Variant -> canonical keyword table for resume tokens.
+    
+    Generated entries map what the word tokenizer leaves of a skill
+    ("node.js" -> "nodejs", "ci/cd" -> "cicd") back to it; SKILL_ALIASES
+    entries win over generated ones. Variants two skills would generate, and
+    variants that are lexicon skills themselves, are left out.
+    """
+    aliases: Dict[str, str] = {}
+    ambiguous = set()
+    for skill in tech_lower:
+        variant = _TOKEN_STRIP_PATTERN.sub('', skill)
+        if variant and variant != skill:
+            if aliases.get(variant, skill) != skill:
+                ambiguous.add(variant)
+            aliases[variant] = skill
+    for variant in ambiguous:
+        del aliases[variant]
+    for canonical, variants in SKILL_ALIASES.items():
+        for variant in variants:
+            aliases[variant] = canonical
+    return {variant: canonical for variant, canonical in aliases.items() if variant not in tech_set}
+
+def _overlay_aliases(base: 'Lexicon', added: List[str], tech_lower: Tuple[str, ...], tech_set: frozenset):
+    """
+    base.aliases plus the variants of the added skills, sharing the base table.
+    
+    Equal to _build_aliases over all skills; rebuilt in full only when an added
+    skill or variant collides with an existing entry.
+    """
+    from collections import ChainMap
+    from types import MappingProxyType
+    extra = {}
+    for skill in added:
+        variant = _TOKEN_STRIP_PATTERN.sub('', skill)
+        if variant and variant != skill:
+            extra.setdefault(variant, []).append(skill)
+    base_variants = {_TOKEN_STRIP_PATTERN.sub('', skill) for skill in base.tech_lower}
+    if any(skill in base.aliases for skill in added) or any(
+            len(skills) > 1 or variant in base.aliases or variant in base_variants
+            for variant, skills in extra.items()):
+        return MappingProxyType(_build_aliases(list(tech_lower), tech_set))
+    return MappingProxyType(ChainMap(
+        {variant: skills[0] for variant, skills in extra.items() if variant not in tech_set}, base.aliases))
+
+def _build_lexicon(tech_skills: List[str], soft_skills: List[str], stop_words) -> Dict[str, Any]:
+    """Compile the lexicon index: skill patterns, categories and the header recognizer."""
+    tech_lower = [skill.lower() for skill in tech_skills]
+    tech_set = set(tech_lower)
+    headers_by_initial: Dict[str, List[Tuple[str, str]]] = {}
+    for section_name, keywords in SECTION_HEADERS.items():
+        for keyword in keywords:
+            headers_by_initial.setdefault(keyword[0], []).append((keyword, section_name))
+    return {
+        'techSkills': list(tech_skills),
+        'softSkills': list(soft_skills),
+        'stopWords': sorted(set(stop_words)),
+        'techLower': tech_lower,
+        'techSet': tech_set,
+        'techPatterns': [r'\b' + re.escape(skill) + r'\b' for skill in tech_lower],
+        'categories': {skill: _categorize_by_rules(skill, tech_set) for skill in tech_lower},
+        'aliases': _build_aliases(tech_lower, tech_set),
+        'phrasePattern': MULTI_WORD_PATTERN,
+        # Header keywords in SECTION_HEADERS priority order, keyed by first character
+        'headers': {initial: tuple(entries) for initial, entries in headers_by_initial.items()},
+    }
+
+class Lexicon:
+    """
+    Immutable, fully built lexicon index.
+
+    Everything is compiled up front and no attribute can be rebound, so one
+    instance can back any number of engines and threads without locking.
+    Collections are tuples, frozensets and read-only mappings.
+    """
+
+    __slots__ = ('tech_skills', 'soft_skills', 'stop_words', 'tech_lower', 'tech_set', 'tech_patterns',
+                 'categories', 'aliases', 'phrase_pattern', 'headers', 'tech_index', 'phrase_regex', 'fingerprint')
+
+    def __init__(self, data: Dict[str, Any]):
+        """data as produced by _build_lexicon (or loaded from a snapshot)."""
+        from types import MappingProxyType
+        values = {
+            'tech_skills': tuple(data['techSkills']),
+            'soft_skills': tuple(data['softSkills']),
+            'stop_words': frozenset(data['stopWords']),
+            'tech_lower': tuple(data['techLower']),
+            'tech_set': frozenset(data['techSet']),
+            'tech_patterns': tuple(data['techPatterns']),
+            'categories': MappingProxyType(dict(data['categories'])),
+            'aliases': MappingProxyType(dict(data['aliases'])),
+            'phrase_pattern': data['phrasePattern'],
+            'headers': MappingProxyType({initial: tuple(entries) for initial, entries in data['headers'].items()}),
+        }
+        # (lowercase skill, compiled word-boundary pattern) pairs, in tech_skills order
+        values['tech_index'] = tuple(zip(values['tech_lower'], (re.compile(p) for p in values['tech_patterns'])))
+        values['phrase_regex'] = re.compile(values['phrase_pattern'])
+        self._freeze(values)
+
+    def _freeze(self, values: Dict[str, Any]) -> None:
+        import hashlib
+        source = json.dumps([list(values['tech_skills']), list(values['soft_skills']), sorted(values['stop_words']),
+                             sorted(values['aliases'].items())], separators=(',', ':'))
+        values['fingerprint'] = hashlib.sha256(source.encode('utf-8')).hexdigest()[:12]
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    @classmethod
+    def from_constants(cls, tech_skills: List[str], soft_skills: List[str], stop_words) -> 'Lexicon':
+        return cls(_build_lexicon(tech_skills, soft_skills, stop_words))
+
+    def overlay(self, tech_skills=(), soft_skills=(), stop_words=()) -> 'Lexicon':
+        """
+        This lexicon plus extra vocabulary, e.g. one customer's skills.
+
+        The result shares this lexicon's compiled patterns, categories, aliases
+        and header table instead of rebuilding them; only the added skills are
+        compiled. Skills already present (case-insensitively) are skipped, and
+        added skills rank after the existing ones, so the overlay behaves like
+        a lexicon built from the concatenated constants.
+        """
+        from collections import ChainMap
+        from types import MappingProxyType
+        added = []
+        known = set(self.tech_set)
+        for skill in tech_skills:
+            skill_lower = skill.lower()
+            if skill_lower not in known:
+                known.add(skill_lower)
+                added.append((skill, skill_lower))
+        # Parts the overlay leaves unchanged stay the very same objects
+        tech_set = frozenset(known) if added else self.tech_set
+        tech_lower = self.tech_lower + tuple(skill_lower for _, skill_lower in added)
+        extra_stop_words = frozenset(stop_words) - self.stop_words
+        added_patterns = tuple(r'\b' + re.escape(skill_lower) + r'\b' for _, skill_lower in added)
+        lexicon = Lexicon.__new__(Lexicon)
+        lexicon._freeze({
+            'tech_skills': self.tech_skills + tuple(skill for skill, _ in added),
+            'soft_skills': self.soft_skills + tuple(s for s in dict.fromkeys(soft_skills) if s not in self.soft_skills),
+            'stop_words': self.stop_words | extra_stop_words if extra_stop_words else self.stop_words,
+            'tech_lower': tech_lower,
+            'tech_set': tech_set,
+            'tech_patterns': self.tech_patterns + added_patterns,
+            'categories': MappingProxyType(ChainMap(
+                {skill_lower: _categorize_by_rules(skill_lower, tech_set) for _, skill_lower in added},
+                self.categories)) if added else self.categories,
+            'aliases': _overlay_aliases(self, [skill_lower for _, skill_lower in added], tech_lower, tech_set)
+                       if added else self.aliases,
+            'phrase_pattern': self.phrase_pattern,
+            'headers': self.headers,
+            'tech_index': self.tech_index + tuple(
+                (skill_lower, re.compile(pattern)) for (_, skill_lower), pattern in zip(added, added_patterns)),
+            'phrase_regex': self.phrase_regex,
+        })
+        return lexicon
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"Lexicon is immutable (cannot set {name!r})")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"Lexicon is immutable (cannot delete {name!r})")
+
+    def to_data(self) -> Dict[str, Any]:
+        """The plain-data form, as stored in a lexicon snapshot."""
+        return {
+            'techSkills': list(self.tech_skills),
+            'softSkills': list(self.soft_skills),
+            'stopWords': sorted(self.stop_words),
+            'techLower': list(self.tech_lower),
+            'techSet': set(self.tech_set),
+            'techPatterns': list(self.tech_patterns),
+            'categories': dict(self.categories),
+            'aliases': dict(self.aliases),
+            'phrasePattern': self.phrase_pattern,
+            'headers': dict(self.headers),
+        }
+
+def _install_lexicon(lexicon: Lexicon) -> None:
+    """Make lexicon the default engine's; the legacy globals mirror it."""
+    global TECH_SKILLS, SOFT_SKILLS, STOP_WORDS, _default_engine
+    _default_engine = ATSEngine(lexicon)
+    TECH_SKILLS = list(lexicon.tech_skills)
+    SOFT_SKILLS = list(lexicon.soft_skills)
+    STOP_WORDS = set(lexicon.stop_words)
+    # Concept vectors skip STOP_WORDS, so the cached ones are stale now
+    _jd_concept_vectors.cache_clear()
+    _resume_concept_vectors.cache_clear()
+
+def _lexicon_checksum(source: bytes) -> bytes:
+    """Ties a snapshot to its source constants, the code-side tables and the engine version."""
+    import hashlib
+    tables = json.dumps([SECTION_HEADERS, JD_SECTION_PATTERNS, TOOL_KEYWORDS, SOFT_SKILL_PATTERNS, MULTI_WORD_PATTERN,
+                         SKILL_ALIASES])
+    digest = hashlib.sha256(f"{LEXICON_SNAPSHOT_FORMAT}|{ENGINE_VERSION}|".encode('utf-8'))
+    digest.update(tables.encode('utf-8'))
+    digest.update(source)
+    return digest.digest()
+
+def _snapshot_unpickler(stream) -> Any:
+    import pickle
+
+    class _DataOnlyUnpickler(pickle.Unpickler):
+        # The index is plain data; refuse anything that would import or call code
+        def find_class(self, module, name):
+            raise pickle.UnpicklingError(f"Lexicon snapshot may not reference {module}.{name}")
+
+    return _DataOnlyUnpickler(stream)
+
+def _read_lexicon_snapshot(path: str, checksum: bytes) -> Optional[Dict[str, Any]]:
+    """The snapshotted index, or None if it is missing, stale or unreadable."""
+    try:
+        with open(path, 'rb') as f:
+            try:
+                import mmap
+                stream = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (ImportError, OSError, ValueError):
+                # No mmap (e.g. Pyodide): a single read is just as good at this size
+                import io
+                stream = io.BytesIO(f.read())
+            try:
+                header = stream.read(_SNAPSHOT_HEADER_SIZE)
+                magic = header[:len(LEXICON_SNAPSHOT_MAGIC)]
+                fmt = int.from_bytes(header[len(LEXICON_SNAPSHOT_MAGIC):len(LEXICON_SNAPSHOT_MAGIC) + 2], 'little')
+                if magic != LEXICON_SNAPSHOT_MAGIC or fmt != LEXICON_SNAPSHOT_FORMAT or header[-32:] != checksum:
+                    return None
+                return _snapshot_unpickler(stream).load()
+            finally:
+                stream.close()
+    except Exception:
+        return None
+
+def write_lexicon_snapshot(path: str = LEXICON_SNAPSHOT_PATH, constants_path: str = CONSTANTS_PATH) -> dict:
+    """
+    Build step: compile the lexicon index from constants_path into a snapshot file.
+
+    The snapshot is a small header (magic, format, checksum of the sources)
+    followed by the index as a data-only pickle (protocol 4, so a snapshot
+    built on CPython loads in Pyodide).
+
+    Returns: {path, bytes, checksum}
+    """
+    import os
+    import pickle
+    with open(constants_path, 'rb') as f:
+        source = f.read()
+    constants = json.loads(source.decode('utf-8'))
+    lexicon = _build_lexicon(
+        constants.get('TECH_SKILLS', []),
+        constants.get('SOFT_SKILLS', []),
+        constants.get('STOP_WORDS', [])
+    )
+    checksum = _lexicon_checksum(source)
+    data = (LEXICON_SNAPSHOT_MAGIC + LEXICON_SNAPSHOT_FORMAT.to_bytes(2, 'little') + checksum
+            + pickle.dumps(lexicon, protocol=4))
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return {'path': path, 'bytes': len(data), 'checksum': checksum.hex()}
+
+def engine_version() -> str:
+    """Engine version plus a fingerprint of the loaded lexicon, e.g. for cache keys."""
+    return _default_engine.engine_version()
+
+# --- Metrics Hook ---
+
+# Receives observations when set (see nlp_metrics.py); None keeps the hot path to one global lookup
+_metrics_sink: Optional[Any] = None
+
+def set_metrics_sink(sink: Optional[Any]) -> None:
+    """
+    Install an observer with observe_call(op, seconds, input_chars, error),
+    observe_match(stage) and observe_cache(cache, hits, misses); None removes it.
+    """
+    global _metrics_sink
+    _metrics_sink = sink
+
+def metrics_sink() -> Optional[Any]:
+    return _metrics_sink
+
+def _observed(op: str):
+    """Report latency and input size of a public entry point to the metrics sink."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            sink = _metrics_sink
+            if sink is None:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            error = True
+            try:
+                result = fn(*args, **kwargs)
+                error = False
+                return result
+            finally:
+                input_chars = sum(len(arg) for arg in args if isinstance(arg, str))
+                sink.observe_call(op, time.perf_counter() - start, input_chars, error)
+        return wrapper
+    return decorate
+
+# --- Internal Utilities ---
+
+def _first_phone(text: str) -> Optional[str]:
+    """Return the first phone-like run with at least 10 digits, or None."""
+    for match in PHONE_PATTERN.finditer(text):
+        candidate = match.group(0).rstrip(' .()-')
+        digits_start = 1 if candidate.startswith('+') else 0
+        if len(candidate) - digits_start < PHONE_MIN_SPAN:
+            continue
+        phone = re.sub(r'[^0-9+() -]', '', candidate).strip()
+        if len(re.sub(r'[^0-9]', '', phone)) >= 10:
+            return phone
+    return None
+
+def extract_contact_info(text: str) -> dict:
+    """
+    Extract email, phone and profile links.
+
+    Every field is scanned lazily in document order and the scan stops at the
+    first valid hit, so the header region is always searched first and the rest
+    of the document is only read when a field is missing there. All scans are
+    linear in the input length (see EMAIL_PATTERN / PHONE_PATTERN).
+    """
+    result = {}
+    email = EMAIL_PATTERN.search(text)
+    if email:
+        result['email'] = email.group(0)
+    phone = _first_phone(text)
+    if phone:
+        result['phone'] = phone
+    linkedin = LINKEDIN_PATTERN.search(text)
+    if linkedin:
+        result['linkedin'] = linkedin.group(0)
+    github = GITHUB_PATTERN.search(text)
+    if github:
+        result['github'] = github.group(0)
+    for url_match in URL_PATTERN.finditer(text):
+        url = url_match.group(0)
+        if 'linkedin' not in url.lower() and 'github' not in url.lower():
+            result['website'] = url
+            break
+    return result
+
+def extract_name(text: str) -> Optional[str]:
+    lines = text.strip().split('\n')
+    for line in lines[:5]:
+        line = line.strip()
+        if not line:
+            continue
+        words = line.split()
+        if 2 <= len(words) <= 4:
+            if all(word[0].isupper() for word in words if word.isalpha()):
+                if not any(header in line.lower() for headers in SECTION_HEADERS.values() for header in headers):
+                    return line
+    return None
+
+def extract_skills(text: str) -> List[str]:
+    return _default_engine.extract_skills(text)
+
+def _extract_skills(lexicon: Lexicon, text: str) -> List[str]:
+    skills = set()
+    text_lower = text.lower()
+    for skill, skill_lower in zip(lexicon.tech_skills, lexicon.tech_lower):
+        if skill_lower in text_lower:
+            skills.add(skill)
+    return list(skills)[:50]
+
+def _lower_buffer(text: str) -> Tuple[str, bool]:
+    """
+    text.lower() with one output character per input character, so offsets
+    are shared; the flag says whether it is exactly text.lower().
+    """
+    lower = text.lower()
+    if len(lower) == len(text):
+        return lower, True
+    # A few characters (e.g. 'İ') lowercase to two code points; keep the first
+    return ''.join(ch.lower()[0] for ch in text), False
+
+def _strip_span(text: str, start: int, end: int) -> Tuple[int, int]:
+    """Narrow (start, end) the way str.strip() would, without copying."""
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return start, end
+
+def _line_spans(text: str, start: int, end: int) -> Iterator[Tuple[int, int]]:
+    """(start, end) of each line in text[start:end], as str.split('\\n') would cut it."""
+    while True:
+        newline = text.find('\n', start, end)
+        if newline == -1:
+            yield start, end
+            return
+        yield start, newline
+        start = newline + 1
+
+def _split_spans(pattern: re.Pattern, text: str, start: int, end: int) -> Iterator[Tuple[int, int]]:
+    """(start, end) of each piece of pattern.split(text[start:end]); pattern must not match empty."""
+    for match in pattern.finditer(text, start, end):
+        yield start, match.start()
+        start = match.end()
+    yield start, end
+
+def _section_at(headers: Dict[str, tuple], lower: str, start: int, end: int) -> Optional[str]:
+    """identify_section() for the stripped line lower[start:end], given Lexicon.headers."""
+    if start == end:
+        return None
+    # Only header keywords sharing the line's first character can match
+    for keyword, section_name in headers.get(lower[start], ()):
+        if lower.startswith(keyword, start, end):
+            after = start + len(keyword)
+            if after == end or lower[after] == ':' or lower[after] == ' ':
+                return section_name
+    return None
+
+def identify_section(line: str) -> Optional[str]:
+    return _default_engine.identify_section(line)
+
+def _identify_section(lexicon: Lexicon, line: str) -> Optional[str]:
+    lower, _ = _lower_buffer(line)
+    return _section_at(lexicon.headers, lower, *_strip_span(lower, 0, len(lower)))
+
+
+class SectionSpans:
+    """
+    Document sections as (start, end) offsets into one shared text buffer.
+    
+    The text is lowercased once, up front; section content is only copied
+    when view() or lower_view() is asked for it. Offsets index both text and
+    lower.
+    """
+    
+    __slots__ = ('text', 'lower', 'spans', '_exact')
+    
+    def __init__(self, text: str, spans: Optional[Dict[str, Tuple[int, int]]] = None):
+        self.text = text
+        self.lower, self._exact = _lower_buffer(text)
+        self.spans = {} if spans is None else spans
+    
+    def full_lower(self) -> str:
+        """Exactly text.lower(), for whole-text scans; the shared buffer unless the text has 'İ' and the like."""
+        return self.lower if self._exact else self.text.lower()
+    
+    def __contains__(self, name: str) -> bool:
+        return name in self.spans
+    
+    def __getitem__(self, name: str) -> Tuple[int, int]:
+        return self.spans[name]
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.spans)
+    
+    def stripped_line(self, start: int, end: int) -> Tuple[str, int, int]:
+        """(buffer, start, end) of the lowercased, stripped line text[start:end]."""
+        if not self._exact:
+            line_lower = self.text[start:end].lower()
+            return (line_lower,) + _strip_span(line_lower, 0, len(line_lower))
+        return (self.lower,) + _strip_span(self.lower, start, end)
+    
+    def view(self, name: str) -> str:
+        start, end = self.spans.get(name, (0, 0))
+        return self.text[start:end]
+    
+    def lower_view(self, name: str) -> str:
+        start, end = self.spans.get(name, (0, 0))
+        return self.lower[start:end]
+    
+    def contains(self, name: str, needle: str) -> bool:
+        """Whether a lowercase needle occurs in the section, without copying it."""
+        if name not in self.spans:
+            return False
+        start, end = self.spans[name]
+        if not self._exact:
+            return needle in self.text[start:end].lower()
+        return self.lower.find(needle, start, end) != -1
+    
+    def line_spans(self, name: str) -> Iterator[Tuple[int, int]]:
+        if name not in self.spans:
+            return iter(())
+        return _line_spans(self.text, *self.spans[name])
+    
+    def as_dict(self) -> Dict[str, str]:
+        return {name: self.text[start:end] for name, (start, end) in self.spans.items()}
+
+
+def resume_section_spans(text: str) -> SectionSpans:
+    """
+    Resume sections as offsets into text.
+    
+    view(name) == parse_resume_sections(text)[name] for every section.
+    """
+    return _default_engine.resume_section_spans(text)
+
+def _resume_section_spans(lexicon: Lexicon, text: str) -> SectionSpans:
+    headers = lexicon.headers
+    doc = SectionSpans(text)
+    spans = doc.spans
+    current_section = 'header'
+    content_start = None
+    content_end = 0
+    for line_start, line_end in _line_spans(text, 0, len(text)):
+        section = _section_at(headers, *doc.stripped_line(line_start, line_end))
+        if section:
+            if content_start is not None:
+                spans[current_section] = _strip_span(text, content_start, content_end)
+            current_section = section
+            content_start = None
+        else:
+            if content_start is None:
+                content_start = line_start
+            content_end = line_end
+    if content_start is not None:
+        spans[current_section] = _strip_span(text, content_start, content_end)
+    return doc
+
+def parse_resume_sections(text: str) -> Dict[str, str]:
+    return _default_engine.parse_resume_sections(text)
+
+def extract_keywords(text: str, topn: int = 30) -> List[str]:
+    return _default_engine.extract_keywords(text, topn)
+
+def _extract_keywords(lexicon: Lexicon, text: str, topn: int) -> List[str]:
+    # 1. Identify explicit technical skills first
+    text_lower = text.lower()
+    stop_words = lexicon.stop_words
+    found_tech = []
+    for skill, regex in lexicon.tech_index:
+        # Word boundaries avoid partial matches like 'Go' in 'Google'
+        if regex.search(text_lower):
+            found_tech.append(skill)
+    
+    # 2. Extract other potentially relevant words (nouns/adj with >3 chars)
+    words = re.findall(r'\b[a-zA-Z]{3,}\b', text_lower)
+    
+    # Filter out stop words, prohibited words, and action verbs
+    filtered = []
+    for w in words:
+        if (w not in stop_words and 
+            w not in PROHIBITED_KEYWORDS and 
+            w not in ACTION_VERBS and 
+            len(w) > 3): # Favor longer words for non-predefined skills
+            filtered.append(w)
+            
+    # Count frequencies
+    word_counts = Counter(filtered)
+    
+    # Combine tech skills with top generic keywords
+    # Tech skills get priority and are always included if they exist
+    tech_set = set(found_tech)
+    generic_keywords = [word for word, count in word_counts.most_common(topn) if word not in tech_set]
+    
+    combined = found_tech + generic_keywords
+    return combined[:topn]
+
+def calculate_readability(text: str) -> int:
+    score = 100
+    sentences = text.split('.')
+    avg_sentence_length = sum(len(s.split()) for s in sentences) / max(len(sentences), 1)
+    if avg_sentence_length > 35:
+        score -= 20
+    elif avg_sentence_length > 25:
+        score -= 10
+    words = text.split()
+    complex_words = sum(1 for w in words if len(w) > 12)
+    if complex_words / max(len(words), 1) > 0.1:
+        score -= 10
+    bullet_count = text.count('•') + text.count('-') + text.count('*')
+    if bullet_count > 5:
+        score += 5
+    return max(0, min(100, score))
+
+# --- Public API Functions ---
+
+def parse_resume(text: str) -> dict:
+    """Entry point for parsing a resume string."""
+    return _default_engine.parse_resume(text)
+
+def _parse_resume(analysis: '_DocumentAnalysis', text: str) -> dict:
+    contact = extract_contact_info(text)
+    name = analysis.name(text)
+    raw_sections = analysis.sections(text)
+    skills = _extract_skills(analysis.lexicon, text)
+    
+    sections = {}
+    for key in ['summary', 'experience', 'education', 'projects', 'certifications', 'achievements']:
+        if key in raw_sections:
+            content = raw_sections[key]
+            if key == 'summary':
+                sections[key] = content
+            else:
+                # Split entries by double newline or common separators
+                items = [item.strip() for item in re.split(r'\n\s*\n', content) if item.strip()]
+                sections[key] = items
+        else:
+            sections[key] = [] if key != 'summary' else ""
+    
+    return {
+        "name": name,
+        "email": contact.get('email'),
+        "phone": contact.get('phone'),
+        "linkedin": contact.get('linkedin'),
+        "github": contact.get('github'),
+        "website": contact.get('website'),
+        "sections": sections,
+        "skills": skills
+    }
+
+def rewrite_bullet(bullet: str, keyword: str) -> str:
+    """Intelligently integrate a keyword into a bullet point."""
+    trimmed = bullet.strip()
+    if not trimmed:
+        return f"• Proficient in {keyword.title()}."
+    
+    keyword = keyword.title()
+    # Simple semantic replacement
+    if 'experience' in trimmed.lower():
+        return re.sub(r'experience', f'experience in {keyword}', trimmed, flags=re.IGNORECASE, count=1)
+    if 'expertise' in trimmed.lower():
+        return re.sub(r'expertise', f'expertise in {keyword}', trimmed, flags=re.IGNORECASE, count=1)
+    if 'developed' in trimmed.lower():
+        return re.sub(r'developed', f'developed {keyword}-driven', trimmed, flags=re.IGNORECASE, count=1)
+    if 'using' in trimmed.lower():
+        return re.sub(r'using', f'using {keyword} and', trimmed, flags=re.IGNORECASE, count=1)
+        
+    # Default: Append with a transition
+    suffix = f" utilizing {keyword}"
+    if trimmed.endswith('.'):
+        return trimmed[:-1] + suffix + "."
+    return trimmed + suffix + "."
+
+# Evaluation modes for score_ats / evaluate_ats:
+#   'full'   - every stage (default)
+#   'triage' - cheap first-pass screening; see each function for the subset returned.
+#              promote_score / promote_evaluation complete a triage result later.
+EVALUATION_MODES = ('full', 'triage')
+
+def _check_mode(mode: str) -> None:
+    if mode not in EVALUATION_MODES:
+        raise ValueError(f"Unknown mode: {mode!r} (expected one of {', '.join(EVALUATION_MODES)})")
+
+def score_ats(resume_text: str, job_desc: str, mode: str = 'full') -> dict:
+    """
+    Entry point for ATS scoring.
+    
+    mode='triage' skips readability and suggestions and returns
+    {mode, score, matchRatio, matchingKeywords, missing,
+     breakdown: {keywordMatch, formatScore, actionVerbs}}, where score spreads
+    the readability weight over the other components. promote_score() turns
+    it into the full response.
+    """
+    return _default_engine.score_ats(resume_text, job_desc, mode)
+
+def _score_ats(analysis: '_DocumentAnalysis', resume_text: str, job_desc: str, mode: str = 'full') -> dict:
+    _check_mode(mode)
+    
+    # Keyword Match
+    # Extract name to filter it out from keywords
+    candidate_name = analysis.name(resume_text)
+    name_parts = set(candidate_name.lower().split()) if candidate_name else set()
+    
+    resume_kw = set(analysis.keywords(resume_text, 30)) - name_parts
+    jd_kw = set(analysis.keywords(job_desc, 30)) - name_parts
+    matched = resume_kw & jd_kw
+    match_ratio = len(matched) / max(len(jd_kw), 1)
+    
+    keyword_score = int(match_ratio * 100)
+    missing = list(jd_kw - resume_kw)[:5]
+    
+    # Format & Sections
+    sections = analysis.sections(resume_text)
+    required = ['summary', 'experience', 'education', 'skills']
+    found = sum(1 for s in required if s in sections)
+    format_score = int((found / len(required)) * 100)
+    
+    # Verbs
+    action_verb_count = sum(1 for w in resume_text.lower().split() if w in ACTION_VERBS)
+    action_score = min(100, action_verb_count * 10)
+    
+    triage = {
+        "mode": "triage",
+        "score": int((keyword_score * 0.40 + format_score * 0.20 + action_score * 0.20) / 0.80),
+        "matchRatio": round(match_ratio, 2),
+        "matchingKeywords": list(matched),
+        "missing": missing,
+        "breakdown": {
+            "keywordMatch": keyword_score,
+            "formatScore": format_score,
+            "actionVerbs": action_score
+        }
+    }
+    if mode == 'triage':
+        return triage
+    return _promote_score(analysis, triage, resume_text)
+
+def promote_score(triage_result: dict, resume_text: str) -> dict:
+    """Complete a score_ats(mode='triage') result, reusing its keyword, format and verb scores."""
+    return _default_engine.promote_score(triage_result, resume_text)
+
+def _promote_score(analysis: '_DocumentAnalysis', triage_result: dict, resume_text: str) -> dict:
+    if triage_result.get('mode') != 'triage':
+        return triage_result
+    breakdown = triage_result['breakdown']
+    keyword_score = breakdown['keywordMatch']
+    format_score = breakdown['formatScore']
+    action_score = breakdown['actionVerbs']
+    missing = triage_result['missing']
+    
+    suggestions = []
+    if missing:
+        suggestions.append(f"Add these keywords: {', '.join(missing)}")
+    
+    sections = analysis.sections(resume_text)
+    if 'summary' not in sections: suggestions.append("Add a professional summary section")
+    if 'skills' not in sections: suggestions.append("Add a dedicated skills section")
+    
+    # Readability
+    readability_score = calculate_readability(resume_text)
+    
+    if action_score < 50:
+        suggestions.append("Use stronger action verbs (led, achieved, optimized)")
+        
+    overall_score = int(
+        keyword_score * 0.40 +
+        format_score * 0.20 +
+        readability_score * 0.20 +
+        action_score * 0.20
+    )
+    
+    return {
+        "score": overall_score,
+        "matchRatio": triage_result['matchRatio'],
+        "matchingKeywords": triage_result['matchingKeywords'],
+        "missing": missing,
+        "suggestions": suggestions[:5],
+        "breakdown": {
+            "keywordMatch": keyword_score,
+            "formatScore": format_score,
+            "readability": readability_score,
+            "actionVerbs": action_score
+        }
+    }
+
+def optimize_resume(resume_text: str, job_desc: str, output: str = 'text'):
+    """
+    Intelligently optimize resume by injecting missing keywords.
+    
+    output='text' (default) returns the rebuilt resume. output='edits' returns
+    the same changes as span-based edit operations on the original text
+    (see _optimize_resume_edits); apply them with apply_edits().
+    """
+    return _default_engine.optimize_resume(resume_text, job_desc, output)
+
+def _optimize_resume_output(analysis: '_DocumentAnalysis', resume_text: str, job_desc: str, output: str):
+    if output == 'edits':
+        return _optimize_resume_edits(analysis, resume_text, job_desc)
+    if output != 'text':
+        raise ValueError(f"Unknown output: {output!r} (expected 'text' or 'edits')")
+    return _optimize_resume(analysis, resume_text, job_desc)
+
+def _optimize_resume(analysis: '_DocumentAnalysis', resume_text: str, job_desc: str) -> str:
+    doc = analysis.section_spans(resume_text)
+    # Copy: the sections are rewritten in place below
+    sections = dict(analysis.sections(resume_text))
+    
+    # Identify missing keywords
+    missing = _missing_keywords(analysis, resume_text, job_desc)
+    
+    if not missing:
+        return resume_text
+
+    # 1. Distribute some keywords into Experience Section (Better Integration)
+    experience_keywords = missing[:min(len(missing), 5)] # Take first few for experience
+    remaining_keywords = missing[min(len(missing), 5):]
+    
+    if sections.get('experience'):
+        # Splice rewritten bullet lines between untouched slices of the original
+        start, end = doc['experience']
+        parts = []
+        cursor = start
+        for line_start, line_end, _, _, new_line, _ in _bullet_rewrites(doc, experience_keywords):
+            parts.append(resume_text[cursor:line_start])
+            parts.append(new_line)
+            cursor = line_end
+        parts.append(resume_text[cursor:end])
+        sections['experience'] = ''.join(parts)
+
+    # 2. Update/Add Skills section with remaining
+    skills_text = sections.get('skills', '')
+    if remaining_keywords:
+        new_skills = [m.title() for m in remaining_keywords]
+        if skills_text:
+            sections['skills'] = skills_text + ", " + ", ".join(new_skills)
+        else:
+            sections['skills'] = ", ".join(new_skills)
+
+    # 3. Enhance Summary if it exists
+    summary_text = sections.get('summary', '')
+    if summary_text:
+        buzzwords = ", ".join([m.title() for m in missing[:2]])
+        sections['summary'] = f"{summary_text.strip()} Expert in {buzzwords} with a focus on delivering high-impact solutions."
+
+    # 3. Reconstruct Resume
+    ordered_sections = ['header', 'summary', 'skills', 'experience', 'projects', 'education', 'certifications', 'achievements']
+    output = []
+    
+    # Header is special - it's usually just the top part
+    if 'header' in sections:
+        output.append(sections['header'])
+    
+    for sec in ordered_sections[1:]:
+        if sec in sections:
+            # Add header for the section
+            header_name = sec.upper()
+            output.append(f"\n{header_name}")
+            output.append(sections[sec])
+            
+    return "\n".join(output)
+
+def _missing_keywords(analysis: '_DocumentAnalysis', resume_text: str, job_desc: str) -> List[str]:
+    """JD keywords absent from the resume, ignoring the candidate's name."""
+    candidate_name = analysis.name(resume_text)
+    name_parts = set(candidate_name.lower().split()) if candidate_name else set()
+    
+    resume_kw = set(analysis.keywords(resume_text, 50)) - name_parts
+    jd_kw = set(analysis.keywords(job_desc, 30)) - name_parts
+    return list(jd_kw - resume_kw)
+
+def _bullet_prefix(text: str, start: int, end: int) -> Optional[str]:
+    if text.startswith('•', start, end): return "• "
+    if text.startswith('-', start, end): return "- "
+    if text.startswith('*', start, end): return "* "
+    return None
+
+def _bullet_rewrites(doc: SectionSpans, keywords: List[str]) -> Iterator[tuple]:
+    """
+    Rewrite the first experience bullets, one keyword each.
+    
+    Yields (line_start, line_end, content_start, content_end, new_line, keyword);
+    content_* excludes the line's surrounding whitespace.
+    """
+    text = doc.text
+    kw_idx = 0
+    for line_start, line_end in doc.line_spans('experience'):
+        if kw_idx >= len(keywords):
+            return
+        content_start, content_end = _strip_span(text, line_start, line_end)
+        prefix = _bullet_prefix(text, content_start, content_end)
+        if prefix is None:
+            continue
+        raw_text = text[content_start:content_end].lstrip('•-* ')
+        yield (line_start, line_end, content_start, content_end,
+               prefix + rewrite_bullet(raw_text, keywords[kw_idx]), keywords[kw_idx])
+        kw_idx += 1
+
+def _optimize_resume_edits(analysis: '_DocumentAnalysis', resume_text: str, job_desc: str) -> List[dict]:
+    """
+    The optimize_resume changes as edit operations on the original text.
+    
+    Returns ResumeEdit dicts sorted by offset:
+    {
+        op: 'replace' | 'insert' | 'append',
+        start: number,      # offsets into resume_text (Python string indices)
+        end: number,        # == start for insert/append
+        text: string,       # replacement or inserted text
+        keywords: string[]  # JD keywords this edit introduces
+    }
+    Everything outside the edits, including sections with unrecognized
+    headers, is left untouched.
+    """
+    missing = _missing_keywords(analysis, resume_text, job_desc)
+    if not missing:
+        return []
+    
+    spans = analysis.section_spans(resume_text)
+    experience_keywords = missing[:min(len(missing), 5)]
+    remaining_keywords = missing[min(len(missing), 5):]
+    edits = []
+    
+    # 1. Rewrite experience bullets in place
+    for _, _, content_start, content_end, new_line, keyword in _bullet_rewrites(spans, experience_keywords):
+        edits.append({
+            'op': 'replace',
+            'start': content_start,
+            'end': content_end,
+            'text': new_line,
+            'keywords': [keyword]
+        })
+    
+    # 2. Extend (or add) the skills section with the remaining keywords
+    if remaining_keywords:
+        new_skills = ", ".join(m.title() for m in remaining_keywords)
+        if 'skills' in spans:
+            start, end = spans['skills']
+            edits.append({
+                'op': 'insert',
+                'start': end,
+                'end': end,
+                'text': (", " + new_skills) if end > start else new_skills,
+                'keywords': remaining_keywords
+            })
+        else:
+            edits.append({
+                'op': 'append',
+                'start': len(resume_text),
+                'end': len(resume_text),
+                'text': f"\n\nSKILLS\n{new_skills}",
+                'keywords': remaining_keywords
+            })
+    
+    # 3. Extend the summary
+    if 'summary' in spans and spans['summary'][1] > spans['summary'][0]:
+        end = spans['summary'][1]
+        buzzwords = ", ".join([m.title() for m in missing[:2]])
+        edits.append({
+            'op': 'insert',
+            'start': end,
+            'end': end,
+            'text': f" Expert in {buzzwords} with a focus on delivering high-impact solutions.",
+            'keywords': missing[:2]
+        })
+    
+    edits.sort(key=lambda edit: edit['start'])
+    return edits
+
+def apply_edits(text: str, edits: List[dict]) -> str:
+    """Apply edit operations (as returned by optimize_resume(output='edits')) to text."""
+    parts = []
+    cursor = len(text)
+    # Back to front so earlier offsets stay valid; at equal offsets the earlier edit ends up first
+    for edit in reversed(edits):
+        parts.append(text[edit['end']:cursor])
+        parts.append(edit['text'])
+        cursor = edit['start']
+    parts.append(text[:cursor])
+    return ''.join(reversed(parts))
+
+# =============================================================================
+# NEW ATS ENGINE V2 - Structured responses matching TypeScript contracts
+# =============================================================================
+
+def _generate_id() -> str:
+    """Generate a simple unique ID."""
+    import hashlib
+    import time
+    return hashlib.md5(f"{time.time()}".encode()).hexdigest()[:12]
+
+
+def _categorize_keyword(lexicon: Lexicon, keyword: str) -> str:
+    """Categorize a keyword into hard_skill, tool, concept, or soft_skill."""
+    kw_lower = keyword.lower()
+    category = lexicon.categories.get(kw_lower)
+    if category is None:
+        category = _categorize_by_rules(kw_lower, lexicon.tech_set)
+    return category
+
+
+def _jd_section_at(lower: str, start: int, end: int) -> Optional[str]:
+    """JD section whose pattern occurs in the stripped line lower[start:end], if any."""
+    if end - start >= 60:
+        return None
+    for section_key, patterns in JD_SECTION_PATTERNS.items():
+        for pattern in patterns:
+            if lower.find(pattern, start, end) != -1:
+                return section_key
+    return None
+
+def jd_section_spans(text: str) -> SectionSpans:
+    """JD sections as offsets into text; section content is not stripped."""
+    doc = SectionSpans(text)
+    spans = doc.spans
+    current_section = 'general'
+    content_start = None
+    content_end = 0
+    for line_start, line_end in _line_spans(text, 0, len(text)):
+        found_section = _jd_section_at(*doc.stripped_line(line_start, line_end))
+        if found_section:
+            if content_start is not None:
+                spans[current_section] = (content_start, content_end)
+            current_section = found_section
+            content_start = None
+        else:
+            if content_start is None:
+                content_start = line_start
+            content_end = line_end
+    if content_start is not None:
+        spans[current_section] = (content_start, content_end)
+    return doc
+
+def parse_jd(text: str) -> dict:
+    """
+    Parse a job description into a structured JobDescriptionModel.
+    
+    Returns a dict matching the TypeScript JobDescriptionModel interface:
+    {
+        id: string,
+        rawText: string,
+        sections: Record<string, string>,
+        categorizedKeywords: KeywordModel[]
+    }
+    """
+    return _default_engine.parse_jd(text)
+
+def _parse_jd(lexicon: Lexicon, text: str) -> dict:
+    doc = jd_section_spans(text)
+    
+    # Extract and categorize keywords
+    categorized_keywords = []
+    text_lower = doc.full_lower()
+    keyword_counts = {}
+    
+    # Find all tech skills in the JD
+    for skill, regex in lexicon.tech_index:
+        matches = regex.findall(text_lower)
+        if matches:
+            keyword_counts[skill] = len(matches)
+    
+    # Add multi-word phrase detection
+    for match in lexicon.phrase_regex.findall(text_lower):
+        key = match.lower()
+        if key not in keyword_counts:
+            keyword_counts[key] = 1
+    
+    # Determine which section each keyword came from (prioritize requirements)
+    for keyword, count in keyword_counts.items():
+        category = _categorize_keyword(lexicon, keyword)
+        
+        # Determine section
+        jd_section = 'general'
+        if doc.contains('requirements', keyword):
+            jd_section = 'requirements'
+        
+        # Calculate weight (requirements get 1.5x boost)
+        base_weight = 1.0
+        frequency_bonus = min(count - 1, 2) * 0.25
+        section_bonus = 0.5 if jd_section == 'requirements' else 0
+        
+        categorized_keywords.append({
+            'keyword': keyword,
+            'category': category,
+            'weight': base_weight + frequency_bonus + section_bonus,
+            'frequency': count,
+            'jdSection': jd_section
+        })
+    
+    # Sort by weight descending
+    categorized_keywords.sort(key=lambda x: x['weight'], reverse=True)
+    
+    return {
+        'id': _generate_id(),
+        'rawText': text,
+        'sections': doc.as_dict(),
+        'categorizedKeywords': categorized_keywords
+    }
+
+
+_WORD_PATTERN = re.compile(r'\S+')
+_BULLET_SPLIT_PATTERN = re.compile(r'\n\s*[-•*]\s*')
+_SKILL_SPLIT_PATTERN = re.compile(r'[,\n•\-*]')
+
+def parse_resume_canonical(text: str) -> dict:
+    """
+    Parse a resume into a canonical format with location strings for each token.
+    
+    Returns a dict with:
+    {
+        sections: {summary: str, experience: [], skills: [], ...},
+        tokens: [{text: str, location: str, normalized: str, canonical?: str}, ...]
+    }
+    
+    canonical is set on tokens that are a known variant of a keyword
+    ("k8s" -> "kubernetes"); match_keywords resolves those without fuzzy matching.
+    """
+    return _default_engine.parse_resume_canonical(text)
+
+def _token(text: str, location: str, normalized: str, aliases: Dict[str, str]) -> dict:
+    """Resume token; known variants (see _build_aliases) also carry their canonical keyword."""
+    token = {
+        'text': text,
+        'location': location,
+        'normalized': normalized
+    }
+    canonical = aliases.get(normalized)
+    if canonical is not None:
+        token['canonical'] = canonical
+    return token
+
+def _word_tokens(lexicon: Lexicon, lower: str, start: int, end: int, location: str, tokens: list) -> None:
+    stop_words, aliases = lexicon.stop_words, lexicon.aliases
+    for match in _WORD_PATTERN.finditer(lower, start, end):
+        clean = _TOKEN_STRIP_PATTERN.sub('', match.group())
+        if clean and clean not in stop_words:
+            tokens.append(_token(clean, location, clean.lower(), aliases))
+
+def _parse_resume_canonical(lexicon: Lexicon, doc: SectionSpans) -> dict:
+    # Tokens are cut straight out of the shared buffers; section text is never re-joined or re-lowered
+    text, lower = doc.text, doc.lower
+    tokens = []
+    
+    # Process summary
+    if 'summary' in doc:
+        _word_tokens(lexicon, lower, *doc['summary'], 'summary:0', tokens)
+    
+    # Process experience (extract bullet points)
+    if 'experience' in doc:
+        for i, bullet in enumerate(_split_spans(_BULLET_SPLIT_PATTERN, text, *doc['experience'])):
+            _word_tokens(lexicon, lower, *_strip_span(text, *bullet), f'experience:0:bullets:{i}', tokens)
+    
+    # Process skills
+    if 'skills' in doc:
+        # Skills are usually comma-separated
+        for i, piece in enumerate(_split_spans(_SKILL_SPLIT_PATTERN, text, *doc['skills'])):
+            start, end = _strip_span(text, *piece)
+            if start < end:
+                tokens.append(_token(text[start:end], f'skills:0:list:{i}', text[start:end].lower(), lexicon.aliases))
+    
+    # Also extract tech skills from full text
+    text_lower = doc.full_lower()
+    for skill, skill_lower in zip(lexicon.tech_skills, lexicon.tech_lower):
+        if skill_lower in text_lower:
+            tokens.append({
+                'text': skill,
+                'location': 'detected',
+                'normalized': skill_lower
+            })
+    
+    return {
+        'sections': doc.as_dict(),
+        'tokens': tokens
+    }
+
+
+def _normalize_for_fuzzy_matching(text: str) -> str:
+    """
+    Normalize text for fuzzy matching by removing common suffixes and variations.
+    E.g., "ReactJS" -> "react", "React.js" -> "react", "Node.JS" -> "node"
+    """
+    # Convert to lowercase
+    normalized = text.lower()
+    
+    # Remove common suffixes/prefixes for tech terms
+    suffixes = ['.js', '.ts', '.jsx', '.tsx', 'js', 'ts', 'jsx', 'tsx', '.net', 'js', 'py']
+    for suffix in suffixes:
+        if normalized.endswith(suffix):
+            normalized = normalized[:-len(suffix)]
+            break
+    
+    # Remove version numbers (e.g., "python3" -> "python")
+    normalized = re.sub(r'\d+$', '', normalized)
+    
+    # Remove common abbreviations
+    abbreviations = {'js': 'javascript', 'ts': 'typescript', 'py': 'python'}
+    if normalized in abbreviations:
+        normalized = abbreviations[normalized]
+    
+    return normalized.strip()
+
+
+def _calculate_similarity(str1: str, str2: str) -> float:
+    """
+    Calculate similarity between two strings using Levenshtein distance ratio.
+    Returns a value between 0.0 and 1.0.
+    """
+    # Quick exact match
+    if str1 == str2:
+        return 1.0
+    
+    # Normalize both strings
+    norm1 = _normalize_for_fuzzy_matching(str1)
+    norm2 = _normalize_for_fuzzy_matching(str2)
+    
+    # Check normalized match
+    if norm1 == norm2:
+        return 0.95  # High similarity for normalized match
+    
+    # Check if one contains the other
+    if norm1 in norm2 or norm2 in norm1:
+        return 0.9
+    
+    # Calculate Levenshtein distance
+    len1, len2 = len(norm1), len(norm2)
+    if len1 == 0 or len2 == 0:
+        return 0.0
+    
+    # Create distance matrix
+    matrix = [[0] * (len2 + 1) for _ in range(len1 + 1)]
+    
+    for i in range(len1 + 1):
+        matrix[i][0] = i
+    for j in range(len2 + 1):
+        matrix[0][j] = j
+    
+    for i in range(1, len1 + 1):
+        for j in range(1, len2 + 1):
+            cost = 0 if norm1[i - 1] == norm2[j - 1] else 1
+            matrix[i][j] = min(
+                matrix[i - 1][j] + 1,      # deletion
+                matrix[i][j - 1] + 1,      # insertion
+                matrix[i - 1][j - 1] + cost # substitution
+            )
+    
+    distance = matrix[len1][len2]
+    max_len = max(len1, len2)
+    similarity = 1.0 - (distance / max_len) if max_len > 0 else 0.0
+    
+    return similarity
+
+
+def match_keywords(jd_model: dict, resume_model: dict, fuzzy_threshold: float = 0.85) -> list:
+    """
+    Match JD keywords against resume tokens with fuzzy matching support.
+    
+    Args:
+        jd_model: Job description model with categorized keywords
+        resume_model: Resume model with tokens
+        fuzzy_threshold: Minimum similarity score (0.0-1.0) for fuzzy matches
+    
+    Returns a list of MatchResultModel dicts:
+    {
+        keyword: string,
+        category: KeywordCategory,
+        status: MatchStatus,
+        locations: string[],
+        scoreContribution: number,
+        matchedVariant: string | None  # The actual variant found (e.g., "ReactJS" for keyword "React")
+    }
+    """
+    keywords = jd_model.get('categorizedKeywords', [])
+    results: List[Any] = [None] * len(keywords)
+    for index, result in _staged_matches(jd_model, resume_model, fuzzy_threshold):
+        results[index] = result
+    return results
+
+
+def _build_alias_map(resume_tokens: list) -> Dict[str, Tuple[List[str], str]]:
+    """Map each canonical keyword to the distinct locations of its variants and the first variant seen."""
+    alias_map = {}
+    for token in resume_tokens:
+        canonical = token.get('canonical')
+        if canonical is None:
+            continue
+        entry = alias_map.get(canonical)
+        if entry is None:
+            entry = alias_map[canonical] = ([], token['normalized'])
+        if token['location'] not in entry[0]:
+            entry[0].append(token['location'])
+    return alias_map
+
+
+def _build_location_map(resume_tokens: list) -> Dict[str, List[str]]:
+    """Map each normalized token to its distinct locations, in document order."""
+    location_map = {}
+    for token in resume_tokens:
+        normalized = token['normalized']
+        if normalized not in location_map:
+            location_map[normalized] = []
+        if token['location'] not in location_map[normalized]:
+            location_map[normalized].append(token['location'])
+    return location_map
+
+
+# Tokens between deadline / time slice checks inside one fuzzy scan
+_FUZZY_CHECK_STRIDE = 64
+
+# Yielded by _staged_matches instead of a result when its time slice is over
+_PAUSE = (-1, None)
+
+
+class _TimeSlice:
+    """
+    Cooperative scheduling for the async API: work runs until `length`
+    seconds have passed since the last pause, then hands control back.
+    """
+
+    __slots__ = ('length', 'end')
+
+    def __init__(self, time_slice_ms: float):
+        self.length = max(time_slice_ms, 0) / 1000
+        self.end = time.perf_counter() + self.length
+
+    def over(self) -> bool:
+        return time.perf_counter() >= self.end
+
+    async def pause(self) -> None:
+        """Yield to the event loop and start a new slice."""
+        import asyncio
+        await asyncio.sleep(0)
+        self.end = time.perf_counter() + self.length
+
+    async def checkpoint(self) -> None:
+        if self.over():
+            await self.pause()
+
+
+def _staged_matches(jd_model: dict, resume_model: dict, fuzzy_threshold: float = 0.85,
+                    deadline: Optional[float] = None,
+                    time_slice: Optional[_TimeSlice] = None) -> Iterator[Tuple[int, dict]]:
+    """
+    match_keywords() results as (keyword index, result), cheapest stage first.
+    
+    Every keyword is tried for an exact match first (or a known alias, see
+    _build_aliases, at the same price), then the rest for a partial match,
+    then the rest again for a fuzzy one (JD order within each stage); a
+    keyword is yielded as soon as a stage decides it. Each keyword gets
+    exactly the result match_keywords would give it.
+    
+    With a deadline (a time.perf_counter() value) the generator stops once it
+    has passed, leaving the remaining keywords undecided. It is checked
+    between keywords and every _FUZZY_CHECK_STRIDE tokens of a fuzzy scan,
+    whose keyword is then left undecided as well. With a time_slice it
+    yields _PAUSE at those same points once the slice is over; the caller
+    pauses the slice and matching resumes where it stopped.
+    """
+    resume_tokens = resume_model.get('tokens', [])
+    
+    # Create a set of normalized resume tokens for fast lookup
+    resume_token_set = {t['normalized'] for t in resume_tokens}
+    location_map = _build_location_map(resume_tokens)
+    alias_map = _build_alias_map(resume_tokens)
+    
+    # Check for exact match, then for a variant the tokenizer already resolved
+    pending = []
+    for index, kw in enumerate(jd_model.get('categorizedKeywords', [])):
+        keyword_normalized = kw['keyword'].lower()
+        locations = location_map.get(keyword_normalized)
+        if locations:
+            yield index, _match_result(kw, keyword_normalized, locations, None, 'exact')
+        elif keyword_normalized in alias_map:
+            locations, matched_variant = alias_map[keyword_normalized]
+            yield index, _match_result(kw, keyword_normalized, locations, matched_variant, 'alias')
+        else:
+            pending.append((index, kw, keyword_normalized))
+    
+    # Also check for partial matches (e.g., "react" in "react.js")
+    unresolved = []
+    for index, kw, keyword_normalized in pending:
+        if deadline is not None and time.perf_counter() >= deadline:
+            return
+        if time_slice is not None and time_slice.over():
+            yield _PAUSE
+        locations, matched_variant = _partial_match(keyword_normalized, location_map, resume_token_set)
+        if locations:
+            yield index, _match_result(kw, keyword_normalized, locations, matched_variant, 'partial')
+        else:
+            unresolved.append((index, kw, keyword_normalized))
+    
+    # Fuzzy matching for variations (e.g., "React" vs "ReactJS" vs "React.js")
+    for index, kw, keyword_normalized in unresolved:
+        if deadline is not None and time.perf_counter() >= deadline:
+            return
+        if time_slice is not None and time_slice.over():
+            yield _PAUSE
+        match = yield from _fuzzy_match(keyword_normalized, location_map, resume_token_set, fuzzy_threshold,
+                                        deadline, time_slice)
+        if match is None:
+            return
+        locations, matched_variant = match
+        yield index, _match_result(kw, keyword_normalized, locations, matched_variant,
+                                   'fuzzy' if locations else 'missing')
+
+
+def _partial_match(keyword_normalized: str, location_map: Dict[str, List[str]],
+                   resume_token_set: set) -> Tuple[List[str], Optional[str]]:
+    """(locations, variant) of the first token containing or contained in the keyword."""
+    for token_norm in resume_token_set:
+        if keyword_normalized in token_norm or token_norm in keyword_normalized:
+            if token_norm in location_map:
+                return location_map[token_norm], token_norm
+            break
+    return [], None
+
+
+def _fuzzy_match(keyword_normalized: str, location_map: Dict[str, List[str]], resume_token_set: set,
+                 fuzzy_threshold: float, deadline: Optional[float] = None, time_slice: Optional[_TimeSlice] = None):
+    """
+    Generator returning (locations, variant) of the most similar token at or
+    above the threshold, or None if the deadline passed first. Yields _PAUSE
+    when time_slice is over mid-scan (see _staged_matches).
+    """
+    best_match = None
+    best_similarity = 0.0
+    checked = deadline is not None or time_slice is not None
+    
+    for scanned, token_norm in enumerate(resume_token_set):
+        if checked and scanned % _FUZZY_CHECK_STRIDE == 0:
+            if deadline is not None and time.perf_counter() >= deadline:
+                return None
+            if time_slice is not None and time_slice.over():
+                yield _PAUSE
+        similarity = _calculate_similarity(keyword_normalized, token_norm)
+        if similarity >= fuzzy_threshold and similarity > best_similarity:
+            best_similarity = similarity
+            best_match = token_norm
+    
+    if best_match and best_match in location_map:
+        return location_map[best_match], best_match
+    return [], None
+
+
+def _match_result(kw: dict, keyword_normalized: str, locations: List[str], matched_variant: Optional[str],
+                  stage: str) -> dict:
+    """MatchResultModel for a keyword decided at stage (exact, alias, partial, fuzzy or missing)."""
+    if _metrics_sink is not None:
+        _metrics_sink.observe_match(stage)
+    
+    if locations:
+        status = 'matched'
+        score_contribution = kw['weight'] * 5
+    else:
+        status = 'missing'
+        score_contribution = 0
+    
+    result = {
+        'keyword': kw['keyword'],
+        'category': kw['category'],
+        'status': status,
+        'locations': locations,
+        'scoreContribution': score_contribution
+    }
+    
+    # Only add matchedVariant if there's a fuzzy match
+    if matched_variant and matched_variant != keyword_normalized:
+        result['matchedVariant'] = matched_variant
+    
+    return result
+
+
+def _token_keys(resume_tokens: list) -> set:
+    """Everything an exact or alias lookup can hit: normalized tokens and their canonical keywords."""
+    keys = {t['normalized'] for t in resume_tokens}
+    keys.update(t['canonical'] for t in resume_tokens if 'canonical' in t)
+    return keys
+
+
+def _match_keywords_exact(jd_model: dict, resume_model: dict) -> list:
+    """
+    Triage matching: exact lexicon hits and known aliases only, no location lists.
+    
+    Returns MatchResultModel dicts without `locations`; keywords that would
+    need the partial or fuzzy stage are reported as 'missing'.
+    """
+    resume_token_set = _token_keys(resume_model.get('tokens', []))
+    results = []
+    for kw in jd_model.get('categorizedKeywords', []):
+        matched = kw['keyword'].lower() in resume_token_set
+        results.append({
+            'keyword': kw['keyword'],
+            'category': kw['category'],
+            'status': 'matched' if matched else 'missing',
+            'scoreContribution': kw['weight'] * 5 if matched else 0
+        })
+    return results
+
+
+# --- Concept Similarity ---
+
+CONCEPT_VECTOR_DIM = 1 << 12  # hash buckets; a power of two
+CONCEPT_JD_SECTIONS = ('general', 'requirements', 'responsibilities')
+CONCEPT_SIMILARITY_FULL = 0.5  # cosine at which the role/concept score reaches 100
+CONCEPT_CACHE_SIZE = 128  # documents whose vectors are kept, per side
+_CONCEPT_TERM_PATTERN = re.compile(r'[a-z0-9][a-z0-9+#]*')
+_CONCEPT_SIGN_BIT = 1 << 31
+
+_numpy_module: Any = False  # not probed yet
+
+
+def _numpy():
+    """NumPy if it can be imported (it is optional, also under Pyodide), else None."""
+    global _numpy_module
+    if _numpy_module is False:
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        _numpy_module = numpy
+    return _numpy_module
+
+
+class ConceptVector:
+    """
+    L2-normalized, feature-hashed term vector of one text.
+    
+    Terms are hashed (crc32) into CONCEPT_VECTOR_DIM buckets with a sign bit,
+    so there is no vocabulary to store and vectors of any two documents are
+    comparable. Only used buckets are kept: {bucket: weight}. Build vectors
+    once per document with concept_vectors() and reuse them for every pair.
+    """
+    
+    __slots__ = ('weights', 'terms')
+    
+    def __init__(self, weights: Dict[int, float], terms: int):
+        self.weights = weights
+        self.terms = terms
+    
+    def __bool__(self) -> bool:
+        return bool(self.weights)
+    
+    def cosine(self, other: 'ConceptVector') -> float:
+        small, large = sorted((self.weights, other.weights), key=len)
+        return sum(weight * large.get(bucket, 0.0) for bucket, weight in small.items())
+
+
+def concept_vector(text: str) -> ConceptVector:
+    """Hashed vector of text's terms (stop words, section words and numbers skipped), weighted 1 + log(tf)."""
+    counts = Counter(
+        term for term in _CONCEPT_TERM_PATTERN.findall(text.lower())
+        if term not in STOP_WORDS and term not in PROHIBITED_KEYWORDS and not term.isdigit()
+    )
+    weights: Dict[int, float] = {}
+    for term, count in counts.items():
+        hashed = zlib.crc32(term.encode('utf-8'))
+        bucket = hashed & (CONCEPT_VECTOR_DIM - 1)
+        sign = 1.0 if hashed & _CONCEPT_SIGN_BIT else -1.0
+        weights[bucket] = weights.get(bucket, 0.0) + sign * (1.0 + math.log(count))
+    norm = math.sqrt(sum(weight * weight for weight in weights.values()))
+    if not norm:
+        return ConceptVector({}, len(counts))
+    return ConceptVector({bucket: weight / norm for bucket, weight in weights.items() if weight}, len(counts))
+
+
+def concept_vectors(sections: Dict[str, str]) -> Dict[str, ConceptVector]:
+    """ConceptVector per section, e.g. of parse_jd()['sections'] or parse_resume_sections()."""
+    return {name: concept_vector(text) for name, text in sections.items()}
+
+
+def concept_similarity_matrix(rows: List[ConceptVector], columns: List[ConceptVector]) -> List[List[float]]:
+    """
+    Cosine similarity of every row vector with every column vector.
+    
+    With NumPy the vectors are packed into two dense matrices over just the
+    buckets they use, and all pairs come out of one matrix product; without
+    it each pair is a sparse dot product.
+    """
+    np = _numpy()
+    if np is None or not rows or not columns:
+        return [[row.cosine(column) for column in columns] for row in rows]
+    buckets: Dict[int, int] = {}
+    for vector in rows + columns:
+        for bucket in vector.weights:
+            buckets.setdefault(bucket, len(buckets))
+    return (_dense_matrix(np, rows, buckets) @ _dense_matrix(np, columns, buckets).T).tolist()
+
+
+def _dense_matrix(np, vectors: List[ConceptVector], buckets: Dict[int, int]):
+    matrix = np.zeros((len(vectors), len(buckets)))
+    for i, vector in enumerate(vectors):
+        if vector.weights:
+            matrix[i, [buckets[bucket] for bucket in vector.weights]] = list(vector.weights.values())
+    return matrix
+
+
+def concept_similarity_score(jd_vectors: Dict[str, ConceptVector],
+                             resume_vectors: Dict[str, ConceptVector]) -> Optional[int]:
+    """
+    How closely a resume's sections cover a JD's title, requirements and responsibilities (0-100).
+    
+    Each JD section in CONCEPT_JD_SECTIONS takes its best cosine against any
+    resume section; those are averaged, weighted by the section's distinct
+    terms, and scaled so that CONCEPT_SIMILARITY_FULL scores 100. None if
+    either side has no terms to compare.
+    """
+    rows = [jd_vectors[name] for name in CONCEPT_JD_SECTIONS if jd_vectors.get(name)]
+    columns = [vector for vector in resume_vectors.values() if vector]
+    if not rows or not columns:
+        return None
+    matrix = concept_similarity_matrix(rows, columns)
+    similarity = sum(row.terms * max(0.0, max(cosines)) for row, cosines in zip(rows, matrix))
+    similarity /= sum(row.terms for row in rows)
+    # Rounded first so that NumPy and pure-Python sums land on the same integer
+    return min(100, int(round(similarity / CONCEPT_SIMILARITY_FULL * 100, 6)))
+
+
+@functools.lru_cache(maxsize=CONCEPT_CACHE_SIZE)
+def _jd_concept_vectors(jd_text: str) -> Dict[str, ConceptVector]:
+    return concept_vectors(jd_section_spans(jd_text).as_dict())
+
+
+@functools.lru_cache(maxsize=CONCEPT_CACHE_SIZE)
+def _resume_concept_vectors(resume_text: str) -> Dict[str, ConceptVector]:
+    return concept_vectors(resume_section_spans(resume_text).as_dict())
+
+
+def _role_title_score(jd_model: dict, resume_text: str) -> int:
+    """roleTitleScore: concept similarity, or ROLE_TITLE_DEFAULT_SCORE when there is nothing to compare."""
+    score = concept_similarity_score(_jd_concept_vectors(jd_model.get('rawText', '')),
+                                     _resume_concept_vectors(resume_text))
+    return ROLE_TITLE_DEFAULT_SCORE if score is None else score
+
+
+ROLE_TITLE_DEFAULT_SCORE = 75
+SCORED_CATEGORIES = ['hard_skill', 'tool', 'concept']
+
+
+def _category_score(matched: int, total: int) -> int:
+    """Category score (0-100); no requirements = perfect score."""
+    if total == 0:
+        return 100
+    return int((matched / total) * 100)
+
+
+def _structure_score(resume_text: str) -> int:
+    """Structure score - check for key sections."""
+    text_lower = resume_text.lower()
+    has_experience = bool(re.search(r'experience|work history|employment', text_lower))
+    has_education = bool(re.search(r'education|degree|university', text_lower))
+    has_skills = bool(re.search(r'skills|technologies|proficient', text_lower))
+    return (40 if has_experience else 0) + (30 if has_education else 0) + (30 if has_skills else 0)
+
+
+def _weighted_total(hard_skill_score: int, tools_score: int, concept_score: int,
+                    role_title_score: int, structure_score: int) -> int:
+    """Total using formula: (HardSkill * 0.45) + (Tools * 0.20) + (Concepts * 0.20) + (RoleTitle * 0.10) + (Structure * 0.05)"""
+    return int(
+        hard_skill_score * 0.45 +
+        tools_score * 0.20 +
+        concept_score * 0.20 +
+        role_title_score * 0.10 +
+        structure_score * 0.05
+    )
+
+
+def calculate_ats_score(jd_model: dict, match_results: list, resume_text: str) -> dict:
+    """
+    Calculate the ATS score breakdown from match results.
+    
+    Returns ATSScoreBreakdown:
+    {
+        hardSkillScore: number,
+        toolsScore: number,
+        conceptScore: number,
+        roleTitleScore: number,
+        structureScore: number,
+        total: number
+    }
+    """
+    # Group by category
+    by_category = {
+        'hard_skill': {'matched': 0, 'total': 0},
+        'tool': {'matched': 0, 'total': 0},
+        'concept': {'matched': 0, 'total': 0},
+        'soft_skill': {'matched': 0, 'total': 0}
+    }
+    
+    for result in match_results:
+        cat = result['category']
+        if cat in by_category:
+            by_category[cat]['total'] += 1
+            if result['status'] == 'matched':
+                by_category[cat]['matched'] += 1
+    
+    # Calculate category scores (0-100)
+    def calc_score(cat):
+        return _category_score(by_category[cat]['matched'], by_category[cat]['total'])
+    
+    hard_skill_score = calc_score('hard_skill')
+    tools_score = calc_score('tool')
+    concept_score = calc_score('concept')
+    
+    # Role title match - how closely the resume's sections cover the JD's title, requirements and duties
+    role_title_score = _role_title_score(jd_model, resume_text)
+    
+    structure_score = _structure_score(resume_text)
+    
+    total = _weighted_total(hard_skill_score, tools_score, concept_score, role_title_score, structure_score)
+    
+    return {
+        'hardSkillScore': hard_skill_score,
+        'toolsScore': tools_score,
+        'conceptScore': concept_score,
+        'roleTitleScore': role_title_score,
+        'structureScore': structure_score,
+        'total': total
+    }
+
+
+def _could_match(keyword: str, token_set: set, joined_tokens: str, fuzzy_norms: dict,
+                 fuzzy_threshold: float) -> bool:
+    """
+    Cheap necessary condition for match_keywords to report `keyword` as matched.
+
+    Exact and partial matches are decided precisely (set lookup, one substring
+    search over the joined tokens, and a lookup of every substring of the
+    keyword). For the fuzzy stage the similarity of each token is capped from
+    above by the cases of _calculate_similarity, using the length difference
+    and the character-bag difference as lower bounds on Levenshtein distance.
+    """
+    if keyword in token_set or keyword in joined_tokens:
+        return True
+    length = len(keyword)
+    for i in range(length):
+        for j in range(i + 1, length + 1):
+            if keyword[i:j] in token_set:
+                return True
+    if not token_set:
+        return False
+
+    norm1 = _normalize_for_fuzzy_matching(keyword)
+    bag1 = Counter(norm1)
+    len1 = len(norm1)
+    for norm2, bag2 in fuzzy_norms.items():
+        if norm1 == norm2:
+            cap = 0.95
+        elif norm1 in norm2 or norm2 in norm1:
+            cap = 0.9
+        elif len1 == 0 or not norm2:
+            continue
+        else:
+            len2 = len(norm2)
+            max_len = max(len1, len2)
+            if 1.0 - (abs(len1 - len2) / max_len) < fuzzy_threshold:
+                continue
+            bag_distance = max(sum((bag1 - bag2).values()), sum((bag2 - bag1).values()))
+            cap = 1.0 - (bag_distance / max_len)
+        if cap >= fuzzy_threshold and cap > 0.0:
+            return True
+    return False
+
+
+def ats_score_upper_bound(jd_model: dict, resume_model: dict, resume_text: str,
+                          fuzzy_threshold: float = 0.85) -> int:
+    """
+    Upper bound on calculate_ats_score(...)['total'] without full matching.
+
+    Keywords count as matched if a resume token is one of their aliases, or
+    unless _could_match proves that no stage of match_keywords can match them, so the bound is never below the real
+    total. Ranking code uses it to skip partial/fuzzy matching and
+    recommendations for candidates that cannot reach a cut-off.
+    """
+    resume_tokens = resume_model.get('tokens', [])
+    token_set = {t['normalized'] for t in resume_tokens}
+    alias_set = {t['canonical'] for t in resume_tokens if 'canonical' in t}
+    joined_tokens = '\n'.join(token_set)
+    fuzzy_norms = {}
+    for token in token_set:
+        norm = _normalize_for_fuzzy_matching(token)
+        if norm not in fuzzy_norms:
+            fuzzy_norms[norm] = Counter(norm)
+
+    matched = {cat: 0 for cat in SCORED_CATEGORIES}
+    totals = {cat: 0 for cat in SCORED_CATEGORIES}
+    for kw in jd_model.get('categorizedKeywords', []):
+        cat = kw['category']
+        if cat not in totals:
+            continue
+        totals[cat] += 1
+        keyword = kw['keyword'].lower()
+        if keyword in alias_set or _could_match(keyword, token_set, joined_tokens, fuzzy_norms, fuzzy_threshold):
+            matched[cat] += 1
+
+    return _weighted_total(
+        _category_score(matched['hard_skill'], totals['hard_skill']),
+        _category_score(matched['tool'], totals['tool']),
+        _category_score(matched['concept'], totals['concept']),
+        _role_title_score(jd_model, resume_text),
+        _structure_score(resume_text)
+    )
+
+
+def generate_recommendations(match_results: list) -> list:
+    """
+    Generate actionable recommendations from match results.
+    
+    Returns a list of Recommendation dicts:
+    {
+        id: string,
+        message: string,
+        severity: 'info' | 'warning' | 'critical',
+        targetLocation?: string,
+        category?: KeywordCategory,
+        keyword?: string
+    }
+    """
+    recommendations = []
+    
+    # Group missing keywords by category
+    missing_by_category = {
+        'hard_skill': [],
+        'tool': [],
+        'concept': [],
+        'soft_skill': []
+    }
+    
+    for result in match_results:
+        if result['status'] == 'missing':
+            cat = result['category']
+            if cat in missing_by_category:
+                missing_by_category[cat].append(result['keyword'])
+    
+    # Generate recommendations for missing high-priority keywords
+    if missing_by_category['hard_skill']:
+        keywords = missing_by_category['hard_skill'][:3]
+        recommendations.append({
+            'id': _generate_id(),
+            'message': f"Add these technical skills to your experience or skills section: {', '.join(keywords)}",
+            'severity': 'critical',
+            'targetLocation': 'experience',
+            'category': 'hard_skill'
+        })
+    
+    if missing_by_category['tool']:
+        keywords = missing_by_category['tool'][:3]
+        recommendations.append({
+            'id': _generate_id(),
+            'message': f"Consider adding experience with these tools: {', '.join(keywords)}",
+            'severity': 'warning',
+            'targetLocation': 'skills',
+            'category': 'tool'
+        })
+    
+    if missing_by_category['concept']:
+        keywords = missing_by_category['concept'][:2]
+        recommendations.append({
+            'id': _generate_id(),
+            'message': f"Include these relevant concepts in your resume: {', '.join(keywords)}",
+            'severity': 'info',
+            'targetLocation': 'summary',
+            'category': 'concept'
+        })
+    
+    return recommendations
+
+
+def evaluate_ats(resume_text: str, jd_text: str, mode: str = 'full', deadline_ms: Optional[float] = None) -> dict:
+    """
+    Complete ATS evaluation - the main entry point for structured ATS analysis.
+    
+    Returns ATSEvaluationResponse:
+    {
+        jdModel: JobDescriptionModel,
+        matchResults: MatchResultModel[],
+        scoreBreakdown: ATSScoreBreakdown,
+        recommendations: Recommendation[]
+    }
+    
+    mode='triage' only counts exact lexicon hits and returns ATSTriageResponse:
+    {mode: 'triage', jdModel, matchResults (without locations), scoreBreakdown}.
+    Its total is a lower bound of the full total; promote_evaluation() fills
+    in the rest for shortlisted candidates.
+    
+    deadline_ms bounds a full evaluation for interactive use: keywords are
+    matched cheapest stage first (see _staged_matches) and matching stops
+    once deadline_ms have passed since the call started. Keywords left
+    undecided count as missing, so the total is a lower bound, but get no
+    recommendations. The response then also has
+    {unevaluatedKeywords: string[], deadlineExceeded: boolean}.
+    """
+    return _default_engine.evaluate_ats(resume_text, jd_text, mode, deadline_ms)
+
+
+def _evaluate_ats(analysis: '_DocumentAnalysis', resume_text: str, jd_text: str, mode: str = 'full',
+                  deadline_ms: Optional[float] = None) -> dict:
+    started = time.perf_counter()
+    _check_mode(mode)
+    
+    # Parse JD
+    jd_model = analysis.jd_model(jd_text)
+    
+    # Parse resume
+    resume_model = analysis.resume_model(resume_text)
+    
+    if mode == 'triage':
+        match_results = _match_keywords_exact(jd_model, resume_model)
+        return {
+            'mode': 'triage',
+            'jdModel': jd_model,
+            'matchResults': match_results,
+            'scoreBreakdown': calculate_ats_score(jd_model, match_results, resume_text)
+        }
+    
+    if deadline_ms is not None:
+        match_results: List[Any] = [None] * len(jd_model.get('categorizedKeywords', []))
+        for index, result in _staged_matches(jd_model, resume_model, deadline=started + deadline_ms / 1000):
+            match_results[index] = result
+        return _bounded_evaluation(jd_model, match_results, resume_text)
+    
+    # Match keywords
+    match_results = match_keywords(jd_model, resume_model)
+    
+    return _full_evaluation(jd_model, match_results, resume_text)
+
+
+def _full_evaluation(jd_model: dict, match_results: list, resume_text: str) -> dict:
+    """ATSEvaluationResponse around finished match results: score and recommendations."""
+    return {
+        'jdModel': jd_model,
+        'matchResults': match_results,
+        'scoreBreakdown': calculate_ats_score(jd_model, match_results, resume_text),
+        'recommendations': generate_recommendations(match_results)
+    }
+
+
+def _bounded_evaluation(jd_model: dict, match_results: list, resume_text: str) -> dict:
+    """Deadline response: match_results entries left None (undecided) are reported as unevaluated."""
+    keywords = jd_model.get('categorizedKeywords', [])
+    unevaluated = [index for index, result in enumerate(match_results) if result is None]
+    for index in unevaluated:
+        kw = keywords[index]
+        match_results[index] = {
+            'keyword': kw['keyword'],
+            'category': kw['category'],
+            'status': 'missing',
+            'locations': [],
+            'scoreContribution': 0
+        }
+    skipped = set(unevaluated)
+    
+    return {
+        'jdModel': jd_model,
+        'matchResults': match_results,
+        'scoreBreakdown': calculate_ats_score(jd_model, match_results, resume_text),
+        'recommendations': generate_recommendations(
+            [result for index, result in enumerate(match_results) if index not in skipped]),
+        'unevaluatedKeywords': [keywords[index]['keyword'] for index in unevaluated],
+        'deadlineExceeded': bool(unevaluated)
+    }
+
+
+# --- Streaming Matches ---
+
+def iter_match_keywords(jd_model: dict, resume_model: dict, fuzzy_threshold: float = 0.85) -> Iterator[dict]:
+    """
+    match_keywords() as a stream: yields each MatchResultModel as soon as it is decided.
+    
+    Exact matches come first, then partial, then fuzzy matches and misses
+    (see _staged_matches), so cheap results arrive before any fuzzy scan
+    starts. Each result equals its match_keywords() counterpart; only the
+    order differs. Feed them to a ScoreAccumulator for running scores.
+    """
+    for _, result in _staged_matches(jd_model, resume_model, fuzzy_threshold):
+        yield result
+
+
+class ScoreAccumulator:
+    """
+    Running calculate_ats_score() over match results as they arrive.
+    
+    breakdown() counts keywords not added yet as missing, so its total never
+    drops and ends equal to calculate_ats_score()'s; max_total() counts them
+    as matched instead, so the two bracket the final total.
+    """
+    
+    def __init__(self, jd_model: dict, resume_text: str):
+        keywords = jd_model.get('categorizedKeywords', [])
+        self.keywords = len(keywords)
+        self.totals = Counter(kw['category'] for kw in keywords)
+        self.pending = Counter(self.totals)
+        self.matched: Counter = Counter()
+        self.matched_keywords: List[str] = []
+        self.decided = 0
+        self.role_title_score = _role_title_score(jd_model, resume_text)
+        self.structure_score = _structure_score(resume_text)
+    
+    def add(self, result: dict) -> None:
+        self.decided += 1
+        self.pending[result['category']] -= 1
+        if result['status'] == 'matched':
+            self.matched[result['category']] += 1
+            self.matched_keywords.append(result['keyword'])
+    
+    def _scores(self, extra: Counter) -> List[int]:
+        return [_category_score(self.matched[cat] + extra[cat], self.totals[cat]) for cat in SCORED_CATEGORIES]
+    
+    def breakdown(self) -> dict:
+        """ATSScoreBreakdown over the keywords decided so far; the rest count as missing."""
+        hard_skill_score, tools_score, concept_score = self._scores(Counter())
+        return {
+            'hardSkillScore': hard_skill_score,
+            'toolsScore': tools_score,
+            'conceptScore': concept_score,
+            'roleTitleScore': self.role_title_score,
+            'structureScore': self.structure_score,
+            'total': _weighted_total(hard_skill_score, tools_score, concept_score,
+                                     self.role_title_score, self.structure_score)
+        }
+    
+    def max_total(self) -> int:
+        """Highest total still reachable if every undecided keyword matches."""
+        return _weighted_total(*self._scores(self.pending), self.role_title_score, self.structure_score)
+    
+    def snapshot(self) -> dict:
+        """
+        Returns: {decided, keywords, scoreBreakdown, maxTotal, matchedKeywords: string[]}
+        """
+        return {
+            'decided': self.decided,
+            'keywords': self.keywords,
+            'scoreBreakdown': self.breakdown(),
+            'maxTotal': self.max_total(),
+            'matchedKeywords': list(self.matched_keywords)
+        }
+
+
+def iter_evaluate_ats(resume_text: str, jd_text: str) -> Iterator[dict]:
+    """
+    evaluate_ats() with progress, for UIs that show scores while fuzzy matching runs.
+    
+    Yields a ScoreAccumulator snapshot plus {matchResult, done: false} after
+    each decided keyword (exact matches first), then a final
+    {matchResult: null, done: true, evaluation} event whose evaluation equals
+    evaluate_ats(resume_text, jd_text).
+    """
+    return _default_engine.iter_evaluate_ats(resume_text, jd_text)
+
+
+def _iter_evaluate_ats(analysis: '_DocumentAnalysis', resume_text: str, jd_text: str) -> Iterator[dict]:
+    jd_model = analysis.jd_model(jd_text)
+    resume_model = analysis.resume_model(resume_text)
+    accumulator = ScoreAccumulator(jd_model, resume_text)
+    match_results: List[Any] = [None] * accumulator.keywords
+    
+    for index, result in _staged_matches(jd_model, resume_model):
+        match_results[index] = result
+        accumulator.add(result)
+        event = accumulator.snapshot()
+        event['matchResult'] = result
+        event['done'] = False
+        yield event
+    
+    event = accumulator.snapshot()
+    event['matchResult'] = None
+    event['done'] = True
+    event['evaluation'] = _full_evaluation(jd_model, match_results, resume_text)
+    yield event
+
+
+def promote_evaluation(triage_result: dict, resume_text: str) -> dict:
+    """
+    Complete an evaluate_ats(mode='triage') result into a full ATSEvaluationResponse.
+    
+    The parsed JD from the triage result is reused as-is (same id); only the
+    resume-side matching stages, scoring and recommendations are run.
+    """
+    return _default_engine.promote_evaluation(triage_result, resume_text)
+
+
+def _promote_evaluation(analysis: '_DocumentAnalysis', triage_result: dict, resume_text: str) -> dict:
+    if triage_result.get('mode') != 'triage':
+        return triage_result
+    jd_model = triage_result['jdModel']
+    match_results = match_keywords(jd_model, analysis.resume_model(resume_text))
+    return _full_evaluation(jd_model, match_results, resume_text)
+
+
+# --- Batched Bridge Entry Point ---
+
+class _DocumentAnalysis:
+    """
+    Per-request memo of document-level analysis, keyed by the raw text.
+
+    Entry points that run in one dispatch() call share an instance, so a
+    resume or JD that several operations touch is sectioned, keyword-scanned
+    and parsed only once. Cached values are shared, so callers must copy
+    before mutating.
+    """
+
+    def __init__(self, lexicon: Lexicon):
+        self.lexicon = lexicon
+        self._cache: Dict[tuple, Any] = {}
+
+    def _memo(self, key: tuple, compute):
+        hit = key in self._cache
+        if not hit:
+            self._cache[key] = compute()
+        if _metrics_sink is not None:
+            _metrics_sink.observe_cache('analysis', int(hit), int(not hit))
+        return self._cache[key]
+
+    def section_spans(self, text: str) -> SectionSpans:
+        return self._memo(('spans', text), lambda: _resume_section_spans(self.lexicon, text))
+
+    def sections(self, text: str) -> Dict[str, str]:
+        return self._memo(('sections', text), lambda: self.section_spans(text).as_dict())
+
+    def name(self, text: str) -> Optional[str]:
+        return self._memo(('name', text), lambda: extract_name(text))
+
+    def keywords(self, text: str, topn: int) -> List[str]:
+        return self._memo(('keywords', text, topn), lambda: _extract_keywords(self.lexicon, text, topn))
+
+    def jd_model(self, text: str) -> dict:
+        return self._memo(('jd', text), lambda: _parse_jd(self.lexicon, text))
+
+    def resume_model(self, text: str) -> dict:
+        return self._memo(('resume', text), lambda: _parse_resume_canonical(self.lexicon, self.section_spans(text)))
+
+
+# Operation name (as used by usePyNLP.ts) -> handler(analysis, args)
+DISPATCH_OPERATIONS = {
+    'parseResume': lambda analysis, args: _parse_resume(analysis, args['text']),
+    'scoreATS': lambda analysis, args: _score_ats(analysis, args['resumeText'], args['jdText'], args.get('mode', 'full')),
+    'promoteScore': lambda analysis, args: _promote_score(analysis, args['triageResult'], args['resumeText']),
+    'optimizeResume': lambda analysis, args: _optimize_resume_output(
+        analysis, args['resumeText'], args['jdText'], args.get('output', 'text')),
+    'rewriteBullet': lambda analysis, args: rewrite_bullet(args['bullet'], args['keyword']),
+    'parseJD': lambda analysis, args: analysis.jd_model(args['text']),
+    'parseResumeCanonical': lambda analysis, args: analysis.resume_model(args['text']),
+    'evaluateATS': lambda analysis, args: _evaluate_ats(analysis, args['resumeText'], args['jdText'], args.get('mode', 'full'),
+                                                        args.get('deadlineMs')),
+    'promoteEvaluation': lambda analysis, args: _promote_evaluation(analysis, args['triageResult'], args['resumeText']),
+}
+
+
+def dispatch(requests_json: str) -> str:
+    """
+    Run several operations in one bridge crossing.
+
+    Takes a JSON list of {id?, op, args} requests and returns a JSON list of
+    {id, result} or {id, error} entries in the same order. All operations
+    share one _DocumentAnalysis, so e.g. parseJD followed by evaluateATS on
+    the same JD parses it once (and both report the same JD id). A failing
+    operation reports its error without aborting the rest of the batch.
+    """
+    return _default_engine.dispatch(requests_json)
+
+
+def _dispatch(analysis: _DocumentAnalysis, requests_json: str) -> str:
+    requests = json.loads(requests_json)
+    responses = []
+    for request in requests:
+        request_id = request.get('id')
+        op = request.get('op')
+        handler = DISPATCH_OPERATIONS.get(op)
+        if handler is None:
+            responses.append({'id': request_id, 'error': f"Unknown operation: {op}"})
+            continue
+        try:
+            responses.append({'id': request_id, 'result': handler(analysis, request.get('args') or {})})
+        except Exception as e:
+            responses.append({'id': request_id, 'error': f"{type(e).__name__}: {e}"})
+    return json.dumps(responses)
+
+
+# --- Async API ---
+
+# Work between two yields to the event loop. In Pyodide a yield lets the browser render
+# and handle input; each one costs a setTimeout round trip, so slices stay a few ms long.
+DEFAULT_TIME_SLICE_MS = 10
+
+async def evaluate_ats_async(resume_text: str, jd_text: str, mode: str = 'full',
+                             deadline_ms: Optional[float] = None,
+                             time_slice_ms: float = DEFAULT_TIME_SLICE_MS) -> dict:
+    """
+    evaluate_ats() as a coroutine that yields to the event loop every
+    time_slice_ms of work, so a long evaluation does not block the browser's
+    main thread (Pyodide) or a service's other tasks (CPython asyncio).
+    
+    Parsing runs as one chunk per document; keyword matching pauses between
+    keywords and inside fuzzy scans. The result equals evaluate_ats(); a
+    deadline_ms counts wall time since the call, including pauses.
+    """
+    return await _default_engine.evaluate_ats_async(resume_text, jd_text, mode, deadline_ms, time_slice_ms)
+
+
+async def _evaluate_ats_async(analysis: _DocumentAnalysis, resume_text: str, jd_text: str, mode: str,
+                              deadline_ms: Optional[float], time_slice: _TimeSlice) -> dict:
+    started = time.perf_counter()
+    _check_mode(mode)
+    jd_model = analysis.jd_model(jd_text)
+    await time_slice.checkpoint()
+    resume_model = analysis.resume_model(resume_text)
+    await time_slice.checkpoint()
+    if mode == 'triage':
+        # Exact lookups only; the parses above are memoized
+        return _evaluate_ats(analysis, resume_text, jd_text, mode)
+    
+    deadline = started + deadline_ms / 1000 if deadline_ms is not None else None
+    match_results: List[Any] = [None] * len(jd_model.get('categorizedKeywords', []))
+    for index, result in _staged_matches(jd_model, resume_model, deadline=deadline, time_slice=time_slice):
+        if result is None:
+            await time_slice.pause()
+        else:
+            match_results[index] = result
+    await time_slice.checkpoint()
+    if deadline is not None:
+        return _bounded_evaluation(jd_model, match_results, resume_text)
+    return _full_evaluation(jd_model, match_results, resume_text)
+
+
+async def map_evaluate_async(pairs, mode: str = 'full', deadline_ms: Optional[float] = None,
+                             time_slice_ms: float = DEFAULT_TIME_SLICE_MS) -> List[dict]:
+    """
+    evaluate_ats_async() over (resume_text, jd_text) pairs, one after another,
+    e.g. one resume against several JDs. Results are in input order; a
+    document that appears in several pairs is parsed once. deadline_ms
+    applies to each evaluation separately.
+    """
+    return await _default_engine.map_evaluate_async(pairs, mode, deadline_ms, time_slice_ms)
+
+
+async def optimize_resume_async(resume_text: str, job_desc: str, output: str = 'text',
+                                time_slice_ms: float = DEFAULT_TIME_SLICE_MS):
+    """optimize_resume() as a coroutine, yielding to the event loop between its analysis steps."""
+    return await _default_engine.optimize_resume_async(resume_text, job_desc, output, time_slice_ms)
+
+
+async def _optimize_resume_async(analysis: _DocumentAnalysis, resume_text: str, job_desc: str, output: str,
+                                 time_slice: _TimeSlice):
+    # Warm the memoized steps one chunk at a time; the final pass only reads them back
+    analysis.section_spans(resume_text)
+    await time_slice.checkpoint()
+    _missing_keywords(analysis, resume_text, job_desc)
+    await time_slice.checkpoint()
+    return _optimize_resume_output(analysis, resume_text, job_desc, output)
+
+
+# --- Engine ---
+
+class ATSEngine:
+    """
+    The public API bound to one immutable Lexicon.
+
+    Methods mirror the module functions of the same name. An engine holds no
+    mutable state (each call gets its own _DocumentAnalysis), so one instance
+    can serve any number of threads, and different engines can use different
+    lexicons side by side. The module functions are a facade over the default
+    engine built from shared-constants.json (see default_engine()).
+    """
+
+    __slots__ = ('lexicon',)
+
+    def __init__(self, lexicon: Lexicon):
+        object.__setattr__(self, 'lexicon', lexicon)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"ATSEngine is immutable (cannot set {name!r})")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"ATSEngine is immutable (cannot delete {name!r})")
+
+    def _analysis(self) -> _DocumentAnalysis:
+        return _DocumentAnalysis(self.lexicon)
+
+    def engine_version(self) -> str:
+        return f"{ENGINE_VERSION}+{self.lexicon.fingerprint}"
+
+    # Lexicon-independent steps, so an engine offers the whole API
+    extract_contact_info = staticmethod(extract_contact_info)
+    extract_name = staticmethod(extract_name)
+    calculate_readability = staticmethod(calculate_readability)
+    rewrite_bullet = staticmethod(rewrite_bullet)
+    apply_edits = staticmethod(apply_edits)
+    jd_section_spans = staticmethod(jd_section_spans)
+    match_keywords = staticmethod(match_keywords)
+    iter_match_keywords = staticmethod(iter_match_keywords)
+    calculate_ats_score = staticmethod(calculate_ats_score)
+    concept_vectors = staticmethod(concept_vectors)
+    concept_similarity_score = staticmethod(concept_similarity_score)
+    ats_score_upper_bound = staticmethod(ats_score_upper_bound)
+    generate_recommendations = staticmethod(generate_recommendations)
+
+    def extract_skills(self, text: str) -> List[str]:
+        return _extract_skills(self.lexicon, text)
+
+    def identify_section(self, line: str) -> Optional[str]:
+        return _identify_section(self.lexicon, line)
+
+    def resume_section_spans(self, text: str) -> SectionSpans:
+        return _resume_section_spans(self.lexicon, text)
+
+    def parse_resume_sections(self, text: str) -> Dict[str, str]:
+        return _resume_section_spans(self.lexicon, text).as_dict()
+
+    def extract_keywords(self, text: str, topn: int = 30) -> List[str]:
+        return _extract_keywords(self.lexicon, text, topn)
+
+    def parse_resume(self, text: str) -> dict:
+        return _parse_resume(self._analysis(), text)
+
+    @_observed('score_ats')
+    def score_ats(self, resume_text: str, job_desc: str, mode: str = 'full') -> dict:
+        return _score_ats(self._analysis(), resume_text, job_desc, mode)
+
+    def promote_score(self, triage_result: dict, resume_text: str) -> dict:
+        return _promote_score(self._analysis(), triage_result, resume_text)
+
+    @_observed('optimize_resume')
+    def optimize_resume(self, resume_text: str, job_desc: str, output: str = 'text'):
+        return _optimize_resume_output(self._analysis(), resume_text, job_desc, output)
+
+    @_observed('parse_jd')
+    def parse_jd(self, text: str) -> dict:
+        return _parse_jd(self.lexicon, text)
+
+    def parse_resume_canonical(self, text: str) -> dict:
+        return _parse_resume_canonical(self.lexicon, _resume_section_spans(self.lexicon, text))
+
+    @_observed('evaluate_ats')
+    def evaluate_ats(self, resume_text: str, jd_text: str, mode: str = 'full',
+                     deadline_ms: Optional[float] = None) -> dict:
+        return _evaluate_ats(self._analysis(), resume_text, jd_text, mode, deadline_ms)
+
+    def promote_evaluation(self, triage_result: dict, resume_text: str) -> dict:
+        return _promote_evaluation(self._analysis(), triage_result, resume_text)
+
+    def iter_evaluate_ats(self, resume_text: str, jd_text: str) -> Iterator[dict]:
+        return _iter_evaluate_ats(self._analysis(), resume_text, jd_text)
+
+    @_observed('dispatch')
+    def dispatch(self, requests_json: str) -> str:
+        return _dispatch(self._analysis(), requests_json)
+
+    async def evaluate_ats_async(self, resume_text: str, jd_text: str, mode: str = 'full',
+                                 deadline_ms: Optional[float] = None,
+                                 time_slice_ms: float = DEFAULT_TIME_SLICE_MS) -> dict:
+        return await _evaluate_ats_async(self._analysis(), resume_text, jd_text, mode, deadline_ms,
+                                         _TimeSlice(time_slice_ms))
+
+    async def map_evaluate_async(self, pairs, mode: str = 'full', deadline_ms: Optional[float] = None,
+                                 time_slice_ms: float = DEFAULT_TIME_SLICE_MS) -> List[dict]:
+        _check_mode(mode)
+        analysis = self._analysis()
+        time_slice = _TimeSlice(time_slice_ms)
+        results = []
+        for resume_text, jd_text in pairs:
+            results.append(await _evaluate_ats_async(analysis, resume_text, jd_text, mode, deadline_ms, time_slice))
+        return results
+
+    async def optimize_resume_async(self, resume_text: str, job_desc: str, output: str = 'text',
+                                    time_slice_ms: float = DEFAULT_TIME_SLICE_MS):
+        return await _optimize_resume_async(self._analysis(), resume_text, job_desc, output,
+                                            _TimeSlice(time_slice_ms))
+
+    def map_evaluate(self, pairs, mode: str = 'full', max_workers: Optional[int] = None,
+                     executor: Optional[Any] = None, deadline_ms: Optional[float] = None) -> List[dict]:
+        """
+        evaluate_ats over (resume_text, jd_text) pairs on a thread pool.
+
+        Results are in input order. Pass an executor to reuse a pool across
+        calls; otherwise one with max_workers threads is created for this call.
+        deadline_ms applies to each evaluation separately.
+        Threads only run Python code in parallel on a free-threaded build, but
+        they let callers share one engine without copying its lexicon.
+        """
+        _check_mode(mode)
+        evaluate = lambda pair: self.evaluate_ats(pair[0], pair[1], mode, deadline_ms)
+        if executor is not None:
+            return list(executor.map(evaluate, pairs))
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            return list(pool.map(evaluate, pairs))
+
+
+_default_engine: ATSEngine
+
+def default_engine() -> ATSEngine:
+    """The engine behind the module functions, built from the shared constants."""
+    return _default_engine
+
+# Load constants on module import
+_load_shared_constants()
+
+
+if __name__ == "__main__":
+    sample_resume = """
+    John Doe
+    john.doe@example.com | 123-456-7890
+    linkedin.com/in/johndoe
+    
+    Summary
+    Experienced Software Engineer with expertise in Python and React.
+    
+    Experience
+    Senior Engineer at Tech Corp
+    - Led a team of 5 developers to build a cloud platform using AWS and Docker.
+    - Optimized database queries, reducing latency by 30%.
+    
+    Skills
+    Python, JavaScript, React, AWS, Docker, SQL, Git
+    """
+    
+    sample_jd = """
+    We are looking for a Senior Software Engineer with strong Python and React skills.
+    Experience with AWS and CI/CD is required.
+    """
+    
+    print("--- Testing Parse Resume ---")
+    parsed = parse_resume(sample_resume)
+    import json
+    print(json.dumps(parsed, indent=2))
+    
+    print("\n--- Testing ATS Score ---")
+    scored = score_ats(sample_resume, sample_jd)
+    print(json.dumps(scored, indent=2))
@@ -0,0 +1,395 @@
+# Equivalence Harness - differential testing of nlp_core against a frozen reference engine
+# For batch/service use; the browser build never imports this module.
+#
+# Run with: python nlp_equivalence.py [--generated 300] [--seed 0] [--corpus requests.jsonl]
+#                                     [--reference path/to/nlp_core.py] [--output report.json]
+#
+# Both engines run every operation on the same (resume, jd) cases; every output
+# field must be equal (generated ids aside). Path operations run the batched,
+# streaming and async entry points on the optimized side only and hold them to
+# the reference's plain single calls. Mismatching cases are shrunk to a
+# minimal input, and per-operation timings give the speedup over the reference.
+# Exits non-zero on any mismatch, which makes it usable as a CI gate.
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import os
+import random
+import sys
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import nlp_core
+import nlp_batch
+from bench_nlp_core import synthetic_resume, synthetic_jd
+
+# Operation -> call on an engine (nlp_core-like module or ATSEngine) for one case
+OPERATIONS: Dict[str, Callable[[Any, str, str], Any]] = {
+    'parse_resume': lambda engine, resume, jd: engine.parse_resume(resume),
+    'parse_jd': lambda engine, resume, jd: engine.parse_jd(jd),
+    'score_ats': lambda engine, resume, jd: engine.score_ats(resume, jd),
+    'match_keywords': lambda engine, resume, jd: engine.match_keywords(
+        engine.parse_jd(jd), engine.parse_resume_canonical(resume)),
+    'evaluate_ats': lambda engine, resume, jd: engine.evaluate_ats(resume, jd),
+}
+
+
+def _resumes(resume: str, jd: str) -> List[str]:
+    """A case's pool for the batch paths: the resume, the JD read as a resume, and the resume again."""
+    return [resume, jd, resume]
+
+
+def _ats_engine(engine):
+    """engine itself if it is an ATSEngine, else the default engine of an nlp_core-like module."""
+    return engine if isinstance(engine, nlp_core.ATSEngine) else engine.default_engine()
+
+
+def _evaluations(engine, resume: str, jd: str) -> List[dict]:
+    return [engine.evaluate_ats(text, jd) for text in _resumes(resume, jd)]
+
+
+def _ranked(engine, resume: str, jd: str, k: int) -> List[dict]:
+    """rank_top_k's topK by evaluating every resume and sorting by total (stable, so ties keep input order)."""
+    evaluations = _evaluations(engine, resume, jd)
+    order = sorted(range(len(evaluations)), key=lambda i: -evaluations[i]['scoreBreakdown']['total'])
+    return [{'index': i, 'total': evaluations[i]['scoreBreakdown']['total'], 'evaluation': evaluations[i]}
+            for i in order[:k]]
+
+
+def _dispatched(engine, resume: str, jd: str) -> dict:
+    request = {'op': 'evaluateATS', 'args': {'resumeText': resume, 'jdText': jd}}
+    return json.loads(engine.dispatch(json.dumps([request])))[0]['result']
+
+
+RANK_K = 2  # of the three _resumes, so rank_top_k gets to prune
+
+# Operation -> (call on the reference, the same result by another path on the optimized engine).
+# nlp_batch only runs on nlp_core's default engine, whatever the optimized engine is.
+PATH_OPERATIONS: Dict[str, Tuple[Callable[[Any, str, str], Any], Callable[[Any, str, str], Any]]] = {
+    'dispatch': (lambda engine, resume, jd: engine.evaluate_ats(resume, jd), _dispatched),
+    'map_evaluate': (_evaluations, lambda engine, resume, jd: _ats_engine(engine).map_evaluate(
+        [(text, jd) for text in _resumes(resume, jd)])),
+    'evaluate_ats_many': (_evaluations, lambda engine, resume, jd: nlp_batch.evaluate_ats_many(
+        _resumes(resume, jd), jd)['results']),
+    'rank_top_k': (lambda engine, resume, jd: _ranked(engine, resume, jd, RANK_K),
+                   lambda engine, resume, jd: nlp_batch.rank_top_k(_resumes(resume, jd), jd, RANK_K)['topK']),
+    'iter_evaluate_ats': (lambda engine, resume, jd: engine.evaluate_ats(resume, jd),
+                          lambda engine, resume, jd: list(engine.iter_evaluate_ats(resume, jd))[-1]['evaluation']),
+    'evaluate_ats_async': (lambda engine, resume, jd: engine.evaluate_ats(resume, jd),
+                           lambda engine, resume, jd: asyncio.run(engine.evaluate_ats_async(resume, jd))),
+    'promote_evaluation': (lambda engine, resume, jd: engine.evaluate_ats(resume, jd),
+                           lambda engine, resume, jd: engine.promote_evaluation(
+                               engine.evaluate_ats(resume, jd, mode='triage'), resume)),
+    'optimize_resume_many': (
+        lambda engine, resume, jd: [engine.optimize_resume(resume, text) for text in (jd, resume)],
+        lambda engine, resume, jd: engine.optimize_resume_many(resume, [jd, resume])),
+}
+
+# Fields that differ between any two calls (uuid4 ids), never compared
+VOLATILE_KEYS = frozenset({'id'})
+
+MAX_MINIMIZED = 10  # mismatches shrunk and reported in full; the rest are only counted
+MAX_CHAR_UNITS = 400  # character-level shrinking only below this size
+
+
+def load_reference(path: Optional[str] = None):
+    """
+    The reference engine: nlp_core_reference.py by default, or any nlp_core.py
+    revision at path (e.g. one written out with `git show REV:public/py-nlp/nlp_core.py`).
+    """
+    if path is None:
+        import nlp_core_reference
+        return nlp_core_reference
+    spec = importlib.util.spec_from_file_location(f"nlp_reference_{abs(hash(os.path.abspath(path)))}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# --- Corpora ---
+
+_VARIANT_TOKENS = ['k8s', 'ReactJS', 'React.js', 'node', 'nodejs', 'Postgres', 'golang', 'C++', 'C#', 'CI/CD',
+                   'ASP.NET', 'Next.js', 'py', 'ts', 'İstanbul', 'naïve', '🚀', 'R', 'Go']
+_HEADERS = ['Summary', 'Experience', 'Skills', 'Education', 'Projects', 'Requirements:', 'Responsibilities:',
+            'Nice to Have:', 'SKILLS', 'Work History']
+
+
+def _mutate(text: str, rng: random.Random) -> str:
+    """A few random line-level edits that push documents off the happy path."""
+    lines = text.split('\n')
+    for _ in range(rng.randint(1, 4)):
+        choice = rng.randrange(6)
+        at = rng.randrange(len(lines) + 1)
+        if choice == 0 and len(lines) > 1:
+            del lines[min(at, len(lines) - 1)]
+        elif choice == 1:
+            lines.insert(at, rng.choice(_HEADERS))
+        elif choice == 2:
+            lines.insert(at, '- ' + ' '.join(rng.choice(_VARIANT_TOKENS) for _ in range(rng.randint(1, 6))))
+        elif choice == 3:
+            lines.insert(at, ', '.join(rng.sample(_VARIANT_TOKENS, rng.randint(2, 6))))
+        elif choice == 4 and lines:
+            i = min(at, len(lines) - 1)
+            lines[i] = lines[i].upper() if rng.random() < 0.5 else lines[i].lstrip('-•* ')
+        else:
+            lines.insert(at, rng.choice(['', '•  ', '*', 'a@b', '555-0100 x12', 'https://example.com/x']))
+    return '\n'.join(lines)
+
+
+def _word_salad(rng: random.Random, vocabulary: List[str]) -> str:
+    words = [rng.choice(vocabulary) for _ in range(rng.randint(0, 120))]
+    return ' '.join(words)
+
+
+def _sparse_document(rng: random.Random, pool: List[str]) -> str:
+    """Random sections of short lines over a few of the pool's terms, so most keywords are missing."""
+    picked = rng.sample(pool, rng.randint(1, min(6, len(pool))))
+    lines = []
+    for header in rng.sample(_HEADERS, rng.randint(1, 4)):
+        lines.append(header)
+        for _ in range(rng.randint(0, 4)):
+            words = [rng.choice(picked) for _ in range(rng.randint(1, 3))]
+            lines.append(rng.choice(['- ', '• ', '']) + rng.choice(['Built ', 'Used ', '', 'Experience with ']) +
+                         rng.choice([' and ', ', ']).join(words))
+    return '\n'.join(lines)
+
+
+def generated_cases(count: int, seed: int = 0) -> Iterator[Tuple[str, str]]:
+    """Deterministic (resume, jd) cases: synthetic documents, mutated ones, sparse ones and word salad."""
+    rng = random.Random(seed)
+    vocabulary = (synthetic_resume(8) + ' ' + synthetic_jd(8)).split() + _VARIANT_TOKENS + _HEADERS + ['\n', '\n\n']
+    lexicon = nlp_core.default_engine().lexicon
+    terms = list(lexicon.tech_skills) + _VARIANT_TOKENS
+    aliases = sorted(lexicon.aliases.items())
+    for _ in range(count):
+        kind = rng.randrange(4)
+        if kind == 0:
+            yield synthetic_resume(rng.randint(0, 40)), synthetic_jd(rng.randint(0, 12))
+        elif kind == 1:
+            yield (_mutate(synthetic_resume(rng.randint(0, 40)), rng),
+                   _mutate(synthetic_jd(rng.randint(0, 12)), rng))
+        elif kind == 2:
+            # Resume and JD share a small pool of terms, like a real stack, with some spelled two ways
+            pool = rng.sample(terms, 7) + [form for pair in rng.sample(aliases, 3) for form in pair]
+            yield _sparse_document(rng, pool), _sparse_document(rng, pool)
+        else:
+            yield _word_salad(rng, vocabulary), _word_salad(rng, vocabulary)
+
+
+def recorded_cases(path: str) -> Iterator[Tuple[str, str]]:
+    """
+    Cases from a JSONL file of recorded {op, args} requests (the load harness's
+    --replay format) or plain {resume, jd} records.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if 'args' in record:
+                args = record['args']
+                yield args.get('resumeText', args.get('text', '')), args.get('jdText', args.get('text', ''))
+            else:
+                yield record.get('resume', ''), record.get('jd', '')
+
+
+# --- Comparison ---
+
+def _comparable(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _comparable(v) for k, v in value.items() if k not in VOLATILE_KEYS}
+    if isinstance(value, (list, tuple)):
+        return [_comparable(v) for v in value]
+    return value
+
+
+def first_difference(expected: Any, actual: Any, path: str = '$') -> Optional[str]:
+    """Path and values of the first difference between two outputs, or None if equal."""
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        if expected.keys() != actual.keys():
+            return (f"{path}: keys only in reference {sorted(expected.keys() - actual.keys())}, "
+                    f"only in optimized {sorted(actual.keys() - expected.keys())}")
+        for key in expected:
+            found = first_difference(expected[key], actual[key], f"{path}.{key}")
+            if found:
+                return found
+        return None
+    if isinstance(expected, list) and isinstance(actual, list):
+        for i, (a, b) in enumerate(zip(expected, actual)):
+            found = first_difference(a, b, f"{path}[{i}]")
+            if found:
+                return found
+        if len(expected) != len(actual):
+            return f"{path}: length {len(expected)} != {len(actual)}"
+        return None
+    if type(expected) is not type(actual) or expected != actual:
+        return f"{path}: {expected!r} != {actual!r}"
+    return None
+
+
+def _outcome(engine, operation: str, resume: str, jd: str, side: str = 'reference') -> Any:
+    """Comparable output, or the exception type: both engines must fail alike."""
+    if operation in PATH_OPERATIONS:
+        call = PATH_OPERATIONS[operation][side == 'optimized']
+    else:
+        call = OPERATIONS[operation]
+    try:
+        return _comparable(call(engine, resume, jd))
+    except Exception as e:
+        return {'raised': type(e).__name__}
+
+
+def _differs(reference, optimized, operation: str) -> Callable[[str, str], bool]:
+    return lambda resume, jd: (_outcome(reference, operation, resume, jd) !=
+                               _outcome(optimized, operation, resume, jd, 'optimized'))
+
+
+# --- Minimization ---
+
+def _shrink(units: List[str], joiner: str, fails: Callable[[str], bool]) -> List[str]:
+    """ddmin-style: drop ever smaller chunks of units while fails() holds."""
+    chunks = 2
+    while len(units) >= 2:
+        size = -(-len(units) // chunks)
+        for start in range(0, len(units), size):
+            candidate = units[:start] + units[start + size:]
+            if fails(joiner.join(candidate)):
+                units = candidate
+                chunks = max(chunks - 1, 2)
+                break
+        else:
+            if chunks >= len(units):
+                break
+            chunks = min(chunks * 2, len(units))
+    if len(units) == 1 and fails(''):
+        return []
+    return units
+
+
+def _shrink_text(text: str, fails: Callable[[str], bool]) -> str:
+    for joiner in ('\n', ' ', ''):
+        units = list(text) if joiner == '' else text.split(joiner)
+        if joiner == '' and len(units) > MAX_CHAR_UNITS:
+            break
+        text = joiner.join(_shrink(units, joiner, fails))
+    return text
+
+
+def minimize(resume: str, jd: str, fails: Callable[[str, str], bool]) -> Tuple[str, str]:
+    """
+    Smallest (resume, jd) found for which fails() still holds, removing lines,
+    then words, then characters of each document. Two rounds, since a smaller
+    JD can make more of the resume removable.
+    """
+    for _ in range(2):
+        previous = (resume, jd)
+        resume = _shrink_text(resume, lambda text: fails(text, jd))
+        jd = _shrink_text(jd, lambda text: fails(resume, text))
+        if (resume, jd) == previous:
+            break
+    return resume, jd
+
+
+# --- Harness ---
+
+def run_equivalence(cases, reference=None, optimized=None, operations: Optional[List[str]] = None,
+                    max_minimized: int = MAX_MINIMIZED) -> dict:
+    """
+    Run reference and optimized engines side by side on cases ((resume, jd) pairs).
+
+    Engines default to the frozen reference and the live nlp_core module; any
+    object with the nlp_core functions works (e.g. an ATSEngine). A path
+    operation (PATH_OPERATIONS) runs its plain calls on the reference and its
+    other path on the optimized engine. Each call is timed; the two engines
+    alternate who goes first to even out cache effects.
+
+    Returns:
+    {
+        cases: number,
+        equivalent: boolean,
+        operations: {[op]: {mismatches, referenceSeconds, optimizedSeconds, speedup}},
+        mismatches: [{operation, case, difference, resume, jd, originalChars: [resume, jd]}]
+    }
+    """
+    reference = reference if reference is not None else load_reference()
+    optimized = optimized if optimized is not None else nlp_core
+    operations = list(operations or [*OPERATIONS, *PATH_OPERATIONS])
+    stats = {op: {'mismatches': 0, 'referenceSeconds': 0.0, 'optimizedSeconds': 0.0} for op in operations}
+    mismatches = []
+    count = 0
+
+    for index, (resume, jd) in enumerate(cases):
+        count += 1
+        for operation in operations:
+            timings = {}
+            outcomes = {}
+            order = (('reference', reference), ('optimized', optimized))
+            for side, engine in (order if index % 2 == 0 else order[::-1]):
+                start = time.perf_counter()
+                outcomes[side] = _outcome(engine, operation, resume, jd, side)
+                timings[side] = time.perf_counter() - start
+            stats[operation]['referenceSeconds'] += timings['reference']
+            stats[operation]['optimizedSeconds'] += timings['optimized']
+            if outcomes['reference'] == outcomes['optimized']:
+                continue
+            stats[operation]['mismatches'] += 1
+            if len(mismatches) >= max_minimized:
+                continue
+            small_resume, small_jd = minimize(resume, jd, _differs(reference, optimized, operation))
+            mismatches.append({
+                'operation': operation,
+                'case': index,
+                'difference': first_difference(_outcome(reference, operation, small_resume, small_jd),
+                                               _outcome(optimized, operation, small_resume, small_jd, 'optimized')),
+                'resume': small_resume,
+                'jd': small_jd,
+                'originalChars': [len(resume), len(jd)]
+            })
+
+    for entry in stats.values():
+        entry['speedup'] = round(entry['referenceSeconds'] / entry['optimizedSeconds'], 3) \
+            if entry['optimizedSeconds'] else None
+        entry['referenceSeconds'] = round(entry['referenceSeconds'], 4)
+        entry['optimizedSeconds'] = round(entry['optimizedSeconds'], 4)
+    return {
+        'cases': count,
+        'equivalent': not any(entry['mismatches'] for entry in stats.values()),
+        'operations': stats,
+        'mismatches': mismatches
+    }
+
+
+# --- CLI ---
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Differential equivalence check of nlp_core against a reference')
+    parser.add_argument('--generated', type=int, default=300, help='number of generated cases')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--corpus', action='append', default=[],
+                        help='JSONL of recorded {op, args} requests or {resume, jd} records (repeatable)')
+    parser.add_argument('--reference', help='nlp_core.py revision to compare against (default: nlp_core_reference.py)')
+    parser.add_argument('--operation', action='append', choices=sorted([*OPERATIONS, *PATH_OPERATIONS]),
+                        help='restrict to these operations (repeatable)')
+    parser.add_argument('--output', help='also write the JSON report to this file')
+    args = parser.parse_args(argv)
+
+    def cases():
+        yield from generated_cases(args.generated, args.seed)
+        for path in args.corpus:
+            yield from recorded_cases(path)
+
+    report = run_equivalence(cases(), load_reference(args.reference), operations=args.operation)
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    print(text)
+    return 0 if report['equivalent'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+# Corpus IDF Table - offline job that counts term document frequencies for nlp_core
+# For batch/service use; the browser build never imports this module.
+#
+# Run with: python nlp_idf.py CORPUS.jsonl [CORPUS.jsonl ...] [--table PATH] [--output PATH]
+#
+# Every string field of a JSONL record ("text", "jd", "resume", or the string
+# arguments of the load harness's {op, args} replay lines) counts as one document.
+# With --table the new documents are added to that table's counts and it is written
+# back as the next version, so postings can be folded in as they arrive; without it
+# a fresh table is built. nlp_core loads the table from shared-constants.idf.json.
+
+import argparse
+import json
+import os
+import sys
+from collections import Counter
+from typing import Optional, Iterable, Iterator
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from nlp_core import ATSEngine, TermWeights, default_engine, read_term_weights
+
+PUBLIC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_TABLE_PATH = os.path.join(PUBLIC_DIR, 'shared-constants.idf.json')
+
+
+class TermStatistics:
+    """
+    Document frequencies of a stream of documents, counted with one engine's lexicon.
+
+    Pass the current table as base to continue it: table() then returns
+    base.updated(...), the next version. Terms are what nlp_core's
+    document_terms() extracts, so lookups in parse_jd and extract_keywords
+    see exactly the counted terms.
+    """
+
+    def __init__(self, engine: Optional[ATSEngine] = None, base: Optional[TermWeights] = None):
+        self.engine = engine if engine is not None else default_engine()
+        fingerprint = self.engine.lexicon.fingerprint
+        if base is not None and base.lexicon not in (None, fingerprint):
+            raise ValueError(f"Table was counted with lexicon {base.lexicon}, not {fingerprint}; "
+                             "rebuild it from the full corpus")
+        self.base = base
+        self.counts: Counter = Counter()
+        self.documents = 0
+
+    def add(self, text: str) -> None:
+        self.counts.update(self.engine.document_terms(text))
+        self.documents += 1
+
+    def add_many(self, texts: Iterable[str]) -> int:
+        """Count every text; returns how many were added."""
+        added = 0
+        for text in texts:
+            self.add(text)
+            added += 1
+        return added
+
+    def table(self) -> TermWeights:
+        if self.base is None:
+            return TermWeights(self.counts, self.documents, 1, self.engine.lexicon.fingerprint)
+        return self.base.updated(self.counts, self.documents)
+
+
+def corpus_documents(path: str) -> Iterator[str]:
+    """Documents of a JSONL corpus: every non-empty string field (or replay argument) of every record."""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            fields = record['args'] if isinstance(record.get('args'), dict) else record
+            for value in fields.values():
+                if isinstance(value, str) and value.strip():
+                    yield value
+
+
+def write_table(table: TermWeights, path: str) -> dict:
+    """
+    Write table atomically (readers never see a partial file).
+
+    Returns: {path, bytes, version, documents, terms}
+    """
+    data = json.dumps(table.to_data(), separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return {'path': path, 'bytes': len(data), 'version': table.version, 'documents': table.documents,
+            'terms': len(table)}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Build or update the corpus IDF table used by nlp_core')
+    parser.add_argument('corpus', nargs='+', help='JSONL files of documents')
+    parser.add_argument('--table', help='existing table to update incrementally')
+    parser.add_argument('--output', help=f'where to write the table (default: --table, else {DEFAULT_TABLE_PATH})')
+    args = parser.parse_args(argv)
+
+    base = None
+    if args.table:
+        base = read_term_weights(args.table)
+        if base is None:
+            print(f"Cannot read term weights table {args.table}", file=sys.stderr)
+            return 1
+    try:
+        statistics = TermStatistics(base=base)
+    except ValueError as e:
+        print(str(e), file=sys.stderr)
+        return 1
+    for path in args.corpus:
+        statistics.add_many(corpus_documents(path))
+
+    summary = write_table(statistics.table(), args.output or args.table or DEFAULT_TABLE_PATH)
+    summary['added'] = statistics.documents
+    print(json.dumps(summary, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
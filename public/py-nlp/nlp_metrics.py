@@ -0,0 +1,224 @@
+# Engine Metrics - Prometheus text-format metrics for the NLP core
+# For service deployments; the browser build never imports this module.
+#
+#   registry = enable_metrics()
+#   serve_metrics(registry, port=9464)        # GET /metrics
+#   registry.write_textfile('/var/lib/node_exporter/nlp.prom')
+
+import bisect
+import os
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Dict, Optional, Tuple
+
+from nlp_core import set_metrics_sink
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+INPUT_SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+MATCH_STAGES = ('exact', 'alias', 'partial', 'fuzzy', 'missing')
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _format_value(value: float) -> str:
+    if value == int(value):
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    if not labels:
+        return ''
+    escaped = (
+        f'{name}="' + value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+        for name, value in labels
+    )
+    return '{' + ','.join(escaped) + '}'
+
+
+class _Histogram:
+    """Cumulative-on-export histogram: per-bucket counts plus sum and count."""
+
+    __slots__ = ('bounds', 'counts', 'sum', 'count')
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def lines(self, name: str, labels: Tuple[Tuple[str, str], ...]) -> List[str]:
+        out = []
+        cumulative = 0
+        for bound, count in zip(self.bounds + (float('inf'),), self.counts):
+            cumulative += count
+            le = '+Inf' if bound == float('inf') else _format_value(bound)
+            out.append(f"{name}_bucket{_format_labels(labels + (('le', le),))} {cumulative}")
+        out.append(f"{name}_sum{_format_labels(labels)} {_format_value(self.sum)}")
+        out.append(f"{name}_count{_format_labels(labels)} {self.count}")
+        return out
+
+
+class MetricsRegistry:
+    """
+    In-process metrics for the NLP core, rendered in the Prometheus text format.
+
+    Installed as the nlp_core metrics sink by enable_metrics(). Tracks, per
+    public entry point, calls and errors, latency and input-size histograms;
+    keyword match stages (for the fuzzy fallback rate); and hits/misses of the
+    dispatch analysis memo and the persistent evaluation cache. Safe to share
+    between threads.
+    """
+
+    def __init__(self, latency_buckets: Tuple[float, ...] = LATENCY_BUCKETS,
+                 input_size_buckets: Tuple[int, ...] = INPUT_SIZE_BUCKETS):
+        self.latency_buckets = tuple(latency_buckets)
+        self.input_size_buckets = tuple(input_size_buckets)
+        self._lock = threading.Lock()
+        self._calls: Dict[Tuple[str, str], int] = {}
+        self._latency: Dict[str, _Histogram] = {}
+        self._input_size: Dict[str, _Histogram] = {}
+        self._matches: Dict[str, int] = dict.fromkeys(MATCH_STAGES, 0)
+        self._cache: Dict[Tuple[str, str], int] = {}
+
+    # --- Sink interface (called by nlp_core) ---
+
+    def observe_call(self, op: str, seconds: float, input_chars: int, error: bool) -> None:
+        outcome = 'error' if error else 'ok'
+        with self._lock:
+            self._calls[(op, outcome)] = self._calls.get((op, outcome), 0) + 1
+            latency = self._latency.get(op)
+            if latency is None:
+                latency = self._latency[op] = _Histogram(self.latency_buckets)
+                self._input_size[op] = _Histogram(self.input_size_buckets)
+            latency.observe(seconds)
+            self._input_size[op].observe(input_chars)
+
+    def observe_match(self, stage: str) -> None:
+        with self._lock:
+            self._matches[stage] = self._matches.get(stage, 0) + 1
+
+    def observe_cache(self, cache: str, hits: int, misses: int) -> None:
+        with self._lock:
+            self._cache[(cache, 'hit')] = self._cache.get((cache, 'hit'), 0) + hits
+            self._cache[(cache, 'miss')] = self._cache.get((cache, 'miss'), 0) + misses
+
+    # --- Queries ---
+
+    def calls(self, op: str, outcome: str = 'ok') -> int:
+        return self._calls.get((op, outcome), 0)
+
+    def fuzzy_fallback_rate(self) -> float:
+        """Share of keyword matches that needed the fuzzy stage."""
+        total = sum(self._matches.values())
+        reached = self._matches.get('fuzzy', 0) + self._matches.get('missing', 0)
+        return reached / total if total else 0.0
+
+    def cache_hit_rate(self, cache: str) -> float:
+        hits = self._cache.get((cache, 'hit'), 0)
+        total = hits + self._cache.get((cache, 'miss'), 0)
+        return hits / total if total else 0.0
+
+    def reset(self) -> None:
+        with self._lock:
+            self._calls.clear()
+            self._latency.clear()
+            self._input_size.clear()
+            self._matches = dict.fromkeys(MATCH_STAGES, 0)
+            self._cache.clear()
+
+    # --- Export ---
+
+    def render(self) -> str:
+        """The current metrics in the Prometheus text exposition format (0.0.4)."""
+        with self._lock:
+            lines = [
+                '# HELP nlp_calls_total Calls to NLP core entry points.',
+                '# TYPE nlp_calls_total counter',
+            ]
+            for (op, outcome), count in sorted(self._calls.items()):
+                lines.append(f"nlp_calls_total{_format_labels((('op', op), ('outcome', outcome)))} {count}")
+
+            lines += ['# HELP nlp_call_duration_seconds Latency of NLP core entry points.',
+                      '# TYPE nlp_call_duration_seconds histogram']
+            for op in sorted(self._latency):
+                lines += self._latency[op].lines('nlp_call_duration_seconds', (('op', op),))
+
+            lines += ['# HELP nlp_input_size_chars Input text length per call, in characters.',
+                      '# TYPE nlp_input_size_chars histogram']
+            for op in sorted(self._input_size):
+                lines += self._input_size[op].lines('nlp_input_size_chars', (('op', op),))
+
+            lines += ['# HELP nlp_keyword_matches_total JD keywords by the match stage that settled them.',
+                      '# TYPE nlp_keyword_matches_total counter']
+            for stage in sorted(self._matches):
+                lines.append(f"nlp_keyword_matches_total{_format_labels((('stage', stage),))} {self._matches[stage]}")
+            lines += ['# HELP nlp_fuzzy_fallback_ratio Share of keyword matches that reached the fuzzy stage.',
+                      '# TYPE nlp_fuzzy_fallback_ratio gauge',
+                      f"nlp_fuzzy_fallback_ratio {_format_value(self.fuzzy_fallback_rate())}"]
+
+            lines += ['# HELP nlp_cache_requests_total Cache lookups by result.',
+                      '# TYPE nlp_cache_requests_total counter']
+            for (cache, result), count in sorted(self._cache.items()):
+                lines.append(f"nlp_cache_requests_total{_format_labels((('cache', cache), ('result', result)))} {count}")
+            lines += ['# HELP nlp_cache_hit_ratio Share of cache lookups that hit.',
+                      '# TYPE nlp_cache_hit_ratio gauge']
+            for cache in sorted({cache for cache, _ in self._cache}):
+                lines.append(f"nlp_cache_hit_ratio{_format_labels((('cache', cache),))} "
+                             f"{_format_value(self.cache_hit_rate(cache))}")
+        return '\n'.join(lines) + '\n'
+
+    def write_textfile(self, path: str) -> None:
+        """Atomically write render() to path (node_exporter textfile collector style)."""
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.nlp_metrics.')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(self.render())
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+
+def enable_metrics(registry: Optional[MetricsRegistry] = None) -> MetricsRegistry:
+    """Install a registry (a new one by default) as the nlp_core metrics sink."""
+    registry = registry or MetricsRegistry()
+    set_metrics_sink(registry)
+    return registry
+
+
+def disable_metrics() -> None:
+    set_metrics_sink(None)
+
+
+def serve_metrics(registry: MetricsRegistry, port: int = 9464, host: str = '127.0.0.1') -> ThreadingHTTPServer:
+    """
+    Serve GET /metrics from a daemon thread. Binds to localhost by default;
+    call shutdown() on the returned server to stop it.
+    """
+    class _Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] not in ('/metrics', '/'):
+                self.send_error(404)
+                return
+            body = registry.render().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', CONTENT_TYPE)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), _Handler)
+    thread = threading.Thread(target=server.serve_forever, name='nlp-metrics', daemon=True)
+    thread.start()
+    return server
@@ -0,0 +1,416 @@
+# Sharded Ranking - coordinator/worker top-k scoring over TCP
+# For batch/service use; the browser build never imports this module.
+#
+# Workers:      python nlp_shards.py worker --port 7070
+# Coordinator:  python nlp_shards.py rank --jds jds.jsonl --resumes resumes.jsonl --workers host:7070,...
+#
+# Messages are length-prefixed JSON frames (4-byte big-endian length, UTF-8
+# body). A coordinator keeps one connection per worker: it sends the JD set
+# once ({op: 'load', jds, k}) and then one shard of the resume corpus at a
+# time ({op: 'rank', shard, offset, resumes}); the worker answers with its
+# local top-k per JD. Stdlib only.
+#
+# Spawned workers map one shared lexicon image (see SharedLexicon) instead of
+# each loading the constants and holding its own copy of the lexicon and IDF table.
+
+import argparse
+import heapq
+import json
+import os
+import socket
+import socketserver
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+from typing import Optional, List, Dict, Any, Tuple
+
+from nlp_batch import rank_top_k
+from nlp_core import LEXICON_IMAGE_ENV, Lexicon, default_engine, write_lexicon_image
+
+_FRAME_HEADER = struct.Struct('>I')
+MAX_FRAME_BYTES = 512 * 1024 * 1024
+DEFAULT_SHARD_SIZE = 500
+DEFAULT_TIMEOUT_S = 600.0
+
+
+# --- Framing ---
+
+def send_frame(sock: socket.socket, message: Any) -> None:
+    body = json.dumps(message, separators=(',', ':')).encode('utf-8')
+    sock.sendall(_FRAME_HEADER.pack(len(body)) + body)
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> Optional[bytes]:
+    """size bytes, or None on a clean EOF before the first byte."""
+    buffer = bytearray()
+    while len(buffer) < size:
+        chunk = sock.recv(min(size - len(buffer), 1 << 20))
+        if not chunk:
+            if not buffer:
+                return None
+            raise ConnectionError("Connection closed mid-frame")
+        buffer += chunk
+    return bytes(buffer)
+
+
+def recv_frame(sock: socket.socket) -> Optional[Any]:
+    """The next message, or None if the peer closed the connection between frames."""
+    header = _recv_exactly(sock, _FRAME_HEADER.size)
+    if header is None:
+        return None
+    (size,) = _FRAME_HEADER.unpack(header)
+    if size > MAX_FRAME_BYTES:
+        raise ValueError(f"Frame of {size} bytes exceeds MAX_FRAME_BYTES")
+    body = _recv_exactly(sock, size)
+    if body is None:
+        raise ConnectionError("Connection closed mid-frame")
+    return json.loads(body.decode('utf-8'))
+
+
+# --- Worker ---
+
+def rank_shard(resume_texts: List[str], jd_texts: List[str], k: int, offset: int = 0) -> dict:
+    """
+    Local top-k of one shard for every JD.
+
+    Returns: {topK: [[index, total][]] per JD (corpus indices, best first), seconds}
+    """
+    start = time.perf_counter()
+    top_k = []
+    for jd_text in jd_texts:
+        ranked = rank_top_k(resume_texts, jd_text, k)
+        top_k.append([[offset + entry['index'], entry['total']] for entry in ranked['topK']])
+    return {'topK': top_k, 'seconds': round(time.perf_counter() - start, 6)}
+
+
+class _WorkerHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        jd_texts: List[str] = []
+        k = 0
+        while True:
+            try:
+                request = recv_frame(self.request)
+            except (OSError, ValueError):
+                return
+            if request is None:
+                return
+            op = request.get('op')
+            try:
+                if op == 'load':
+                    jd_texts, k = list(request['jds']), int(request['k'])
+                    response = {'ok': True}
+                elif op == 'rank':
+                    response = rank_shard(request['resumes'], jd_texts, k, int(request.get('offset', 0)))
+                    response['shard'] = request.get('shard')
+                else:
+                    response = {'error': f"Unknown operation: {op}"}
+            except Exception as e:
+                response = {'error': f"{type(e).__name__}: {e}"}
+            try:
+                send_frame(self.request, response)
+            except OSError:
+                return
+
+
+class _WorkerServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def serve_worker(port: int = 0, host: str = '127.0.0.1', background: bool = True) -> _WorkerServer:
+    """
+    Start a ranking worker. With background=True it runs in a daemon thread and
+    the server is returned (server_address has the bound port; call shutdown()
+    to stop it); otherwise this blocks serving requests.
+    """
+    server = _WorkerServer((host, port), _WorkerHandler)
+    if not background:
+        server.serve_forever()
+        return server
+    thread = threading.Thread(target=server.serve_forever, name='nlp-shard-worker', daemon=True)
+    thread.start()
+    return server
+
+
+class SharedLexicon:
+    """
+    One lexicon image (see nlp_core.lexicon_image) for all local worker processes.
+
+    The image is written once to shared memory (/dev/shm where it exists,
+    else the temp directory). Workers started with env() in their
+    environment map it read-only when they import nlp_core: skill tables,
+    stop words, categories, aliases, headers and the IDF table are then used
+    in place, one copy for all of them, and no worker reads the constants,
+    unpickles or compiles skill patterns. Use as a context manager, or
+    close() to remove the file once the workers are gone (mappings stay
+    valid until then).
+    """
+
+    def __init__(self, lexicon: Optional[Lexicon] = None, directory: Optional[str] = None):
+        if directory is None:
+            directory = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+        fd, self.path = tempfile.mkstemp(prefix='nlp-lexicon-', suffix='.img', dir=directory)
+        os.close(fd)
+        self.info = write_lexicon_image(self.path, lexicon if lexicon is not None else default_engine().lexicon)
+
+    def env(self, base: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """Environment for a worker process: base (default os.environ) plus the image path."""
+        env = dict(os.environ if base is None else base)
+        env[LEXICON_IMAGE_ENV] = self.path
+        return env
+
+    def close(self) -> None:
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self) -> 'SharedLexicon':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def spawn_workers(count: int, host: str = '127.0.0.1',
+                  shared: Optional[SharedLexicon] = None) -> List[Tuple[subprocess.Popen, Tuple[str, int]]]:
+    """
+    Start count local worker processes on free ports; terminate() them when done.
+
+    With shared, the workers map its lexicon image instead of loading their own.
+    """
+    workers = []
+    env = shared.env() if shared is not None else None
+    for _ in range(count):
+        process = subprocess.Popen([sys.executable, __file__, 'worker', '--host', host, '--port', '0'],
+                                   stdout=subprocess.PIPE, text=True, env=env)
+        # Wait for "listening on host:port"; nlp_core may log its constants source first
+        line = process.stdout.readline()
+        while line and not line.startswith('listening on '):
+            line = process.stdout.readline()
+        line = line.strip()
+        if not line:
+            process.kill()
+            raise RuntimeError(f"Worker exited before listening (code {process.wait()})")
+        workers.append((process, parse_address(line[len('listening on '):])))
+    return workers
+
+
+def parse_address(value: str) -> Tuple[str, int]:
+    host, _, port = value.rpartition(':')
+    return host or '127.0.0.1', int(port)
+
+
+# --- Coordinator ---
+
+def merge_top_k(shard_results: List[List[list]], k: int) -> List[dict]:
+    """
+    Merge per-shard [index, total] lists for one JD into the global top-k.
+
+    Ties go to the lower corpus index, as in rank_top_k over the whole corpus.
+    """
+    candidates = (entry for entries in shard_results for entry in entries)
+    best = heapq.nsmallest(k, candidates, key=lambda entry: (-entry[1], entry[0]))
+    return [{'index': index, 'total': total} for index, total in best]
+
+
+def rank_sharded(resume_texts: List[str], jd_texts: List[str], workers: List[Tuple[str, int]],
+                 k: int = 50, shard_size: int = DEFAULT_SHARD_SIZE,
+                 timeout_s: float = DEFAULT_TIMEOUT_S) -> dict:
+    """
+    Rank the resume corpus against every JD across worker processes.
+
+    The corpus is cut into shards of shard_size resumes, which idle workers
+    pull one at a time. A worker that cannot be reached, drops its
+    connection or exceeds timeout_s is marked dead and its in-flight shard
+    goes back to the queue for the others. Results equal rank_top_k over the
+    whole corpus (index and total) for each JD; run evaluate_ats on the
+    winners if the full responses are needed.
+
+    Returns:
+    {
+        topK: [{index, total}][],   # per JD, best first
+        shards: [{shard, start, end, worker, attempts, seconds, wallSeconds, resumesPerSecond}],
+        report: {resumes, jds, shards, workers, deadWorkers: string[], reassigned, elapsedS, resumesPerSecond}
+    }
+    Raises RuntimeError if every worker dies with shards left, or if a worker
+    reports an error for a shard.
+    """
+    if shard_size < 1:
+        raise ValueError("shard_size must be at least 1")
+    bounds = [(start, min(start + shard_size, len(resume_texts)))
+              for start in range(0, len(resume_texts), shard_size)]
+    pending = deque(range(len(bounds)))
+    attempts = [0] * len(bounds)
+    results: Dict[int, dict] = {}
+    dead: List[str] = []
+    failures: List[str] = []
+    state = {'inFlight': 0, 'reassigned': 0}
+    condition = threading.Condition()
+    started = time.perf_counter()
+
+    def next_shard() -> Optional[int]:
+        with condition:
+            # A shard in flight elsewhere may still come back if its worker dies
+            while not pending and state['inFlight'] and not failures:
+                condition.wait()
+            if not pending or failures:
+                return None
+            shard = pending.popleft()
+            state['inFlight'] += 1
+            attempts[shard] += 1
+            return shard
+
+    def run(address: Tuple[str, int]) -> None:
+        name = f"{address[0]}:{address[1]}"
+        shard = None
+        try:
+            with socket.create_connection(address, timeout=timeout_s) as sock:
+                send_frame(sock, {'op': 'load', 'jds': jd_texts, 'k': k})
+                if recv_frame(sock) is None:
+                    raise ConnectionError("Worker closed the connection")
+                while True:
+                    shard = next_shard()
+                    if shard is None:
+                        return
+                    start, end = bounds[shard]
+                    sent = time.perf_counter()
+                    send_frame(sock, {'op': 'rank', 'shard': shard, 'offset': start,
+                                      'resumes': resume_texts[start:end]})
+                    response = recv_frame(sock)
+                    if response is None:
+                        raise ConnectionError("Worker closed the connection")
+                    wall = time.perf_counter() - sent
+                    with condition:
+                        state['inFlight'] -= 1
+                        if 'error' in response:
+                            failures.append(f"shard {shard} on {name}: {response['error']}")
+                        else:
+                            response['worker'] = name
+                            response['wallSeconds'] = wall
+                            results[shard] = response
+                        condition.notify_all()
+                    shard = None
+        except (OSError, ValueError):
+            with condition:
+                dead.append(name)
+                if shard is not None:
+                    state['inFlight'] -= 1
+                    state['reassigned'] += 1
+                    pending.appendleft(shard)
+                condition.notify_all()
+
+    threads = [threading.Thread(target=run, args=(address,), name=f'nlp-shard-{i}', daemon=True)
+               for i, address in enumerate(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    if failures:
+        raise RuntimeError(f"Worker error: {failures[0]}")
+    if len(results) < len(bounds):
+        raise RuntimeError(f"All workers failed; {len(bounds) - len(results)} of {len(bounds)} shards unscored")
+
+    top_k = [merge_top_k([results[shard]['topK'][j] for shard in range(len(bounds))], k)
+             for j in range(len(jd_texts))]
+    shards = []
+    for shard, (start, end) in enumerate(bounds):
+        result = results[shard]
+        shards.append({
+            'shard': shard,
+            'start': start,
+            'end': end,
+            'worker': result['worker'],
+            'attempts': attempts[shard],
+            'seconds': round(result['seconds'], 3),
+            'wallSeconds': round(result['wallSeconds'], 3),
+            'resumesPerSecond': round((end - start) / result['wallSeconds'], 2) if result['wallSeconds'] else 0.0
+        })
+    return {
+        'topK': top_k,
+        'shards': shards,
+        'report': {
+            'resumes': len(resume_texts),
+            'jds': len(jd_texts),
+            'shards': len(bounds),
+            'workers': len(workers),
+            'deadWorkers': dead,
+            'reassigned': state['reassigned'],
+            'elapsedS': round(elapsed, 3),
+            'resumesPerSecond': round(len(resume_texts) / elapsed, 2) if elapsed else 0.0
+        }
+    }
+
+
+# --- CLI ---
+
+def _read_texts(path: str) -> List[str]:
+    """JSONL of strings or {text} objects."""
+    texts = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                value = json.loads(line)
+                texts.append(value['text'] if isinstance(value, dict) else value)
+    return texts
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Sharded top-k resume ranking')
+    commands = parser.add_subparsers(dest='command', required=True)
+    worker = commands.add_parser('worker', help='serve ranking requests')
+    worker.add_argument('--host', default='127.0.0.1')
+    worker.add_argument('--port', type=int, default=7070)
+    rank = commands.add_parser('rank', help='coordinate a ranking run')
+    rank.add_argument('--jds', required=True, help='JSONL of JD texts')
+    rank.add_argument('--resumes', required=True, help='JSONL of resume texts')
+    rank.add_argument('--workers', help='comma-separated host:port list')
+    rank.add_argument('--spawn', type=int, default=0, help='start this many local workers instead')
+    rank.add_argument('--k', type=int, default=50)
+    rank.add_argument('--shard-size', type=int, default=DEFAULT_SHARD_SIZE)
+    rank.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT_S)
+    rank.add_argument('--output', help='also write the JSON report to this file')
+    args = parser.parse_args(argv)
+
+    if args.command == 'worker':
+        server = _WorkerServer((args.host, args.port), _WorkerHandler)
+        print(f"listening on {server.server_address[0]}:{server.server_address[1]}", flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+        return 0
+
+    if not args.workers and not args.spawn:
+        parser.error('rank needs --workers or --spawn')
+    shared = SharedLexicon() if args.spawn else None
+    spawned = spawn_workers(args.spawn, shared=shared) if args.spawn else []
+    try:
+        addresses = [parse_address(a) for a in args.workers.split(',')] if args.workers else []
+        addresses += [address for _, address in spawned]
+        report = rank_sharded(_read_texts(args.resumes), _read_texts(args.jds), addresses,
+                              args.k, args.shard_size, args.timeout)
+    finally:
+        for process, _ in spawned:
+            process.terminate()
+            process.wait()
+        if shared is not None:
+            shared.close()
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
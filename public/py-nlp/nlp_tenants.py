@@ -0,0 +1,175 @@
+# Tenant Lexicons - per-customer vocabularies over one shared lexicon index
+# For batch/service use; the browser build never imports this module.
+
+import json
+import sys
+import threading
+from collections import OrderedDict
+from typing import Optional, List, Dict, Any, Iterable
+
+from nlp_core import ATSEngine, Lexicon, default_engine, metrics_sink
+
+
+def _overlay_bytes(lexicon: Lexicon, base: Lexicon) -> int:
+    """
+    Estimated memory a tenant index holds on top of its base: the combined
+    tuples and sets it had to allocate plus its own skills. Objects shared
+    with the base are not counted.
+    """
+    size = 0
+    for name in ('tech_skills', 'soft_skills', 'stop_words', 'tech_lower', 'tech_set'):
+        value = getattr(lexicon, name)
+        if value is not getattr(base, name):
+            size += sys.getsizeof(value)
+    added = lexicon.tech_lower[len(base.tech_lower):]
+    # The tenant's own category table holds one entry per added skill
+    size += sys.getsizeof(dict.fromkeys(added))
+    for skill in added:
+        size += sys.getsizeof(skill)
+    if lexicon.aliases is not base.aliases:
+        # Alias entries for the added skills
+        size += sys.getsizeof(dict.fromkeys(
+            variant for variant, canonical in lexicon.aliases.items() if base.aliases.get(variant) != canonical))
+    return size
+
+
+class LexiconRegistry:
+    """
+    Named tenant lexicons layered over one shared base lexicon.
+
+    register() only records a tenant's extra vocabulary. The tenant's engine is
+    built on first use as base.overlay(...), which shares the base's tables,
+    and is kept in an LRU of at most max_engines entries and max_bytes
+    estimated overlay memory (see _overlay_bytes). Evicted tenants are
+    rebuilt on their next use. Safe to share between threads.
+    """
+
+    def __init__(self, base: Optional[Lexicon] = None, max_engines: int = 64,
+                 max_bytes: Optional[int] = None):
+        if max_engines < 1:
+            raise ValueError("max_engines must be at least 1")
+        self.base = base if base is not None else default_engine().lexicon
+        self.max_engines = max_engines
+        self.max_bytes = max_bytes
+        self._base_engine = ATSEngine(self.base)
+        self._overlays: Dict[str, Dict[str, tuple]] = {}
+        # tenant -> (engine, estimated bytes), least recently used first
+        self._engines: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._resident_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_file(cls, path: str, **kwargs) -> 'LexiconRegistry':
+        """
+        Registry from a JSON file of {tenant: {TECH_SKILLS?, SOFT_SKILLS?, STOP_WORDS?}},
+        the same keys as shared-constants.json.
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            tenants = json.load(f)
+        registry = cls(**kwargs)
+        for tenant, constants in tenants.items():
+            registry.register(
+                tenant,
+                constants.get('TECH_SKILLS', []),
+                constants.get('SOFT_SKILLS', []),
+                constants.get('STOP_WORDS', [])
+            )
+        return registry
+
+    # --- Tenants ---
+
+    def register(self, tenant: str, tech_skills: Iterable[str] = (), soft_skills: Iterable[str] = (),
+                 stop_words: Iterable[str] = ()) -> None:
+        """Add or replace a tenant's vocabulary; a replaced tenant is rebuilt on next use."""
+        overlay = {
+            'tech_skills': tuple(tech_skills),
+            'soft_skills': tuple(soft_skills),
+            'stop_words': tuple(stop_words)
+        }
+        with self._lock:
+            self._overlays[tenant] = overlay
+            self._drop(tenant)
+
+    def unregister(self, tenant: str) -> None:
+        with self._lock:
+            self._overlays.pop(tenant, None)
+            self._drop(tenant)
+
+    def tenants(self) -> List[str]:
+        with self._lock:
+            return list(self._overlays)
+
+    def __contains__(self, tenant: str) -> bool:
+        return tenant in self._overlays
+
+    # --- Engines ---
+
+    def engine(self, tenant: Optional[str] = None) -> ATSEngine:
+        """
+        The engine for tenant (the base engine for None).
+
+        Raises KeyError for unregistered tenants.
+        """
+        if tenant is None:
+            return self._base_engine
+        with self._lock:
+            entry = self._engines.get(tenant)
+            if entry is not None:
+                self._engines.move_to_end(tenant)
+                self.hits += 1
+            else:
+                overlay = self._overlays[tenant]
+                self.misses += 1
+        sink = metrics_sink()
+        if sink is not None:
+            sink.observe_cache('tenant', int(entry is not None), int(entry is None))
+        if entry is not None:
+            return entry[0]
+
+        # Build outside the lock; a concurrent build of the same tenant just loses the race
+        lexicon = self.base.overlay(**overlay)
+        engine = ATSEngine(lexicon)
+        size = _overlay_bytes(lexicon, self.base)
+        with self._lock:
+            if self._overlays.get(tenant) is not overlay:
+                # Re-registered or removed meanwhile: serve this build, but do not keep it
+                return engine
+            current = self._engines.get(tenant)
+            if current is not None:
+                self._engines.move_to_end(tenant)
+                return current[0]
+            self._engines[tenant] = (engine, size)
+            self._resident_bytes += size
+            self._evict()
+        return engine
+
+    def _drop(self, tenant: str) -> None:
+        entry = self._engines.pop(tenant, None)
+        if entry is not None:
+            self._resident_bytes -= entry[1]
+
+    def _evict(self) -> None:
+        # The newest entry always stays, even if it alone exceeds max_bytes
+        while len(self._engines) > 1 and (
+                len(self._engines) > self.max_engines or
+                (self.max_bytes is not None and self._resident_bytes > self.max_bytes)):
+            _, (_, size) = self._engines.popitem(last=False)
+            self._resident_bytes -= size
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns: {tenants, resident, residentBytes, hits, misses, evictions}
+        """
+        with self._lock:
+            return {
+                'tenants': len(self._overlays),
+                'resident': len(self._engines),
+                'residentBytes': self._resident_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
@@ -0,0 +1,88 @@
+# Load / Soak Harness Unit Tests
+# Run with: python -m pytest test_load_nlp_core.py -v
+
+import json
+import math
+import random
+import pytest
+import sys
+import os
+
+# Add parent directory to path for import
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from load_nlp_core import LatencyHistogram, synthetic_workload, replay_workload, run_load, main
+from test_nlp_core import SAMPLE_JD, SAMPLE_RESUME
+
+
+class TestLatencyHistogram:
+    def test_percentiles_within_one_percent(self):
+        """Bucketed percentiles stay within the bucket growth factor of exact ones."""
+        rng = random.Random(3)
+        samples = sorted(rng.lognormvariate(-4, 1) for _ in range(5000))
+        histogram = LatencyHistogram()
+        for value in samples:
+            histogram.record(value)
+
+        for pct in (50, 95, 99, 99.9):
+            exact = samples[max(1, math.ceil(round(pct * len(samples) / 100, 9))) - 1]
+            assert exact <= histogram.percentile(pct) <= exact * 1.0101
+
+    def test_memory_does_not_grow_with_samples(self):
+        """Repeated values share buckets."""
+        histogram = LatencyHistogram()
+        for _ in range(10000):
+            histogram.record(0.01)
+
+        assert len(histogram.buckets) == 1
+        assert histogram.count == 10000
+
+
+class TestRunLoad:
+    def test_in_process_report(self):
+        """A short run reports throughput, tail latency, windows and RSS."""
+        report = run_load(synthetic_workload(seed=1, variants=2), rate=40, duration_s=0.5,
+                          concurrency=2, interval_s=0.25)
+        summary = report['summary']
+
+        assert summary['offered'] == 20
+        assert summary['completed'] + summary['errors'] + summary['dropped'] == summary['offered']
+        assert summary['errors'] == 0
+        assert set(summary['latencyMs']) >= {'p50', 'p95', 'p99', 'p999'}
+        assert summary['latencyMs']['p50'] <= summary['latencyMs']['p999']
+        assert report['windows']
+        assert set(report['operations']) <= {'evaluateATS', 'scoreATS', 'optimizeResume'}
+
+    def test_errors_are_counted(self):
+        """Failing requests are reported, not raised."""
+        bad = lambda: {'op': 'scoreATS', 'args': {'resumeText': SAMPLE_RESUME}}
+        report = run_load(bad, rate=20, duration_s=0.2, concurrency=1)
+
+        assert report['summary']['errors'] == report['summary']['offered']
+
+    def test_replay_workload(self, tmp_path):
+        """Recorded dispatch-style requests are replayed in order, cyclically."""
+        path = tmp_path / 'requests.jsonl'
+        requests = [{'op': 'scoreATS', 'args': {'resumeText': SAMPLE_RESUME, 'jdText': SAMPLE_JD}},
+                    {'op': 'evaluateATS', 'args': {'resumeText': SAMPLE_RESUME, 'jdText': SAMPLE_JD}}]
+        path.write_text('\n'.join(json.dumps(r) for r in requests) + '\n')
+        next_request = replay_workload(str(path))
+
+        assert [next_request()['op'] for _ in range(3)] == ['scoreATS', 'evaluateATS', 'scoreATS']
+
+    def test_unknown_mix_operation(self):
+        """Mixes may only name supported operations."""
+        with pytest.raises(ValueError):
+            synthetic_workload({'parseResume': 1})
+
+    def test_cli_writes_report(self, tmp_path, capsys):
+        """The CLI prints the report and writes it to --output."""
+        output = tmp_path / 'report.json'
+        code = main(['--rate', '20', '--duration', '0.2', '--interval', '0.1', '--output', str(output)])
+
+        assert code == 0
+        assert json.loads(output.read_text())['summary']['offered'] == 4
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
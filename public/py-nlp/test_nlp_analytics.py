@@ -0,0 +1,135 @@
+# Skill Demand Analytics Unit Tests
+# Run with: python -m pytest test_nlp_analytics.py -v
+
+import json
+import random
+import pytest
+import sys
+import os
+from collections import Counter
+
+# Add parent directory to path for import
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from nlp_core import parse_jd
+from nlp_analytics import CountMinSketch, SpaceSaving, SkillDemandAggregator
+from test_nlp_core import SAMPLE_JD
+
+
+def zipf_stream(n: int, vocabulary: int = 500, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(vocabulary)]
+    return rng.choices([f"skill{i}" for i in range(vocabulary)], weights=weights, k=n)
+
+
+# --- Count-Min Sketch Tests ---
+
+class TestCountMinSketch:
+    def test_never_underestimates(self):
+        """Estimates are upper bounds within the epsilon * total guarantee."""
+        stream = zipf_stream(5000)
+        sketch = CountMinSketch(width=256, depth=4)
+        for key in stream:
+            sketch.add(key)
+
+        for key, true_count in Counter(stream).items():
+            assert true_count <= sketch.estimate(key) <= true_count + sketch.error_bound()
+
+    def test_merge_equals_single_stream(self):
+        """Merging per-worker sketches gives the same counts as one sketch."""
+        stream = zipf_stream(2000)
+        whole, left, right = CountMinSketch(128, 3), CountMinSketch(128, 3), CountMinSketch(128, 3)
+        for i, key in enumerate(stream):
+            whole.add(key)
+            (left if i % 2 else right).add(key)
+        left.merge(right)
+
+        assert left.to_dict() == whole.to_dict()
+
+    def test_merge_rejects_mismatched_dimensions(self):
+        """Sketches must share width and depth to merge."""
+        with pytest.raises(ValueError):
+            CountMinSketch(128, 3).merge(CountMinSketch(64, 3))
+
+
+# --- Space-Saving Tests ---
+
+class TestSpaceSaving:
+    def test_finds_heavy_hitters(self):
+        """Keys above total / capacity are always tracked, with valid bounds."""
+        stream = zipf_stream(5000)
+        summary = SpaceSaving(capacity=20)
+        for key in stream:
+            summary.add(key)
+        truth = Counter(stream)
+        tracked = {key: (count, error) for key, count, error in summary.top()}
+
+        for key, true_count in truth.items():
+            if true_count > len(stream) / 20:
+                assert key in tracked
+        for key, (count, error) in tracked.items():
+            assert count - error <= truth[key] <= count
+
+    def test_memory_is_fixed(self):
+        """Counters never exceed capacity, however many keys arrive."""
+        summary = SpaceSaving(capacity=10)
+        for key in zipf_stream(3000, vocabulary=2000):
+            summary.add(key)
+
+        assert len(summary.top()) == 10
+        assert len(summary._heap) <= 4 * summary.capacity + 1
+
+    def test_merge_keeps_bounds(self):
+        """Merged counters still bracket the true combined counts."""
+        stream = zipf_stream(4000)
+        left, right = SpaceSaving(15), SpaceSaving(15)
+        for i, key in enumerate(stream):
+            (left if i % 3 else right).add(key)
+        left.merge(right)
+        truth = Counter(stream)
+
+        assert left.total == len(stream)
+        for key, count, error in left.top():
+            assert count - error <= truth[key] <= count
+
+
+# --- Aggregator Tests ---
+
+class TestSkillDemandAggregator:
+    def test_top_skills_by_category(self):
+        """Keywords from parse_jd are counted once per posting."""
+        aggregator = SkillDemandAggregator(width=256, capacity=16)
+        aggregator.add_many([SAMPLE_JD] * 3)
+        model = parse_jd(SAMPLE_JD)
+        hard_skills = {kw['keyword'] for kw in model['categorizedKeywords'] if kw['category'] == 'hard_skill'}
+        top = aggregator.top('hard_skill', 5)
+
+        assert top
+        assert all(entry['keyword'] in hard_skills for entry in top)
+        assert all(entry['count'] == 3 and entry['errorBound'] == 0 for entry in top)
+
+    def test_merge_across_processes(self):
+        """Serialized aggregators merge into the same snapshot as one stream."""
+        postings = [SAMPLE_JD, "Requirements:\n- Go and Rust", "Must have Python and AWS"] * 4
+        whole = SkillDemandAggregator(width=256, capacity=16)
+        whole.add_many(postings)
+        left, right = SkillDemandAggregator(width=256, capacity=16), SkillDemandAggregator(width=256, capacity=16)
+        left.add_many(postings[:5])
+        right.add_many(postings[5:])
+        left.merge(SkillDemandAggregator.from_dict(json.loads(json.dumps(right.to_dict()))))
+
+        assert left.snapshot() == whole.snapshot()
+
+    def test_snapshot_shape(self):
+        """Snapshots cover every category and report the sketch error bound."""
+        aggregator = SkillDemandAggregator(width=256, capacity=16)
+        aggregator.add(SAMPLE_JD)
+        snapshot = aggregator.snapshot(3)
+
+        assert snapshot['postings'] == 1
+        assert set(snapshot['categories']) == {'hard_skill', 'tool', 'concept', 'soft_skill'}
+        assert 0 < snapshot['confidence'] < 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,188 @@
+# Batch Scoring Unit Tests
+# Run with: python -m pytest test_nlp_batch.py -v
+
+import pytest
+import sys
+import os
+
+# Add parent directory to path for import
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from nlp_core import evaluate_ats
+from nlp_batch import (
+    minhash_signature,
+    estimate_similarity,
+    choose_bands,
+    find_near_duplicates,
+    evaluate_ats_many,
+    rank_top_k
+)
+from test_nlp_core import SAMPLE_JD, SAMPLE_RESUME
+
+
+OTHER_RESUME = """
+Jane Smith
+jane@example.com
+
+Summary
+Data analyst focused on reporting and dashboards.
+
+Experience
+- Built Tableau dashboards for the finance team
+- Automated Excel reports with VBA
+
+Skills
+Excel, Tableau, SQL, VBA
+"""
+
+
+# --- MinHash Tests ---
+
+class TestMinHash:
+    def test_signature_is_deterministic(self):
+        """Same token set should always produce the same signature."""
+        tokens = {'python', 'react', 'aws'}
+
+        assert minhash_signature(tokens) == minhash_signature(set(tokens))
+
+    def test_similarity_tracks_jaccard(self):
+        """Identical sets estimate 1.0, disjoint sets estimate close to 0."""
+        base = {f"token{i}" for i in range(100)}
+        disjoint = {f"other{i}" for i in range(100)}
+
+        assert estimate_similarity(minhash_signature(base), minhash_signature(base)) == 1.0
+        assert estimate_similarity(minhash_signature(base), minhash_signature(disjoint)) < 0.2
+
+    def test_bands_cover_signature(self):
+        """Chosen banding should split the signature exactly."""
+        bands, rows = choose_bands(0.9, 64)
+
+        assert bands * rows == 64
+        assert (1.0 / bands) ** (1.0 / rows) <= 0.9
+
+
+# --- Clustering Tests ---
+
+class TestFindNearDuplicates:
+    def test_groups_near_duplicates(self):
+        """Sets sharing almost all tokens should land in one cluster."""
+        base = {f"token{i}" for i in range(100)}
+        near = (base - {'token0'}) | {'extra'}
+        far = {f"other{i}" for i in range(100)}
+
+        clusters = find_near_duplicates([minhash_signature(s) for s in (base, far, near)], threshold=0.8)
+
+        assert clusters == [[0, 2], [1]]
+
+    def test_members_matching_each_other_but_not_the_head(self):
+        """A bucket joins every similar pair, not only pairs with its first member."""
+        twin = minhash_signature({f"twin{i}" for i in range(100)})
+        other = minhash_signature({f"other{i}" for i in range(100)})
+        # Every bucket holding both twins is headed by a half-similar signature
+        first_half = twin[:32] + other[32:]
+        second_half = other[:32] + twin[32:]
+        clusters = find_near_duplicates([first_half, second_half, twin, twin], threshold=0.9, bands=64)
+
+        assert clusters == [[0], [1], [2, 3]]
+
+    def test_empty_input(self):
+        """No signatures means no clusters."""
+        assert find_near_duplicates([]) == []
+
+
+# --- Batch Evaluation Tests ---
+
+class TestEvaluateATSMany:
+    def test_duplicates_are_scored_once(self):
+        """Resubmitted resumes should reuse the representative's result."""
+        resumes = [SAMPLE_RESUME, OTHER_RESUME, SAMPLE_RESUME + "\n"]
+        result = evaluate_ats_many(resumes, SAMPLE_JD)
+
+        assert result['representatives'] == [0, 1, 0]
+        assert result['results'][2] is not result['results'][0]
+        assert result['results'][2]['scoreBreakdown'] == result['results'][0]['scoreBreakdown']
+        assert result['report']['evaluated'] == 2
+        assert result['report']['skipped'] == 1
+
+    def test_members_get_their_own_locations(self):
+        """A member's result is its own copy, with matched keywords located in its own text."""
+        moved = SAMPLE_RESUME.replace("Summary\n", "Summary\nDocker and AWS specialist.\n")
+        result = evaluate_ats_many([SAMPLE_RESUME, moved], SAMPLE_JD)
+        head, member = result['results']
+        member['matchResults'][0]['status'] = 'changed'
+        member['jdModel']['categorizedKeywords'][0]['keyword'] = 'changed'
+
+        assert result['representatives'] == [0, 0]
+        assert head['matchResults'][0]['status'] != 'changed'
+        assert head['jdModel']['categorizedKeywords'][0]['keyword'] != 'changed'
+        assert [r['locations'] for r in member['matchResults'][1:]] == \
+            [r['locations'] for r in evaluate_ats(moved, SAMPLE_JD)['matchResults'][1:]]
+        assert [r['locations'] for r in member['matchResults']] != [r['locations'] for r in head['matchResults']]
+
+    def test_members_score_their_own_text(self):
+        """Role and structure scores come from the member's text, not the representative's."""
+        trimmed = SAMPLE_RESUME.replace("Education\nBS Computer Science, State University (2017)\n", "")
+        result = evaluate_ats_many([SAMPLE_RESUME, trimmed], SAMPLE_JD, dedupe_threshold=0.5)
+        head, member = result['results']
+        own = evaluate_ats(trimmed, SAMPLE_JD)['scoreBreakdown']
+
+        assert result['representatives'] == [0, 0]
+        assert member['scoreBreakdown']['structureScore'] == own['structureScore']
+        assert member['scoreBreakdown']['roleTitleScore'] == own['roleTitleScore']
+        assert member['scoreBreakdown']['structureScore'] != head['scoreBreakdown']['structureScore']
+
+    def test_matches_single_evaluation(self):
+        """Batch results should score the same as evaluate_ats."""
+        result = evaluate_ats_many([SAMPLE_RESUME, OTHER_RESUME], SAMPLE_JD)
+
+        for text, evaluation in zip([SAMPLE_RESUME, OTHER_RESUME], result['results']):
+            assert evaluation['scoreBreakdown'] == evaluate_ats(text, SAMPLE_JD)['scoreBreakdown']
+
+    def test_dedupe_can_be_disabled(self):
+        """dedupe_threshold=None should score every resume."""
+        result = evaluate_ats_many([SAMPLE_RESUME, SAMPLE_RESUME], SAMPLE_JD, dedupe_threshold=None)
+
+        assert result['report']['evaluated'] == 2
+        assert result['report']['savedRatio'] == 0.0
+
+
+# --- Top-k Ranking Tests ---
+
+class TestRankTopK:
+    CORPUS = [
+        OTHER_RESUME,
+        SAMPLE_RESUME,
+        "John Doe\nSummary\nJunior developer.\nSkills\nHTML, CSS",
+        SAMPLE_RESUME.replace('Kubernetes', ''),
+        OTHER_RESUME + "\nPython, React",
+        "Jane Roe\nExperience\n- Wrote Java services on AWS",
+    ] * 3
+
+    def full_ranking(self):
+        totals = [evaluate_ats(text, SAMPLE_JD)['scoreBreakdown']['total'] for text in self.CORPUS]
+        return sorted(range(len(self.CORPUS)), key=lambda i: -totals[i])
+
+    @pytest.mark.parametrize('k', [1, 3, 7, 50])
+    def test_top_k_matches_full_scoring(self, k):
+        """Pruned ranking must return exactly the fully scored top-k."""
+        result = rank_top_k(self.CORPUS, SAMPLE_JD, k)
+
+        assert [entry['index'] for entry in result['topK']] == self.full_ranking()[:k]
+
+    def test_prunes_hopeless_candidates(self):
+        """Candidates that cannot reach the cut-off should skip full matching."""
+        result = rank_top_k(self.CORPUS, SAMPLE_JD, 1)
+
+        assert result['report']['pruned'] > 0
+        assert result['report']['evaluated'] + result['report']['pruned'] == len(self.CORPUS)
+
+    def test_top_k_includes_recommendations(self):
+        """Final entries carry a complete evaluation."""
+        entry = rank_top_k(self.CORPUS, SAMPLE_JD, 2)['topK'][0]
+
+        assert 'recommendations' in entry['evaluation']
+        assert entry['evaluation']['scoreBreakdown']['total'] == entry['total']
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
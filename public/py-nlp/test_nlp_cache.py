@@ -0,0 +1,100 @@
+# Evaluation Cache Unit Tests
+# Run with: python -m pytest test_nlp_cache.py -v
+
+import pytest
+import sys
+import os
+import time
+
+# Add parent directory to path for import
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from nlp_core import evaluate_ats
+from nlp_cache import EvaluationCache, evaluate_ats_cached
+from test_nlp_core import SAMPLE_JD, SAMPLE_RESUME
+
+
+@pytest.fixture
+def cache(tmp_path):
+    with EvaluationCache(str(tmp_path / 'cache.db')) as cache:
+        yield cache
+
+
+# --- Lookup / Insert Tests ---
+
+class TestEvaluationCache:
+    def test_round_trip(self, cache):
+        """Stored results come back unchanged."""
+        result = evaluate_ats(SAMPLE_RESUME, SAMPLE_JD)
+        cache.put(SAMPLE_RESUME, SAMPLE_JD, result)
+
+        assert cache.get(SAMPLE_RESUME, SAMPLE_JD) == result
+
+    def test_miss_returns_none(self, cache):
+        """Unknown pairs are misses."""
+        assert cache.get(SAMPLE_RESUME, SAMPLE_JD) is None
+
+    def test_bulk_lookup_preserves_order(self, cache):
+        """get_many returns results aligned with the requested pairs."""
+        cache.put_many([('a', 'jd', {'n': 1}), ('b', 'jd', {'n': 2})])
+
+        assert cache.get_many([('b', 'jd'), ('x', 'jd'), ('a', 'jd')]) == [{'n': 2}, None, {'n': 1}]
+
+    def test_other_engine_version_is_ignored(self, tmp_path):
+        """Results from another engine/lexicon version must not be served."""
+        path = str(tmp_path / 'cache.db')
+        with EvaluationCache(path, version='old') as old:
+            old.put('resume', 'jd', {'stale': True})
+        with EvaluationCache(path, version='new') as new:
+            assert new.get('resume', 'jd') is None
+
+    def test_concurrent_reader_sees_committed_writes(self, tmp_path):
+        """A second connection (e.g. another worker) reads what the writer committed."""
+        path = str(tmp_path / 'cache.db')
+        with EvaluationCache(path) as writer, EvaluationCache(path) as reader:
+            writer.put('resume', 'jd', {'n': 1})
+            assert reader.get('resume', 'jd') == {'n': 1}
+
+
+# --- Eviction Tests ---
+
+class TestEviction:
+    def test_evict_by_age(self, cache):
+        """Entries older than max_age_s are removed."""
+        cache.put('resume', 'jd', {'n': 1})
+        time.sleep(0.01)
+
+        assert cache.evict(max_age_s=0) == 1
+        assert cache.stats()['entries'] == 0
+
+    def test_evict_by_size_keeps_newest(self, cache):
+        """Size eviction removes the oldest entries first."""
+        for i in range(5):
+            cache.put(f"resume{i}", 'jd', {'payload': 'x' * 200, 'n': i})
+            time.sleep(0.01)
+        newest_size = cache.stats()['bytes'] // 5
+
+        cache.evict(max_bytes=newest_size * 2)
+
+        assert cache.get('resume4', 'jd') is not None
+        assert cache.get('resume0', 'jd') is None
+        assert cache.stats()['bytes'] <= newest_size * 2
+
+
+# --- Cached Evaluation Tests ---
+
+class TestEvaluateATSCached:
+    def test_second_run_is_all_hits(self, cache):
+        """Unchanged pairs are served from the cache on the next run."""
+        pairs = [(SAMPLE_RESUME, SAMPLE_JD), ("John Doe\nSkills\nPython", SAMPLE_JD)]
+
+        first = evaluate_ats_cached(cache, pairs)
+        second = evaluate_ats_cached(cache, pairs)
+
+        assert first['report']['misses'] == 2
+        assert second['report']['hits'] == 2
+        assert [r['scoreBreakdown'] for r in second['results']] == [r['scoreBreakdown'] for r in first['results']]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -4,22 +4,74 @@
 import pytest
 import sys
 import os
+import time
+import json
+import asyncio
 
 # Add parent directory to path for import
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+import nlp_core
 from nlp_core import (
+    extract_contact_info,
     parse_jd,
     parse_resume_canonical,
     match_keywords,
     calculate_ats_score,
+    ats_score_upper_bound,
     generate_recommendations,
-    evaluate_ats
+    evaluate_ats,
+    score_ats,
+    optimize_resume,
+    optimize_resume_many,
+    apply_edits,
+    utf16_edits,
+    parse_resume_sections,
+    resume_section_spans,
+    jd_section_spans,
+    promote_evaluation,
+    promote_score,
+    dispatch,
+    iter_match_keywords,
+    iter_evaluate_ats,
+    ScoreAccumulator,
+    concept_vector,
+    concept_vectors,
+    concept_similarity_matrix,
+    concept_similarity_score,
+    evaluate_ats_async,
+    map_evaluate_async,
+    optimize_resume_async,
+    optimize_resume_many_async,
+    iter_evaluate_ats_async,
+    write_lexicon_snapshot,
+    write_lexicon_image,
+    open_lexicon_image,
+    TermWeights,
+    ATSEngine,
+    Lexicon,
+    default_engine
+)
+from bench_nlp_core import (
+    ADVERSARIAL_CASES,
+    ADVERSARIAL_SIZE,
+    run_bound_benchmark,
+    run_memory_benchmark
 )
 
 
 # --- Test Data ---
 
+def _best_time(fn, *args, repeats: int = 3) -> float:
+    """Fastest of a few runs, to keep timing comparisons stable on a busy host."""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
 SAMPLE_JD = """
 Senior Software Engineer
 
@@ -73,6 +125,40 @@ BS Computer Science, State University (2017)
 """
 
 
+# --- Contact Extraction Tests ---
+
+class TestExtractContactInfo:
+    def test_extracts_header_contacts(self):
+        """Verify email, phone and profile links are read from the header."""
+        result = extract_contact_info(SAMPLE_RESUME)
+        
+        assert result['email'] == 'john.doe@example.com'
+        assert result['phone'] == '555-123-4567'
+        assert result['linkedin'] == 'linkedin.com/in/johndoe'
+        assert result['github'] == 'github.com/johndoe'
+        
+    def test_skips_invalid_phone_candidates(self):
+        """Date ranges and short numbers should not shadow a later phone number."""
+        result = extract_contact_info("Jane Roe (2017 - 2020)\nCall +1 (555) 123-4567.")
+        
+        assert result['phone'] == '+1 (555) 123-4567'
+        
+    def test_website_skips_profile_urls(self):
+        """Verify LinkedIn/GitHub URLs are not reported as the personal website."""
+        text = "https://linkedin.com/in/jane https://github.com/jane https://jane.dev"
+        result = extract_contact_info(text)
+        
+        assert result['website'] == 'https://jane.dev'
+        
+    @pytest.mark.parametrize('case', sorted(ADVERSARIAL_CASES))
+    def test_adversarial_input_scales_linearly(self, case):
+        """10x the adversarial input takes about 10x as long (under 20x with noise), not 100x; budgets live in bench_nlp_core."""
+        small, large = (_best_time(extract_contact_info, ADVERSARIAL_CASES[case](size))
+                        for size in (ADVERSARIAL_SIZE // 10, ADVERSARIAL_SIZE))
+        
+        assert large < small * 20, f"{case}: {small:.3f}s -> {large:.3f}s"
+
+
 # --- Parse JD Tests ---
 
 class TestParseJD:
@@ -201,6 +287,55 @@ class TestMatchKeywords:
         assert len(with_locations) > 0
 
 
+class TestKeywordAliases:
+    RESUME = "Jane Doe\nExperience\n- Ran k8s clusters behind nodejs services\nSkills\nk8s, ReactJS, Postgres"
+    JD = "Requirements:\n- Kubernetes, Node.js, React and PostgreSQL"
+    
+
+    def test_tokens_carry_canonical_keyword(self):
+        """Known variants are resolved once, at tokenization."""
+        tokens = parse_resume_canonical(self.RESUME)['tokens']
+        canonical = {t['normalized']: t.get('canonical') for t in tokens}
+    
+
+        assert canonical['k8s'] == 'kubernetes'
+        assert canonical['nodejs'] == 'node.js'
+        assert canonical['reactjs'] == 'react'
+        assert canonical['clusters'] is None
+    
+
+    def test_alias_matches_report_variant_and_locations(self):
+        """Alias hits are matched with every location of the variant, without the fuzzy stage."""
+        results = {r['keyword']: r for r in match_keywords(parse_jd(self.JD), parse_resume_canonical(self.RESUME))}
+    
+
+        assert results['kubernetes']['status'] == 'matched'
+        assert results['kubernetes']['matchedVariant'] == 'k8s'
+        assert results['kubernetes']['locations'] == ['experience:0:bullets:0', 'skills:0:list:0']
+        assert results['postgresql']['matchedVariant'] == 'postgres'
+    
+
+    def test_triage_and_upper_bound_count_aliases(self):
+        """Triage sees alias hits, and the upper bound still covers the full total."""
+        triage = evaluate_ats(self.RESUME, self.JD, mode='triage')
+        full = evaluate_ats(self.RESUME, self.JD)
+        bound = ats_score_upper_bound(parse_jd(self.JD), parse_resume_canonical(self.RESUME), self.RESUME)
+    
+
+        assert {r['keyword'] for r in triage['matchResults'] if r['status'] == 'matched'} >= {'kubernetes', 'postgresql'}
+        assert triage['scoreBreakdown']['total'] <= full['scoreBreakdown']['total'] <= bound
+    
+
+    def test_generated_aliases(self):
+        """Tokenizer forms of lexicon skills are generated; variants that are skills themselves are not aliases."""
+        lexicon = Lexicon.from_constants(['Node.js', 'CI/CD', 'Go', 'Golang'], [], [])
+    
+
+        assert lexicon.aliases['nodejs'] == 'node.js'
+        assert lexicon.aliases['cicd'] == 'ci/cd'
+        assert 'golang' not in lexicon.aliases
+
+
 # --- Scoring Tests ---
 
 class TestCalculateATSScore:
@@ -262,6 +397,80 @@ class TestCalculateATSScore:
             assert 0 <= value <= 100, f"{key} = {value} is out of range"
 
 
+class TestConceptSimilarity:
+    UNRELATED_RESUME = """
+    Jane Roe
+    Summary
+    Pastry chef with ten years in French kitchens.
+    Experience
+    - Ran a bakery, planned seasonal menus and trained apprentices
+    Skills
+    Baking, menu design, food safety
+    """
+    
+    def test_role_title_score_reflects_similarity(self):
+        """Related resumes score higher than unrelated ones, and the score is the breakdown's roleTitleScore."""
+        jd_model = parse_jd(SAMPLE_JD)
+        related = calculate_ats_score(jd_model, [], SAMPLE_RESUME)['roleTitleScore']
+        unrelated = calculate_ats_score(jd_model, [], self.UNRELATED_RESUME)['roleTitleScore']
+        
+        assert 0 <= unrelated < related <= 100
+        assert related == concept_similarity_score(concept_vectors(jd_model['sections']),
+                                                   concept_vectors(parse_resume_sections(SAMPLE_RESUME)))
+        
+    def test_nothing_to_compare_keeps_default(self):
+        """Without JD text the role score falls back to the old fixed value."""
+        assert calculate_ats_score({'categorizedKeywords': []}, [], SAMPLE_RESUME)['roleTitleScore'] == 75
+        assert concept_similarity_score({'requirements': concept_vector('and the')}, {}) is None
+        
+    def test_vectors_are_normalized_and_hashed(self):
+        """Vectors are unit length over a fixed number of buckets, so any two documents compare."""
+        vector = concept_vector("Python services, Python tooling and Kafka pipelines")
+        
+        assert abs(vector.cosine(vector) - 1.0) < 1e-9
+        assert all(0 <= bucket < nlp_core.CONCEPT_VECTOR_DIM for bucket in vector.weights)
+        assert vector.terms == 5
+        assert not concept_vector("the and 2024")
+        
+    def test_matrix_with_and_without_numpy(self, monkeypatch):
+        """The NumPy matrix product and the pure-Python path give the same similarities."""
+        rows = [concept_vector(SAMPLE_JD), concept_vector("Kubernetes and Go"), concept_vector("")]
+        columns = [concept_vector(SAMPLE_RESUME), concept_vector(self.UNRELATED_RESUME)]
+        matrix = concept_similarity_matrix(rows, columns)
+        monkeypatch.setattr(nlp_core, '_numpy_module', None)
+        pure = concept_similarity_matrix(rows, columns)
+        
+        assert [[round(x, 9) for x in row] for row in matrix] == [[round(x, 9) for x in row] for row in pure]
+        assert pure[0][0] == rows[0].cosine(columns[0])
+        assert pure[2] == [0.0, 0.0]
+
+
+class TestATSScoreUpperBound:
+    @pytest.mark.parametrize('resume', [
+        SAMPLE_RESUME,
+        "John Doe\nSummary\nJunior developer.\nSkills\nHTML, CSS",
+        "Jane Roe\nExperience\n- Wrote Java services on AWS with ReactJS",
+        ""
+    ])
+    def test_bound_never_below_total(self, resume):
+        """The cheap bound must dominate the fully matched score."""
+        jd_model = parse_jd(SAMPLE_JD)
+        resume_model = parse_resume_canonical(resume)
+        match_results = match_keywords(jd_model, resume_model)
+        
+        total = calculate_ats_score(jd_model, match_results, resume)['total']
+        
+        assert ats_score_upper_bound(jd_model, resume_model, resume) >= total
+        
+    def test_bound_benchmark_cases_hold(self):
+        """The --bound benchmark covers on- and off-profile JDs, and its bounds dominate the totals."""
+        report = run_bound_benchmark(['small', 'medium'])
+        
+        assert [(case['size'], case['profile']) for case in report] == \
+            [('small', 'on'), ('small', 'off'), ('medium', 'on'), ('medium', 'off')]
+        assert all(case['bound'] >= case['total'] for case in report)
+
+
 # --- Recommendation Tests ---
 
 class TestGenerateRecommendations:
@@ -325,5 +534,731 @@ class TestEvaluateATS:
         assert breakdown['total'] == expected_total
 
 
+
+class TestEvaluationModes:
+    def test_triage_returns_documented_subset(self):
+        """Triage skips locations and recommendations."""
+        result = evaluate_ats(SAMPLE_RESUME, SAMPLE_JD, mode='triage')
+        
+        assert result['mode'] == 'triage'
+        assert 'recommendations' not in result
+        assert all('locations' not in r for r in result['matchResults'])
+        
+    def test_triage_total_is_lower_bound(self):
+        """Exact-only matching can never score above the full pipeline."""
+        for resume in [SAMPLE_RESUME, "John Doe\nSkills\nReactJS, Postgres"]:
+            triage = evaluate_ats(resume, SAMPLE_JD, mode='triage')
+            full = evaluate_ats(resume, SAMPLE_JD)
+            
+            assert triage['scoreBreakdown']['total'] <= full['scoreBreakdown']['total']
+            
+    def test_promote_evaluation_matches_full(self):
+        """Promoting a triage result gives the full evaluation for the same JD model."""
+        triage = evaluate_ats(SAMPLE_RESUME, SAMPLE_JD, mode='triage')
+        promoted = promote_evaluation(triage, SAMPLE_RESUME)
+        full = evaluate_ats(SAMPLE_RESUME, SAMPLE_JD)
+        
+        assert promoted['jdModel'] is triage['jdModel']
+        assert promoted['matchResults'] == full['matchResults']
+        assert promoted['scoreBreakdown'] == full['scoreBreakdown']
+        assert len(promoted['recommendations']) == len(full['recommendations'])
+        
+    def test_promote_evaluation_only_rematches_triage_misses(self, monkeypatch):
+        """Keywords triage matched are not rematched; only its misses reach the partial stage."""
+        resume = "John Doe\nSkills\nReactJS, Python, Docker"
+        triage = evaluate_ats(resume, SAMPLE_JD, mode='triage')
+        full = evaluate_ats(resume, SAMPLE_JD)
+        misses = [r['keyword'].lower() for r in triage['matchResults'] if r['status'] == 'missing']
+        partial = []
+        partial_match = nlp_core._partial_match
+        monkeypatch.setattr(nlp_core, '_partial_match', lambda keyword, *args: partial.append(keyword) or
+                            partial_match(keyword, *args))
+        monkeypatch.setattr(nlp_core, 'match_keywords', None)
+        promoted = promote_evaluation(triage, resume)
+        
+        assert partial == misses
+        assert any(r['status'] == 'matched' for r in triage['matchResults'])
+        assert promoted['matchResults'] == full['matchResults']
+        
+    def test_promote_score_matches_full(self):
+        """Promoting a score_ats triage result equals full scoring."""
+        triage = score_ats(SAMPLE_RESUME, SAMPLE_JD, mode='triage')
+        
+        assert 'suggestions' not in triage
+        assert 'readability' not in triage['breakdown']
+        assert promote_score(triage, SAMPLE_RESUME) == score_ats(SAMPLE_RESUME, SAMPLE_JD)
+        
+    def test_unknown_mode_rejected(self):
+        """Invalid modes fail loudly instead of silently running the full pipeline."""
+        with pytest.raises(ValueError):
+            evaluate_ats(SAMPLE_RESUME, SAMPLE_JD, mode='fast')
+
+
+class TestDeadlineEvaluation:
+    @staticmethod
+    def _slow_resume():
+        # Thousands of distinct skill tokens make every fuzzy keyword expensive
+        import random
+        rng = random.Random(1)
+        junk = ', '.join(''.join(rng.choice('abcdefghijklmnop') for _ in range(rng.randint(5, 12)))
+                         for _ in range(3000))
+        return SAMPLE_RESUME + "\n\nSkills\n" + junk
+    
+    def test_generous_deadline_matches_full(self):
+        """With time to spare the result equals a plain full evaluation."""
+        full = evaluate_ats(SAMPLE_RESUME, SAMPLE_JD)
+        bounded = evaluate_ats(SAMPLE_RESUME, SAMPLE_JD, deadline_ms=60000)
+        
+        assert bounded['matchResults'] == full['matchResults']
+        assert bounded['scoreBreakdown'] == full['scoreBreakdown']
+        assert [r['message'] for r in bounded['recommendations']] == [r['message'] for r in full['recommendations']]
+        assert bounded['unevaluatedKeywords'] == []
+        assert bounded['deadlineExceeded'] is False
+        
+    def test_expired_deadline_keeps_exact_matches(self):
+        """Exact matches are always decided; the rest is reported, counted missing and not recommended."""
+        full = evaluate_ats(SAMPLE_RESUME, SAMPLE_JD)
+        bounded = evaluate_ats(SAMPLE_RESUME, SAMPLE_JD, deadline_ms=0)
+        unevaluated = set(bounded['unevaluatedKeywords'])
+        exact = {r['keyword'] for r in evaluate_ats(SAMPLE_RESUME, SAMPLE_JD, mode='triage')['matchResults']
+                 if r['status'] == 'matched'}
+        
+        assert {r['keyword'] for r in bounded['matchResults'] if r['status'] == 'matched'} == exact
+        assert unevaluated == {r['keyword'] for r in bounded['matchResults']} - exact
+        assert bounded['scoreBreakdown']['total'] <= full['scoreBreakdown']['total']
+        assert not any(keyword in r['message'] for r in bounded['recommendations'] for keyword in unevaluated)
+        
+    def test_pathological_resume_answers_in_time(self, monkeypatch):
+        """A resume that makes fuzzy matching slow stops scanning at the deadline."""
+        scans = []
+        fuzzy_match = nlp_core._fuzzy_match
+        monkeypatch.setattr(nlp_core, '_fuzzy_match', lambda *args: scans.append(args[0]) or fuzzy_match(*args))
+        resume = self._slow_resume()
+        jd = SAMPLE_JD + "\nRequirements:\n- Terraform, GraphQL, Kafka, Rust, Scala, Snowflake, observability"
+        result = evaluate_ats(resume, jd, deadline_ms=50)
+        bounded_scans = list(scans)
+        scans.clear()
+        evaluate_ats(resume, jd)
+        
+        assert result['deadlineExceeded'] is True
+        assert 0 < len(bounded_scans) < len(scans)
+        # The scan the deadline interrupted leaves its keyword undecided
+        assert bounded_scans[-1] in {keyword.lower() for keyword in result['unevaluatedKeywords']}
+        
+    def test_spent_budget_skips_concept_vectors(self, monkeypatch):
+        """Past the deadline roleTitleScore is not computed, and the response says so with every keyword decided."""
+        built = []
+        concept_vectors = nlp_core._concept_vectors
+        monkeypatch.setattr(nlp_core, '_concept_vectors', lambda *args: built.append(args) or concept_vectors(*args))
+        jd = "Requirements:\n- Python, Docker"
+        resume = "Skills\nPython, Docker\nExperience\nBuilt services under a spent budget."
+        bounded = evaluate_ats(resume, jd, deadline_ms=0)
+        
+        assert built == []
+        assert bounded['unevaluatedKeywords'] == []
+        assert bounded['deadlineExceeded'] is True
+        assert bounded['scoreBreakdown']['roleTitleScore'] == nlp_core.ROLE_TITLE_DEFAULT_SCORE
+        # Vectors cached by an earlier evaluation are still compared
+        full = evaluate_ats(resume, jd)
+        assert evaluate_ats(resume, jd, deadline_ms=0)['scoreBreakdown'] == full['scoreBreakdown']
+        
+    def test_dispatch_passes_deadline(self):
+        """The batched bridge accepts deadlineMs for evaluateATS."""
+        request = {'op': 'evaluateATS', 'args': {'resumeText': SAMPLE_RESUME, 'jdText': SAMPLE_JD, 'deadlineMs': 0}}
+        response = json.loads(dispatch(json.dumps([request])))[0]
+        
+        assert response['result']['deadlineExceeded'] is True
+
+
+class TestStreamingMatches:
+    def test_stream_yields_every_result_exact_first(self):
+        """The stream holds match_keywords' results, exact matches before the rest."""
+        jd_model = parse_jd(SAMPLE_JD)
+        resume_model = parse_resume_canonical(SAMPLE_RESUME)
+        streamed = list(iter_match_keywords(jd_model, resume_model))
+        exact = {r['keyword'] for r in evaluate_ats(SAMPLE_RESUME, SAMPLE_JD, mode='triage')['matchResults']
+                 if r['status'] == 'matched'}
+        key = lambda r: r['keyword']
+    
+
+        assert sorted(streamed, key=key) == sorted(match_keywords(jd_model, resume_model), key=key)
+        assert exact
+        assert {r['keyword'] for r in streamed[:len(exact)]} == exact
+    
+
+    def test_accumulator_brackets_final_score(self):
+        """Running totals only rise, maxTotal only falls, and both end at calculate_ats_score."""
+        jd_model = parse_jd(SAMPLE_JD)
+        resume_model = parse_resume_canonical(SAMPLE_RESUME)
+        accumulator = ScoreAccumulator(jd_model, SAMPLE_RESUME)
+        final = calculate_ats_score(jd_model, match_keywords(jd_model, resume_model), SAMPLE_RESUME)
+        totals, bounds = [accumulator.breakdown()['total']], [accumulator.max_total()]
+        for result in iter_match_keywords(jd_model, resume_model):
+            accumulator.add(result)
+            totals.append(accumulator.breakdown()['total'])
+            bounds.append(accumulator.max_total())
+    
+
+        assert totals == sorted(totals) and bounds == sorted(bounds, reverse=True)
+        assert accumulator.breakdown() == final
+        assert bounds[-1] == final['total']
+        assert all(low <= final['total'] <= high for low, high in zip(totals, bounds))
+    
+
+    def test_iter_evaluate_ats_ends_with_full_evaluation(self):
+        """One progress event per keyword, then a done event carrying evaluate_ats' result."""
+        events = list(iter_evaluate_ats(SAMPLE_RESUME, SAMPLE_JD))
+        full = evaluate_ats(SAMPLE_RESUME, SAMPLE_JD)
+        done = events[-1]
+    
+
+        assert len(events) == len(full['matchResults']) + 1
+        assert not any(e['done'] for e in events[:-1]) and done['done'] is True
+        assert done['evaluation']['matchResults'] == full['matchResults']
+        assert done['evaluation']['scoreBreakdown'] == full['scoreBreakdown'] == done['scoreBreakdown']
+        assert [r['message'] for r in done['evaluation']['recommendations']] == \
+            [r['message'] for r in full['recommendations']]
+        assert events[0]['matchedKeywords'] == [events[0]['matchResult']['keyword']]
+    
+
+    def test_first_event_precedes_fuzzy_matching(self, monkeypatch):
+        """Exact results arrive before the fuzzy stage starts."""
+        scans = []
+        fuzzy_match = nlp_core._fuzzy_match
+        monkeypatch.setattr(nlp_core, '_fuzzy_match', lambda *args: scans.append(args[0]) or fuzzy_match(*args))
+        resume = TestDeadlineEvaluation._slow_resume()
+        jd = SAMPLE_JD + "\nRequirements:\n- Terraform, GraphQL, Kafka, Rust, Scala, Snowflake, observability"
+        events = iter_evaluate_ats(resume, jd)
+        first = next(events)
+        fuzzy_before_first = len(scans)
+        last = list(events)[-1]
+    
+
+        assert first['matchResult']['status'] == 'matched'
+        assert fuzzy_before_first == 0 and scans
+        assert last['done'] is True
+
+
+class TestAsyncAPI:
+    @staticmethod
+    def _comparable(evaluation):
+        return (evaluation['matchResults'], evaluation['scoreBreakdown'],
+                [r['message'] for r in evaluation['recommendations']])
+    
+
+    def test_evaluate_ats_async_matches_sync(self):
+        """The coroutine returns what evaluate_ats returns, in every mode."""
+        full = asyncio.run(evaluate_ats_async(SAMPLE_RESUME, SAMPLE_JD, time_slice_ms=0))
+        triage = asyncio.run(evaluate_ats_async(SAMPLE_RESUME, SAMPLE_JD, mode='triage'))
+        bounded = asyncio.run(evaluate_ats_async(SAMPLE_RESUME, SAMPLE_JD, deadline_ms=0))
+    
+
+        assert self._comparable(full) == self._comparable(evaluate_ats(SAMPLE_RESUME, SAMPLE_JD))
+        assert triage['matchResults'] == evaluate_ats(SAMPLE_RESUME, SAMPLE_JD, mode='triage')['matchResults']
+        assert bounded['deadlineExceeded'] is True
+    
+
+    def test_long_evaluation_yields_to_event_loop(self):
+        """A slow fuzzy stage is cut into slices, so other tasks keep running in between."""
+        resume = TestDeadlineEvaluation._slow_resume()
+        jd = SAMPLE_JD + "\nRequirements:\n- Terraform, GraphQL, Kafka, Rust, Scala, Snowflake, observability"
+        ticks = []
+    
+
+        async def ticker():
+            while True:
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0)
+    
+
+        async def run():
+            task = asyncio.ensure_future(ticker())
+            result = await evaluate_ats_async(resume, jd, time_slice_ms=5)
+            task.cancel()
+            return result
+    
+
+        result = asyncio.run(run())
+        gaps = [b - a for a, b in zip(ticks, ticks[1:])]
+    
+
+        assert self._comparable(result) == self._comparable(evaluate_ats(resume, jd))
+        assert len(ticks) > 10
+        assert max(gaps) < (ticks[-1] - ticks[0]) / 5
+    
+
+    def test_iter_evaluate_ats_async_streams_progress(self):
+        """The async iterator yields iter_evaluate_ats's events while other tasks keep running."""
+        resume = TestDeadlineEvaluation._slow_resume()
+        jd = SAMPLE_JD + "\nRequirements:\n- Terraform, GraphQL, Kafka, Rust, Scala, Snowflake, observability"
+        ticks = []
+    
+
+        async def collect():
+            async def ticker():
+                while True:
+                    ticks.append(len(events))
+                    await asyncio.sleep(0)
+            events = []
+            task = asyncio.ensure_future(ticker())
+            async for event in iter_evaluate_ats_async(resume, jd, time_slice_ms=5):
+                events.append(event)
+            task.cancel()
+            return events
+    
+
+        events = asyncio.run(collect())
+        expected = list(iter_evaluate_ats(resume, jd))
+    
+
+        assert [e['matchResult'] for e in events] == [e['matchResult'] for e in expected]
+        assert [e['scoreBreakdown'] for e in events] == [e['scoreBreakdown'] for e in expected]
+        assert self._comparable(events[-1]['evaluation']) == self._comparable(expected[-1]['evaluation'])
+        assert len(set(ticks)) > 2  # the UI side ran between progress events
+    
+
+    def test_iter_evaluate_ats_async_deadline(self):
+        """With a deadline the final event carries the bounded evaluation."""
+        async def collect():
+            return [event async for event in iter_evaluate_ats_async(SAMPLE_RESUME, SAMPLE_JD, deadline_ms=0)]
+    
+
+        events = asyncio.run(collect())
+        bounded = evaluate_ats(SAMPLE_RESUME, SAMPLE_JD, deadline_ms=0)
+    
+
+        assert events[-1]['done'] is True
+        assert events[-1]['evaluation']['unevaluatedKeywords'] == bounded['unevaluatedKeywords']
+        assert len(events) == len(bounded['matchResults']) - len(bounded['unevaluatedKeywords']) + 1
+    
+
+    def test_map_evaluate_async(self):
+        """Batch results come back in input order and equal single evaluations."""
+        jds = [SAMPLE_JD, SAMPLE_JD + "\n- Terraform and Kafka", "Requirements: Rust"]
+        results = asyncio.run(map_evaluate_async([(SAMPLE_RESUME, jd) for jd in jds]))
+    
+
+        assert [self._comparable(r) for r in results] == \
+            [self._comparable(evaluate_ats(SAMPLE_RESUME, jd)) for jd in jds]
+    
+
+    def test_optimize_resume_async_matches_sync(self):
+        """Text and edit outputs equal optimize_resume's."""
+        text = asyncio.run(optimize_resume_async(SAMPLE_RESUME, SAMPLE_JD))
+        edits = asyncio.run(optimize_resume_async(SAMPLE_RESUME, SAMPLE_JD, output='edits'))
+    
+
+        assert text == optimize_resume(SAMPLE_RESUME, SAMPLE_JD)
+        assert edits == optimize_resume(SAMPLE_RESUME, SAMPLE_JD, output='edits')
+
+
+# --- Memory Budget Tests ---
+
+class TestLexiconSnapshot:
+    @pytest.fixture
+    def constants_path(self, tmp_path):
+        path = tmp_path / 'shared-constants.json'
+        path.write_text(json.dumps({
+            'TECH_SKILLS': nlp_core.TECH_SKILLS,
+            'SOFT_SKILLS': nlp_core.SOFT_SKILLS,
+            'STOP_WORDS': sorted(nlp_core.STOP_WORDS)
+        }))
+        return path
+    
+    def test_round_trip(self, constants_path, tmp_path):
+        """A fresh snapshot loads back as the same index."""
+        snapshot = tmp_path / 'lexicon.snapshot'
+        write_lexicon_snapshot(str(snapshot), str(constants_path))
+        checksum = nlp_core._lexicon_checksum(constants_path.read_bytes())
+        
+        assert nlp_core._read_lexicon_snapshot(str(snapshot), checksum) == nlp_core.default_engine().lexicon.to_data()
+        
+    def test_stale_snapshot_is_ignored(self, constants_path, tmp_path):
+        """Changed constants invalidate the snapshot."""
+        snapshot = tmp_path / 'lexicon.snapshot'
+        write_lexicon_snapshot(str(snapshot), str(constants_path))
+        constants_path.write_text(json.dumps({'TECH_SKILLS': ['Python'], 'SOFT_SKILLS': [], 'STOP_WORDS': []}))
+        checksum = nlp_core._lexicon_checksum(constants_path.read_bytes())
+        
+        assert nlp_core._read_lexicon_snapshot(str(snapshot), checksum) is None
+        
+    def test_code_references_are_refused(self, constants_path, tmp_path):
+        """Snapshots may only contain plain data."""
+        import pickle
+        checksum = nlp_core._lexicon_checksum(constants_path.read_bytes())
+        snapshot = tmp_path / 'lexicon.snapshot'
+        snapshot.write_bytes(nlp_core.LEXICON_SNAPSHOT_MAGIC + nlp_core.LEXICON_SNAPSHOT_FORMAT.to_bytes(2, 'little')
+                             + checksum + pickle.dumps({'call': os.getcwd}))
+        
+        assert nlp_core._read_lexicon_snapshot(str(snapshot), checksum) is None
+        
+    @pytest.mark.parametrize('skill', ['go', 'c++', 'c#', 'node.js', 'ci/cd', '.net', 'aa', 'a_b'])
+    def test_skill_count_matches_word_boundary_regex(self, skill):
+        """The str.find scan counts exactly what the old compiled \\b...\\b pattern found."""
+        import random
+        import re
+        rng = random.Random(skill)
+        pieces = ['go', 'c++', 'c#', 'node.js', 'ci/cd', '.net', 'aa', 'a_b', 'x', '_', ' ', '+', '.', '/', '\n', 'ü', '2']
+        pattern = re.compile(r'\b' + re.escape(skill) + r'\b')
+        for _ in range(2000):
+            text = ''.join(rng.choice(pieces) for _ in range(rng.randint(0, 12)))
+            expected = len(pattern.findall(text))
+        
+            assert nlp_core._skill_count(text, skill) == expected, text
+            assert nlp_core._skill_count(text, skill, 1) == min(expected, 1), text
+        
+    def test_engine_loads_matching_snapshot(self, constants_path, tmp_path, monkeypatch, capsys):
+        """Startup uses the snapshot when it matches and falls back to JSON when it does not."""
+        write_lexicon_snapshot(str(tmp_path / 'shared-constants.snapshot'), str(constants_path))
+        saved = nlp_core.default_engine().lexicon
+        monkeypatch.chdir(tmp_path)
+        try:
+            monkeypatch.setattr(nlp_core, '_constants_loaded', False)
+            nlp_core._load_shared_constants()
+            assert 'Loaded lexicon snapshot' in capsys.readouterr().out
+            
+            constants_path.write_text(json.dumps({'TECH_SKILLS': ['Python'], 'SOFT_SKILLS': [], 'STOP_WORDS': []}))
+            monkeypatch.setattr(nlp_core, '_constants_loaded', False)
+            nlp_core._load_shared_constants()
+            assert 'Loaded from shared-constants.json' in capsys.readouterr().out
+            assert nlp_core.TECH_SKILLS == ['Python']
+        finally:
+            nlp_core._install_lexicon(saved)
+
+
+class TestLexiconImage:
+    COUNTS = {'python': 9, 'kafka': 1, 'candidate': 10, 'c++': 2, 'naïve': 3}
+    
+    def _weighted(self):
+        lexicon = default_engine().lexicon
+        return lexicon.with_term_weights(TermWeights(self.COUNTS, 10, 2, lexicon.fingerprint))
+    
+    def test_round_trip_with_term_weights(self, tmp_path):
+        """A mapped image behaves like the lexicon it was written from, IDF table included."""
+        lexicon = self._weighted()
+        write_lexicon_image(str(tmp_path / 'lexicon.img'), lexicon)
+        mapped = open_lexicon_image(str(tmp_path / 'lexicon.img'))
+        jd = SAMPLE_JD + "\n- Kafka streaming"
+        
+        assert mapped.to_data() == lexicon.to_data()
+        assert ATSEngine(mapped).engine_version() == ATSEngine(lexicon).engine_version()
+        assert ATSEngine(mapped).parse_jd(jd)['categorizedKeywords'] == ATSEngine(lexicon).parse_jd(jd)['categorizedKeywords']
+        for term in list(self.COUNTS) + ['unseen', '']:
+            assert mapped.term_weights.weight(term) == lexicon.term_weights.weight(term)
+        assert mapped.term_weights.counts() == self.COUNTS
+        assert mapped.term_weights.updated({'kafka': 1}, 1).counts()['kafka'] == 2
+        
+    def test_image_without_term_weights(self, tmp_path):
+        """Images of unweighted lexicons map to unweighted lexicons."""
+        write_lexicon_image(str(tmp_path / 'lexicon.img'))
+        mapped = open_lexicon_image(str(tmp_path / 'lexicon.img'))
+        
+        assert mapped.term_weights is None
+        assert mapped.fingerprint == default_engine().lexicon.fingerprint
+        
+    def test_foreign_images_are_refused(self, tmp_path, monkeypatch):
+        """Other files and images of another engine version are rejected."""
+        path = tmp_path / 'lexicon.img'
+        path.write_bytes(b'not an image at all')
+        with pytest.raises(ValueError):
+            open_lexicon_image(str(path))
+        
+        write_lexicon_image(str(path), self._weighted())
+        monkeypatch.setattr(nlp_core, 'ENGINE_VERSION', '0.0.0')
+        with pytest.raises(ValueError):
+            open_lexicon_image(str(path))
+        
+    def test_mapped_tables_are_read_in_place(self, tmp_path, monkeypatch):
+        """Opening an image unpickles nothing and compiles only the phrase pattern; results are unchanged."""
+        import re
+        jd = "Requirements:\n- Haskell and Python"
+        lexicon = self._weighted()
+        write_lexicon_image(str(tmp_path / 'lexicon.img'), lexicon)
+        compiled = []
+        compile_pattern = re.compile
+        monkeypatch.setattr(re, 'compile', lambda pattern, *args: compiled.append(pattern) or compile_pattern(pattern, *args))
+        monkeypatch.setattr(nlp_core, '_snapshot_unpickler', None)
+        mapped = open_lexicon_image(str(tmp_path / 'lexicon.img'))
+        monkeypatch.undo()
+        mapped_result = ATSEngine(mapped).evaluate_ats(SAMPLE_RESUME, SAMPLE_JD)
+        built_result = ATSEngine(lexicon).evaluate_ats(SAMPLE_RESUME, SAMPLE_JD)
+        
+        assert compiled == [lexicon.phrase_pattern]
+        assert isinstance(mapped.stop_words, nlp_core._ImageStringSet)
+        assert isinstance(mapped.aliases, nlp_core._ImageStringMap)
+        assert mapped_result['jdModel']['categorizedKeywords'] == built_result['jdModel']['categorizedKeywords']
+        for key in ('matchResults', 'scoreBreakdown', 'recommendations'):
+            assert mapped_result[key] == built_result[key]
+        assert ATSEngine(mapped.overlay(['Haskell'])).parse_jd(jd)['categorizedKeywords'] == \
+            ATSEngine(lexicon.overlay(['Haskell'])).parse_jd(jd)['categorizedKeywords']
+        with pytest.raises(TypeError):
+            mapped.categories['python'] = 'tool'
+        
+    def test_startup_maps_image_from_env(self, tmp_path, monkeypatch):
+        """With NLP_LEXICON_IMAGE set, startup maps the image; an unusable one falls back to the constants."""
+        lexicon = self._weighted()
+        write_lexicon_image(str(tmp_path / 'lexicon.img'), lexicon)
+        saved = nlp_core.default_engine().lexicon
+        try:
+            monkeypatch.setenv(nlp_core.LEXICON_IMAGE_ENV, str(tmp_path / 'lexicon.img'))
+            monkeypatch.setattr(nlp_core, '_constants_loaded', False)
+            nlp_core._load_shared_constants()
+            assert isinstance(nlp_core.default_engine().lexicon.tech_set, nlp_core._ImageStringSet)
+            assert nlp_core.engine_version() == ATSEngine(lexicon).engine_version()
+        
+            monkeypatch.setenv(nlp_core.LEXICON_IMAGE_ENV, str(tmp_path / 'missing.img'))
+            monkeypatch.setattr(nlp_core, '_constants_loaded', False)
+            nlp_core._load_shared_constants()
+            assert not isinstance(nlp_core.default_engine().lexicon.tech_set, nlp_core._ImageStringSet)
+            assert nlp_core.default_engine().lexicon.term_weights is None
+        finally:
+            nlp_core._install_lexicon(saved)
+
+
+class TestSectionSpans:
+    def test_resume_views_match_parsed_sections(self):
+        """Span views reproduce parse_resume_sections exactly."""
+        doc = resume_section_spans(SAMPLE_RESUME)
+        
+        assert {name: doc.view(name) for name in doc} == parse_resume_sections(SAMPLE_RESUME)
+        
+    def test_spans_index_shared_buffers(self):
+        """Offsets are valid in both the original and the lowercased text."""
+        doc = resume_section_spans(SAMPLE_RESUME)
+        start, end = doc['skills']
+        
+        assert doc.lower[start:end] == SAMPLE_RESUME[start:end].lower()
+        assert doc.contains('skills', 'python')
+        assert not doc.contains('skills', 'mentored')
+        
+    def test_jd_views_match_model_sections(self):
+        """parse_jd sections come straight from the JD spans."""
+        doc = jd_section_spans(SAMPLE_JD)
+        
+        assert {name: doc.view(name) for name in doc} == parse_jd(SAMPLE_JD)['sections']
+        assert doc.contains('requirements', 'python')
+        
+    def test_length_changing_lowercase(self):
+        """Characters whose lowercase is longer do not shift offsets."""
+        text = "İstanbul Office\nSkills\nPython, İnfra"
+        doc = resume_section_spans(text)
+        
+        assert doc.view('skills') == "Python, İnfra"
+        assert len(doc.lower) == len(text)
+        assert doc.full_lower() == text.lower()
+
+
+class TestOptimizeResumeEdits:
+    def test_edits_reproduce_rebuilt_sections(self):
+        """Applying the edits yields the same sections as the rebuilt text."""
+        edits = optimize_resume(SAMPLE_RESUME, SAMPLE_JD, output='edits')
+        
+        assert edits
+        assert parse_resume_sections(apply_edits(SAMPLE_RESUME, edits)) == \
+            parse_resume_sections(optimize_resume(SAMPLE_RESUME, SAMPLE_JD))
+        
+    def test_edits_are_ordered_and_disjoint(self):
+        """Edits are sorted by offset and never overlap."""
+        edits = optimize_resume(SAMPLE_RESUME, SAMPLE_JD, output='edits')
+        
+        for prev, edit in zip(edits, edits[1:]):
+            assert prev['end'] <= edit['start']
+        
+    def test_untouched_text_is_preserved(self):
+        """Content outside the edits, including unknown sections, is kept verbatim."""
+        resume = SAMPLE_RESUME + "\nVolunteering\n  Food bank   organizer\n"
+        result = apply_edits(resume, optimize_resume(resume, SAMPLE_JD, output='edits'))
+        
+        assert "Volunteering\n  Food bank   organizer\n" in result
+        assert result.startswith(resume[:resume.index('Summary')])
+        
+    def test_missing_skills_section_is_appended(self):
+        """Without a skills section the remaining keywords are appended as one."""
+        resume = "John Doe\nExperience\n- Wrote scripts"
+        edits = optimize_resume(resume, SAMPLE_JD, output='edits')
+        
+        assert edits[-1]['op'] == 'append'
+        assert edits[-1]['start'] == len(resume)
+        assert 'SKILLS' in apply_edits(resume, edits)
+        
+    def test_no_edits_when_nothing_missing(self):
+        """A resume that already covers the JD needs no edits."""
+        assert optimize_resume(SAMPLE_JD, SAMPLE_JD, output='edits') == []
+        
+    def test_utf16_offsets_round_trip_with_astral_characters(self):
+        """Through the bridge, edits land in the right place when applied to the UTF-16 text."""
+        resume = "🚀🚀 " + SAMPLE_RESUME.replace("Summary\n", "Summary\n𝒜 builder 😀.\n")
+        request = {'op': 'optimizeResume', 'args': {'resumeText': resume, 'jdText': SAMPLE_JD, 'output': 'edits'}}
+        bridged = json.loads(dispatch(json.dumps([request])))[0]['result']
+        edits = optimize_resume(resume, SAMPLE_JD, output='edits')
+        
+        def apply_utf16(text, edits):
+            units = text.encode('utf-16-le')
+            for edit in reversed(edits):
+                units = units[:2 * edit['start']] + edit['text'].encode('utf-16-le') + units[2 * edit['end']:]
+            return units.decode('utf-16-le')
+        
+        assert bridged == utf16_edits(resume, edits)
+        assert bridged[0]['start'] == edits[0]['start'] + 4  # 🚀🚀, 𝒜 and 😀 come first
+        assert apply_utf16(resume, bridged) == apply_edits(resume, edits)
+        assert parse_resume_sections(apply_edits(resume, edits)) == \
+            parse_resume_sections(optimize_resume(resume, SAMPLE_JD))
+        assert utf16_edits(SAMPLE_RESUME, edits) is edits
+        
+    def test_unknown_output_raises(self):
+        """Only 'text' and 'edits' are supported."""
+        with pytest.raises(ValueError):
+            optimize_resume(SAMPLE_RESUME, SAMPLE_JD, output='diff')
+
+
+class TestOptimizeResumeMany:
+    JDS = [SAMPLE_JD, "Requirements:\n- Terraform, Kafka and Rust experience", SAMPLE_JD, SAMPLE_RESUME]
+
+    def test_variants_equal_single_calls(self):
+        """Each variant, text or edits, equals optimize_resume for its JD."""
+        texts = optimize_resume_many(SAMPLE_RESUME, self.JDS)
+        edits = optimize_resume_many(SAMPLE_RESUME, self.JDS, output='edits')
+        
+        assert texts == [optimize_resume(SAMPLE_RESUME, jd) for jd in self.JDS]
+        assert edits == [optimize_resume(SAMPLE_RESUME, jd, output='edits') for jd in self.JDS]
+        assert texts[3] == SAMPLE_RESUME and edits[3] == []
+        assert edits[0] is not edits[2]
+        
+    def test_documents_are_analyzed_once(self, monkeypatch):
+        """The resume's name and keywords, and each distinct JD's keywords, are computed once."""
+        scanned = []
+        extract_keywords = nlp_core._extract_keywords
+        monkeypatch.setattr(nlp_core, '_extract_keywords',
+                            lambda lexicon, text, topn: scanned.append((text, topn)) or extract_keywords(lexicon, text, topn))
+        names = []
+        extract_name = nlp_core.extract_name
+        monkeypatch.setattr(nlp_core, 'extract_name', lambda text: names.append(text) or extract_name(text))
+        optimize_resume_many(SAMPLE_RESUME, self.JDS)
+        
+        assert names == [SAMPLE_RESUME]
+        assert sorted(scanned) == sorted([(SAMPLE_RESUME, 50), (SAMPLE_JD, 30), (self.JDS[1], 30), (SAMPLE_RESUME, 30)])
+        
+    def test_async_dispatch_and_errors(self):
+        """The async variant and the dispatch op return the same variants; bad output raises up front."""
+        expected = optimize_resume_many(SAMPLE_RESUME, self.JDS)
+        response, = json.loads(dispatch(json.dumps([
+            {'op': 'optimizeResumeMany', 'args': {'resumeText': SAMPLE_RESUME, 'jdTexts': self.JDS}}])))
+        
+        assert asyncio.run(optimize_resume_many_async(SAMPLE_RESUME, self.JDS, time_slice_ms=0)) == expected
+        assert response['result'] == expected
+        assert optimize_resume_many(SAMPLE_RESUME, []) == []
+        with pytest.raises(ValueError):
+            optimize_resume_many(SAMPLE_RESUME, [], output='diff')
+
+
+class TestMemoryBudget:
+    def test_peak_memory_within_committed_budget(self):
+        """Peak allocations of the public functions must stay within memory_budget.json."""
+        report = run_memory_benchmark(['small', 'medium'])
+        
+        over = [f"{c['function']}[{c['size']}] {c['peakBytes']} > {c['budgetBytes']}"
+                for c in report if not c['withinBudget']]
+        assert not over, over
+        assert all(c['budgetBytes'] is not None for c in report)
+
+
+# --- Batched Dispatch Tests ---
+
+class TestDispatch:
+    def test_dispatch_runs_operations_in_order(self):
+        """Each request gets a response with its id, in request order."""
+        requests = [
+            {'id': 'jd', 'op': 'parseJD', 'args': {'text': SAMPLE_JD}},
+            {'id': 'eval', 'op': 'evaluateATS', 'args': {'resumeText': SAMPLE_RESUME, 'jdText': SAMPLE_JD}},
+            {'id': 'score', 'op': 'scoreATS', 'args': {'resumeText': SAMPLE_RESUME, 'jdText': SAMPLE_JD}}
+        ]
+        responses = json.loads(dispatch(json.dumps(requests)))
+        
+        assert [r['id'] for r in responses] == ['jd', 'eval', 'score']
+        assert responses[2]['result'] == score_ats(SAMPLE_RESUME, SAMPLE_JD)
+        
+    def test_dispatch_shares_document_analysis(self):
+        """A JD used by several operations is parsed once per batch."""
+        requests = [
+            {'op': 'parseJD', 'args': {'text': SAMPLE_JD}},
+            {'op': 'evaluateATS', 'args': {'resumeText': SAMPLE_RESUME, 'jdText': SAMPLE_JD}}
+        ]
+        jd_result, eval_result = json.loads(dispatch(json.dumps(requests)))
+        
+        assert eval_result['result']['jdModel']['id'] == jd_result['result']['id']
+        
+    def test_dispatch_reports_errors_per_operation(self):
+        """Bad operations fail alone without aborting the batch."""
+        requests = [
+            {'id': 1, 'op': 'noSuchOp', 'args': {}},
+            {'id': 2, 'op': 'parseJD', 'args': {}},
+            {'id': 3, 'op': 'rewriteBullet', 'args': {'bullet': 'Built APIs', 'keyword': 'python'}}
+        ]
+        responses = json.loads(dispatch(json.dumps(requests)))
+        
+        assert 'error' in responses[0]
+        assert 'error' in responses[1]
+        assert responses[2]['result'] == 'Built APIs utilizing Python.'
+
+
+# --- Engine Tests ---
+
+class TestATSEngine:
+    def test_module_functions_use_default_engine(self):
+        """The module API is a facade over default_engine()."""
+        engine = default_engine()
+        
+        assert engine.score_ats(SAMPLE_RESUME, SAMPLE_JD) == score_ats(SAMPLE_RESUME, SAMPLE_JD)
+        assert engine.parse_resume_canonical(SAMPLE_RESUME) == parse_resume_canonical(SAMPLE_RESUME)
+        assert engine.engine_version() == nlp_core.engine_version()
+        
+    def test_map_evaluate_matches_serial(self):
+        """Sharing one engine across threads gives the serial results, in order."""
+        engine = default_engine()
+        pairs = [(SAMPLE_RESUME, SAMPLE_JD), (SAMPLE_JD, SAMPLE_RESUME), (SAMPLE_RESUME, SAMPLE_RESUME)] * 4
+        serial = [engine.evaluate_ats(resume, jd) for resume, jd in pairs]
+        threaded = engine.map_evaluate(pairs, max_workers=4)
+        
+        for expected, actual in zip(serial, threaded):
+            assert actual['matchResults'] == expected['matchResults']
+            assert actual['scoreBreakdown'] == expected['scoreBreakdown']
+        assert len(threaded) == len(pairs)
+        
+    def test_engines_with_different_lexicons_are_independent(self):
+        """A custom engine sees only its own lexicon and leaves the default alone."""
+        engine = ATSEngine(Lexicon.from_constants(['Haskell'], [], []))
+        jd = "Requirements:\n- Haskell and Python"
+        
+        assert [k['keyword'] for k in engine.parse_jd(jd)['categorizedKeywords']] == ['haskell']
+        assert 'python' in [k['keyword'] for k in parse_jd(jd)['categorizedKeywords']]
+        
+    def test_role_title_score_uses_engine_lexicon(self):
+        """Concept vectors skip the engine's stop words and are cached per lexicon, read-only."""
+        resume_words = set(nlp_core._CONCEPT_TERM_PATTERN.findall(SAMPLE_RESUME.lower()))
+        engine = ATSEngine(default_engine().lexicon.overlay(stop_words=resume_words))
+        jd_model = parse_jd(SAMPLE_JD)
+        default_score = calculate_ats_score(jd_model, [], SAMPLE_RESUME)['roleTitleScore']
+        
+        assert default_score != 75
+        assert engine.calculate_ats_score(jd_model, [], SAMPLE_RESUME)['roleTitleScore'] == 75
+        assert engine.evaluate_ats(SAMPLE_RESUME, SAMPLE_JD)['scoreBreakdown']['roleTitleScore'] == 75
+        assert calculate_ats_score(jd_model, [], SAMPLE_RESUME)['roleTitleScore'] == default_score
+        vectors = concept_vectors({'general': SAMPLE_JD})
+        with pytest.raises(TypeError):
+            vectors['general'].weights[0] = 1.0
+        
+    def test_engine_and_lexicon_are_immutable(self):
+        """Nothing reachable from an engine can be rebound or mutated."""
+        engine = default_engine()
+        
+        with pytest.raises(AttributeError):
+            engine.lexicon = Lexicon.from_constants([], [], [])
+        with pytest.raises(AttributeError):
+            engine.lexicon.tech_skills = ()
+        with pytest.raises(TypeError):
+            engine.lexicon.categories['python'] = 'tool'
+        assert isinstance(engine.lexicon.stop_words, frozenset)
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
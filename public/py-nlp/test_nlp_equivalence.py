@@ -0,0 +1,146 @@
+# Equivalence Harness Unit Tests
+# Run with: python -m pytest test_nlp_equivalence.py -v
+
+import json
+import pytest
+import sys
+import os
+
+# Add parent directory to path for import
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import nlp_core
+import nlp_core_reference
+from nlp_equivalence import (
+    generated_cases,
+    recorded_cases,
+    first_difference,
+    minimize,
+    load_reference,
+    run_equivalence,
+    main,
+    OPERATIONS,
+    PATH_OPERATIONS
+)
+from test_nlp_core import SAMPLE_JD, SAMPLE_RESUME
+
+
+class _KafkaSkewedEngine:
+    """nlp_core with a score_ats that is off by one whenever the resume mentions Kafka."""
+
+    def __getattr__(self, name):
+        return getattr(nlp_core, name)
+
+    def score_ats(self, resume_text, job_desc):
+        result = nlp_core.score_ats(resume_text, job_desc)
+        if 'kafka' in resume_text.lower():
+            result['score'] += 1
+        return result
+
+
+class _SkewedPromotionEngine:
+    """nlp_core whose promote_evaluation total is off by one."""
+
+    def __getattr__(self, name):
+        return getattr(nlp_core, name)
+
+    def promote_evaluation(self, triage_result, resume_text):
+        result = nlp_core.promote_evaluation(triage_result, resume_text)
+        result['scoreBreakdown']['total'] += 1
+        return result
+
+
+class TestEquivalence:
+    def test_live_engine_matches_frozen_reference(self):
+        """Every operation of nlp_core equals the frozen reference on generated cases."""
+        report = run_equivalence(generated_cases(24, seed=3))
+
+        assert report['equivalent'], report['mismatches']
+        assert report['cases'] == 24
+        assert list(report['operations']) == [*OPERATIONS, *PATH_OPERATIONS]
+        assert all(op['speedup'] > 0 for op in report['operations'].values())
+
+    def test_path_operations_are_held_to_single_calls(self):
+        """Another path to evaluate_ats's result is compared field by field with the reference's single call."""
+        report = run_equivalence([(SAMPLE_RESUME, SAMPLE_JD)], optimized=_SkewedPromotionEngine(),
+                                 operations=['promote_evaluation', 'iter_evaluate_ats', 'rank_top_k'])
+
+        assert not report['equivalent']
+        assert {op: entry['mismatches'] for op, entry in report['operations'].items()} == \
+            {'promote_evaluation': 1, 'iter_evaluate_ats': 0, 'rank_top_k': 0}
+        assert report['mismatches'][0]['difference'].startswith('$.scoreBreakdown.total:')
+
+    def test_reference_is_refrozen_with_version_bumps(self):
+        """A behaviour change bumps ENGINE_VERSION and re-freezes the reference with it."""
+        assert nlp_core_reference.ENGINE_VERSION == nlp_core.ENGINE_VERSION
+
+    def test_mismatch_is_minimized(self):
+        """A mismatching case is reported shrunk to the input that still triggers it."""
+        report = run_equivalence([(SAMPLE_RESUME + "\n- Ran Kafka clusters", SAMPLE_JD)],
+                                 optimized=_KafkaSkewedEngine(), operations=['score_ats', 'parse_jd'])
+        mismatch = report['mismatches'][0]
+
+        assert not report['equivalent']
+        assert report['operations']['score_ats']['mismatches'] == 1
+        assert report['operations']['parse_jd']['mismatches'] == 0
+        assert mismatch['resume'].lower() == 'kafka'
+        assert mismatch['jd'] == ''
+        assert mismatch['difference'].startswith('$.score:')
+
+    def test_first_difference(self):
+        """Differences are reported by path; equal values give None."""
+        assert first_difference({'a': [1, {'b': 2}]}, {'a': [1, {'b': 2}]}) is None
+        assert first_difference({'a': [1, {'b': 2}]}, {'a': [1, {'b': 3}]}) == '$.a[1].b: 2 != 3'
+        assert first_difference([1], [1, 2]) == '$: length 1 != 2'
+        assert first_difference({'a': 1}, {'a': 1, 'b': 2}).startswith("$: keys only in reference []")
+        assert first_difference({'a': 1}, {'a': 1.0}) == '$.a: 1 != 1.0'
+
+    def test_minimize_shrinks_both_documents(self):
+        """Lines, words and characters that do not matter are removed from resume and JD."""
+        fails = lambda resume, jd: 'go' in resume and 'rust' in jd
+        resume, jd = minimize("header\nwe go fast\nfooter", "a\nb rust c\nd", fails)
+
+        assert (resume, jd) == ('go', 'rust')
+
+
+class TestCorpora:
+    def test_generated_cases_are_deterministic(self):
+        """The same seed always yields the same corpus."""
+        assert list(generated_cases(12, seed=7)) == list(generated_cases(12, seed=7))
+        assert list(generated_cases(12, seed=7)) != list(generated_cases(12, seed=8))
+
+    def test_recorded_cases(self, tmp_path):
+        """Replay-format requests and plain records both become (resume, jd) cases."""
+        path = tmp_path / 'recorded.jsonl'
+        path.write_text('\n'.join(json.dumps(r) for r in [
+            {'op': 'evaluateATS', 'args': {'resumeText': 'R1', 'jdText': 'J1'}},
+            {'op': 'parseJD', 'args': {'text': 'J2'}},
+            {'resume': 'R3', 'jd': 'J3'},
+        ]) + '\n\n')
+
+        assert list(recorded_cases(str(path))) == [('R1', 'J1'), ('J2', 'J2'), ('R3', 'J3')]
+
+
+class TestCLI:
+    def test_cli_report_and_exit_code(self, tmp_path):
+        """Equivalent engines exit 0; a changed revision as reference exits 1 with its mismatches."""
+        corpus = tmp_path / 'pairs.jsonl'
+        corpus.write_text(json.dumps({'resume': SAMPLE_RESUME, 'jd': SAMPLE_JD}) + '\n')
+        changed = tmp_path / 'changed_core.py'
+        source = open(nlp_core.__file__, encoding='utf-8').read()
+        changed.write_text(source.replace('CONCEPT_SIMILARITY_FULL = 0.5', 'CONCEPT_SIMILARITY_FULL = 0.25'),
+                           encoding='utf-8')
+        output = tmp_path / 'report.json'
+
+        assert main(['--generated', '2', '--corpus', str(corpus), '--output', str(output)]) == 0
+        assert json.loads(output.read_text())['cases'] == 3
+        assert main(['--generated', '0', '--corpus', str(corpus), '--reference', str(changed),
+                     '--operation', 'evaluate_ats', '--output', str(output)]) == 1
+        report = json.loads(output.read_text())
+        assert list(report['operations']) == ['evaluate_ats']
+        assert 'scoreBreakdown' in report['mismatches'][0]['difference']
+        assert load_reference(str(changed)).CONCEPT_SIMILARITY_FULL == 0.25
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
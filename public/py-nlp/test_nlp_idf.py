@@ -0,0 +1,128 @@
+# Corpus IDF Table Unit Tests
+# Run with: python -m pytest test_nlp_idf.py -v
+
+import json
+import pytest
+import sys
+import os
+
+# Add parent directory to path for import
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from nlp_core import ATSEngine, TermWeights, default_engine, read_term_weights
+from nlp_idf import TermStatistics, corpus_documents, write_table, main
+from test_nlp_core import SAMPLE_JD
+
+# Every posting asks for Python and a "candidate"; only one mentions Kafka
+POSTINGS = [
+    f"Posting {i}: the ideal candidate writes Python services for our {team} team."
+    for i, team in enumerate(['payments', 'search', 'growth', 'billing', 'platform',
+                              'mobile', 'ads', 'identity', 'storage', 'infra'])
+] + ["Streaming posting: the candidate runs Kafka and Python pipelines."]
+
+
+def _table(texts=POSTINGS) -> TermWeights:
+    statistics = TermStatistics()
+    statistics.add_many(texts)
+    return statistics.table()
+
+
+def _weight(jd_model, keyword):
+    return next(k['weight'] for k in jd_model['categorizedKeywords'] if k['keyword'] == keyword)
+
+
+class TestTermWeights:
+    def test_common_terms_weigh_less(self):
+        """Terms in every document weigh least; rare and unseen terms weigh more."""
+        table = _table()
+
+        assert table.weight('candidate') < table.weight('kafka') < table.weight('never-seen') == 1.0
+        assert table.weight('python') == table.weight('candidate')
+        assert table.documents == len(POSTINGS) and table.version == 1
+        assert table.lexicon == default_engine().lexicon.fingerprint
+
+    def test_incremental_update_equals_full_build(self):
+        """Folding in new postings gives the same counts as one build over all of them."""
+        base = _table(POSTINGS[:4])
+        statistics = TermStatistics(base=base)
+        statistics.add_many(POSTINGS[4:])
+        updated = statistics.table()
+        full = _table()
+
+        assert updated.counts() == full.counts()
+        assert updated.documents == full.documents
+        assert updated.version == 2
+        assert updated.weight('kafka') == full.weight('kafka')
+
+    def test_round_trip_and_sorted_storage(self, tmp_path):
+        """The stored table is a sorted term array plus frequencies and reads back equal."""
+        table = _table()
+        path = str(tmp_path / 'idf.json')
+        summary = write_table(table, path)
+        data = json.loads(open(path, encoding='utf-8').read())
+        loaded = read_term_weights(path)
+
+        assert data['terms'].split('\n') == sorted(data['terms'].split('\n'))
+        assert summary['terms'] == len(data['frequencies']) == len(table)
+        assert loaded.counts() == table.counts() and loaded.fingerprint == table.fingerprint
+        assert read_term_weights(str(tmp_path / 'missing.json')) is None
+
+    def test_table_is_tied_to_its_lexicon(self):
+        """A table counted with another lexicon is refused."""
+        table = _table()
+        other = default_engine().lexicon.overlay(['Haskell'])
+
+        with pytest.raises(ValueError):
+            other.with_term_weights(table)
+        with pytest.raises(ValueError):
+            TermStatistics(ATSEngine(other), base=table)
+
+
+class TestWeightedKeywords:
+    def test_extract_keywords_demotes_filler(self):
+        """With a table, a rarer word outranks a more frequent one every document has."""
+        text = "candidate candidate candidate observability observability"
+        plain = default_engine()
+        weighted = ATSEngine(plain.lexicon.with_term_weights(_table()))
+
+        assert plain.extract_keywords(text) == ['candidate', 'observability']
+        assert weighted.extract_keywords(text) == ['observability', 'candidate']
+
+    def test_parse_jd_weights_use_idf(self):
+        """JD keyword weights drop for skills every posting asks for; without a table nothing changes."""
+        jd = SAMPLE_JD + "\n- Kafka streaming experience"
+        plain = default_engine()
+        weighted = ATSEngine(plain.lexicon.with_term_weights(_table()))
+        plain_model, weighted_model = plain.parse_jd(jd), weighted.parse_jd(jd)
+
+        assert _weight(plain_model, 'kafka') == 1.0
+        assert _weight(weighted_model, 'kafka') == weighted.lexicon.term_weights.weight('kafka')
+        assert _weight(weighted_model, 'python') < _weight(plain_model, 'python')
+        assert weighted.engine_version() != plain.engine_version()
+        assert ATSEngine(weighted.lexicon.with_term_weights(None)).engine_version() == plain.engine_version()
+
+
+class TestCLI:
+    def test_build_then_update(self, tmp_path):
+        """The job builds a table from JSONL, then folds a second batch into it as version 2."""
+        first, second = tmp_path / 'first.jsonl', tmp_path / 'second.jsonl'
+        first.write_text('\n'.join(json.dumps({'jd': text}) for text in POSTINGS[:6]) + '\n')
+        second.write_text('\n'.join([
+            json.dumps({'op': 'parseJD', 'args': {'text': POSTINGS[6]}}),
+            json.dumps({'resume': POSTINGS[7], 'jd': POSTINGS[8], 'id': 7}),
+            json.dumps({'text': POSTINGS[9]}),
+            json.dumps({'text': POSTINGS[10]}),
+        ]) + '\n')
+        table = str(tmp_path / 'idf.json')
+
+        assert len(list(corpus_documents(str(second)))) == 5
+        assert main([str(first), '--output', table]) == 0
+        assert main([str(second), '--table', table]) == 0
+        updated = read_term_weights(table)
+        assert updated.version == 2
+        assert updated.counts() == _table().counts()
+        assert main([str(second), '--table', str(tmp_path / 'missing.json')]) == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
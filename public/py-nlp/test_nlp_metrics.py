@@ -0,0 +1,170 @@
+# Engine Metrics Unit Tests
+# Run with: python -m pytest test_nlp_metrics.py -v
+
+import asyncio
+import json
+import urllib.request
+import pytest
+import sys
+import os
+
+# Add parent directory to path for import
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import nlp_core
+from nlp_core import (
+    evaluate_ats,
+    score_ats,
+    parse_jd,
+    dispatch,
+    promote_evaluation,
+    iter_evaluate_ats,
+    evaluate_ats_async,
+    iter_evaluate_ats_async,
+    optimize_resume_many,
+    optimize_resume_many_async
+)
+from nlp_cache import EvaluationCache, evaluate_ats_cached
+from nlp_metrics import MetricsRegistry, enable_metrics, disable_metrics, serve_metrics
+from test_nlp_core import SAMPLE_JD, SAMPLE_RESUME
+
+
+@pytest.fixture
+def registry():
+    registry = enable_metrics()
+    yield registry
+    disable_metrics()
+
+
+class TestMetricsRegistry:
+    def test_counts_entry_point_calls(self, registry):
+        """Public entry points record one call each, with latency and input size."""
+        evaluate_ats(SAMPLE_RESUME, SAMPLE_JD)
+        score_ats(SAMPLE_RESUME, SAMPLE_JD)
+        parse_jd(SAMPLE_JD)
+
+        assert registry.calls('evaluate_ats') == 1
+        assert registry.calls('score_ats') == 1
+        assert registry.calls('parse_jd') == 1
+        assert f'nlp_input_size_chars_sum{{op="parse_jd"}} {len(SAMPLE_JD)}' in registry.render()
+
+    def test_async_and_streaming_entry_points(self, registry):
+        """Coroutines, async iterators and generators are observed once each, when they finish."""
+        async def run():
+            await evaluate_ats_async(SAMPLE_RESUME, SAMPLE_JD)
+            await optimize_resume_many_async(SAMPLE_RESUME, [SAMPLE_JD])
+            return [event async for event in iter_evaluate_ats_async(SAMPLE_RESUME, SAMPLE_JD)]
+
+        asyncio.run(run())
+        events = iter_evaluate_ats(SAMPLE_RESUME, SAMPLE_JD)
+        next(events)
+        assert registry.calls('iter_evaluate_ats') == 0
+        events.close()
+        promote_evaluation(evaluate_ats(SAMPLE_RESUME, SAMPLE_JD, mode='triage'), SAMPLE_RESUME)
+
+        for op in ('evaluate_ats_async', 'optimize_resume_many_async', 'iter_evaluate_ats_async',
+                   'iter_evaluate_ats', 'promote_evaluation'):
+            assert registry.calls(op) == 1, op
+        assert registry.calls('iter_evaluate_ats', 'error') == 0
+
+    def test_list_arguments_count_as_input(self, registry):
+        """Lists of texts count toward the input size."""
+        optimize_resume_many(SAMPLE_RESUME, [SAMPLE_JD, SAMPLE_JD])
+
+        expected = len(SAMPLE_RESUME) + 2 * len(SAMPLE_JD)
+        assert f'nlp_input_size_chars_sum{{op="optimize_resume_many"}} {expected}' in registry.render()
+
+    def test_errors_are_counted(self, registry):
+        """A raising call is still observed, as an error."""
+        with pytest.raises(ValueError):
+            evaluate_ats(SAMPLE_RESUME, SAMPLE_JD, mode='bogus')
+
+        assert registry.calls('evaluate_ats', 'error') == 1
+
+    def test_fuzzy_fallback_rate(self, registry):
+        """Every matched keyword reports the stage that settled it."""
+        evaluate_ats(SAMPLE_RESUME, SAMPLE_JD)
+        keywords = len(parse_jd(SAMPLE_JD)['categorizedKeywords'])
+
+        assert sum(registry._matches.values()) == keywords
+        assert 0.0 <= registry.fuzzy_fallback_rate() <= 1.0
+
+    def test_cache_hit_rates(self, registry, tmp_path):
+        """Dispatch memo and evaluation cache lookups feed the hit ratios."""
+        dispatch(json.dumps([
+            {'op': 'parseJD', 'args': {'text': SAMPLE_JD}},
+            {'op': 'parseJD', 'args': {'text': SAMPLE_JD}},
+        ]))
+
+        assert registry.cache_hit_rate('analysis') == 0.5
+
+        with EvaluationCache(str(tmp_path / 'cache.db')) as cache:
+            evaluate_ats_cached(cache, [(SAMPLE_RESUME, SAMPLE_JD)])
+            evaluate_ats_cached(cache, [(SAMPLE_RESUME, SAMPLE_JD)])
+
+        assert registry.cache_hit_rate('evaluation') == 0.5
+
+    def test_disabled_by_default(self):
+        """Without enable_metrics() nothing is observed."""
+        registry = MetricsRegistry()
+        evaluate_ats(SAMPLE_RESUME, SAMPLE_JD)
+
+        assert nlp_core.metrics_sink() is None
+        assert registry.calls('evaluate_ats') == 0
+
+
+class TestPrometheusExport:
+    def test_histogram_buckets_are_cumulative(self):
+        """Bucket counts never decrease and +Inf equals the count."""
+        registry = MetricsRegistry(latency_buckets=(0.1, 1.0))
+        for seconds in (0.05, 0.1, 0.5, 5.0):
+            registry.observe_call('parse_jd', seconds, 10, False)
+        text = registry.render()
+
+        assert 'nlp_call_duration_seconds_bucket{op="parse_jd",le="0.1"} 2' in text
+        assert 'nlp_call_duration_seconds_bucket{op="parse_jd",le="1"} 3' in text
+        assert 'nlp_call_duration_seconds_bucket{op="parse_jd",le="+Inf"} 4' in text
+        assert 'nlp_call_duration_seconds_count{op="parse_jd"} 4' in text
+
+    def test_every_sample_has_a_type(self):
+        """Each metric family is declared before its samples."""
+        registry = MetricsRegistry()
+        registry.observe_call('score_ats', 0.01, 100, False)
+        registry.observe_cache('analysis', 1, 0)
+        declared = set()
+        for line in registry.render().splitlines():
+            if line.startswith('# TYPE'):
+                declared.add(line.split()[2])
+            elif not line.startswith('#'):
+                name = line.split('{')[0].split(' ')[0]
+                assert any(name == family or name.startswith(family + '_') for family in declared)
+
+    def test_textfile_export(self, tmp_path):
+        """write_textfile leaves exactly the rendered text behind."""
+        registry = MetricsRegistry()
+        registry.observe_match('exact')
+        path = tmp_path / 'nlp.prom'
+        registry.write_textfile(str(path))
+
+        assert path.read_text() == registry.render()
+        assert os.listdir(tmp_path) == ['nlp.prom']
+
+    def test_http_endpoint(self):
+        """serve_metrics exposes /metrics on localhost."""
+        registry = MetricsRegistry()
+        registry.observe_match('fuzzy')
+        server = serve_metrics(registry, port=0)
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+            with urllib.request.urlopen(url, timeout=5) as response:
+                body = response.read().decode('utf-8')
+                assert response.headers['Content-Type'].startswith('text/plain; version=0.0.4')
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert 'nlp_keyword_matches_total{stage="fuzzy"} 1' in body
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
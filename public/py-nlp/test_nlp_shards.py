@@ -0,0 +1,176 @@
+# Sharded Ranking Unit Tests
+# Run with: python -m pytest test_nlp_shards.py -v
+
+import json
+import socket
+import threading
+import pytest
+import sys
+import os
+
+# Add parent directory to path for import
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_nlp_core import synthetic_resume, synthetic_jd
+from nlp_batch import rank_top_k
+from nlp_shards import (
+    send_frame,
+    recv_frame,
+    merge_top_k,
+    rank_sharded,
+    serve_worker,
+    spawn_workers,
+    SharedLexicon,
+    main
+)
+from nlp_core import default_engine
+
+RESUMES = [synthetic_resume(n) for n in range(2, 26)]
+JDS = [synthetic_jd(4), synthetic_jd(9)]
+
+
+def _expected(k):
+    return [[{'index': e['index'], 'total': e['total']} for e in rank_top_k(RESUMES, jd, k)['topK']]
+            for jd in JDS]
+
+
+@pytest.fixture
+def workers():
+    servers = [serve_worker(), serve_worker()]
+    yield [server.server_address for server in servers]
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def _dying_worker():
+    """Accepts the JD set, then drops the connection on the first shard."""
+    listener = socket.socket()
+    listener.bind(('127.0.0.1', 0))
+    listener.listen()
+
+    def serve():
+        conn, _ = listener.accept()
+        with conn:
+            recv_frame(conn)
+            send_frame(conn, {'ok': True})
+            recv_frame(conn)
+        listener.close()
+
+    threading.Thread(target=serve, daemon=True).start()
+    return listener.getsockname()
+
+
+def _closed_port():
+    sock = socket.socket()
+    sock.bind(('127.0.0.1', 0))
+    address = sock.getsockname()
+    sock.close()
+    return address
+
+
+class TestFraming:
+    def test_round_trip(self):
+        """Frames carry JSON messages intact, back to back."""
+        a, b = socket.socketpair()
+        with a, b:
+            send_frame(a, {'op': 'load', 'jds': ['é' * 10]})
+            send_frame(a, [1, 2])
+            a.close()
+            assert recv_frame(b) == {'op': 'load', 'jds': ['é' * 10]}
+            assert recv_frame(b) == [1, 2]
+            assert recv_frame(b) is None
+
+    def test_merge_prefers_lower_index_on_ties(self):
+        """The global order is total descending, then corpus index."""
+        merged = merge_top_k([[[5, 80], [6, 70]], [[1, 70], [2, 60]]], 3)
+
+        assert merged == [{'index': 5, 'total': 80}, {'index': 1, 'total': 70}, {'index': 6, 'total': 70}]
+
+
+class TestRankSharded:
+    def test_matches_single_process_ranking(self, workers):
+        """Merged shard results equal rank_top_k over the whole corpus."""
+        result = rank_sharded(RESUMES, JDS, workers, k=5, shard_size=7)
+
+        assert result['topK'] == _expected(5)
+        assert [(s['start'], s['end']) for s in result['shards']] == [(0, 7), (7, 14), (14, 21), (21, 24)]
+        assert all(s['resumesPerSecond'] > 0 for s in result['shards'])
+        assert result['report']['deadWorkers'] == []
+
+    def test_dead_worker_shard_is_reassigned(self, workers):
+        """A worker dying mid-shard hands its shard back to the live ones."""
+        dying = _dying_worker()
+        result = rank_sharded(RESUMES, JDS, [dying, workers[0]], k=5, shard_size=2)
+
+        assert result['topK'] == _expected(5)
+        assert result['report']['deadWorkers'] == [f"{dying[0]}:{dying[1]}"]
+        assert result['report']['reassigned'] == 1
+        assert max(s['attempts'] for s in result['shards']) == 2
+
+    def test_unreachable_worker_is_skipped(self, workers):
+        """Workers that cannot be reached are reported dead without losing work."""
+        result = rank_sharded(RESUMES, JDS, [_closed_port(), workers[1]], k=3, shard_size=10)
+
+        assert result['topK'] == _expected(3)
+        assert len(result['report']['deadWorkers']) == 1
+
+    def test_all_workers_dead(self):
+        """Without a live worker the run fails instead of returning partial results."""
+        with pytest.raises(RuntimeError):
+            rank_sharded(RESUMES, JDS, [_closed_port()], k=3, shard_size=10)
+
+
+class TestWorkerProcesses:
+    def test_spawned_workers_and_cli(self, tmp_path):
+        """The CLI ranks through local worker processes and writes the report."""
+        resumes = tmp_path / 'resumes.jsonl'
+        jds = tmp_path / 'jds.jsonl'
+        resumes.write_text('\n'.join(json.dumps(r) for r in RESUMES) + '\n')
+        jds.write_text('\n'.join(json.dumps({'text': jd}) for jd in JDS) + '\n')
+        output = tmp_path / 'report.json'
+
+        code = main(['rank', '--jds', str(jds), '--resumes', str(resumes), '--spawn', '2',
+                     '--k', '4', '--shard-size', '8', '--output', str(output)])
+
+        assert code == 0
+        assert json.loads(output.read_text())['topK'] == _expected(4)
+
+    def test_killed_worker_process(self):
+        """A worker process killed before the run is treated like any dead worker."""
+        spawned = spawn_workers(2)
+        try:
+            spawned[0][0].kill()
+            spawned[0][0].wait()
+            result = rank_sharded(RESUMES, JDS, [address for _, address in spawned], k=4, shard_size=8)
+        finally:
+            for process, _ in spawned:
+                process.kill()
+                process.wait()
+
+        assert result['topK'] == _expected(4)
+        host, port = spawned[0][1]
+        assert result['report']['deadWorkers'] == [f"{host}:{port}"]
+
+    def test_workers_map_shared_lexicon(self):
+        """Spawned workers rank with the lexicon in the shared image, and close() removes the image."""
+        resumes = ["Skills\nPython", "Skills\nHaskell, Python"]
+        jds = ["Requirements:\n- Haskell and Python"]
+        with SharedLexicon(default_engine().lexicon.overlay(['Haskell'])) as shared:
+            spawned = spawn_workers(1, shared=shared)
+            try:
+                result = rank_sharded(resumes, jds, [address for _, address in spawned], k=2, shard_size=1)
+            finally:
+                for process, _ in spawned:
+                    process.kill()
+                    process.wait()
+            assert os.path.exists(shared.path)
+
+        # Without the overlay Haskell is no keyword, and both resumes would tie
+        assert [entry['index'] for entry in result['topK'][0]] == [1, 0]
+        assert result['topK'][0][0]['total'] > result['topK'][0][1]['total']
+        assert not os.path.exists(shared.path)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
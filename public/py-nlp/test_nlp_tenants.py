@@ -0,0 +1,156 @@
+# Tenant Lexicon Registry Unit Tests
+# Run with: python -m pytest test_nlp_tenants.py -v
+
+import json
+import threading
+import pytest
+import sys
+import os
+
+# Add parent directory to path for import
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from nlp_core import ATSEngine, Lexicon, default_engine, parse_jd
+from nlp_tenants import LexiconRegistry
+from test_nlp_core import SAMPLE_JD, SAMPLE_RESUME
+
+TENANT_JD = SAMPLE_JD + "\n- Experience with Haskell and Erlang is a plus"
+
+
+def _keywords(jd_model):
+    return [k['keyword'] for k in jd_model['categorizedKeywords']]
+
+
+class TestLexiconOverlay:
+    def test_overlay_matches_concatenated_constants(self):
+        """An overlay scores exactly like a lexicon built from base + tenant constants."""
+        base = default_engine().lexicon
+        overlay = ATSEngine(base.overlay(['Haskell', 'Erlang', 'python'], ['grit'], ['plus']))
+        built = ATSEngine(Lexicon.from_constants(
+            list(base.tech_skills) + ['Haskell', 'Erlang'],
+            list(base.soft_skills) + ['grit'],
+            set(base.stop_words) | {'plus'}
+        ))
+
+        assert _keywords(overlay.parse_jd(TENANT_JD)) == _keywords(built.parse_jd(TENANT_JD))
+        assert overlay.evaluate_ats(SAMPLE_RESUME, TENANT_JD)['scoreBreakdown'] == \
+            built.evaluate_ats(SAMPLE_RESUME, TENANT_JD)['scoreBreakdown']
+        assert overlay.engine_version() == built.engine_version()
+
+    def test_overlay_shares_base_index(self):
+        """Unchanged parts of the base are the same objects, not copies."""
+        base = default_engine().lexicon
+        overlay = base.overlay(['Haskell'])
+
+        assert all(a is b for a, b in zip(overlay.tech_lower, base.tech_lower))
+        assert overlay.phrase_regex is base.phrase_regex
+        assert overlay.stop_words is base.stop_words
+        assert overlay.headers is base.headers
+
+
+class TestLexiconRegistry:
+    def test_tenants_are_isolated(self):
+        """A tenant's skills are visible to that tenant only."""
+        registry = LexiconRegistry()
+        registry.register('acme', ['Haskell'])
+        registry.register('globex', ['Erlang'])
+
+        assert 'haskell' in _keywords(registry.engine('acme').parse_jd(TENANT_JD))
+        assert 'haskell' not in _keywords(registry.engine('globex').parse_jd(TENANT_JD))
+        assert 'haskell' not in _keywords(parse_jd(TENANT_JD))
+        assert registry.engine(None) is not registry.engine('acme')
+
+    def test_engines_are_built_lazily_and_reused(self):
+        """register() builds nothing; the first engine() call builds, later ones hit."""
+        registry = LexiconRegistry()
+        registry.register('acme', ['Haskell'])
+
+        assert registry.stats()['resident'] == 0
+        assert registry.engine('acme') is registry.engine('acme')
+        assert registry.stats()['misses'] == 1
+        assert registry.stats()['hits'] == 1
+
+    def test_lru_eviction_by_count(self):
+        """Least recently used tenants are evicted and rebuilt on demand."""
+        registry = LexiconRegistry(max_engines=2)
+        for tenant in ('a', 'b', 'c'):
+            registry.register(tenant, [f'Skill-{tenant}'])
+        first = registry.engine('a')
+        registry.engine('b')
+        registry.engine('a')
+        registry.engine('c')
+
+        stats = registry.stats()
+        assert stats['resident'] == 2
+        assert stats['evictions'] == 1
+        assert registry.engine('a') is first
+        registry.engine('b')
+        assert registry.stats()['misses'] == 4
+
+    def test_lru_eviction_by_bytes(self):
+        """The byte budget bounds resident overlay memory, keeping at least the newest tenant."""
+        registry = LexiconRegistry(max_bytes=1)
+        registry.register('a', ['Haskell'])
+        registry.register('b', ['Erlang'])
+        registry.engine('a')
+        registry.engine('b')
+
+        stats = registry.stats()
+        assert stats['resident'] == 1
+        assert stats['residentBytes'] > 0
+
+    def test_reregister_rebuilds(self):
+        """Replacing a tenant's vocabulary drops its cached engine."""
+        registry = LexiconRegistry()
+        registry.register('acme', ['Haskell'])
+        registry.engine('acme')
+        registry.register('acme', ['Erlang'])
+        keywords = _keywords(registry.engine('acme').parse_jd(TENANT_JD))
+
+        assert 'erlang' in keywords and 'haskell' not in keywords
+
+    def test_unknown_tenant(self):
+        """Unregistered tenants raise KeyError."""
+        registry = LexiconRegistry()
+        registry.register('acme', ['Haskell'])
+        registry.unregister('acme')
+
+        with pytest.raises(KeyError):
+            registry.engine('acme')
+
+    def test_from_file(self, tmp_path):
+        """Tenant files use the shared-constants.json keys."""
+        path = tmp_path / 'tenants.json'
+        path.write_text(json.dumps({'acme': {'TECH_SKILLS': ['Haskell']}, 'globex': {}}))
+        registry = LexiconRegistry.from_file(str(path), max_engines=8)
+
+        assert sorted(registry.tenants()) == ['acme', 'globex']
+        assert registry.max_engines == 8
+        assert 'haskell' in _keywords(registry.engine('acme').parse_jd(TENANT_JD))
+
+    def test_concurrent_access(self):
+        """Threads hammering a small LRU keep it within bounds and get the right tenant."""
+        registry = LexiconRegistry(max_engines=3)
+        tenants = [f't{i}' for i in range(8)]
+        for tenant in tenants:
+            registry.register(tenant, [f'Skill{tenant}'])
+        errors = []
+
+        def worker(offset):
+            for i in range(40):
+                tenant = tenants[(i + offset) % len(tenants)]
+                if f'skill{tenant}' not in registry.engine(tenant).lexicon.tech_set:
+                    errors.append(tenant)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert not errors
+        assert registry.stats()['resident'] <= 3
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -2,7 +2,10 @@ import { useState, useEffect, useCallback, useRef } from 'react';
 import type { PyodideInterface } from 'pyodide';
 import type {
     JobDescriptionModel,
-    ATSEvaluationResponse
+    ATSEvaluationResponse,
+    ATSEvaluationProgress,
+    ATSTriageResponse,
+    EvaluationMode
 } from '@/shared/types/ats';
 
 export interface PyNLPResponse {
@@ -42,9 +45,36 @@ export interface ResumeCanonicalModel {
         text: string;
         location: string;
         normalized: string;
+        /** Set when the token is a known variant of a keyword, e.g. "k8s" -> "kubernetes" */
+        canonical?: string;
     }>;
 }
 
+/**
+ * One operation for the batched `dispatch` entry point.
+ * Operation names mirror the single-call methods of this hook.
+ */
+export type PyNLPBatchRequest =
+    | { id?: string; op: 'parseResume'; args: { text: string } }
+    | { id?: string; op: 'scoreATS'; args: { resumeText: string; jdText: string; mode?: EvaluationMode } }
+    | { id?: string; op: 'promoteScore'; args: { triageResult: Record<string, any>; resumeText: string } }
+    | { id?: string; op: 'optimizeResume'; args: { resumeText: string; jdText: string; output?: 'text' | 'edits' } }
+    | { id?: string; op: 'optimizeResumeMany'; args: { resumeText: string; jdTexts: string[]; output?: 'text' | 'edits' } }
+    | { id?: string; op: 'rewriteBullet'; args: { bullet: string; keyword: string } }
+    | { id?: string; op: 'parseJD'; args: { text: string } }
+    | { id?: string; op: 'parseResumeCanonical'; args: { text: string } }
+    | { id?: string; op: 'evaluateATS'; args: { resumeText: string; jdText: string; mode?: EvaluationMode; deadlineMs?: number } }
+    | { id?: string; op: 'promoteEvaluation'; args: { triageResult: ATSTriageResponse; resumeText: string } };
+
+/**
+ * Per-operation outcome from `dispatch`, in request order.
+ */
+export interface PyNLPBatchResponse {
+    id?: string | null;
+    result?: any;
+    error?: string;
+}
+
 let pyodideInstance: PyodideInterface | null = null;
 let initializationPromise: Promise<PyodideInterface> | null = null;
 
@@ -80,6 +110,18 @@ export const usePyNLP = () => {
                 // Setup the virtual filesystem
                 py.FS.writeFile('nlp_core.py', code);
 
+                // Shared constants, the prebuilt lexicon snapshot and the corpus IDF table are
+                // optional: nlp_core falls back to its defaults, and ignores a snapshot or
+                // table that does not match
+                const [constants, snapshot, termWeights] = await Promise.all([
+                    fetch('/shared-constants.json').then(r => (r.ok ? r.text() : null)).catch(() => null),
+                    fetch('/shared-constants.snapshot').then(r => (r.ok ? r.arrayBuffer() : null)).catch(() => null),
+                    fetch('/shared-constants.idf.json').then(r => (r.ok ? r.text() : null)).catch(() => null),
+                ]);
+                if (constants) py.FS.writeFile('shared-constants.json', constants);
+                if (constants && snapshot) py.FS.writeFile('shared-constants.snapshot', new Uint8Array(snapshot));
+                if (constants && termWeights) py.FS.writeFile('shared-constants.idf.json', termWeights);
+
                 // Warm up and verify imports - include new ATS v2 functions
                 await py.runPythonAsync(`
           import json
@@ -87,7 +129,9 @@ export const usePyNLP = () => {
           from nlp_core import (
               parse_resume, score_ats, optimize_resume, rewrite_bullet,
               parse_jd, parse_resume_canonical, match_keywords, 
-              calculate_ats_score, generate_recommendations, evaluate_ats
+              calculate_ats_score, generate_recommendations, evaluate_ats,
+              dispatch, evaluate_ats_async, map_evaluate_async, optimize_resume_async,
+              optimize_resume_many_async, iter_evaluate_ats_async
           )
         `);
 
@@ -134,10 +178,25 @@ export const usePyNLP = () => {
         const py = await init();
         py.globals.set("res_text", resumeText);
         py.globals.set("jd_text", jobDesc);
-        const result = await py.runPythonAsync(`optimize_resume(res_text, jd_text)`);
+        // The async variant yields to the browser between steps instead of blocking the main thread
+        const result = await py.runPythonAsync(`await optimize_resume_async(res_text, jd_text)`);
         return result;
     }, [init]);
 
+    /**
+     * Tailor one resume to several job descriptions, cooperatively like optimizeResume.
+     * The resume is analyzed once; variants are in `jobDescriptionTexts` order.
+     */
+    const optimizeResumeMany = useCallback(async (resumeText: string, jobDescriptionTexts: string[]): Promise<string[]> => {
+        const py = await init();
+        py.globals.set("res_text", resumeText);
+        py.globals.set("jd_texts_json", JSON.stringify(jobDescriptionTexts));
+        const jsonStr = await py.runPythonAsync(
+            `json.dumps(await optimize_resume_many_async(res_text, json.loads(jd_texts_json)))`
+        );
+        return JSON.parse(jsonStr);
+    }, [init]);
+
     const rewriteBullet = useCallback(async (bullet: string, keyword: string): Promise<string> => {
         const py = await init();
         py.globals.set("bullet_text", bullet);
@@ -176,16 +235,71 @@ export const usePyNLP = () => {
      * 
      * @param resumeText - The resume text content
      * @param jobDescriptionText - The job description text content
+     * @param deadlineMs - Optional matching budget; keywords left over are listed in `unevaluatedKeywords`
+     * @param onProgress - Optional callback with the running score after each decided keyword
      * @returns Complete ATS evaluation response with breakdown and recommendations
+     *
+     * Runs cooperatively: Python yields to the browser every few milliseconds, so the UI
+     * stays responsive (and can render `onProgress` updates) during large evaluations.
      */
     const evaluateATS = useCallback(async (
         resumeText: string,
-        jobDescriptionText: string
+        jobDescriptionText: string,
+        deadlineMs?: number,
+        onProgress?: (progress: ATSEvaluationProgress) => void
     ): Promise<ATSEvaluationResponse> => {
         const py = await init();
         py.globals.set("resume_text", resumeText);
         py.globals.set("jd_text", jobDescriptionText);
-        const jsonStr = await py.runPythonAsync(`json.dumps(evaluate_ats(resume_text, jd_text))`);
+        py.globals.set("deadline_ms", deadlineMs ?? null);
+        if (!onProgress) {
+            const jsonStr = await py.runPythonAsync(
+                `json.dumps(await evaluate_ats_async(resume_text, jd_text, deadline_ms=deadline_ms))`
+            );
+            return JSON.parse(jsonStr);
+        }
+        py.globals.set("on_progress", (eventJson: string) => onProgress(JSON.parse(eventJson)));
+        try {
+            const jsonStr = await py.runPythonAsync(`
+async def _evaluate_with_progress():
+    async for event in iter_evaluate_ats_async(resume_text, jd_text, deadline_ms=deadline_ms):
+        if event['done']:
+            return json.dumps(event['evaluation'])
+        on_progress(json.dumps(event))
+await _evaluate_with_progress()
+`);
+            return JSON.parse(jsonStr);
+        } finally {
+            py.globals.delete("on_progress");
+        }
+    }, [init]);
+
+    /**
+     * Evaluate one resume against several job descriptions, cooperatively like evaluateATS.
+     * The resume is parsed once; results are in `jobDescriptionTexts` order.
+     */
+    const evaluateATSMany = useCallback(async (
+        resumeText: string,
+        jobDescriptionTexts: string[]
+    ): Promise<ATSEvaluationResponse[]> => {
+        const py = await init();
+        py.globals.set("resume_text", resumeText);
+        py.globals.set("jd_texts_json", JSON.stringify(jobDescriptionTexts));
+        const jsonStr = await py.runPythonAsync(
+            `json.dumps(await map_evaluate_async([(resume_text, jd) for jd in json.loads(jd_texts_json)]))`
+        );
+        return JSON.parse(jsonStr);
+    }, [init]);
+
+    /**
+     * Run several operations in a single Python round trip.
+     * Operations share one document analysis, so a resume or JD used by several
+     * of them is parsed once. Failed operations carry an `error` instead of a `result`.
+     */
+    const runBatch = useCallback(async (requests: PyNLPBatchRequest[]): Promise<PyNLPBatchResponse[]> => {
+        const py = await init();
+        py.globals.set("batch_requests", JSON.stringify(requests));
+        const jsonStr = await py.runPythonAsync(`dispatch(batch_requests)`);
         return JSON.parse(jsonStr);
     }, [init]);
 
@@ -194,11 +308,15 @@ export const usePyNLP = () => {
         parseResume,
         scoreATS,
         optimizeResume,
+        optimizeResumeMany,
         rewriteBullet,
         // New ATS v2
         parseJD,
         parseResumeCanonical,
         evaluateATS,
+        evaluateATSMany,
+        // Batched
+        runBatch,
         // Status
         status,
         error,
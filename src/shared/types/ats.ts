@@ -16,6 +16,9 @@ export type MatchStatus = 'matched' | 'partial' | 'missing';
 /** Recommendation severity levels */
 export type RecommendationSeverity = 'info' | 'warning' | 'critical';
 
+/** Evaluation depth: 'triage' runs exact matching and the weighted total only */
+export type EvaluationMode = 'full' | 'triage';
+
 // --- Core Models ---
 
 /**
@@ -60,7 +63,7 @@ export interface ATSScoreBreakdown {
     toolsScore: number;
     /** Score for domain concepts (0-100) */
     conceptScore: number;
-    /** Score for role/title match (0-100) */
+    /** Score for role/title match (0-100): similarity of the resume's sections to the JD's title, requirements and responsibilities */
     roleTitleScore: number;
     /** Score for resume structure/formatting (0-100) */
     structureScore: number;
@@ -112,6 +115,64 @@ export interface ATSEvaluationResponse {
     scoreBreakdown: ATSScoreBreakdown;
     /** Actionable recommendations */
     recommendations: Recommendation[];
+    /** With a deadline: keywords matching had no time for (counted as missing, not recommended) */
+    unevaluatedKeywords?: string[];
+    /** With a deadline: whether the evaluation ran past it (roleTitleScore may then be the default) */
+    deadlineExceeded?: boolean;
+}
+
+/**
+ * Progress event while an evaluation runs (iter_evaluate_ats / iter_evaluate_ats_async),
+ * sent after each keyword is decided; exact matches arrive first.
+ */
+export interface ATSEvaluationProgress {
+    /** Keywords decided so far, out of `keywords` */
+    decided: number;
+    keywords: number;
+    /** Running breakdown; undecided keywords count as missing, so the total never drops */
+    scoreBreakdown: ATSScoreBreakdown;
+    /** Highest total still reachable if every undecided keyword matches */
+    maxTotal: number;
+    matchedKeywords: string[];
+    /** The keyword just decided */
+    matchResult: MatchResultModel;
+    done: false;
+}
+
+/**
+ * First-pass screening result from evaluate_ats(mode='triage').
+ * Only exact lexicon hits count, so the total is a lower bound of the full total.
+ * Complete it with promote_evaluation for shortlisted candidates.
+ */
+export interface ATSTriageResponse {
+    mode: 'triage';
+    /** Parsed job description model (reused when promoting) */
+    jdModel: JobDescriptionModel;
+    /** Exact-match results, without location lists */
+    matchResults: Omit<MatchResultModel, 'locations'>[];
+    /** Score breakdown from exact matches only */
+    scoreBreakdown: ATSScoreBreakdown;
+}
+
+/**
+ * Span-based resume change from optimize_resume(output='edits').
+ * Offsets index the original resume text; apply edits back to front.
+ *
+ * Offsets received through the Pyodide bridge (`dispatch`) are UTF-16 code
+ * units, so `text.slice(start, end)` is correct even after emoji. Calling
+ * Python's optimize_resume directly yields code-point offsets instead
+ * (convert them with utf16_edits).
+ */
+export interface ResumeEditOperation {
+    op: 'replace' | 'insert' | 'append';
+    /** Start offset in the original text (UTF-16 code units) */
+    start: number;
+    /** End offset (equal to start for insert/append) */
+    end: number;
+    /** Replacement or inserted text */
+    text: string;
+    /** JD keywords this edit introduces */
+    keywords: string[];
 }
 
 // --- Request Types ---